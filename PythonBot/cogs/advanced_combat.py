@@ -1,18 +1,23 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button, Select
-import json
 import random
+from utils.game_data import game_data
 from utils.ability_utils import (
     initialize_hunter_abilities, 
     get_ability_data, 
     apply_ability_effect,
-    is_ability_on_cooldown,
-    get_remaining_cooldown,
+    get_ability_cooldowns,
     process_turn_effects,
     get_effective_stats,
     get_hunter_abilities_by_level
 )
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.vitals import vitals
+from utils.combat_engine import (
+    ATTACK, FLEE, WAIT, PLAYER, ENEMY, HIT, EVADE, STUNNED, ESCAPED,
+    ADVANCED_RULES, Action, Combatant, CombatState, damage_dealt, resolve_turn,
+)
 from utils.boss_dialogue import (
     get_boss_dialogue,
     format_boss_encounter_text,
@@ -27,41 +32,20 @@ class AdvancedCombat(commands.Cog):
         self.active_combats = {}  # Track active combat sessions
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def load_gates_data(self):
         """Load gates data from JSON file"""
-        try:
-            with open('data/gates.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return game_data.gates()
     
     def load_dungeons_data(self):
         """Load dungeons data from JSON file"""
-        try:
-            with open('data/dungeons.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return game_data.dungeons()
     
     def load_monster_data(self):
         """Load monster data from JSON file"""
-        try:
-            with open('data/monsters.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return game_data.monsters()
     
     @commands.command(name='abilities')
     async def show_abilities(self, ctx):
@@ -81,7 +65,7 @@ class AdvancedCombat(commands.Cog):
         available_abilities = get_hunter_abilities_by_level(current_level)
         hunter['abilities'] = available_abilities
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         from utils.theme_utils import get_user_theme_colors
         colors = get_user_theme_colors(ctx.author.id)
@@ -93,12 +77,12 @@ class AdvancedCombat(commands.Cog):
         )
         
         abilities_text = ""
-        for ability_id in hunter.get('abilities', []):
+        abilities = hunter.get('abilities', [])
+        for ability_id, remaining in zip(abilities, get_ability_cooldowns(user_id, abilities)):
             ability_data = get_ability_data(ability_id)
             if ability_data:
                 cooldown_status = ""
-                if is_ability_on_cooldown(hunter, ability_id):
-                    remaining = get_remaining_cooldown(hunter, ability_id)
+                if remaining is not None:
                     cooldown_status = f" (Cooldown: {remaining})"
                 
                 mana_cost = ability_data.get('mana_cost', 0)
@@ -625,6 +609,46 @@ class AdvancedCombatView(View):
         
         self.add_combat_buttons()
     
+    def play_turn(self, hunter, action):
+        """Resolve one exchange through the combat engine and write the results back.
+        
+        An 'evasion' buff dodges the next counter-attack and frozen turns skip it.
+        """
+        effective_stats = get_effective_stats(hunter)
+        temp_buffs = hunter.get('temp_buffs', {})
+        monster_hp = self.monster_data.get('hp', 1)
+        player = Combatant(
+            hunter.get('name', 'Hunter'), hunter.get('hp', 100), hunter.get('max_hp', 100),
+            effective_stats['strength'], effective_stats['defense'],
+            flee_chance=0.8, evade='evasion' in temp_buffs
+        )
+        enemy = Combatant(
+            self.monster_data.get('name', 'monster'), monster_hp, self.monster_data.get('max_hp', monster_hp),
+            self.monster_data.get('attack', 5), self.monster_data.get('defense', 0),
+            stunned=self.monster_data.get('frozen_turns', 0)
+        )
+        state, events = resolve_turn(CombatState(player, enemy), Action(action), ADVANCED_RULES)
+        
+        hunter['hp'] = state.player.hp
+        self.monster_data['hp'] = state.enemy.hp
+        if 'evasion' in temp_buffs and not state.player.evade:
+            del temp_buffs['evasion']
+        if 'frozen_turns' in self.monster_data:
+            self.monster_data['frozen_turns'] = state.enemy.stunned
+        return state, events
+    
+    def describe_counter(self, events):
+        """Text for the monster's side of the exchange"""
+        monster_name = self.monster_data.get('name', 'monster')
+        for event in events:
+            if event.kind == STUNNED:
+                return f"\n\nThe {monster_name} is frozen and cannot attack!"
+            if event.kind == EVADE:
+                return f"\n\nYou evaded the {monster_name}'s attack!"
+            if event.kind == HIT and event.actor == ENEMY:
+                return f"\n\nThe {monster_name} dealt {event.amount} damage to you!"
+        return ""
+    
     def add_combat_buttons(self):
         """Add combat buttons including abilities"""
         self.clear_items()
@@ -638,16 +662,15 @@ class AdvancedCombatView(View):
         self.add_item(attack_btn)
         
         # Ability buttons
-        abilities = hunter.get('abilities', [])
-        for ability_id in abilities[:3]:  # Limit to 3 abilities to fit in one row
+        abilities = hunter.get('abilities', [])[:3]  # Limit to 3 abilities to fit in one row
+        for ability_id, remaining in zip(abilities, get_ability_cooldowns(self.user_id, abilities)):
             ability_data = get_ability_data(ability_id)
             if ability_data:
-                is_on_cooldown = is_ability_on_cooldown(hunter, ability_id)
+                is_on_cooldown = remaining is not None
                 has_mana = hunter.get('mana', 0) >= ability_data['mana_cost']
                 
                 button_label = ability_data['name'][:20]  # Truncate for button
                 if is_on_cooldown:
-                    remaining = get_remaining_cooldown(hunter, ability_id)
                     button_label = f"{ability_data['name'][:15]} ({remaining})"
                 elif not has_mana:
                     button_label = f"{ability_data['name'][:15]} (No MP)"
@@ -673,49 +696,39 @@ class AdvancedCombatView(View):
         
         await interaction.response.defer()
         
-        hunters_data = self.combat_cog.load_hunters_data()
-        hunter = hunters_data.get(self.user_id, {})
+        async with hunter_store.transaction(self.user_id):
+            hunters_data = self.combat_cog.load_hunters_data()
+            hunter = hunters_data.get(self.user_id, {})
+            if hunter:
+                vitals.settle(self.user_id, hunter)  # Buttons skip before_invoke
         
-        # Player attacks monster
-        effective_stats = get_effective_stats(hunter)
-        damage_dealt = max(1, effective_stats['strength'] - self.monster_data.get('defense', 0))
-        self.monster_data['hp'] = max(0, self.monster_data.get('hp', 1) - damage_dealt)
+            # Player attacks monster, then the monster attacks back
+            state, events = self.play_turn(hunter, ATTACK)
+            result_text = f"You dealt {damage_dealt(events, PLAYER)} damage!"
         
-        result_text = f"You dealt {damage_dealt} damage!"
+            # Check if monster is defeated
+            if self.monster_data['hp'] <= 0:
+                await self.handle_victory(interaction, hunter, hunters_data)
+                return
         
-        # Check if monster is defeated
-        if self.monster_data['hp'] <= 0:
-            await self.handle_victory(interaction, hunter, hunters_data)
-            return
+            result_text += self.describe_counter(events)
         
-        # Monster attacks back
-        monster_damage = max(1, self.monster_data.get('attack', 5) - effective_stats['defense'])
+            # Process turn effects
+            turn_effects = process_turn_effects(hunter)
+            if turn_effects:
+                result_text += f"\n\n{turn_effects}"
         
-        # Check for evasion buff
-        temp_buffs = hunter.get('temp_buffs', {})
-        if 'evasion' in temp_buffs:
-            result_text += f"\n\nYou evaded the {self.monster_data.get('name', 'monster')}'s attack!"
-            del temp_buffs['evasion']
-        else:
-            hunter['hp'] = max(0, hunter.get('hp', 100) - monster_damage)
-            result_text += f"\n\nThe {self.monster_data.get('name', 'monster')} dealt {monster_damage} damage to you!"
-        
-        # Process turn effects
-        turn_effects = process_turn_effects(hunter)
-        if turn_effects:
-            result_text += f"\n\n{turn_effects}"
+            # Save hunter data
+            hunters_data[self.user_id] = hunter
+            hunter_store.mark_dirty(self.user_id)
         
-        # Save hunter data
-        hunters_data[self.user_id] = hunter
-        self.combat_cog.save_hunters_data(hunters_data)
-        
-        # Check if hunter is defeated
-        if hunter['hp'] <= 0:
-            await self.handle_defeat(interaction)
-            return
+            # Check if hunter is defeated
+            if hunter['hp'] <= 0:
+                await self.handle_defeat(interaction)
+                return
         
-        # Update combat display
-        await self.update_combat_display(interaction, result_text)
+            # Update combat display
+            await self.update_combat_display(interaction, result_text)
     
     async def ability_callback(self, interaction, ability_id):
         """Handle ability usage"""
@@ -725,56 +738,46 @@ class AdvancedCombatView(View):
         
         await interaction.response.defer()
         
-        hunters_data = self.combat_cog.load_hunters_data()
-        hunter = hunters_data.get(self.user_id, {})
+        async with hunter_store.transaction(self.user_id):
+            hunters_data = self.combat_cog.load_hunters_data()
+            hunter = hunters_data.get(self.user_id, {})
+            if hunter:
+                vitals.settle(self.user_id, hunter)  # Buttons skip before_invoke
         
-        # Apply ability effect
-        result_message, success = apply_ability_effect(hunter, self.monster_data, ability_id)
+            # Apply ability effect
+            result_message, success = apply_ability_effect(hunter, self.monster_data, ability_id, self.user_id)
         
-        if not success:
-            await interaction.followup.send(result_message, ephemeral=True)
-            return
+            if not success:
+                hunter_store.after_commit(self.user_id, interaction.followup.send, result_message, ephemeral=True)
+                return
         
-        result_text = result_message
+            result_text = result_message
         
-        # Check if monster is defeated
-        if self.monster_data['hp'] <= 0:
-            await self.handle_victory(interaction, hunter, hunters_data)
-            return
+            # Check if monster is defeated
+            if self.monster_data['hp'] <= 0:
+                await self.handle_victory(interaction, hunter, hunters_data)
+                return
         
-        # Monster counter-attack (if not frozen)
-        if self.monster_data.get('frozen_turns', 0) > 0:
-            self.monster_data['frozen_turns'] -= 1
-            result_text += f"\n\nThe {self.monster_data.get('name', 'monster')} is frozen and cannot attack!"
-        else:
-            effective_stats = get_effective_stats(hunter)
-            monster_damage = max(1, self.monster_data.get('attack', 5) - effective_stats['defense'])
-            
-            # Check for evasion buff
-            temp_buffs = hunter.get('temp_buffs', {})
-            if 'evasion' in temp_buffs:
-                result_text += f"\n\nYou evaded the {self.monster_data.get('name', 'monster')}'s attack!"
-                del temp_buffs['evasion']
-            else:
-                hunter['hp'] = max(0, hunter.get('hp', 100) - monster_damage)
-                result_text += f"\n\nThe {self.monster_data.get('name', 'monster')} dealt {monster_damage} damage to you!"
-        
-        # Process turn effects
-        turn_effects = process_turn_effects(hunter)
-        if turn_effects:
-            result_text += f"\n\n{turn_effects}"
-        
-        # Save hunter data
-        hunters_data[self.user_id] = hunter
-        self.combat_cog.save_hunters_data(hunters_data)
+            # Monster counter-attack (if not frozen)
+            state, events = self.play_turn(hunter, WAIT)
+            result_text += self.describe_counter(events)
         
-        # Check if hunter is defeated
-        if hunter['hp'] <= 0:
-            await self.handle_defeat(interaction)
-            return
+            # Process turn effects
+            turn_effects = process_turn_effects(hunter)
+            if turn_effects:
+                result_text += f"\n\n{turn_effects}"
+        
+            # Save hunter data
+            hunters_data[self.user_id] = hunter
+            hunter_store.mark_dirty(self.user_id)
         
-        # Update combat display
-        await self.update_combat_display(interaction, result_text)
+            # Check if hunter is defeated
+            if hunter['hp'] <= 0:
+                await self.handle_defeat(interaction)
+                return
+        
+            # Update combat display
+            await self.update_combat_display(interaction, result_text)
     
     async def flee_callback(self, interaction):
         """Handle flee attempt"""
@@ -785,7 +788,9 @@ class AdvancedCombatView(View):
         await interaction.response.defer()
         
         # 80% chance to flee successfully
-        if random.random() < 0.8:
+        hunter = self.combat_cog.load_hunters_data().get(self.user_id, {})
+        state, _ = self.play_turn(hunter, FLEE)
+        if state.outcome == ESCAPED:
             for item in self.children:
                 item.disabled = True
             
@@ -798,6 +803,13 @@ class AdvancedCombatView(View):
         else:
             await interaction.followup.send("❌ You failed to escape! The monster blocks your path.", ephemeral=True)
     
+    async def show(self, embed):
+        """Edit the combat message; queued until the turn's hunter transaction commits"""
+        try:
+            await self.message.edit(embed=embed, view=self)
+        except:
+            pass
+    
     async def update_combat_display(self, interaction, result_text):
         """Update the combat embed and buttons with boss dialogue"""
         hunters_data = self.combat_cog.load_hunters_data()
@@ -869,10 +881,7 @@ class AdvancedCombatView(View):
         # Update buttons
         self.add_combat_buttons()
         
-        try:
-            await self.message.edit(embed=embed, view=self)
-        except:
-            pass
+        hunter_store.after_commit(self.user_id, self.show, embed)
     
     async def handle_victory(self, interaction, hunter, hunters_data):
         """Handle combat victory"""
@@ -900,7 +909,7 @@ class AdvancedCombatView(View):
         update_quest_progress(hunter, 'kill_monsters', 1)
         
         hunters_data[self.user_id] = hunter
-        self.combat_cog.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(self.user_id)
         
         from utils.theme_utils import get_user_theme_colors
         colors = get_user_theme_colors(self.user_id)
@@ -924,10 +933,7 @@ class AdvancedCombatView(View):
                 inline=True
             )
         
-        try:
-            await self.message.edit(embed=embed, view=self)
-        except:
-            pass
+        hunter_store.after_commit(self.user_id, self.show, embed)
     
     async def handle_defeat(self, interaction):
         """Handle combat defeat"""
@@ -954,12 +960,9 @@ class AdvancedCombatView(View):
         hunter = hunters_data.get(self.user_id, {})
         hunter['hp'] = 1
         hunters_data[self.user_id] = hunter
-        self.combat_cog.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(self.user_id)
         
-        try:
-            await self.message.edit(embed=embed, view=self)
-        except:
-            pass
+        hunter_store.after_commit(self.user_id, self.show, embed)
 
 async def setup(bot):
     await bot.add_cog(AdvancedCombat(bot))
\ No newline at end of file
@@ -1,39 +1,21 @@
 import discord
 from discord.ext import commands
-import json
 from datetime import datetime
+from utils.hunter_store import hunter_store, load_hunters_data
 
 class DailyQuests(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     @commands.command(name='daily_quests', aliases=['daily'])
     async def show_daily_quests(self, ctx):
         """Display daily quests"""
         user_id = str(ctx.author.id)
         
-        # Check if player is resting
-        from main import check_if_resting
-        is_resting, rest_message = check_if_resting(user_id)
-        if is_resting:
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, rest_message)
-            await ctx.send(embed=embed)
-            return
-        
         hunters_data = self.load_hunters_data()
         
         if user_id not in hunters_data:
@@ -42,22 +24,22 @@ class DailyQuests(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        hunter = hunters_data[user_id]
-        
-        # Check and reset daily quests if needed
-        from daily_quest_system import should_reset_daily_quests, generate_daily_quests
+        # Reset under the hunter's lock so a concurrent quest update is not overwritten
+        async with hunter_store.transaction(user_id) as hunter:
+            # Check and reset daily quests if needed
+            from daily_quest_system import should_reset_daily_quests, generate_daily_quests
         
-        quests = hunter.get('quests', {})
-        last_reset = quests.get('last_daily_reset', '')
+            quests = hunter.get('quests', {})
+            last_reset = quests.get('last_daily_reset', '')
         
-        if should_reset_daily_quests(last_reset):
-            # Generate new daily quests
-            daily_quests = generate_daily_quests(hunter['level'])
-            if 'quests' not in hunter:
-                hunter['quests'] = {}
-            hunter['quests']['daily'] = daily_quests
-            hunter['quests']['last_daily_reset'] = datetime.now().strftime("%Y-%m-%d")
-            self.save_hunters_data(hunters_data)
+            if should_reset_daily_quests(last_reset):
+                # Generate new daily quests
+                daily_quests = generate_daily_quests(hunter['level'])
+                if 'quests' not in hunter:
+                    hunter['quests'] = {}
+                hunter['quests']['daily'] = daily_quests
+                hunter['quests']['last_daily_reset'] = datetime.now().strftime("%Y-%m-%d")
+                hunter_store.mark_dirty(user_id)
         
         daily_quests = hunter.get('quests', {}).get('daily', {})
         
@@ -1,26 +1,15 @@
 import discord
 from discord.ext import commands
-import json
-import random
 import asyncio
 import time
 from datetime import datetime, timedelta
-
-def load_hunters_data():
-    """Loads hunter data from a JSON file."""
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-    except json.JSONDecodeError:
-        print("Error: hunters_data.json is empty or malformed. Returning empty dict.")
-        return {}
-
-def save_hunters_data(data):
-    """Saves hunter data to a JSON file."""
-    with open('hunters_data.json', 'w') as f:
-        json.dump(data, f, indent=4)
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.game_data import game_data
+from utils.spawn_tables import SpawnTables, get_spawn_tables
+from utils.combat_engine import (
+    ATTACK, FLEE, PLAYER, ENEMY, ESCAPE, VICTORY, DEFEAT,
+    DUNGEON_VIEW_RULES, Action, Combatant, CombatState, damage_dealt, find_event, resolve_turn,
+)
 
 def get_user_theme_colors(user_id):
     """Get user-specific theme colors."""
@@ -41,10 +30,8 @@ def award_exp(hunter, exp_gained):
 
 def load_monster_data():
     """Load monster data from JSON file"""
-    try:
-        with open('data/monsters.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
+    data = game_data.get('monsters')
+    if data is None:
         # Fallback monsters if file doesn't exist
         return {
             "goblins": [
@@ -72,38 +59,16 @@ def load_monster_data():
                 }
             ]
         }
+    return data
 
 def select_random_monster(hunter_rank):
     """Select a random monster based on hunter rank"""
-    monsters_data = load_monster_data()
-    
-    # Rank-based monster selection with progressive access
-    if hunter_rank in ["E Rank", "F Rank"]:
-        available_monsters = monsters_data.get("goblins", [])
-    elif hunter_rank == "D Rank":
-        available_monsters = monsters_data.get("goblins", []) + monsters_data.get("wolves", [])
-    elif hunter_rank == "C Rank":
-        available_monsters = (monsters_data.get("goblins", []) + 
-                            monsters_data.get("wolves", []) + 
-                            monsters_data.get("orcs", []))
-    elif hunter_rank == "B Rank":
-        available_monsters = (monsters_data.get("wolves", []) + 
-                            monsters_data.get("orcs", []) + 
-                            monsters_data.get("spiders", []) + 
-                            monsters_data.get("undead", []))
-    elif hunter_rank == "A Rank":
-        available_monsters = (monsters_data.get("orcs", []) + 
-                            monsters_data.get("spiders", []) + 
-                            monsters_data.get("undead", []) + 
-                            monsters_data.get("elementals", []))
-    else:  # S Rank and National Level
-        # Access to all monster types including demons
-        all_monsters = []
-        for monster_type in monsters_data.values():
-            all_monsters.extend(monster_type)
-        available_monsters = all_monsters
+    if game_data.get('monsters') is not None:
+        monster = get_spawn_tables().spawn(hunter_rank)
+    else:
+        monster = SpawnTables(load_monster_data()).spawn(hunter_rank)
     
-    if not available_monsters:
+    if monster is None:
         # Fallback monster
         return {
             "name": "Wild Slime",
@@ -112,7 +77,7 @@ def select_random_monster(hunter_rank):
             "image_url": "https://static.wikia.nocookie.net/solo-leveling/images/2/2a/Slime.png"
         }
     
-    return random.choice(available_monsters)
+    return monster
 
 class DungeonCombatView(discord.ui.View):
     def __init__(self, bot_ref, hunter_id, monster_data, initial_combat_log):
@@ -123,12 +88,24 @@ class DungeonCombatView(discord.ui.View):
         self.combat_log = [initial_combat_log]
         self.message = None
 
+    def play_turn(self, hunter, action):
+        """Resolve one exchange through the combat engine and write HP back"""
+        dungeon_battle = hunter['dungeon_battle']
+        player = Combatant(hunter.get('name', 'Hunter'), hunter['hp'], hunter.get('max_hp', 100),
+                           hunter['attack'], hunter['defense'], flee_chance=1.0)
+        enemy = Combatant(self.monster_data['name'], dungeon_battle['current_monster_hp'], self.monster_data['hp'],
+                          self.monster_data['attack'], self.monster_data['defense'])
+        state, events = resolve_turn(CombatState(player, enemy), Action(action), DUNGEON_VIEW_RULES)
+        hunter['hp'] = state.player.hp
+        dungeon_battle['current_monster_hp'] = state.enemy.hp
+        return state, events
+
     async def on_timeout(self):
         hunters_data = load_hunters_data()
         hunter = hunters_data.get(self.hunter_id)
         if hunter and hunter.get('dungeon_battle'):
             del hunter['dungeon_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(self.hunter_id)
         
         for item in self.children:
             item.disabled = True
@@ -198,7 +175,7 @@ class DungeonCombatView(discord.ui.View):
             await interaction.response.send_message("You are defeated and cannot attack!", ephemeral=True)
             hunter['hp'] = hunter.get('max_hp', 100)
             del hunter['dungeon_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(self.hunter_id)
             for item in self.children: 
                 item.disabled = True
             await self.message.edit(view=self)
@@ -207,13 +184,11 @@ class DungeonCombatView(discord.ui.View):
             
         dungeon_battle = hunter['dungeon_battle']
 
-        # Hunter attacks monster
-        hunter_damage_dealt = max(1, hunter['attack'] - self.monster_data['defense'])
-        dungeon_battle['current_monster_hp'] -= hunter_damage_dealt
-        dungeon_battle['current_monster_hp'] = max(0, dungeon_battle['current_monster_hp'])
-        self.combat_log.append(f"You attacked the {self.monster_data['name']} for {hunter_damage_dealt} damage!")
+        # Hunter attacks monster, monster retaliates if it survives
+        state, events = self.play_turn(hunter, ATTACK)
+        self.combat_log.append(f"You attacked the {self.monster_data['name']} for {damage_dealt(events, PLAYER)} damage!")
 
-        if dungeon_battle['current_monster_hp'] <= 0:
+        if state.outcome == VICTORY:
             # Monster defeated
             exp_gained = self.monster_data['exp_reward']
             gold_gained = self.monster_data['gold_reward']
@@ -231,7 +206,7 @@ class DungeonCombatView(discord.ui.View):
             self.combat_log.append(f"You gained {exp_gained} EXP and {gold_gained} gold!")
             
             del hunter['dungeon_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(self.hunter_id)
 
             for item in self.children:
                 item.disabled = True
@@ -239,17 +214,13 @@ class DungeonCombatView(discord.ui.View):
             self.stop()
             return
         
-        # Monster retaliates
-        monster_damage_dealt = max(1, self.monster_data['attack'] - hunter['defense'])
-        hunter['hp'] -= monster_damage_dealt
-        hunter['hp'] = max(0, hunter['hp'])
-        self.combat_log.append(f"The {self.monster_data['name']} retaliated, dealing {monster_damage_dealt} damage!")
+        self.combat_log.append(f"The {self.monster_data['name']} retaliated, dealing {damage_dealt(events, ENEMY)} damage!")
 
-        if hunter['hp'] <= 0:
+        if state.outcome == DEFEAT:
             self.combat_log.append("💀 You were defeated by the monster!")
             del hunter['dungeon_battle']
             hunter['hp'] = hunter.get('max_hp', 100)
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(self.hunter_id)
 
             for item in self.children:
                 item.disabled = True
@@ -259,7 +230,7 @@ class DungeonCombatView(discord.ui.View):
             return
 
         hunter['dungeon_battle'] = dungeon_battle
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(self.hunter_id)
         
         await interaction.response.edit_message(embed=self.get_combat_embed(), view=self)
 
@@ -277,19 +248,18 @@ class DungeonCombatView(discord.ui.View):
             self.stop()
             return
         
-        # Fleeing penalty
-        flee_damage = random.randint(5, 20)
-        hunter['hp'] -= flee_damage
-        hunter['hp'] = max(0, hunter['hp'])
+        # Escaping always works but costs some HP
+        state, events = self.play_turn(hunter, FLEE)
+        flee_damage = find_event(events, ESCAPE).amount
 
         self.combat_log.append(f"You attempted to flee from the {self.monster_data['name']}!")
         self.combat_log.append(f"You successfully escaped but took {flee_damage} damage.")
 
-        if hunter['hp'] <= 0:
+        if state.outcome == DEFEAT:
             self.combat_log.append("💀 You were defeated while trying to flee! You automatically recovered.")
             hunter['hp'] = hunter.get('max_hp', 100)
             del hunter['dungeon_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(self.hunter_id)
             
             for item in self.children: 
                 item.disabled = True
@@ -299,7 +269,7 @@ class DungeonCombatView(discord.ui.View):
             return
         
         del hunter['dungeon_battle']
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(self.hunter_id)
 
         self.combat_log.append("You successfully fled the battle.")
         for item in self.children:
@@ -343,14 +313,14 @@ class DungeonManagement(commands.Cog):
                     pass
             
             del hunter['dungeon_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
             await ctx.send("Your previous hunt state was invalid and has been cleared. Please try `.hunt` again.")
             return
         
         # Auto-heal if defeated
         if hunter['hp'] <= 0:
             hunter['hp'] = hunter.get('max_hp', 100)
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
 
         # Select a random monster for the hunt
         monster_data = select_random_monster(hunter.get('rank', 'E Rank'))
@@ -372,7 +342,7 @@ class DungeonManagement(commands.Cog):
                 "channel_id": ctx.channel.id
             }
             hunters_data[user_id] = hunter
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
 
         except discord.Forbidden:
             await ctx.send("I don't have permissions to send messages with buttons in this channel. Please check my permissions.")
@@ -1,141 +1,25 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
+import copy
+from utils.floor_scaling import DUNGEONS, dungeon_floor_monster
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.activity import activities, RAID
 
 class DungeonRaids(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.active_raids = {}  # Store active dungeon raids
+        self.active_raids = activities.view(RAID, 'DungeonRaids')  # Store active dungeon raids
         self.dungeon_data = self.load_dungeon_data()
     
     def load_dungeon_data(self):
         """Load dungeon configuration"""
-        return {
-            "dungeons": {
-                "Abandoned Mine": {
-                    "min_level": 1,
-                    "min_rank": "E",
-                    "floors": 3,
-                    "boss_floor": 3,
-                    "base_difficulty": 10,
-                    "rewards": {
-                        "exp_per_floor": 50,
-                        "gold_per_floor": 75,
-                        "boss_exp": 200,
-                        "boss_gold": 300
-                    }
-                },
-                "Goblin Cave": {
-                    "min_level": 5,
-                    "min_rank": "D",
-                    "floors": 4,
-                    "boss_floor": 4,
-                    "base_difficulty": 20,
-                    "rewards": {
-                        "exp_per_floor": 100,
-                        "gold_per_floor": 150,
-                        "boss_exp": 400,
-                        "boss_gold": 600
-                    }
-                },
-                "Demon Castle": {
-                    "min_level": 25,
-                    "min_rank": "C",
-                    "floors": 5,
-                    "boss_floor": 5,
-                    "base_difficulty": 30,
-                    "rewards": {
-                        "exp_per_floor": 200,
-                        "gold_per_floor": 300,
-                        "boss_exp": 1000,
-                        "boss_gold": 1500
-                    }
-                },
-                "Red Gate Portal": {
-                    "min_level": 40,
-                    "min_rank": "B",
-                    "floors": 10,
-                    "boss_floor": 10,
-                    "base_difficulty": 50,
-                    "rewards": {
-                        "exp_per_floor": 300,
-                        "gold_per_floor": 500,
-                        "boss_exp": 2000,
-                        "boss_gold": 3000
-                    }
-                },
-                "Monarch's Domain": {
-                    "min_level": 90,
-                    "min_rank": "S",
-                    "floors": 15,
-                    "boss_floor": 15,
-                    "base_difficulty": 100,
-                    "rewards": {
-                        "exp_per_floor": 500,
-                        "gold_per_floor": 800,
-                        "boss_exp": 5000,
-                        "boss_gold": 8000
-                    }
-                },
-                "Red Dungeon": {
-                    "min_level": 30,
-                    "min_rank": "C",
-                    "floors": 8,
-                    "boss_floor": 8,
-                    "base_difficulty": 40,
-                    "special_access": "Red",
-                    "rewards": {
-                        "exp_per_floor": 250,
-                        "gold_per_floor": 400,
-                        "boss_exp": 1500,
-                        "boss_gold": 2500
-                    }
-                },
-                "Blue Dungeon": {
-                    "min_level": 50,
-                    "min_rank": "B",
-                    "floors": 12,
-                    "boss_floor": 12,
-                    "base_difficulty": 60,
-                    "special_access": "Blue",
-                    "rewards": {
-                        "exp_per_floor": 400,
-                        "gold_per_floor": 600,
-                        "boss_exp": 2500,
-                        "boss_gold": 4000
-                    }
-                },
-                "Gold Dungeon": {
-                    "min_level": 70,
-                    "min_rank": "A",
-                    "floors": 20,
-                    "boss_floor": 20,
-                    "base_difficulty": 80,
-                    "special_access": "Gold",
-                    "rewards": {
-                        "exp_per_floor": 600,
-                        "gold_per_floor": 1000,
-                        "boss_exp": 4000,
-                        "boss_gold": 7000
-                    }
-                }
-            }
-        }
+        return copy.deepcopy(DUNGEONS)
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def get_rank_value(self, rank):
         """Convert rank to numerical value for comparison"""
@@ -206,8 +90,9 @@ class DungeonRaids(commands.Cog):
         hunter = hunters_data[user_id]
         
         # Check if hunter is already in any type of battle or exploration
-        if hunter.get('battle') or hunter.get('gate_battle') or hunter.get('dungeon_battle') or user_id in self.active_raids:
-            await ctx.send("You're already in battle or raid! Finish your current activity first.")
+        activity = activities.current(user_id)
+        if activity is not None:
+            await ctx.send(activities.busy_message(activity))
             return
         
         # Find the dungeon
@@ -304,53 +189,7 @@ class DungeonRaids(commands.Cog):
         dungeon_data = self.dungeon_data["dungeons"][raid["dungeon_name"]]
         
         # Generate floor monster with proper scaling and variety
-        if is_boss_floor:
-            # Boss monster with special abilities
-            base_hp = dungeon_data["base_difficulty"] + (current_floor * 20)
-            base_attack = 15 + (current_floor * 4)
-            boss_names = [
-                f"{raid['dungeon_name']} Lord",
-                f"{raid['dungeon_name']} King", 
-                f"{raid['dungeon_name']} Overlord",
-                f"Ancient {raid['dungeon_name']} Guardian"
-            ]
-            monster_name = boss_names[hash(raid['dungeon_name']) % len(boss_names)]
-            
-            monster = {
-                "name": monster_name,
-                "hp": base_hp,
-                "attack": base_attack,
-                "defense": 5 + (current_floor // 2),
-                "exp_reward": dungeon_data["rewards"]["boss_exp"],
-                "gold_reward": dungeon_data["rewards"]["boss_gold"],
-                "level": current_floor + 10,
-                "abilities": ["Devastating Strike", "Fury", "Regeneration"],
-                "rarity": "boss"
-            }
-        else:
-            # Regular floor monster with scaling difficulty
-            floor_multiplier = 1.15 ** (current_floor - 1)
-            base_hp = int((20 + (dungeon_data["base_difficulty"] // 4)) * floor_multiplier)
-            base_attack = int((6 + (current_floor * 1.5)) * floor_multiplier)
-            
-            monster_types = [
-                "Skeleton Warrior", "Orc Berserker", "Shadow Beast", 
-                "Stone Golem", "Fire Elemental", "Ice Wraith",
-                "Demon Scout", "Undead Knight", "Crystal Spider"
-            ]
-            monster_name = f"{monster_types[(current_floor - 1) % len(monster_types)]} Lv.{current_floor + 5}"
-            
-            monster = {
-                "name": monster_name,
-                "hp": base_hp,
-                "attack": base_attack,
-                "defense": 2 + (current_floor // 3),
-                "exp_reward": int(dungeon_data["rewards"]["exp_per_floor"] * (1 + current_floor * 0.1)),
-                "gold_reward": int(dungeon_data["rewards"]["gold_per_floor"] * (1 + current_floor * 0.1)),
-                "level": current_floor + 5,
-                "abilities": ["Strike", "Guard"],
-                "rarity": "elite" if current_floor > dungeon_data["floors"] // 2 else "common"
-            }
+        monster = dungeon_floor_monster(raid["dungeon_name"], dungeon_data, current_floor, boss_floor)
         
         if is_boss_floor:
             # Boss encounter - ask player if they want to fight or flee
@@ -402,7 +241,7 @@ class DungeonRaids(commands.Cog):
                         'is_boss': is_boss_floor
                     }
                     
-                    self.save_hunters_data(hunters_data)
+                    hunter_store.mark_dirty(user_id)
                     
                     embed = discord.Embed(
                         title=f"⚔️ Boss Battle - {monster['name']}",
@@ -542,7 +381,7 @@ class DungeonRaids(commands.Cog):
                     else:
                         # Continue exploring
                         raid['current_floor'] += 1
-                        self.save_hunters_data(hunters_data)
+                        hunter_store.mark_dirty(user_id)
                         await asyncio.sleep(1)
                         await self.process_floor(ctx, user_id)
                         
@@ -567,7 +406,7 @@ class DungeonRaids(commands.Cog):
         if hasattr(self, 'active_raids') and user_id in self.active_raids:
             del self.active_raids[user_id]
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="💀 Death",
@@ -600,96 +439,97 @@ class DungeonRaids(commands.Cog):
         if raid.get('completed', False):
             return
         raid['completed'] = True
-        hunters_data = self.load_hunters_data()
-        hunter = hunters_data[user_id]
-        
-        # Clear dungeon battle state
-        if 'dungeon_battle' in hunter:
-            del hunter['dungeon_battle']
-        
-        # Award accumulated rewards
-        total_exp = raid["total_exp"]
-        total_gold = raid["total_gold"]
-        
-        dropped_key = None
-        level_ups = 0
-        level_up_data = None
-        
-        if success and total_exp > 0:
-            # Award EXP using new leveling system
-            from utils.leveling_system import award_exp, send_level_up_notification
-            level_up_data = await award_exp(user_id, total_exp, self.bot, "dungeon_clear")
+        async with hunter_store.transaction(user_id):
+            hunters_data = self.load_hunters_data()
+            hunter = hunters_data[user_id]
+        
+            # Clear dungeon battle state
+            if 'dungeon_battle' in hunter:
+                del hunter['dungeon_battle']
+        
+            # Award accumulated rewards
+            total_exp = raid["total_exp"]
+            total_gold = raid["total_gold"]
+        
+            dropped_key = None
+            level_ups = 0
+            level_up_data = None
+        
+            if success and total_exp > 0:
+                # Award EXP using new leveling system
+                from utils.leveling_system import award_exp, send_level_up_notification
+                level_up_data = await award_exp(user_id, total_exp, self.bot, "dungeon_clear")
             
-            hunter['gold'] = hunter.get('gold', 0) + total_gold
+                hunter['gold'] = hunter.get('gold', 0) + total_gold
             
-            # Track dungeon completion for rank progression
-            hunter['dungeons_cleared'] = hunter.get('dungeons_cleared', 0) + 1
+                # Track dungeon completion for rank progression
+                hunter['dungeons_cleared'] = hunter.get('dungeons_cleared', 0) + 1
             
-            # Check for rare dungeon key drops
-            from daily_quest_system import add_dungeon_key_drop
-            dropped_key = add_dungeon_key_drop(hunter, hunter.get('rank', 'E'))
+                # Check for rare dungeon key drops
+                from daily_quest_system import add_dungeon_key_drop
+                dropped_key = add_dungeon_key_drop(hunter, hunter.get('rank', 'E'))
             
-            # Handle level up notifications
-            if level_up_data.get("levels_gained", 0) > 0:
-                level_ups = level_up_data["levels_gained"]
-                await send_level_up_notification(ctx.author, level_up_data)
+                # Handle level up notifications
+                if level_up_data.get("levels_gained", 0) > 0:
+                    level_ups = level_up_data["levels_gained"]
+                    hunter_store.after_commit(user_id, send_level_up_notification, ctx.author, level_up_data)
             
-            # Restore some HP
-            hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + 50)
+                # Restore some HP
+                hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + 50)
         
-        # Clean up raid
-        del self.active_raids[user_id]
-        self.save_hunters_data(hunters_data)
+            # Clean up raid
+            del self.active_raids[user_id]
+            hunter_store.mark_dirty(user_id)
         
-        if success:
-            key_message = ""
-            if dropped_key:
-                key_message = f"\n🗝️ **RARE DROP:** {dropped_key}!"
+            if success:
+                key_message = ""
+                if dropped_key:
+                    key_message = f"\n🗝️ **RARE DROP:** {dropped_key}!"
             
-            embed = discord.Embed(
-                title="🏆 Dungeon Raid Completed!",
-                description=f"You have successfully raided {raid['dungeon_name']}!{key_message}",
-                color=discord.Color.gold()
-            )
+                embed = discord.Embed(
+                    title="🏆 Dungeon Raid Completed!",
+                    description=f"You have successfully raided {raid['dungeon_name']}!{key_message}",
+                    color=discord.Color.gold()
+                )
             
-            rewards_text = f"💰 {total_gold} Gold\n⭐ {total_exp} EXP"
-            if level_ups > 0:
-                rewards_text += f"\n🎉 Level Up! (+{level_ups} levels)"
+                rewards_text = f"💰 {total_gold} Gold\n⭐ {total_exp} EXP"
+                if level_ups > 0:
+                    rewards_text += f"\n🎉 Level Up! (+{level_ups} levels)"
             
-            embed.add_field(name="Total Rewards", value=rewards_text, inline=True)
-            embed.add_field(
-                name="Floors Cleared",
-                value=f"{raid['current_floor'] - 1}/{raid['max_floors']}",
-                inline=True
-            )
-        else:
-            embed = discord.Embed(
-                title="💀 Raid Failed",
-                description=f"You were defeated in {raid['dungeon_name']}.",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="No rewards gained", value="Better luck next time!", inline=False)
-        
-        await ctx.send(embed=embed)
-        
-        # Send detailed victory screen to private channel
-        if success:
-            # Import the completion function
-            import main
-            victory_data = {
-                'monster_name': f"{raid['dungeon_name']} (Dungeon Raid)",
-                'gold_gained': total_gold,
-                'exp_gained': total_exp,
-                'level_up_data': level_up_data if level_ups > 0 else None,
-                'hunter_stats': {
-                    'level': hunter['level'],
-                    'hp': hunter['hp'],
-                    'max_hp': hunter.get('max_hp', 100),
-                    'gold': hunter['gold']
-                },
-                'additional_info': f"Floors Cleared: {raid['current_floor'] - 1}/{raid['max_floors']}" + (f"\n🗝️ Rare Drop: {dropped_key}" if dropped_key else "")
-            }
-            await main.send_combat_completion_message(user_id, victory_data)
+                embed.add_field(name="Total Rewards", value=rewards_text, inline=True)
+                embed.add_field(
+                    name="Floors Cleared",
+                    value=f"{raid['current_floor'] - 1}/{raid['max_floors']}",
+                    inline=True
+                )
+            else:
+                embed = discord.Embed(
+                    title="💀 Raid Failed",
+                    description=f"You were defeated in {raid['dungeon_name']}.",
+                    color=discord.Color.red()
+                )
+                embed.add_field(name="No rewards gained", value="Better luck next time!", inline=False)
+        
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+        
+            # Send detailed victory screen to private channel
+            if success:
+                # Import the completion function
+                import main
+                victory_data = {
+                    'monster_name': f"{raid['dungeon_name']} (Dungeon Raid)",
+                    'gold_gained': total_gold,
+                    'exp_gained': total_exp,
+                    'level_up_data': level_up_data if level_ups > 0 else None,
+                    'hunter_stats': {
+                        'level': hunter['level'],
+                        'hp': hunter['hp'],
+                        'max_hp': hunter.get('max_hp', 100),
+                        'gold': hunter['gold']
+                    },
+                    'additional_info': f"Floors Cleared: {raid['current_floor'] - 1}/{raid['max_floors']}" + (f"\n🗝️ Rare Drop: {dropped_key}" if dropped_key else "")
+                }
+                hunter_store.after_commit(user_id, main.send_combat_completion_message, user_id, victory_data)
 
 async def setup(bot):
     await bot.add_cog(DungeonRaids(bot))
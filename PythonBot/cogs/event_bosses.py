@@ -1,17 +1,22 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
-from datetime import datetime, timedelta
-from utils.boss_dialogue import (
-    get_boss_dialogue,
-    format_boss_encounter_text,
-    get_boss_status_effects,
-    should_trigger_dialogue,
-    get_contextual_boss_response
-)
-from ui_elements_event import EventCombatView, JoinEventView
+from datetime import datetime
+from utils.boss_dialogue import format_boss_encounter_text
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.game_data import game_data
+from utils.boss_catalog import get_boss_catalog
+from utils.event_ticks import ATTACK, DEFEND, FLEE, EventTicker, resolve_tick
+from utils.channel_pool import ChannelPool, close_channel
+from utils.scheduler import scheduler
+from utils.activity import activities, EVENT
+from utils.vitals import vitals
+
+# Seconds an event may run before it times out
+EVENT_TIME_LIMIT = 600
+# Seconds a finished event's channel stays up before cleanup
+CLEANUP_DELAY = 30
 
 class EventBossCombatView(discord.ui.View):
     """Interactive combat view for event boss encounters"""
@@ -94,6 +99,7 @@ class EventJoinView(discord.ui.View):
         """Handle joining the event"""
         await interaction.response.defer(ephemeral=True)
         
+        claimed = False
         try:
             user_id = str(interaction.user.id)
             user = interaction.user
@@ -108,8 +114,9 @@ class EventJoinView(discord.ui.View):
             hunter = hunters_data[user_id]
             
             # Check if hunter is already in battle
-            if hunter.get('in_battle', False):
-                await interaction.followup.send("You are already in combat! Finish your current battle first.", ephemeral=True)
+            activity = activities.current(user_id)
+            if activity is not None:
+                await interaction.followup.send(activities.busy_message(activity), ephemeral=True)
                 return
             
             # Get event state
@@ -130,13 +137,17 @@ class EventJoinView(discord.ui.View):
                 await interaction.followup.send(f"You are already participating in this event! Check {self.event_channel.mention}", ephemeral=True)
                 return
             
+            # Buttons skip before_invoke; join with the live HP (settle before the claim pauses regeneration)
+            vitals.settle(user_id, hunter)
+            
+            # Mark hunter as in battle before the first await, so a second click cannot join twice
+            if activities.begin(user_id, EVENT, 'EventBosses', data=self.event_id) is None:
+                await interaction.followup.send(activities.busy_message(activities.current(user_id)), ephemeral=True)
+                return
+            claimed = True
+            
             # Grant access to private event channel
-            await self.event_channel.set_permissions(
-                user, 
-                read_messages=True, 
-                send_messages=True,
-                view_channel=True
-            )
+            await self.event_cog.chambers.grant(self.event_channel, user)
             
             # Add participant to event
             event_state['participants'][user_id] = {
@@ -146,12 +157,7 @@ class EventJoinView(discord.ui.View):
                 'max_hp': hunter.get('max_hp', 100),
                 'joined_at': datetime.now()
             }
-            
-            # Mark hunter as in battle
-            hunter['in_battle'] = True
-            hunter['battle_type'] = 'event_boss'
-            hunter['event_id'] = self.event_id
-            self.event_cog.save_hunters_data(hunters_data)
+            claimed = False  # The event now owns the activity and ends it with the fight
             
             await interaction.followup.send(
                 f"You have joined the **{boss_data['name']}** event! You now have access to {self.event_channel.mention}",
@@ -177,6 +183,8 @@ class EventJoinView(discord.ui.View):
                 await self.event_cog.start_event_combat(self.event_id)
             
         except Exception as e:
+            if claimed:
+                activities.end(user_id, EVENT)
             await interaction.followup.send(f"Error joining event: {str(e)}", ephemeral=True)
             print(f"Event join error: {e}")
 
@@ -186,90 +194,30 @@ class EventBosses(commands.Cog):
         self.active_events = {}  # Track active event boss encounters
         self.event_participants = {}  # Track participants in each event
         self.event_channels = {}  # Track event channels
+        # Event and combat chambers are leased from a warm pool rather than created per fight
+        self.chambers = ChannelPool(None, category_name="Event Chambers", prefix="chamber", size=1, idle_timeout=None)
+        self.chambers.attach(bot)
+        # Event time limits and post-victory cleanups, fired by the shared scheduler
+        self.event_timeouts = scheduler.table('boss_event_timeout', persist=False, on_expire=self.event_global_timer)
+        self.cleanups = scheduler.table('boss_event_cleanup', persist=False, on_expire=self.delayed_cleanup)
         
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        try:
-            with open('hunters_data.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving hunters data: {e}")
-    
-    def load_event_bosses_data(self):
-        """Load event boss data from JSON file"""
-        try:
-            with open('data/event_bosses.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {"event_bosses": []}
-
-    def load_boss_priority_data(self):
-        """Load boss priority and spawning configuration"""
-        try:
-            with open('data/boss_priority.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {
-                "boss_priority": {"tier_1_legendary": ["antares", "shadow_monarch", "kamish"]},
-                "spawn_weights": {"tier_1_legendary": 5},
-                "auto_spawn_settings": {"enabled": False}
-            }
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def load_monster_data(self):
         """Load monster data from JSON file"""
-        try:
-            with open('data/monsters.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {"monsters": []}
+        return game_data.get('monsters', {"monsters": []})
 
     def select_priority_boss(self):
         """Select a boss based on priority system favoring canon bosses"""
-        priority_data = self.load_boss_priority_data()
-        event_bosses_data = self.load_event_bosses_data()
-        bosses = event_bosses_data.get('event_bosses', [])
-        
-        if not bosses:
-            return None
-        
-        # Get priority tiers and weights
-        boss_priority = priority_data.get('boss_priority', {})
-        spawn_weights = priority_data.get('spawn_weights', {})
-        
-        # Create weighted selection pools
-        weighted_bosses = []
-        
-        for tier, boss_ids in boss_priority.items():
-            weight = spawn_weights.get(tier, 1)
-            tier_bosses = [boss for boss in bosses if boss['id'] in boss_ids]
-            
-            # Add each boss multiple times based on weight (higher weight = more likely)
-            for boss in tier_bosses:
-                weighted_bosses.extend([boss] * weight)
-        
-        # Add any bosses not in priority tiers with default weight
-        categorized_boss_ids = set()
-        for tier_bosses in boss_priority.values():
-            categorized_boss_ids.update(tier_bosses)
-        
-        uncategorized_bosses = [boss for boss in bosses if boss['id'] not in categorized_boss_ids]
-        weighted_bosses.extend(uncategorized_bosses)
-        
-        return random.choice(weighted_bosses) if weighted_bosses else random.choice(bosses)
+        return get_boss_catalog().draw()
 
     @commands.command(name="event_boss", aliases=["spawn_boss"])
     @commands.has_permissions(administrator=True)
     async def spawn_event_boss(self, ctx, boss_id: str = None):
         """Admin command to spawn an event boss"""
-        event_bosses_data = self.load_event_bosses_data()
+        catalog = get_boss_catalog()
         
         if not boss_id:
             # Use priority system to select most iconic Solo Leveling bosses
@@ -279,11 +227,7 @@ class EventBosses(commands.Cog):
                 return
         else:
             # Find the specified boss
-            boss_data = None
-            for boss in event_bosses_data.get("event_bosses", []):
-                if boss['id'] == boss_id:
-                    boss_data = boss
-                    break
+            boss_data = catalog.get(boss_id)
             
             if not boss_data:
                 # Show available bosses if invalid ID provided
@@ -293,36 +237,19 @@ class EventBosses(commands.Cog):
                 )
                 
                 # Group bosses by priority tier
-                priority_data = self.load_boss_priority_data()
-                boss_priority = priority_data.get('boss_priority', {})
-                
                 bosses_list = ""
                 
-                # Show Legendary tier bosses first
-                if 'tier_1_legendary' in boss_priority:
-                    bosses_list += "**🌟 Legendary Monarchs:**\n"
-                    for boss_id in boss_priority['tier_1_legendary']:
-                        boss = next((b for b in event_bosses_data.get("event_bosses", []) if b['id'] == boss_id), None)
-                        if boss:
-                            bosses_list += f"  `{boss['id']}` - {boss['name']}\n"
-                    bosses_list += "\n"
-                
-                # Show Major tier bosses
-                if 'tier_2_major' in boss_priority:
-                    bosses_list += "**⚔️ Major Bosses:**\n"
-                    for boss_id in boss_priority['tier_2_major']:
-                        boss = next((b for b in event_bosses_data.get("event_bosses", []) if b['id'] == boss_id), None)
-                        if boss:
-                            bosses_list += f"  `{boss['id']}` - {boss['name']}\n"
-                    bosses_list += "\n"
-                
-                # Show other tiers
-                if 'tier_3_notable' in boss_priority:
-                    bosses_list += "**🔥 Notable Enemies:**\n"
-                    for boss_id in boss_priority['tier_3_notable']:
-                        boss = next((b for b in event_bosses_data.get("event_bosses", []) if b['id'] == boss_id), None)
-                        if boss:
+                # Show Legendary tier bosses first, then Major, then other tiers
+                for tier_key, heading, spacer in (
+                    ('tier_1_legendary', "**🌟 Legendary Monarchs:**\n", "\n"),
+                    ('tier_2_major', "**⚔️ Major Bosses:**\n", "\n"),
+                    ('tier_3_notable', "**🔥 Notable Enemies:**\n", ""),
+                ):
+                    if tier_key in catalog.tiers:
+                        bosses_list += heading
+                        for boss in catalog.tier(tier_key):
                             bosses_list += f"  `{boss['id']}` - {boss['name']}\n"
+                        bosses_list += spacer
                 
                 embed.description = bosses_list or "No event bosses configured."
                 embed.set_footer(text="Use .event_boss <boss_id> to spawn a specific boss, or .event_boss for priority selection")
@@ -343,50 +270,26 @@ class EventBosses(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def spawn_random_boss(self, ctx, tier: str = None):
         """Admin command to spawn a random event boss, optionally from a specific tier"""
-        priority_data = self.load_boss_priority_data()
-        event_bosses_data = self.load_event_bosses_data()
-        bosses = event_bosses_data.get('event_bosses', [])
+        catalog = get_boss_catalog()
         
-        if not bosses:
+        if not catalog.bosses:
             await ctx.send("❌ No event bosses configured.")
             return
         
-        boss_priority = priority_data.get('boss_priority', {})
-        
         if tier:
-            # Spawn from specific tier
-            tier_key = f"tier_{tier.lower()}" if not tier.lower().startswith('tier_') else tier.lower()
-            
-            # Check for tier aliases
-            tier_aliases = {
-                'legendary': 'tier_1_legendary',
-                'major': 'tier_2_major', 
-                'notable': 'tier_3_notable',
-                'standard': 'tier_4_standard',
-                'common': 'tier_5_common',
-                '1': 'tier_1_legendary',
-                '2': 'tier_2_major',
-                '3': 'tier_3_notable',
-                '4': 'tier_4_standard',
-                '5': 'tier_5_common'
-            }
+            # Spawn from specific tier ("legendary", "1", "tier_1" and "tier_1_legendary" all work)
+            tier_key = catalog.resolve_tier(tier)
             
-            if tier_key in tier_aliases:
-                tier_key = tier_aliases[tier_key]
-            
-            if tier_key not in boss_priority:
-                available_tiers = list(boss_priority.keys())
+            if tier_key is None:
+                available_tiers = list(catalog.tiers.keys())
                 await ctx.send(f"❌ Invalid tier '{tier}'. Available tiers: {', '.join(available_tiers)}")
                 return
             
-            tier_boss_ids = boss_priority[tier_key]
-            tier_bosses = [boss for boss in bosses if boss['id'] in tier_boss_ids]
+            boss_data = catalog.draw_from_tier(tier_key)
             
-            if not tier_bosses:
+            if not boss_data:
                 await ctx.send(f"❌ No bosses found in tier '{tier_key}'.")
                 return
-            
-            boss_data = random.choice(tier_bosses)
             tier_name = tier_key.replace('tier_', '').replace('_', ' ').title()
             
             await ctx.send(f"🎲 Randomly selected **{boss_data['name']}** from {tier_name} tier!")
@@ -403,11 +306,10 @@ class EventBosses(commands.Cog):
         if boss_data['id'] in self.active_events:
             await ctx.send(f"❌ {boss_data['name']} is already active! Selecting another...")
             # Try again with a different selection
-            available_bosses = [boss for boss in bosses if boss['id'] not in self.active_events]
-            if not available_bosses:
+            boss_data = catalog.draw(exclude=self.active_events)
+            if not boss_data:
                 await ctx.send("❌ All event bosses are currently active!")
                 return
-            boss_data = random.choice(available_bosses)
             await ctx.send(f"🔄 Selected **{boss_data['name']}** instead!")
         
         # Start the event boss encounter
@@ -417,12 +319,9 @@ class EventBosses(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def list_event_bosses(self, ctx):
         """Admin command to list all available event bosses organized by tier"""
-        event_bosses_data = self.load_event_bosses_data()
-        priority_data = self.load_boss_priority_data()
-        bosses = event_bosses_data.get('event_bosses', [])
-        boss_priority = priority_data.get('boss_priority', {})
+        catalog = get_boss_catalog()
         
-        if not bosses:
+        if not catalog.bosses:
             await ctx.send("❌ No event bosses configured.")
             return
         
@@ -442,13 +341,11 @@ class EventBosses(commands.Cog):
         }
         
         for tier_key, tier_display in tier_names.items():
-            if tier_key in boss_priority:
+            if tier_key in catalog.tiers:
                 tier_bosses = []
-                for boss_id in boss_priority[tier_key]:
-                    boss = next((b for b in bosses if b['id'] == boss_id), None)
-                    if boss:
-                        status = "🔴 ACTIVE" if boss_id in self.active_events else "🟢 Available"
-                        tier_bosses.append(f"`{boss['id']}` - {boss['name']} {status}")
+                for boss in catalog.tier(tier_key):
+                    status = "🔴 ACTIVE" if boss['id'] in self.active_events else "🟢 Available"
+                    tier_bosses.append(f"`{boss['id']}` - {boss['name']} {status}")
                 
                 if tier_bosses:
                     embed.add_field(
@@ -458,11 +355,7 @@ class EventBosses(commands.Cog):
                     )
         
         # Add uncategorized bosses
-        categorized_boss_ids = set()
-        for tier_bosses in boss_priority.values():
-            categorized_boss_ids.update(tier_bosses)
-        
-        uncategorized_bosses = [boss for boss in bosses if boss['id'] not in categorized_boss_ids]
+        uncategorized_bosses = catalog.uncategorized
         if uncategorized_bosses:
             uncategorized_list = []
             for boss in uncategorized_bosses:
@@ -485,26 +378,11 @@ class EventBosses(commands.Cog):
             # Generate unique event ID
             event_id = f"event_{boss_data['id']}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{random.randint(100,999)}"
             
-            # Create private event channel first
-            guild = ctx.guild
-            event_category = discord.utils.get(guild.categories, name="Event Chambers")
-            if not event_category:
-                event_category = await guild.create_category("Event Chambers", overwrites={
-                    guild.default_role: discord.PermissionOverwrite(read_messages=False)
-                })
-            
-            # Create private event channel with restricted access
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True)
-            }
-            
-            event_channel = await guild.create_text_channel(
-                f"event-{boss_data['name'].lower().replace(' ', '-')}-{random.randint(100,999)}",
-                category=event_category,
-                overwrites=overwrites,
-                topic=f"Private event channel for {boss_data['name']} encounter"
-            )
+            # Lease the private event channel first; participants are granted access as they join
+            event_channel = await self.chambers.lease(ctx.guild, event_id, [])
+            if not event_channel:
+                await ctx.send("❌ Could not open an event chamber. Please try again.")
+                return
             
             # Store active event with complete data
             self.active_events[event_id] = {
@@ -577,7 +455,7 @@ class EventBosses(commands.Cog):
             self.active_events[event_id]['announcement_message'] = message
             
             # Start global event timer (10 minutes total)
-            asyncio.create_task(self.event_global_timer(event_id))
+            self.event_timeouts.start(event_id, EVENT_TIME_LIMIT)
             
             await ctx.send(f"Event boss **{boss_data['name']}** spawned! Private event channel created: {event_channel.mention}")
             
@@ -585,18 +463,13 @@ class EventBosses(commands.Cog):
             await ctx.send(f"Failed to start event boss encounter: {str(e)}")
             print(f"Event boss error: {e}")
 
-    async def event_global_timer(self, event_id):
-        """Global timer for event - auto-deletes channel if not completed"""
+    async def event_global_timer(self, event_id, _data=None):
+        """Global timer for event - releases the channel if not completed in time"""
         try:
-            await asyncio.sleep(600)  # 10 minutes total event time
-            
             event_state = self.active_events.get(event_id)
             if event_state:
                 await self.end_event_battle(event_id, "timeout")
                 
-        except asyncio.CancelledError:
-            # Event was completed successfully, timer cancelled
-            pass
         except Exception as e:
             print(f"Error in event global timer: {e}")
 
@@ -606,6 +479,11 @@ class EventBosses(commands.Cog):
             event_state = self.active_events.pop(event_id, None)
             if not event_state:
                 return
+            self.event_timeouts.discard(event_id)
+            for user_id in event_state['participants']:
+                activities.end(user_id, EVENT)
+            if event_state.get('ticker'):
+                event_state['ticker'].stop()
             
             event_channel = event_state['event_channel']
             boss_data = event_state['boss_data']
@@ -648,106 +526,26 @@ class EventBosses(commands.Cog):
             final_embed.set_footer(text="This channel will be deleted in 10 seconds...")
             await event_channel.send(embed=final_embed)
             
-            # Delete channel after delay
+            # Return channel to the pool after delay
             await asyncio.sleep(10)
             try:
-                await event_channel.delete()
-                print(f"Event channel deleted for {boss_data['name']} - outcome: {outcome}")
-            except discord.errors.NotFound:
-                print(f"Event channel for {boss_data['name']} already deleted")
+                await self.chambers.release_channel(event_channel)
+                print(f"Event channel released for {boss_data['name']} - outcome: {outcome}")
             except Exception as e:
-                print(f"Error deleting event channel: {e}")
+                print(f"Error releasing event channel: {e}")
                 
         except Exception as e:
             print(f"Error ending event battle: {e}")
 
     async def create_private_combat_channel(self, user, boss_data):
-        """Create a private combat channel for turn-based boss encounter"""
+        """Lease a private combat channel for turn-based boss encounter"""
         try:
-            guild = user.guild
-            
-            # Set up permissions for private channel
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                user: discord.PermissionOverwrite(read_messages=True, send_messages=True),
-                guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True)
-            }
-            
-            # Get events category or create it
-            event_category = discord.utils.get(guild.categories, name="Event Chambers")
-            if not event_category:
-                event_category = await guild.create_category("Event Chambers", overwrites={
-                    guild.default_role: discord.PermissionOverwrite(read_messages=False)
-                })
-            
-            # Create private combat channel
-            channel_name = f"{boss_data['name'].lower().replace(' ', '-')}-vs-{user.display_name.lower().replace(' ', '-')}"
-            combat_channel = await guild.create_text_channel(
-                channel_name,
-                category=event_category,
-                overwrites=overwrites,
-                topic=f"Private combat chamber: {user.display_name} vs {boss_data['name']}"
-            )
-            
-            return combat_channel
+            # Keyed by user so the lease is recognised again after a restart
+            return await self.chambers.lease(user.guild, user.id, [user])
             
         except Exception as e:
             print(f"Error creating combat channel: {e}")
             return None
-                # Fallback: create or find event category
-                event_category = None
-                for category in ctx.guild.categories:
-                    if "event" in category.name.lower():
-                        event_category = category
-                        break
-                if not event_category:
-                    event_category = await ctx.guild.create_category("🔥 Event Bosses")
-
-            event_channel = await ctx.guild.create_text_channel(
-                f"event-{boss_data['name'].lower().replace(' ', '-')}",
-                category=event_category,
-                overwrites=overwrites
-            )
-
-            # Store event battle state in global dictionary
-            active_event_battles[event_id] = {
-                'boss_data': boss_data.copy(),
-                'current_boss_hp': boss_data['hp'],
-                'participants': {},  # user_id: hunter_data
-                'combat_message': None,
-                'combat_view_instance': None,
-                'event_channel_id': event_channel.id,
-                'start_time': datetime.now()
-            }
-
-            # Create join event view with shared state
-            join_view = JoinEventView(event_id, boss_data, event_channel, active_event_battles)
-            
-            # Send announcement to system channel
-            system_channel = ctx.guild.get_channel(1381439963656355849)  # SYSTEM_CHANNEL_ID
-            if system_channel:
-                embed = discord.Embed(
-                    title=f"🚨 EVENT BOSS ALERT! 🚨",
-                    description=boss_data.get('event_start_message', f"A powerful {boss_data['name']} has appeared!"),
-                    color=discord.Color.red()
-                )
-                
-                embed.add_field(name="Boss Level", value=boss_data.get('level', 'Unknown'), inline=True)
-                embed.add_field(name="Estimated HP", value=f"{boss_data['hp']:,}", inline=True)
-                embed.add_field(name="Participants", value="0", inline=True)
-                
-                if boss_data.get('image_url'):
-                    embed.set_image(url=boss_data['image_url'])
-                
-                embed.set_footer(text=f"Event ID: {event_id}")
-                
-                await system_channel.send(embed=embed, view=join_view)
-                
-            await ctx.send(f"Event boss **{boss_data['name']}** has been spawned! Check the announcements channel to join!")
-            
-        except Exception as e:
-            await ctx.send(f"Failed to start event boss encounter: {str(e)}")
-            print(f"Event boss error: {e}")
 
     async def add_participant_to_event(self, user, boss_id):
         """Add a participant to an event boss encounter"""
@@ -757,14 +555,28 @@ class EventBosses(commands.Cog):
         event_data = self.active_events[boss_id]
         event_channel = event_data['channel']
         
-        # Add user to channel
-        await event_channel.set_permissions(user, read_messages=True, send_messages=True)
-        
-        # Load hunter data
+        # Load hunter data; settle before the claim pauses regeneration
         hunters_data = self.load_hunters_data()
         hunter = hunters_data.get(str(user.id), {})
+        if hunter:
+            vitals.settle(user.id, hunter)
+        
+        # Claim the hunter before the first await; one fight at a time
+        activity = activities.current(user.id)
+        if activity is not None:
+            await event_channel.send(f"{user.mention} {activities.busy_message(activity)}")
+            return False
+        activities.begin(user.id, EVENT, 'EventBosses', data=boss_id)
+        
+        # Add user to channel
+        try:
+            await self.chambers.grant(event_channel, user)
+        except Exception:
+            activities.end(user.id, EVENT)
+            raise
         
         if not hunter:
+            activities.end(user.id, EVENT)
             await event_channel.send(f"❌ {user.mention}, you need to start your hunter journey first! Use `.start`")
             return False
         
@@ -778,7 +590,7 @@ class EventBosses(commands.Cog):
         
         # Welcome message
         embed = discord.Embed(
-            title=f"⚔️ Hunter Joined!",
+            title="⚔️ Hunter Joined!",
             description=f"{user.mention} has joined the battle against {event_data['boss_data']['name']}!",
             color=discord.Color.green()
         )
@@ -861,161 +673,103 @@ class EventBosses(commands.Cog):
         
         # Store combat message reference
         event_data['combat_message'] = combat_message
+        event_data['combat_view'] = combat_view
+        
+        # Clicks are queued and resolved together once per tick
+        ticker = EventTicker(lambda actions: self.run_event_tick(boss_id, actions))
+        event_data['ticker'] = ticker
+        ticker.start()
+
+    def queue_event_action(self, user_id, boss_id, action):
+        """Queue a participant's action for the next combat tick"""
+        event_data = self.active_events.get(boss_id)
+        if not event_data or str(user_id) not in event_data['participants']:
+            return
+        ticker = event_data.get('ticker')
+        if ticker:
+            ticker.submit(user_id, action)
 
     async def handle_event_attack(self, user_id, boss_id):
         """Handle attack action in event boss combat"""
-        if boss_id not in self.active_events:
-            return
-            
-        event_data = self.active_events[boss_id]
-        event_channel = event_data['channel']
-        boss_monster = event_data['boss_monster']
-        
-        # Get participant data
-        participant = event_data['participants'].get(str(user_id))
-        if not participant:
-            return
-            
-        hunter = participant['hunter']
-        user = participant['user']
-        
-        # Calculate damage
-        base_damage = hunter.get('attack', 10)
-        damage = random.randint(int(base_damage * 0.8), int(base_damage * 1.2))
-        
-        # Apply damage to boss
-        boss_monster['hp'] = max(0, boss_monster['hp'] - damage)
-        
-        # Create combat update embed
-        embed = discord.Embed(
-            title=f"⚔️ {user.display_name} attacks {boss_monster['name']}!",
-            description=f"**{damage}** damage dealt!",
-            color=discord.Color.red()
-        )
-        
-        embed.add_field(
-            name="💀 Boss HP",
-            value=f"{boss_monster['hp']}/{boss_monster['max_hp']}",
-            inline=True
-        )
-        
-        await event_channel.send(embed=embed)
-        
-        # Check if boss is defeated
-        if boss_monster['hp'] <= 0:
-            await self.handle_event_boss_defeat(boss_id)
-            return
-            
-        # Boss counter-attack
-        await self.handle_boss_counter_attack(boss_id)
-        
-        # Update combat interface
-        await self.update_event_combat_display(boss_id)
+        self.queue_event_action(user_id, boss_id, ATTACK)
 
     async def handle_event_defend(self, user_id, boss_id):
         """Handle defend action in event boss combat"""
-        if boss_id not in self.active_events:
-            return
-            
-        event_data = self.active_events[boss_id]
-        event_channel = event_data['channel']
-        
-        participant = event_data['participants'].get(str(user_id))
-        if not participant:
-            return
-            
-        user = participant['user']
-        
-        # Send defend message
-        embed = discord.Embed(
-            title=f"🛡️ {user.display_name} takes a defensive stance!",
-            description="Defense increased for the next attack!",
-            color=discord.Color.blue()
-        )
-        
-        await event_channel.send(embed=embed)
-        
-        # Boss attack with reduced damage
-        await self.handle_boss_counter_attack(boss_id, defensive_user_id=user_id)
-        await self.update_event_combat_display(boss_id)
+        self.queue_event_action(user_id, boss_id, DEFEND)
 
     async def handle_event_flee(self, user_id, boss_id):
         """Handle flee action in event boss combat"""
+        self.queue_event_action(user_id, boss_id, FLEE)
+
+    async def run_event_tick(self, boss_id, actions):
+        """Resolve one round of queued actions: attacks, one boss counter-attack, one display edit"""
         if boss_id not in self.active_events:
             return
             
         event_data = self.active_events[boss_id]
         event_channel = event_data['channel']
+        participants = event_data['participants']
         
-        participant = event_data['participants'].get(str(user_id))
-        if not participant:
-            return
-            
-        user = participant['user']
-        
-        # Remove participant
-        del event_data['participants'][str(user_id)]
+        # Resolving drops fled participants, so keep their users for the permission change
+        fled_users = {
+            user_id: participants[user_id]['user']
+            for user_id, action in actions.items()
+            if action == FLEE and user_id in participants
+        }
         
-        # Remove channel permissions
-        await event_channel.set_permissions(user, read_messages=False)
+        result = resolve_tick(event_data['boss_monster'], participants, actions)
         
-        # Send flee message
-        embed = discord.Embed(
-            title=f"🏃 {user.display_name} has fled from battle!",
-            description="Sometimes retreat is the wisest choice...",
-            color=discord.Color.yellow()
-        )
+        for user_id, user in fled_users.items():
+            activities.end(user_id, EVENT)
+            await event_channel.set_permissions(user, read_messages=False)
         
-        await event_channel.send(embed=embed)
+        # One counter-attack per tick, applied to the live hunter record so
+        # concurrent updates are not lost
+        if result.boss_target:
+            target = participants[result.boss_target]
+            async with hunter_store.transaction(result.boss_target) as target_hunter:
+                if target_hunter is None:
+                    target_hunter = target['hunter']
+                current_hp = target_hunter.get('hp', target_hunter.get('max_hp', 100))
+                target_hunter['hp'] = max(0, current_hp - result.boss_damage)
+                target['hunter'] = target_hunter
         
         # Check if no participants left
-        if not event_data['participants']:
-            await self.cleanup_event(boss_id)
-        else:
-            await self.update_event_combat_display(boss_id)
-
-    async def handle_boss_counter_attack(self, boss_id, defensive_user_id=None):
-        """Handle boss counter-attack"""
-        event_data = self.active_events[boss_id]
-        boss_monster = event_data['boss_monster']
-        event_channel = event_data['channel']
-        
-        # Select random participant as target
-        participants = list(event_data['participants'].values())
         if not participants:
+            await self.cleanup_event(boss_id)
             return
-            
-        target = random.choice(participants)
-        target_hunter = target['hunter']
-        
-        # Calculate boss damage
-        boss_damage = random.randint(15, 25)
-        
-        # Reduce damage if target is defending
-        if defensive_user_id and str(target['user'].id) == str(defensive_user_id):
-            boss_damage = int(boss_damage * 0.5)
-            defense_text = " (reduced by defense)"
-        else:
-            defense_text = ""
         
-        # Apply damage to hunter
-        current_hp = target_hunter.get('hp', target_hunter.get('max_hp', 100))
-        new_hp = max(0, current_hp - boss_damage)
-        target_hunter['hp'] = new_hp
+        await self.update_event_combat_display(boss_id, result, fled_users)
         
-        # Update hunter data
-        hunters_data = self.load_hunters_data()
-        hunters_data[str(target['user'].id)] = target_hunter
-        self.save_hunters_data(hunters_data)
-        
-        # Send counter-attack message
-        embed = discord.Embed(
-            title=f"💥 {boss_monster['name']} strikes back!",
-            description=f"{target['user'].mention} takes **{boss_damage}** damage{defense_text}!",
-            color=discord.Color.orange()
-        )
+        # Check if boss is defeated
+        if result.boss_defeated:
+            await self.handle_event_boss_defeat(boss_id)
+
+    def format_tick_summary(self, event_data, result, fled_users, max_lines=10):
+        """Render one tick's actions as the lines of a single embed field"""
+        participants = event_data['participants']
         
-        await event_channel.send(embed=embed)
+        def name(user_id):
+            participant = participants.get(user_id)
+            return participant['user'].display_name if participant else "A hunter"
+        
+        lines = [f"⚔️ {name(user_id)} deals **{damage}**" for user_id, damage in result.attacks]
+        if len(lines) > max_lines:
+            hidden = len(lines) - max_lines
+            lines = lines[:max_lines] + [f"...and {hidden} more attacks"]
+        if result.attacks:
+            lines.append(f"Total: **{result.total_damage:,}** damage from {len(result.attacks)} hunters")
+        if result.defenders:
+            lines.append(f"🛡️ {len(result.defenders)} hunters took a defensive stance")
+        if fled_users:
+            lines.append(f"🏃 Fled: {', '.join(user.display_name for user in fled_users.values())}")
+        if result.boss_target:
+            defense_text = " (reduced by defense)" if result.boss_target in result.defenders else ""
+            lines.append(
+                f"💥 {event_data['boss_monster']['name']} strikes {participants[result.boss_target]['user'].mention} "
+                f"for **{result.boss_damage}** damage{defense_text}!"
+            )
+        return "\n".join(lines)
 
     async def handle_event_boss_defeat(self, boss_id):
         """Handle event boss defeat"""
@@ -1023,14 +777,14 @@ class EventBosses(commands.Cog):
         event_channel = event_data['channel']
         boss_data = event_data['boss_data']
         
+        if event_data.get('ticker'):
+            event_data['ticker'].stop()
+        
         # Calculate rewards
         participants = event_data['participants']
         reward_exp = 200
         reward_gold = 500
         
-        # Award rewards to all participants
-        hunters_data = self.load_hunters_data()
-        
         victory_embed = discord.Embed(
             title=f"🎉 VICTORY! {boss_data['name']} Defeated!",
             description=f"The mighty {boss_data['name']} has fallen to your combined efforts!",
@@ -1041,18 +795,16 @@ class EventBosses(commands.Cog):
         if boss_data.get('image_url'):
             victory_embed.set_thumbnail(url=boss_data['image_url'])
         
+        # Award rewards to all participants
         participant_list = ""
         for user_id, participant in participants.items():
-            hunter = hunters_data.get(user_id, {})
-            if hunter:
-                # Award exp and gold
-                hunter['exp'] = hunter.get('exp', 0) + reward_exp
-                hunter['gold'] = hunter.get('gold', 0) + reward_gold
-                hunters_data[user_id] = hunter
-                
-                participant_list += f"{participant['user'].mention} - Level {hunter.get('level', 1)}\n"
-        
-        self.save_hunters_data(hunters_data)
+            async with hunter_store.transaction(user_id) as hunter:
+                if hunter:
+                    # Award exp and gold
+                    hunter['exp'] = hunter.get('exp', 0) + reward_exp
+                    hunter['gold'] = hunter.get('gold', 0) + reward_gold
+                    
+                    participant_list += f"{participant['user'].mention} - Level {hunter.get('level', 1)}\n"
         
         victory_embed.add_field(
             name="🏆 Victorious Hunters",
@@ -1069,31 +821,34 @@ class EventBosses(commands.Cog):
         await event_channel.send(embed=victory_embed)
         
         # Clean up event after delay
-        asyncio.create_task(self.delayed_cleanup(boss_id))
+        self.cleanups.start(boss_id, CLEANUP_DELAY)
 
-    async def delayed_cleanup(self, boss_id):
-        """Clean up event after a delay"""
-        await asyncio.sleep(30)  # Wait 30 seconds
+    async def delayed_cleanup(self, boss_id, _data=None):
+        """Clean up event once its cleanup delay is up"""
         await self.cleanup_event(boss_id)
 
     async def cleanup_event(self, boss_id):
         """Clean up event boss encounter"""
         if boss_id in self.active_events:
             event_data = self.active_events[boss_id]
+            if event_data.get('ticker'):
+                event_data['ticker'].stop()
             
             try:
-                await event_data['channel'].delete()
+                await close_channel(event_data['channel'])
             except:
                 pass  # Channel may already be deleted
                 
             # Remove from active events
             del self.active_events[boss_id]
+            for user_id in event_data['participants']:
+                activities.end(user_id, EVENT)
             
             if event_data['channel'].id in self.event_channels:
                 del self.event_channels[event_data['channel'].id]
 
-    async def update_event_combat_display(self, boss_id):
-        """Update the combat display with current status"""
+    async def update_event_combat_display(self, boss_id, result=None, fled_users=None):
+        """Update the combat display with current status and the last tick's summary"""
         event_data = self.active_events[boss_id]
         boss_monster = event_data['boss_monster']
         combat_message = event_data.get('combat_message')
@@ -1105,7 +860,7 @@ class EventBosses(commands.Cog):
         boss_data = event_data['boss_data']
         embed = discord.Embed(
             title=f"💀 BOSS BATTLE: {boss_monster['name']}",
-            description=f"The battle continues!",
+            description="The battle continues!",
             color=discord.Color.dark_red()
         )
         
@@ -1125,10 +880,16 @@ class EventBosses(commands.Cog):
             inline=True
         )
         
+        if result is not None:
+            summary = self.format_tick_summary(event_data, result, fled_users or {})
+            if summary:
+                embed.add_field(name="📜 Last Round", value=summary[:1024], inline=False)
+        
         embed.set_footer(text="Use the combat buttons to attack, defend, or flee!")
         
-        # Create new combat view
-        combat_view = EventBossCombatView(self, boss_id, event_data['channel'])
+        # Reuse the live view; each interaction already resets its timeout
+        combat_view = event_data.get('combat_view') or EventBossCombatView(self, boss_id, event_data['channel'])
+        event_data['combat_view'] = combat_view
         
         try:
             await combat_message.edit(embed=embed, view=combat_view)
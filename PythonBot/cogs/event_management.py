@@ -1,27 +1,29 @@
 import discord
 from discord.ext import commands, tasks
 from discord.ui import Button, View
-import json
 import asyncio
 import random
 import time
 from datetime import datetime, timedelta
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.game_data import game_data
+from utils.channel_pool import ChannelPool
+from utils.scheduler import scheduler
+from utils.activity import activities, EVENT
+from utils.vitals import vitals
+from utils.inventory_model import add_instance
+from utils.combat_engine import (
+    ATTACK, DEFEND, FLEE, PLAYER, ENEMY, HEAL,
+    WORLD_BOSS_RULES, Action, Combatant, CombatState, damage_dealt, find_event, resolve_turn,
+)
 
 def load_boss_dialogues():
     """Load boss dialogue data from JSON file"""
-    try:
-        with open('data/boss_dialogues.json', 'r') as f:
-            return json.load(f).get('boss_dialogues', {})
-    except FileNotFoundError:
-        return {}
+    return game_data.boss_dialogues()
 
 def load_event_bosses():
     """Load event boss data from JSON file"""
-    try:
-        with open('data/event_bosses.json', 'r') as f:
-            return json.load(f).get('event_bosses', [])
-    except FileNotFoundError:
-        return []
+    return game_data.event_bosses()
 
 class EventJoinView(discord.ui.View):
     """Advanced UI system for joining event boss encounters"""
@@ -36,6 +38,7 @@ class EventJoinView(discord.ui.View):
         """Handle joining the event battle with comprehensive validation"""
         print(f"DEBUG: Join event button clicked by {interaction.user.name} ({interaction.user.id})")
         
+        claimed = False
         try:
             print(f"DEBUG: About to defer interaction...")
             await interaction.response.defer(ephemeral=True)
@@ -58,9 +61,10 @@ class EventJoinView(discord.ui.View):
             print(f"DEBUG: Hunter found - Level: {hunter.get('level', 1)}, HP: {hunter.get('hp', 0)}")
             
             # Check if hunter is already in any battle or event
-            if hunter.get('in_battle', False):
-                print(f"DEBUG: User {user_id} is already in battle")
-                await interaction.followup.send("❌ You are already in combat! Finish your current battle first.", ephemeral=True)
+            activity = activities.current(user_id)
+            if activity is not None:
+                print(f"DEBUG: User {user_id} is already busy ({activity.kind})")
+                await interaction.followup.send(activities.busy_message(activity), ephemeral=True)
                 return
             
             # Get event state
@@ -89,12 +93,22 @@ class EventJoinView(discord.ui.View):
             
             print(f"DEBUG: All validation checks passed, proceeding with event join")
             
+            # Buttons skip before_invoke; join with the live HP (settle before the claim pauses regeneration)
+            vitals.settle(user_id, hunter)
+            
+            # Mark hunter as in event battle before the first await, so a second click cannot join twice
+            if activities.begin(user_id, EVENT, 'EventManagement', data=self.event_id) is None:
+                await interaction.followup.send(activities.busy_message(activities.current(user_id)), ephemeral=True)
+                return
+            claimed = True
+            
             # Create private event channel if not exists
             if 'event_channel_id' not in event_state:
                 print(f"DEBUG: Creating new private event channel")
-                event_channel = await self.event_cog.create_private_event_channel(interaction.guild, boss_data, user)
+                event_channel = await self.event_cog.create_private_event_channel(interaction.guild, boss_data, user, self.event_id)
                 if not event_channel:
                     print(f"ERROR: Failed to create private event channel")
+                    activities.end(user_id, EVENT)
                     await interaction.followup.send("❌ Failed to create event channel. Please try again.", ephemeral=True)
                     return
                 event_state['event_channel_id'] = event_channel.id
@@ -104,8 +118,9 @@ class EventJoinView(discord.ui.View):
                 event_channel = self.event_cog.bot.get_channel(event_state['event_channel_id'])
                 if not event_channel:
                     print(f"ERROR: Existing event channel not found, creating new one")
-                    event_channel = await self.event_cog.create_private_event_channel(interaction.guild, boss_data, user)
+                    event_channel = await self.event_cog.create_private_event_channel(interaction.guild, boss_data, user, self.event_id)
                     if not event_channel:
+                        activities.end(user_id, EVENT)
                         await interaction.followup.send("❌ Failed to create event channel. Please try again.", ephemeral=True)
                         return
                     event_state['event_channel_id'] = event_channel.id
@@ -113,15 +128,11 @@ class EventJoinView(discord.ui.View):
             # Grant access to private event channel
             print(f"DEBUG: Granting permissions to {user.name} for channel {event_channel.name}")
             try:
-                await event_channel.set_permissions(
-                    user, 
-                    read_messages=True, 
-                    send_messages=True,
-                    view_channel=True
-                )
+                await self.event_cog.event_channels.grant(event_channel, user)
                 print(f"DEBUG: Permissions granted successfully")
             except Exception as e:
                 print(f"ERROR: Failed to grant channel permissions: {e}")
+                activities.end(user_id, EVENT)
                 await interaction.followup.send(f"❌ Failed to grant channel access: {str(e)}", ephemeral=True)
                 return
             
@@ -137,14 +148,7 @@ class EventJoinView(discord.ui.View):
                 'joined_at': datetime.now()
             }
             print(f"DEBUG: Participant added, total participants: {len(event_state['participants'])}")
-            
-            # Mark hunter as in event battle
-            hunter['in_battle'] = True
-            hunter['battle_type'] = 'event_boss'
-            hunter['event_id'] = self.event_id
-            hunters_data[user_id] = hunter
-            self.event_cog.save_hunters_data(hunters_data)
-            print(f"DEBUG: Hunter data saved with event battle state")
+            claimed = False  # The event now owns the activity and ends it with the fight
             
             # Update global event state
             self.event_cog.bot.active_event_battles[self.event_id] = event_state
@@ -229,6 +233,8 @@ class EventJoinView(discord.ui.View):
                     
         except Exception as e:
             print(f"CRITICAL ERROR in join_event_battle: {e}")
+            if claimed:
+                activities.end(user_id, EVENT)
             import traceback
             traceback.print_exc()
             try:
@@ -263,6 +269,18 @@ class EventCombatView(discord.ui.View):
         self.event_cog = event_cog
         self.event_id = event_id
         
+    def play_turn(self, participant, hunter, event_state, action):
+        """Resolve one participant's exchange with the boss and write HP back"""
+        boss_data = event_state['boss_data']
+        player = Combatant(hunter.get('name', 'Hunter'), participant['hp'], participant['max_hp'],
+                           hunter.get('attack', 25), hunter.get('defense', 15), flee_chance=1.0)
+        boss = Combatant(boss_data['name'], event_state['current_boss_hp'], boss_data.get('hp', event_state['current_boss_hp']),
+                         boss_data.get('attack', 30), boss_data.get('defense', 0))
+        state, events = resolve_turn(CombatState(player, boss), action, WORLD_BOSS_RULES)
+        participant['hp'] = hunter['hp'] = state.player.hp
+        event_state['current_boss_hp'] = state.enemy.hp
+        return state, events
+    
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Ensure only participants can interact"""
         event_state = self.event_cog.bot.active_event_battles.get(self.event_id)
@@ -351,28 +369,17 @@ class EventCombatView(discord.ui.View):
         
         boss_data = event_state['boss_data']
         
-        # Calculate damage
-        base_damage = hunter.get('attack', 25)
-        damage_variance = random.uniform(0.8, 1.2)
-        damage_dealt = max(1, int((base_damage * damage_variance) - boss_data.get('defense', 0)))
-        
-        # Apply damage to boss
-        event_state['current_boss_hp'] = max(0, event_state['current_boss_hp'] - damage_dealt)
-        
-        # Boss counter-attack
-        boss_damage = max(1, int((boss_data.get('attack', 30) * random.uniform(0.8, 1.2)) - hunter.get('defense', 15)))
-        participant['hp'] = max(0, participant['hp'] - boss_damage)
-        
-        # Update hunter data
-        hunter['hp'] = participant['hp']
-        self.event_cog.save_hunters_data(hunters_data)
+        # Attack the boss; it counter-attacks unless this hit finished it
+        state, events = self.play_turn(participant, hunter, event_state, Action(ATTACK))
+        boss_damage = damage_dealt(events, ENEMY)
+        hunter_store.mark_dirty(user_id)
         
         # Combat feedback with boss dialogue
-        feedback = f"⚔️ You dealt **{damage_dealt}** damage to {boss_data['name']}!"
-        if participant['hp'] > 0:
+        feedback = f"⚔️ You dealt **{damage_dealt(events, PLAYER)}** damage to {boss_data['name']}!"
+        if boss_damage and participant['hp'] > 0:
             feedback += f"\n💥 {boss_data['name']} retaliated for **{boss_damage}** damage!"
             feedback += f"\n💚 Your HP: **{participant['hp']}/{participant['max_hp']}**"
-        else:
+        elif boss_damage:
             feedback += f"\n💀 You were defeated by {boss_data['name']}'s counter-attack!"
         
         # Add random boss combat dialogue
@@ -416,17 +423,11 @@ class EventCombatView(discord.ui.View):
         
         boss_data = event_state['boss_data']
         
-        # Reduced boss damage due to defending
-        boss_damage = max(1, int((boss_data.get('attack', 30) * random.uniform(0.4, 0.6)) - hunter.get('defense', 15)))
-        participant['hp'] = max(0, participant['hp'] - boss_damage)
-        
-        # Small HP recovery for successful defense
-        heal_amount = max(1, int(participant['max_hp'] * 0.05))
-        participant['hp'] = min(participant['max_hp'], participant['hp'] + heal_amount)
-        
-        # Update hunter data
-        hunter['hp'] = participant['hp']
-        self.event_cog.save_hunters_data(hunters_data)
+        # Reduced boss damage due to defending, plus a small HP recovery
+        state, events = self.play_turn(participant, hunter, event_state, Action(DEFEND))
+        boss_damage = damage_dealt(events, ENEMY)
+        heal_amount = find_event(events, HEAL).amount
+        hunter_store.mark_dirty(user_id)
         
         feedback = f"🛡️ You successfully defended against {boss_data['name']}!"
         feedback += f"\n💥 Reduced damage taken: **{boss_damage}** damage!"
@@ -467,12 +468,12 @@ class EventCombatView(discord.ui.View):
         hunters_data = self.event_cog.load_hunters_data()
         hunter = hunters_data.get(user_id)
         if hunter:
-            hunter['in_battle'] = False
-            hunter.pop('battle_type', None)
-            hunter.pop('event_id', None)
-            # Apply flee penalty
-            hunter['hp'] = max(1, hunter['hp'] - 20)
-            self.event_cog.save_hunters_data(hunters_data)
+            activities.end(user_id, EVENT)
+            # Apply flee penalty; running away never knocks a hunter out
+            fleeing = {'hp': hunter['hp'], 'max_hp': hunter.get('max_hp', 100)}
+            self.play_turn(fleeing, hunter, event_state, Action(FLEE))
+            hunter['hp'] = max(1, hunter['hp'])
+            hunter_store.mark_dirty(user_id)
         
         # Create flee feedback with boss dialogue
         boss_data = event_state['boss_data']
@@ -525,6 +526,14 @@ class EventManagement(commands.Cog):
         self.EVENT_DURATION = 900  # 15 minutes max event duration
         self.SYSTEM_CHANNEL_ID = 1381439963656355849  # announcements channel
         self.PRIVATE_EVENT_CATEGORY_ID = 1382529024022155274  # Private Events category
+        # Event chambers are leased from a warm pool rather than created per event
+        self.event_channels = ChannelPool(
+            self.PRIVATE_EVENT_CATEGORY_ID, category_name="Event Chambers",
+            prefix="event-chamber", size=1, idle_timeout=None
+        )
+        self.event_channels.attach(bot)
+        # Max-duration timeouts for running events, fired by the shared scheduler
+        self.event_timeouts = scheduler.table('event_timeout', persist=False, on_expire=self.event_global_timer)
         
         # Weekend double EXP configuration
         self.weekend_exp_multiplier = 2.0
@@ -654,30 +663,8 @@ class EventManagement(commands.Cog):
         }
 
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file with custom encoder"""
-        try:
-            import json
-            
-            class CustomEncoder(json.JSONEncoder):
-                def default(self, o):
-                    if hasattr(o, 'value'):  # Discord Color objects
-                        return o.value
-                    if hasattr(o, '__dict__'):
-                        return o.__dict__
-                    return str(o)
-            
-            with open('hunters_data.json', 'w') as f:
-                json.dump(data, f, indent=4, cls=CustomEncoder)
-        except Exception as e:
-            print(f"Error saving hunters data: {e}")
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
 
     def is_weekend(self):
         """Check if current day is weekend"""
@@ -693,90 +680,13 @@ class EventManagement(commands.Cog):
             self.double_exp_active = False
             return 1.0
 
-    async def create_private_event_channel(self, guild, boss_data, user):
-        """Create private event channel with restricted access and comprehensive debugging"""
-        try:
-            print(f"DEBUG: create_private_event_channel called for user {user.name} ({user.id})")
-            
-            # Get or create event category
-            event_category = discord.utils.get(guild.categories, id=self.PRIVATE_EVENT_CATEGORY_ID)
-            if not event_category:
-                print(f"DEBUG: Event category not found, creating new one")
-                event_category = await guild.create_category(
-                    "Event Chambers",
-                    overwrites={
-                        guild.default_role: discord.PermissionOverwrite(read_messages=False)
-                    }
-                )
-                print(f"DEBUG: Created event category: {event_category.name} ({event_category.id})")
-            else:
-                print(f"DEBUG: Found existing event category: {event_category.name} ({event_category.id})")
-
-            # Generate unique channel name
-            timestamp = int(time.time())
-            channel_name = f"event-{boss_data['name'].lower().replace(' ', '-')}-{user.name.lower().replace(' ', '-')}-{timestamp}"
-            print(f"DEBUG: Generated channel name: {channel_name}")
-
-            # Create explicit permission overwrites
-            overwrites = {
-                # Hide from everyone by default
-                guild.default_role: discord.PermissionOverwrite(
-                    read_messages=False,
-                    send_messages=False,
-                    view_channel=False
-                ),
-                # Give bot full permissions
-                guild.me: discord.PermissionOverwrite(
-                    read_messages=True,
-                    send_messages=True,
-                    manage_messages=True,
-                    embed_links=True,
-                    add_reactions=True,
-                    view_channel=True,
-                    manage_channels=True,
-                    manage_permissions=True
-                ),
-                # Give specific user access
-                user: discord.PermissionOverwrite(
-                    read_messages=True,
-                    send_messages=True,
-                    view_channel=True,
-                    embed_links=True,
-                    add_reactions=True
-                )
-            }
-            
-            print(f"DEBUG: Permission overwrites configured for {len(overwrites)} entities")
-
-            # Create the channel
-            print(f"DEBUG: Creating text channel in category {event_category.name}")
-            event_channel = await guild.create_text_channel(
-                name=channel_name,
-                category=event_category,
-                overwrites=overwrites,
-                topic=f"Private event battle against {boss_data['name']} for {user.name}"
-            )
-            
-            print(f"DEBUG: Successfully created event channel: {event_channel.name} ({event_channel.id})")
-            
-            # Verify permissions were set correctly
-            user_perms = event_channel.permissions_for(user)
-            bot_perms = event_channel.permissions_for(guild.me)
-            
-            print(f"DEBUG: User permissions - read: {user_perms.read_messages}, send: {user_perms.send_messages}, view: {user_perms.view_channel}")
-            print(f"DEBUG: Bot permissions - read: {bot_perms.read_messages}, send: {bot_perms.send_messages}, manage: {bot_perms.manage_messages}")
-
-            return event_channel
-
-        except discord.Forbidden as e:
-            print(f"ERROR: Bot lacks permissions to create channel: {e}")
-            print(f"DEBUG: Bot permissions in guild: {guild.me.guild_permissions}")
-            return None
-        except Exception as e:
-            print(f"ERROR: Unexpected error creating event channel: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+    async def create_private_event_channel(self, guild, boss_data, user, event_id):
+        """Lease a private event chamber for an event, visible to its participants only"""
+        print(f"DEBUG: create_private_event_channel called for user {user.name} ({user.id})")
+        event_channel = await self.event_channels.lease(guild, f"event-{event_id}", [user])
+        if event_channel is not None:
+            print(f"DEBUG: Leased event channel: {event_channel.name} ({event_channel.id}) against {boss_data['name']}")
+        return event_channel
 
     async def start_event_combat(self, event_id):
         """Initialize combat for an event with comprehensive debugging"""
@@ -822,7 +732,7 @@ class EventManagement(commands.Cog):
             self.bot.active_event_battles[event_id] = event_state
 
             # Start global event timer
-            asyncio.create_task(self.event_global_timer(event_id))
+            self.event_timeouts.start(event_id, self.EVENT_DURATION)
             print(f"DEBUG: Global timer started for event {event_id}")
             
         except discord.Forbidden as e:
@@ -832,17 +742,13 @@ class EventManagement(commands.Cog):
             print(f"ERROR: Failed to start combat for event {event_id}: {e}")
             await event_channel.send(f"❌ Unexpected error starting combat: {str(e)}", delete_after=10)
 
-    async def event_global_timer(self, event_id):
-        """Global timer for event - auto-cleanup after max duration"""
+    async def event_global_timer(self, event_id, _data=None):
+        """Global timer for event - auto-cleanup after max duration (15 minutes)"""
         try:
-            await asyncio.sleep(self.EVENT_DURATION)  # 15 minutes max
-            
             event_state = self.bot.active_event_battles.get(event_id)
             if event_state:
                 await self.end_event_battle(event_id, "timeout")
                 
-        except asyncio.CancelledError:
-            pass
         except Exception as e:
             print(f"Error in event global timer: {e}")
 
@@ -851,6 +757,7 @@ class EventManagement(commands.Cog):
         event_state = self.bot.active_event_battles.pop(event_id, None)
         if not event_state:
             return
+        self.event_timeouts.discard(event_id)
 
         boss_data = event_state['boss_data']
         event_channel = self.bot.get_channel(event_state['event_channel_id'])
@@ -866,16 +773,14 @@ class EventManagement(commands.Cog):
         # Clean up hunter battle states
         await self.cleanup_hunter_states(event_state)
 
-        # Delete channel after delay
+        # Return the channel to the pool after a delay
         if event_channel:
             await asyncio.sleep(10)
             try:
-                await event_channel.delete()
-                print(f"Event channel deleted for {boss_data['name']} - outcome: {outcome}")
-            except discord.errors.NotFound:
-                pass
+                await self.event_channels.release_channel(event_channel)
+                print(f"Event channel released for {boss_data['name']} - outcome: {outcome}")
             except Exception as e:
-                print(f"Error deleting event channel: {e}")
+                print(f"Error releasing event channel: {e}")
 
     async def handle_victory_rewards(self, event_state, event_channel):
         """Handle victory rewards distribution"""
@@ -910,7 +815,7 @@ class EventManagement(commands.Cog):
                 if boss_data.get('exclusive_equipment', False) and random.random() < 0.30:  # 30% chance
                     exclusive_item = self.get_random_exclusive_equipment()
                     if exclusive_item:
-                        hunter.setdefault('inventory', []).append(exclusive_item)
+                        add_instance(hunter, exclusive_item)
                         victory_embed.add_field(
                             name=f"🌟 Exclusive Drop for {participant['user'].display_name}!",
                             value=f"**{exclusive_item['name']}** - {exclusive_item['description']}",
@@ -918,15 +823,12 @@ class EventManagement(commands.Cog):
                         )
                 
                 # Reset battle state
-                hunter['in_battle'] = False
-                hunter.pop('battle_type', None)
-                hunter.pop('event_id', None)
+                activities.end(user_id, EVENT)
                 hunter['hp'] = hunter.get('max_hp', 100)  # Full heal after victory
                 
                 # Save data
                 hunters_data[user_id] = hunter
-                
-        self.save_hunters_data(hunters_data)
+                hunter_store.mark_dirty(user_id)
 
         # Add reward summary
         victory_embed.add_field(
@@ -955,12 +857,9 @@ class EventManagement(commands.Cog):
                 # Minor penalty
                 hunter['gold'] = max(0, hunter.get('gold', 0) - 25)
                 # Reset battle state
-                hunter['in_battle'] = False
-                hunter.pop('battle_type', None)
-                hunter.pop('event_id', None)
+                activities.end(user_id, EVENT)
                 hunter['hp'] = hunter.get('max_hp', 100)  # Revive with full HP
-
-        self.save_hunters_data(hunters_data)
+                hunter_store.mark_dirty(user_id)
 
         defeat_embed.add_field(
             name="⚖️ Penalties",
@@ -987,16 +886,8 @@ class EventManagement(commands.Cog):
 
     async def cleanup_hunter_states(self, event_state):
         """Clean up hunter battle states"""
-        hunters_data = self.load_hunters_data()
-        
         for user_id in event_state['participants']:
-            hunter = hunters_data.get(user_id)
-            if hunter:
-                hunter['in_battle'] = False
-                hunter.pop('battle_type', None)
-                hunter.pop('event_id', None)
-        
-        self.save_hunters_data(hunters_data)
+            activities.end(user_id, EVENT)
 
     def get_random_exclusive_equipment(self):
         """Get random exclusive equipment item"""
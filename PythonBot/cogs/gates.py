@@ -1,74 +1,37 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
+import copy
+from utils.floor_scaling import DEFAULT_GATES, gate_floor_count, gate_floor_monster, is_red_gate
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.game_data import game_data
+from utils.activity import activities, EXPLORATION
 
 class Gates(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.gate_data = self.load_gate_data()
-        self.active_explorations = {}  # Track active doorway explorations
+        self.active_explorations = activities.view(EXPLORATION, 'Gates')  # Track active doorway explorations
+    
+    @property
+    def gate_data(self):
+        """Current gate configuration (follows hot reloads of data/gates.json)"""
+        return self.load_gate_data()
     
     def load_gate_data(self):
         """Load gate configuration from JSON file"""
-        try:
-            with open('data/gates.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
+        data = game_data.get('gates')
+        if data is None:
             return self.get_default_gates()
+        return data
     
     def get_default_gates(self):
         """Default gate configuration if file doesn't exist"""
-        return {
-            "gates": {
-                "E-Rank": [
-                    {"name": "Abandoned Factory", "difficulty": 1, "level_req": 1, "rewards": {"exp": 50, "gold": 100}},
-                    {"name": "Dark Alley", "difficulty": 2, "level_req": 3, "rewards": {"exp": 75, "gold": 150}}
-                ],
-                "D-Rank": [
-                    {"name": "Haunted School", "difficulty": 3, "level_req": 10, "rewards": {"exp": 150, "gold": 300}},
-                    {"name": "Underground Tunnel", "difficulty": 4, "level_req": 15, "rewards": {"exp": 200, "gold": 400}}
-                ],
-                "C-Rank": [
-                    {"name": "Ancient Ruins", "difficulty": 5, "level_req": 25, "rewards": {"exp": 350, "gold": 700}},
-                    {"name": "Mystic Forest", "difficulty": 6, "level_req": 30, "rewards": {"exp": 450, "gold": 900}}
-                ],
-                "B-Rank": [
-                    {"name": "Crystal Caverns", "difficulty": 7, "level_req": 40, "rewards": {"exp": 600, "gold": 1200}},
-                    {"name": "Demon's Lair", "difficulty": 8, "level_req": 45, "rewards": {"exp": 750, "gold": 1500}}
-                ],
-                "A-Rank": [
-                    {"name": "Dragon's Den", "difficulty": 9, "level_req": 60, "rewards": {"exp": 1000, "gold": 2000}},
-                    {"name": "Shadow Realm", "difficulty": 10, "level_req": 70, "rewards": {"exp": 1250, "gold": 2500}}
-                ],
-                "S-Rank": [
-                    {"name": "Heaven's Trial", "difficulty": 12, "level_req": 80, "rewards": {"exp": 1750, "gold": 3500}},
-                    {"name": "Monarch's Domain", "difficulty": 15, "level_req": 90, "rewards": {"exp": 2500, "gold": 5000}}
-                ],
-                "Red-Gate": [
-                    {"name": "Red Gate (E)", "difficulty": 3, "level_req": 5, "special_access": "red_gates", "rewards": {"exp": 200, "gold": 400, "items": ["Shadow Fragment"]}},
-                    {"name": "Red Gate (D)", "difficulty": 6, "level_req": 15, "special_access": "red_gates", "rewards": {"exp": 500, "gold": 800, "items": ["Shadow Essence"]}},
-                    {"name": "Red Gate (C)", "difficulty": 10, "level_req": 30, "special_access": "red_gates", "rewards": {"exp": 1000, "gold": 1600, "items": ["Shadow Crystal"]}},
-                    {"name": "Red Gate (B)", "difficulty": 15, "level_req": 45, "special_access": "red_gates", "rewards": {"exp": 1800, "gold": 2800, "items": ["Shadow Stone"]}},
-                    {"name": "Red Gate (A)", "difficulty": 20, "level_req": 65, "special_access": "red_gates", "rewards": {"exp": 2800, "gold": 4200, "items": ["Shadow Core"]}},
-                    {"name": "Red Gate (S)", "difficulty": 25, "level_req": 85, "special_access": "red_gates", "rewards": {"exp": 4000, "gold": 6000, "items": ["Shadow Heart"]}}
-                ]
-            }
-        }
+        return copy.deepcopy(DEFAULT_GATES)
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     @commands.command(name='gates', aliases=['doorways'])
     async def list_gates(self, ctx):
@@ -160,13 +123,9 @@ class Gates(commands.Cog):
         hunter = hunters_data[user_id]
         
         # Check if hunter is already in any type of battle or exploration
-        if hunter.get('battle') or hunter.get('gate_battle') or hunter.get('dungeon_battle'):
-            await ctx.send("You're already in battle! Finish your current fight first.")
-            return
-            
-        # Check if already exploring a doorway
-        if user_id in self.active_explorations:
-            await ctx.send("You're already exploring a dimensional gate! Complete your current exploration first.")
+        activity = activities.current(user_id)
+        if activity is not None:
+            await ctx.send(activities.busy_message(activity))
             return
         
         # Find the gate
@@ -206,10 +165,7 @@ class Gates(commands.Cog):
         await asyncio.sleep(2)
         
         # Determine floors based on gate type and difficulty
-        if selected_gate['name'].startswith('Red Gate'):
-            max_floors = 5 + selected_gate['difficulty'] // 3  # Red gates have more floors
-        else:
-            max_floors = 3 + selected_gate['difficulty'] // 4  # Regular gates scale with difficulty
+        max_floors = gate_floor_count(selected_gate)
         
         boss_floor = max_floors  # Boss is on the final floor
         
@@ -225,12 +181,10 @@ class Gates(commands.Cog):
             "total_gold": 0,
             "hunter_hp": hunter['hp'],
             "hunter_max_hp": hunter.get('max_hp', 100),
-            "gate_type": "red" if selected_gate['name'].startswith('Red Gate') else "normal"
+            "gate_type": "red" if is_red_gate(selected_gate) else "normal"
         }
         
         # Store active gate exploration
-        if not hasattr(self, 'active_explorations'):
-            self.active_explorations = {}
         self.active_explorations[user_id] = gate_data
         
         # Start first floor
@@ -261,48 +215,10 @@ class Gates(commands.Cog):
         is_boss_floor = current_floor == boss_floor
         
         # Generate monster for this floor with proper scaling
-        if is_boss_floor:
-            # Boss monster with enhanced stats and rewards
-            if exploration.get("gate_type") == "red":
-                base_hp = 120 + (exploration["difficulty"] * 20)
-                base_attack = 25 + (exploration["difficulty"] * 4)
-                boss_name = f"Red {exploration['gate_name']} King"
-            else:
-                base_hp = 100 + (exploration["difficulty"] * 15)
-                base_attack = 20 + (exploration["difficulty"] * 3)
-                boss_name = f"{exploration['gate_name']} Boss"
-            
-            monster = {
-                "name": boss_name,
-                "hp": base_hp,
-                "attack": base_attack,
-                "defense": 3 + (exploration["difficulty"] // 2),
-                "exp_reward": exploration["rewards"]["exp"],
-                "gold_reward": exploration["rewards"]["gold"],
-                "level": 5 + exploration["difficulty"],
-                "abilities": ["Powerful Strike", "Rage"],
-                "rarity": "boss"
-            }
-        else:
-            # Regular floor monster with scaling difficulty
-            floor_multiplier = 1.2 ** (current_floor - 1)
-            base_hp = int((25 + (exploration["difficulty"] * 4)) * floor_multiplier)
-            base_attack = int((6 + (exploration["difficulty"] * 2)) * floor_multiplier)
-            
-            monster_types = ["Guardian", "Sentinel", "Warden", "Keeper", "Protector"]
-            monster_name = f"Floor {current_floor} {monster_types[(current_floor - 1) % len(monster_types)]}"
-            
-            monster = {
-                "name": monster_name,
-                "hp": base_hp,
-                "attack": base_attack,
-                "defense": 1 + (exploration["difficulty"] // 3),
-                "exp_reward": int((20 + (current_floor * 8)) * (1 + exploration["difficulty"] * 0.1)),
-                "gold_reward": int((30 + (current_floor * 15)) * (1 + exploration["difficulty"] * 0.1)),
-                "level": current_floor + exploration["difficulty"] // 2,
-                "abilities": ["Strike"],
-                "rarity": "common"
-            }
+        monster = gate_floor_monster(
+            exploration["gate_name"], exploration["difficulty"], exploration["rewards"],
+            current_floor, boss_floor, red=exploration.get("gate_type") == "red"
+        )
         
         if is_boss_floor:
             # Boss encounter - ask player if they want to fight or flee
@@ -357,7 +273,7 @@ class Gates(commands.Cog):
                         'is_boss': is_boss_floor
                     }
                     
-                    self.save_hunters_data(hunters_data)
+                    hunter_store.mark_dirty(user_id)
                     
                     embed = discord.Embed(
                         title=f"⚔️ Boss Battle - {monster['name']}",
@@ -498,7 +414,7 @@ class Gates(commands.Cog):
                     else:
                         # Continue exploring
                         exploration['current_floor'] += 1
-                        self.save_hunters_data(hunters_data)
+                        hunter_store.mark_dirty(user_id)
                         await asyncio.sleep(1)
                         await self.process_gate_floor(ctx, user_id)
                         
@@ -523,7 +439,7 @@ class Gates(commands.Cog):
         if hasattr(self, 'active_explorations') and user_id in self.active_explorations:
             del self.active_explorations[user_id]
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="💀 Death",
@@ -561,110 +477,111 @@ class Gates(commands.Cog):
         if "boss_floor" not in exploration:
             exploration["boss_floor"] = exploration.get("max_floors", 3)
         
-        hunters_data = self.load_hunters_data()
-        hunter = hunters_data[user_id]
+        async with hunter_store.transaction(user_id):
+            hunters_data = self.load_hunters_data()
+            hunter = hunters_data[user_id]
         
-        # Award accumulated rewards
-        total_exp = exploration["total_exp"]
-        total_gold = exploration["total_gold"]
+            # Award accumulated rewards
+            total_exp = exploration["total_exp"]
+            total_gold = exploration["total_gold"]
         
-        level_ups = 0
-        rank_up_msg = ""
-        level_up_data = None
+            level_ups = 0
+            rank_up_msg = ""
+            level_up_data = None
         
-        if success and total_exp > 0:
-            # Award EXP using new leveling system
-            from utils.leveling_system import award_exp, send_level_up_notification
-            level_up_data = await award_exp(user_id, total_exp, self.bot, "gate_clear")
+            if success and total_exp > 0:
+                # Award EXP using new leveling system
+                from utils.leveling_system import award_exp, send_level_up_notification
+                level_up_data = await award_exp(user_id, total_exp, self.bot, "gate_clear")
             
-            hunter['gold'] = hunter.get('gold', 0) + total_gold
+                hunter['gold'] = hunter.get('gold', 0) + total_gold
             
-            # Track gate completion for rank progression
-            hunter['gates_cleared'] = hunter.get('gates_cleared', 0) + 1
+                # Track gate completion for rank progression
+                hunter['gates_cleared'] = hunter.get('gates_cleared', 0) + 1
             
-            # Update quest progress
-            try:
-                from daily_quest_system import update_quest_progress
-                update_quest_progress(hunter, "clear_gates", 1)
-                update_quest_progress(hunter, "earn_gold", total_gold)
-            except:
-                pass
+                # Update quest progress
+                try:
+                    from daily_quest_system import update_quest_progress
+                    update_quest_progress(hunter, "clear_gates", 1)
+                    update_quest_progress(hunter, "earn_gold", total_gold)
+                except:
+                    pass
             
-            # Handle level up notifications
-            if level_up_data.get("levels_gained", 0) > 0:
-                level_ups = level_up_data["levels_gained"]
-                await send_level_up_notification(ctx.author, level_up_data)
+                # Handle level up notifications
+                if level_up_data.get("levels_gained", 0) > 0:
+                    level_ups = level_up_data["levels_gained"]
+                    hunter_store.after_commit(user_id, send_level_up_notification, ctx.author, level_up_data)
                 
-                # Announce rank up if applicable
-                if level_up_data.get("rank_changed", False):
-                    rank_up_msg = f"\n🎊 **RANK UP!** You are now {level_up_data['new_rank']}-Rank!"
+                    # Announce rank up if applicable
+                    if level_up_data.get("rank_changed", False):
+                        rank_up_msg = f"\n🎊 **RANK UP!** You are now {level_up_data['new_rank']}-Rank!"
             
-            # Check for rank up
-            try:
-                from main import check_rank_up
-                if check_rank_up(hunter):
-                    rank_up_msg = f"\n🎊 **RANK UP!** You are now {hunter['rank']}-Rank!"
-            except:
-                pass
+                # Check for rank up
+                try:
+                    from main import check_rank_up
+                    if check_rank_up(hunter):
+                        rank_up_msg = f"\n🎊 **RANK UP!** You are now {hunter['rank']}-Rank!"
+                except:
+                    pass
             
-            # Restore some HP
-            hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + 30)
+                # Restore some HP
+                hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + 30)
         
-        # Clean up exploration and hunter battle state
-        del self.active_explorations[user_id]
+            # Clean up exploration and hunter battle state
+            del self.active_explorations[user_id]
         
-        # Clear gate battle state from hunter
-        if 'gate_battle' in hunter:
-            del hunter['gate_battle']
+            # Clear gate battle state from hunter
+            if 'gate_battle' in hunter:
+                del hunter['gate_battle']
             
-        self.save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
         
-        if success:
-            embed = discord.Embed(
-                title="🏆 Gate Exploration Completed!",
-                description=f"You have successfully explored {exploration['gate_name']}!",
-                color=discord.Color.gold()
-            )
+            if success:
+                embed = discord.Embed(
+                    title="🏆 Gate Exploration Completed!",
+                    description=f"You have successfully explored {exploration['gate_name']}!",
+                    color=discord.Color.gold()
+                )
             
-            rewards_text = f"💰 {total_gold} Gold\n⭐ {total_exp} EXP"
-            if level_ups > 0:
-                rewards_text += f"\n🎉 Level Up! (+{level_ups} levels)"
-            rewards_text += rank_up_msg
+                rewards_text = f"💰 {total_gold} Gold\n⭐ {total_exp} EXP"
+                if level_ups > 0:
+                    rewards_text += f"\n🎉 Level Up! (+{level_ups} levels)"
+                rewards_text += rank_up_msg
             
-            embed.add_field(name="Total Rewards", value=rewards_text, inline=True)
-            embed.add_field(
-                name="Floors Cleared",
-                value=f"{exploration['current_floor']}/{exploration['boss_floor']}",
-                inline=True
-            )
-        else:
-            embed = discord.Embed(
-                title="💀 Gate Exploration Failed",
-                description=f"You were defeated in {exploration['gate_name']}.",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="No rewards gained", value="Better luck next time!", inline=False)
-        
-        await ctx.send(embed=embed)
-        
-        # Send detailed victory screen to private channel
-        if success:
-            # Import the completion function
-            import main
-            victory_data = {
-                'monster_name': f"{exploration['gate_name']} (Gate Exploration)",
-                'gold_gained': total_gold,
-                'exp_gained': total_exp,
-                'level_up_data': level_up_data if level_ups > 0 else None,
-                'hunter_stats': {
-                    'level': hunter['level'],
-                    'hp': hunter['hp'],
-                    'max_hp': hunter.get('max_hp', 100),
-                    'gold': hunter['gold']
-                },
-                'additional_info': f"Floors Cleared: {exploration['current_floor']}/{exploration['boss_floor']}" + rank_up_msg
-            }
-            await main.send_combat_completion_message(user_id, victory_data)
+                embed.add_field(name="Total Rewards", value=rewards_text, inline=True)
+                embed.add_field(
+                    name="Floors Cleared",
+                    value=f"{exploration['current_floor']}/{exploration['boss_floor']}",
+                    inline=True
+                )
+            else:
+                embed = discord.Embed(
+                    title="💀 Gate Exploration Failed",
+                    description=f"You were defeated in {exploration['gate_name']}.",
+                    color=discord.Color.red()
+                )
+                embed.add_field(name="No rewards gained", value="Better luck next time!", inline=False)
+        
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+        
+            # Send detailed victory screen to private channel
+            if success:
+                # Import the completion function
+                import main
+                victory_data = {
+                    'monster_name': f"{exploration['gate_name']} (Gate Exploration)",
+                    'gold_gained': total_gold,
+                    'exp_gained': total_exp,
+                    'level_up_data': level_up_data if level_ups > 0 else None,
+                    'hunter_stats': {
+                        'level': hunter['level'],
+                        'hp': hunter['hp'],
+                        'max_hp': hunter.get('max_hp', 100),
+                        'gold': hunter['gold']
+                    },
+                    'additional_info': f"Floors Cleared: {exploration['current_floor']}/{exploration['boss_floor']}" + rank_up_msg
+                }
+                hunter_store.after_commit(user_id, main.send_combat_completion_message, user_id, victory_data)
     
 
     
@@ -736,7 +653,7 @@ class Gates(commands.Cog):
             "exploration_id": user_id
         }
         
-        self.save_hunters_data({user_id: hunter})
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="⚔️ Boss Battle!",
@@ -1,11 +1,17 @@
 import discord
 from discord.ext import commands
 import asyncio
-import json
 import random
 import time
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.channel_pool import ChannelPool
+from utils.scheduler import scheduler
 
 COMBAT_CATEGORY_ID = 1382589016393650248
+# Seconds hunters get to react before an event starts
+JOIN_WINDOW = 120
+# Seconds an event lasts once it has started
+EVENT_DURATION = 3600
 
 # Solo Leveling Boss Definitions
 SOLO_LEVELING_BOSSES = {
@@ -140,64 +146,23 @@ class GlobalEvents(commands.Cog):
         self.participant_channels = {}
         self.event_battles = {}
         self.rank_announcements = []
+        # Participant battle channels are leased from a warm pool and handed back when the event ends
+        self.battle_channels = ChannelPool(COMBAT_CATEGORY_ID, prefix="event-battle", size=0, idle_timeout=None)
+        self.battle_channels.attach(bot)
+        # The join window and event end, fired by the shared scheduler
+        self.event_timers = scheduler.table('global_event', persist=False, on_expire=self.on_event_timer)
 
     def load_hunters_data(self):
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def save_hunters_data(self, data):
-        try:
-            with open('hunters_data.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"[ERROR] Failed to save hunters data: {e}")
+        return load_hunters_data()
 
     async def create_event_combat_channel(self, user, boss_data):
-        """Create individual event combat channel for participant"""
-        guild = user.guild
-        
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(view_channel=False),
-            guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True),
-            user: discord.PermissionOverwrite(view_channel=True, send_messages=True)
-        }
-        
-        # Add moderator permissions
-        for role in guild.roles:
-            if any(perm_name in role.name.lower() for perm_name in ['mod', 'admin', 'staff']):
-                overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
-        
-        category = discord.utils.get(guild.categories, id=COMBAT_CATEGORY_ID)
-        if category is None:
-            try:
-                fetched = await self.bot.fetch_channel(COMBAT_CATEGORY_ID)
-                if isinstance(fetched, discord.CategoryChannel):
-                    category = fetched
-            except Exception as e:
-                print(f"[ERROR] Failed to fetch category: {e}")
-                return None
-
+        """Lease individual event combat channel for participant"""
         try:
-            # Clean username for channel name
-            username = user.display_name
-            import re
-            username = re.sub(r'[^\w\s\-]', '', username)
-            if len(username) > 20:
-                username = username[:20]
-            channel_name = f"{username}'s Event Battle"
-            
-            print(f"[DEBUG] Creating event channel for {user.display_name}")
+            print(f"[DEBUG] Leasing event channel for {user.display_name}")
             
-            event_channel = await guild.create_text_channel(
-                name=channel_name,
-                overwrites=overwrites,
-                category=category,
-                topic=f"Global Event Battle - {boss_data['name']}",
-                reason="Global event combat channel"
-            )
+            event_channel = await self.battle_channels.lease(user.guild, user.id, [user])
+            if event_channel is None:
+                return None
             
             self.participant_channels[str(user.id)] = event_channel.id
             
@@ -222,7 +187,7 @@ class GlobalEvents(commands.Cog):
                     'channel_id': event_channel.id,
                     'event_type': 'global_event'
                 }
-                self.save_hunters_data(hunters_data)
+                hunter_store.mark_dirty(user.id)
             
             # Send welcome message to event channel
             welcome_embed = discord.Embed(
@@ -332,17 +297,26 @@ class GlobalEvents(commands.Cog):
             }
 
             # Wait for participants
-            await self.wait_for_event_join(message, event_type)
+            self.wait_for_event_join(message, event_type)
 
         except Exception as e:
             print(f"[ERROR] Failed to trigger event: {e}")
             self.active_event = None
 
-    async def wait_for_event_join(self, message, event_type):
-        """Wait for users to join the event with real-time updates"""
+    def wait_for_event_join(self, message, event_type):
+        """Give users the join window, then close it"""
+        self.event_timers.start('join', JOIN_WINDOW, (message, event_type))
+
+    async def on_event_timer(self, timer, data):
+        """Scheduler callback for the join window and the end of an event"""
+        if timer == 'join':
+            await self.close_event_join(*data)
+        elif timer == 'end':
+            await self.end_event()
+
+    async def close_event_join(self, message, event_type):
+        """Collect the users who joined and start the event"""
         try:
-            await asyncio.sleep(120)  # 2 minutes for joining
-            
             if not self.active_event:
                 return
                 
@@ -438,23 +412,28 @@ class GlobalEvents(commands.Cog):
             self.event_start_time = time.time()
             
             # Schedule event end
-            asyncio.create_task(self.schedule_event_end())
+            self.schedule_event_end()
             
         except Exception as e:
             print(f"[ERROR] Error starting event: {e}")
             await self.cancel_event("Failed to start event properly.")
 
-    async def schedule_event_end(self):
+    def schedule_event_end(self):
         """Schedule the end of the current event"""
-        await asyncio.sleep(3600)  # 1 hour event duration
-        await self.end_event()
+        self.event_timers.start('end', EVENT_DURATION)
 
     async def end_event(self):
         """End the current event"""
         if not self.active_event:
             return
             
+        self.event_timers.discard('join')
+        self.event_timers.discard('end')
         try:
+            # Hand the battle channels back to the pool
+            for user_id in list(self.participant_channels):
+                await self.battle_channels.release(user_id)
+            
             # Clear event data
             self.active_event = None
             self.event_participants.clear()
@@ -466,7 +445,7 @@ class GlobalEvents(commands.Cog):
             for user_id in hunters_data:
                 if 'event_battle' in hunters_data[user_id]:
                     del hunters_data[user_id]['event_battle']
-            self.save_hunters_data(hunters_data)
+                    hunter_store.mark_dirty(user_id)
             
             print("[INFO] Global event ended successfully")
             
@@ -537,7 +516,7 @@ class GlobalEvents(commands.Cog):
             'data': None
         }
 
-        await self.wait_for_event_join(message, event_type)
+        self.wait_for_event_join(message, event_type)
 
     @commands.command(name='end_event')
     @commands.has_permissions(administrator=True)
@@ -1,21 +1,28 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button, Select
-import json
 import asyncio
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.game_data import game_data
+from utils.item_index import ItemIndex, find_inventory_key
+from utils.derived_stats import derived_stats
+from utils.inventory_model import INSTANCES_FIELD, add_item, get_inventory, inventory_entries, remove_item
 
 class Inventory(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.items_data = self.load_items_data()
+    
+    @property
+    def items_data(self):
+        """Current item catalog (follows hot reloads of data/items.json)"""
+        return self.load_items_data()
     
     def load_items_data(self):
         """Load items configuration from JSON file"""
-        try:
-            with open('data/items.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
+        data = game_data.get('items')
+        if data is None:
             return self.get_default_items()
+        return data
     
     def get_default_items(self):
         """Default items configuration - should match data/items.json structure"""
@@ -71,48 +78,37 @@ class Inventory(commands.Cog):
         }
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+    @property
+    def item_index(self):
+        """Item index over the current catalog (default items if data/items.json is missing)"""
+        return game_data.derive(
+            'items', 'inventory_item_index',
+            lambda data: ItemIndex(data if data is not None else self.get_default_items())
+        )
     
     def get_item_info(self, item_name):
-        """Get item information from all categories"""
-        for category in self.items_data.values():
-            if item_name in category:
-                return category[item_name]
-        return None
+        """Get item information by name, alias or legacy "Name_1" key"""
+        return self.item_index.get_info(item_name)
     
-    def update_hunter_stats(self, hunter):
-        """Update hunter's total stats including equipment bonuses"""
-        # Store base stats (without equipment)
-        if 'base_strength' not in hunter:
-            hunter['base_strength'] = hunter.get('strength', 10)
-            hunter['base_agility'] = hunter.get('agility', 10)
-            hunter['base_intelligence'] = hunter.get('intelligence', 10)
-        
-        # Reset to base stats
-        hunter['strength'] = hunter['base_strength']
-        hunter['agility'] = hunter['base_agility'] 
-        hunter['intelligence'] = hunter['base_intelligence']
-        
-        # Add equipment bonuses
-        equipment = hunter.get('equipment', {})
-        for item_name in equipment.values():
-            if item_name:
-                item_info = self.get_item_info(item_name)
-                if item_info:
-                    hunter['strength'] += item_info.get('strength', 0)
-                    hunter['agility'] += item_info.get('agility', 0)
-                    hunter['intelligence'] += item_info.get('intelligence', 0)
-                    hunter['defense'] = hunter.get('defense', 0) + item_info.get('defense', 0)
+    def get_entries(self, hunter, keys=None):
+        """Inventory entries with their info resolved once (rolled instances included)"""
+        return inventory_entries(hunter, self.item_index, keys)
+    
+    def get_owned_item_info(self, hunter, key):
+        """Info for an inventory key, falling back to the properties uncatalogued items carry"""
+        entries = self.get_entries(hunter, [key])
+        return (entries[0].info if entries else None) or self.get_item_info(key)
+    
+    def missing_item_message(self, item_name, inventory):
+        """Error for an item the hunter doesn't have, with close matches from their inventory"""
+        suggestions = self.item_index.suggest(item_name, keys=inventory.keys())
+        message = f"You don't have '{item_name}' in your inventory!"
+        if suggestions:
+            message += f" Did you mean {', '.join(f'**{s}**' for s in suggestions)}?"
+        return message
     
     def get_rarity_color(self, rarity):
         """Get Discord color based on item rarity"""
@@ -137,19 +133,9 @@ class Inventory(commands.Cog):
             return
         
         hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
+        entries = self.get_entries(hunter)
         equipment = hunter.get('equipment', {})
         
-        # Handle both old list format and new dict format
-        if isinstance(inventory, list):
-            # Convert old list format to new dict format
-            old_items = inventory
-            inventory = {}
-            for item in old_items:
-                inventory[item] = inventory.get(item, 0) + 1
-            hunter['inventory'] = inventory
-            self.save_hunters_data(hunters_data)
-        
         from utils.theme_utils import get_user_theme_colors
         colors = get_user_theme_colors(ctx.author.id)
         
@@ -185,20 +171,12 @@ class Inventory(commands.Cog):
         embed.add_field(name="⚔️ Equipped", value=equipped_text or "Nothing equipped", inline=False)
         
         # Show inventory items
-        if inventory:
+        if entries:
             inventory_text = ""
-            for item, count in inventory.items():
-                # Ensure count is an integer
-                try:
-                    count = int(count) if count is not None else 0
-                except (ValueError, TypeError):
-                    count = 0
-                
-                if count > 0:
-                    item_info = self.get_item_info(item)
-                    rarity = item_info.get('rarity', 'Common') if item_info else 'Common'
-                    count_text = f" x{count}" if count > 1 else ""
-                    inventory_text += f"• **{item}** ({rarity}){count_text}\n"
+            for entry in entries:
+                rarity = entry.info.get('rarity', 'Common')
+                count_text = f" x{entry.count}" if entry.count > 1 else ""
+                inventory_text += f"• **{entry.key}** ({rarity}){count_text}\n"
             
             embed.add_field(name="📦 Items", value=inventory_text[:1024] if inventory_text else "Your inventory is empty", inline=False)
         else:
@@ -228,36 +206,19 @@ class Inventory(commands.Cog):
             return
         
         hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
-        
-        # Handle both old list format and new dict format
-        if isinstance(inventory, list):
-            # Convert old list format to new dict format
-            old_items = inventory
-            inventory = {}
-            for item in old_items:
-                inventory[item] = inventory.get(item, 0) + 1
-            hunter['inventory'] = inventory
+        inventory = get_inventory(hunter, self.item_index)
         
         # Find item in inventory
-        item_found = None
-        for item_name_key, quantity in inventory.items():
-            # Ensure quantity is an integer
-            try:
-                quantity = int(quantity) if quantity is not None else 0
-            except (ValueError, TypeError):
-                quantity = 0
-            
-            if item_name_key.lower() == item_name.lower() and quantity > 0:
-                item_found = item_name_key
-                break
+        item_found = find_inventory_key(inventory, item_name, self.item_index)
+        if item_found and inventory[item_found] <= 0:
+            item_found = None
         
         if not item_found:
-            await ctx.send(f"You don't have '{item_name}' in your inventory!")
+            await ctx.send(self.missing_item_message(item_name, inventory))
             return
         
         # Get item info
-        item_info = self.get_item_info(item_found)
+        item_info = self.get_owned_item_info(hunter, item_found)
         if not item_info:
             await ctx.send("Item information not found!")
             return
@@ -271,14 +232,12 @@ class Inventory(commands.Cog):
         equipment = hunter.get('equipment', {})
         old_item = equipment.get(item_type)
         
-        # Remove from inventory (dict format)
-        inventory[item_found] -= 1
-        if inventory[item_found] <= 0:
-            del inventory[item_found]
+        # Remove from inventory
+        remove_item(hunter, item_found)
         
         # Add old item back to inventory if exists
         if old_item:
-            inventory[old_item] = inventory.get(old_item, 0) + 1
+            add_item(hunter, old_item, index=self.item_index)
         
         # Update quest progress for equipping items
         try:
@@ -292,10 +251,9 @@ class Inventory(commands.Cog):
         hunter['equipment'] = equipment
         
         # Update total stats with equipment bonuses
-        from main import update_hunter_equipment_stats
-        update_hunter_equipment_stats(hunter)
+        derived_stats.apply(hunter)
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="⚔️ Equipment Updated!",
@@ -328,29 +286,17 @@ class Inventory(commands.Cog):
             return
         
         hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
-        
-        # Handle both old list format and new dict format
-        if isinstance(inventory, list):
-            old_items = inventory
-            inventory = {}
-            for item in old_items:
-                inventory[item] = inventory.get(item, 0) + 1
-            hunter['inventory'] = inventory
-        
-        # Find item in inventory (case insensitive)
-        item_found = None
-        for item in inventory.keys():
-            if item.lower() == item_name.lower():
-                item_found = item
-                break
+        inventory = get_inventory(hunter, self.item_index)
+        
+        # Find item in inventory (case insensitive, aliases allowed)
+        item_found = find_inventory_key(inventory, item_name, self.item_index)
         
         if not item_found or inventory.get(item_found, 0) <= 0:
-            await ctx.send(f"You don't have '{item_name}' in your inventory!")
+            await ctx.send(self.missing_item_message(item_name, inventory))
             return
         
         # Get item info
-        item_info = self.get_item_info(item_found)
+        item_info = self.get_owned_item_info(hunter, item_found)
         if not item_info:
             await ctx.send("Item information not found!")
             return
@@ -402,12 +348,10 @@ class Inventory(commands.Cog):
             hunter['exp'] += exp_boost
             result_text = f"Gained {exp_boost} bonus EXP!"
         
-        # Remove one item from inventory (dict format)
-        inventory[item_found] -= 1
-        if inventory[item_found] <= 0:
-            del inventory[item_found]
+        # Remove one item from inventory
+        remove_item(hunter, item_found)
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="✨ Item Used!",
@@ -415,7 +359,7 @@ class Inventory(commands.Cog):
             color=discord.Color.green()
         )
         embed.add_field(name="Effect", value=result_text, inline=False)
-        embed.add_field(name="Remaining", value=f"Items in inventory: {len(hunter.get('inventory', []))}", inline=False)
+        embed.add_field(name="Remaining", value=f"Items in inventory: {sum(get_inventory(hunter, self.item_index).values())}", inline=False)
         
         await ctx.send(embed=embed)
     
@@ -444,6 +388,14 @@ class Inventory(commands.Cog):
             inline=False
         )
         
+        instances = hunter.get(INSTANCES_FIELD, {})
+        if instances:
+            embed.add_field(
+                name="Rolled Instances",
+                value="\n".join(f"{key}: {len(units)}" for key, units in instances.items())[:1024],
+                inline=False
+            )
+        
         # Check each item
         valid_items = []
         invalid_items = []
@@ -527,14 +479,12 @@ class Inventory(commands.Cog):
                 hunter['special_access']['special_dungeons'].append(key_color)
         
         # Remove one key from inventory
-        inventory[item_name] -= 1
-        if inventory[item_name] <= 0:
-            del inventory[item_name]
+        remove_item(hunter, item_name)
         
         # Save changes
         hunters_data = self.load_hunters_data()
         hunters_data[str(ctx.author.id)] = hunter
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(ctx.author.id)
         
         embed.set_footer(text="Special access has been permanently unlocked for your hunter!")
         await ctx.send(embed=embed)
@@ -549,6 +499,7 @@ class InteractiveInventoryView(View):
         self.inventory_cog = inventory_cog
         self.selected_item = None
         self.message = None
+        self.load_entries()
         
         # Add item selection dropdown
         self.add_item(ItemSelectDropdown(self))
@@ -581,6 +532,15 @@ class InteractiveInventoryView(View):
             except:
                 pass
     
+    def load_entries(self):
+        """Resolve the hunter's items against the catalog once per render"""
+        self.entries = self.inventory_cog.get_entries(self.hunter)
+        self.item_infos = {entry.key: entry.info for entry in self.entries if entry.info}
+    
+    def item_info(self, item_name):
+        """Info for an owned or equipped item without another catalog lookup for owned ones"""
+        return self.item_infos.get(item_name) or self.inventory_cog.get_item_info(item_name)
+    
     def update_buttons(self):
         """Update button states based on selected item"""
         if not self.selected_item:
@@ -589,7 +549,7 @@ class InteractiveInventoryView(View):
             self.sell_button.disabled = True
             return
         
-        item_info = self.inventory_cog.get_item_info(self.selected_item)
+        item_info = self.item_info(self.selected_item)
         if not item_info:
             self.equip_button.disabled = True
             self.use_button.disabled = True
@@ -620,14 +580,14 @@ class InteractiveInventoryView(View):
         user_id = str(self.ctx.author.id)
         hunter = hunters_data.get(user_id, {})
         
-        item_info = self.inventory_cog.get_item_info(self.selected_item)
+        item_info = self.item_info(self.selected_item)
         if not item_info:
             await interaction.followup.send("Item information not found!", ephemeral=True)
             return
         
         item_type = item_info['type']
         equipment = hunter.get('equipment', {})
-        inventory = hunter.get('inventory', {})
+        inventory = get_inventory(hunter, self.inventory_cog.item_index)
         
         # Check if item is currently equipped
         currently_equipped = equipment.get(item_type) == self.selected_item
@@ -635,7 +595,7 @@ class InteractiveInventoryView(View):
         if currently_equipped:
             # Unequip the item
             equipment[item_type] = None
-            inventory[self.selected_item] = inventory.get(self.selected_item, 0) + 1
+            add_item(hunter, self.selected_item, index=self.inventory_cog.item_index)
             action = "unequipped"
         else:
             # Equip the item
@@ -644,14 +604,12 @@ class InteractiveInventoryView(View):
                 return
             
             # Remove from inventory
-            inventory[self.selected_item] -= 1
-            if inventory[self.selected_item] <= 0:
-                del inventory[self.selected_item]
+            remove_item(hunter, self.selected_item)
             
             # Add old item back to inventory if exists
             old_item = equipment.get(item_type)
             if old_item:
-                inventory[old_item] = inventory.get(old_item, 0) + 1
+                add_item(hunter, old_item, index=self.inventory_cog.item_index)
             
             # Equip new item
             equipment[item_type] = self.selected_item
@@ -659,12 +617,11 @@ class InteractiveInventoryView(View):
         
         # Update hunter data
         hunter['equipment'] = equipment
-        hunter['inventory'] = inventory
         hunters_data[user_id] = hunter
         
         # Update stats
-        self.inventory_cog.update_hunter_stats(hunter)
-        self.inventory_cog.save_hunters_data(hunters_data)
+        derived_stats.apply(hunter)
+        hunter_store.mark_dirty(user_id)
         
         await interaction.followup.send(f"Successfully {action} **{self.selected_item}**!", ephemeral=True)
         
@@ -683,64 +640,62 @@ class InteractiveInventoryView(View):
         
         await interaction.response.defer()
         
-        # Load fresh data
-        hunters_data = self.inventory_cog.load_hunters_data()
-        user_id = str(self.ctx.author.id)
-        hunter = hunters_data.get(user_id, {})
-        inventory = hunter.get('inventory', {})
-        
-        if inventory.get(self.selected_item, 0) <= 0:
-            await interaction.followup.send("You don't have this item in your inventory!", ephemeral=True)
-            return
-        
-        item_info = self.inventory_cog.get_item_info(self.selected_item)
-        if not item_info or item_info.get('type') != 'consumable':
-            await interaction.followup.send("This item cannot be used!", ephemeral=True)
-            return
+        async with hunter_store.transaction(self.ctx.author.id):
+            # Load fresh data
+            hunters_data = self.inventory_cog.load_hunters_data()
+            user_id = str(self.ctx.author.id)
+            hunter = hunters_data.get(user_id, {})
+            inventory = get_inventory(hunter, self.inventory_cog.item_index)
         
-        # Use the item
-        inventory[self.selected_item] -= 1
-        if inventory[self.selected_item] <= 0:
-            del inventory[self.selected_item]
-        
-        # Apply item effects
-        effect = item_info.get('effect', '')
-        result_msg = f"Used **{self.selected_item}**"
-        
-        if effect == 'heal':
-            heal_amount = item_info.get('heal_amount', 50)
-            old_hp = hunter.get('hp', 0)
-            max_hp = hunter.get('max_hp', 100)
-            hunter['hp'] = min(max_hp, old_hp + heal_amount)
-            actual_heal = hunter['hp'] - old_hp
-            result_msg += f" and restored {actual_heal} HP!"
+            if inventory.get(self.selected_item, 0) <= 0:
+                hunter_store.after_commit(user_id, interaction.followup.send, "You don't have this item in your inventory!", ephemeral=True)
+                return
         
-        elif effect == 'mana':
-            mana_amount = item_info.get('mana_amount', 30)
-            old_mp = hunter.get('mp', 0)
-            max_mp = hunter.get('max_mp', 50)
-            hunter['mp'] = min(max_mp, old_mp + mana_amount)
-            actual_mana = hunter['mp'] - old_mp
-            result_msg += f" and restored {actual_mana} MP!"
+            item_info = self.item_info(self.selected_item)
+            if not item_info or item_info.get('type') != 'consumable':
+                hunter_store.after_commit(user_id, interaction.followup.send, "This item cannot be used!", ephemeral=True)
+                return
         
-        elif effect == 'exp_boost':
-            exp_amount = item_info.get('exp_amount', 200)
-            from main import award_exp
-            level_data = await award_exp(user_id, exp_amount, self.inventory_cog.bot)
-            result_msg += f" and gained {exp_amount} EXP!"
+            # Use the item
+            remove_item(hunter, self.selected_item)
+        
+            # Apply item effects
+            effect = item_info.get('effect', '')
+            result_msg = f"Used **{self.selected_item}**"
+        
+            if effect == 'heal':
+                heal_amount = item_info.get('heal_amount', 50)
+                old_hp = hunter.get('hp', 0)
+                max_hp = hunter.get('max_hp', 100)
+                hunter['hp'] = min(max_hp, old_hp + heal_amount)
+                actual_heal = hunter['hp'] - old_hp
+                result_msg += f" and restored {actual_heal} HP!"
+        
+            elif effect == 'mana':
+                mana_amount = item_info.get('mana_amount', 30)
+                old_mp = hunter.get('mp', 0)
+                max_mp = hunter.get('max_mp', 50)
+                hunter['mp'] = min(max_mp, old_mp + mana_amount)
+                actual_mana = hunter['mp'] - old_mp
+                result_msg += f" and restored {actual_mana} MP!"
+        
+            elif effect == 'exp_boost':
+                exp_amount = item_info.get('exp_amount', 200)
+                from main import award_exp
+                level_data = await award_exp(user_id, exp_amount, self.inventory_cog.bot)
+                result_msg += f" and gained {exp_amount} EXP!"
             
-            if level_data.get('levels_gained', 0) > 0:
-                result_msg += f"\nLevel up! {level_data['old_level']} → {level_data['new_level']}"
+                if level_data.get('levels_gained', 0) > 0:
+                    result_msg += f"\nLevel up! {level_data['old_level']} → {level_data['new_level']}"
         
-        # Save data
-        hunter['inventory'] = inventory
-        hunters_data[user_id] = hunter
-        self.inventory_cog.save_hunters_data(hunters_data)
+            # Save data
+            hunters_data[user_id] = hunter
+            hunter_store.mark_dirty(user_id)
         
-        await interaction.followup.send(result_msg, ephemeral=True)
+            hunter_store.after_commit(user_id, interaction.followup.send, result_msg, ephemeral=True)
         
-        # Refresh the inventory display
-        await self.refresh_inventory()
+            # Refresh the inventory display
+            hunter_store.after_commit(user_id, self.refresh_inventory)
     
     async def sell_callback(self, interaction):
         """Handle sell item button press"""
@@ -758,13 +713,13 @@ class InteractiveInventoryView(View):
         hunters_data = self.inventory_cog.load_hunters_data()
         user_id = str(self.ctx.author.id)
         hunter = hunters_data.get(user_id, {})
-        inventory = hunter.get('inventory', {})
+        inventory = get_inventory(hunter, self.inventory_cog.item_index)
         
         if inventory.get(self.selected_item, 0) <= 0:
             await interaction.followup.send("You don't have this item in your inventory!", ephemeral=True)
             return
         
-        item_info = self.inventory_cog.get_item_info(self.selected_item)
+        item_info = self.item_info(self.selected_item)
         if not item_info:
             await interaction.followup.send("Item information not found!", ephemeral=True)
             return
@@ -774,16 +729,13 @@ class InteractiveInventoryView(View):
         sell_price = max(1, original_price // 2)
         
         # Remove item and add gold
-        inventory[self.selected_item] -= 1
-        if inventory[self.selected_item] <= 0:
-            del inventory[self.selected_item]
+        remove_item(hunter, self.selected_item)
         
         hunter['gold'] = hunter.get('gold', 0) + sell_price
         
         # Save data
-        hunter['inventory'] = inventory
         hunters_data[user_id] = hunter
-        self.inventory_cog.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         await interaction.followup.send(f"Sold **{self.selected_item}** for {sell_price} gold!\nTotal gold: {hunter['gold']}", ephemeral=True)
         
@@ -809,6 +761,7 @@ class InteractiveInventoryView(View):
         
         # Clear selection
         self.selected_item = None
+        self.load_entries()
         self.update_buttons()
         
         # Update dropdown
@@ -850,7 +803,7 @@ class InteractiveInventoryView(View):
             item = equipment.get(slot)
             icon = slot_icons.get(slot, '📭')
             if item:
-                item_info = self.inventory_cog.get_item_info(item)
+                item_info = self.item_info(item)
                 rarity = item_info.get('rarity', 'Common') if item_info else 'Common'
                 slot_name = "Offhand" if slot == 'shield' else slot.title()
                 equipped_text += f"{icon} {slot_name}: **{item}** ({rarity})\n"
@@ -861,8 +814,7 @@ class InteractiveInventoryView(View):
         embed.add_field(name="⚔️ Equipped", value=equipped_text or "Nothing equipped", inline=False)
         
         # Show inventory count
-        inventory = self.hunter.get('inventory', {})
-        total_items = sum(count for count in inventory.values() if isinstance(count, int) and count > 0)
+        total_items = sum(entry.count for entry in self.entries)
         
         embed.add_field(
             name="📦 Inventory",
@@ -877,7 +829,7 @@ class InteractiveInventoryView(View):
         )
         
         if self.selected_item:
-            item_info = self.inventory_cog.get_item_info(self.selected_item)
+            item_info = self.item_info(self.selected_item)
             if item_info:
                 embed.add_field(
                     name=f"🔍 Selected: {self.selected_item}",
@@ -898,34 +850,31 @@ class ItemSelectDropdown(Select):
     
     def create_options(self, hunter):
         """Create dropdown options from inventory"""
-        inventory = hunter.get('inventory', {})
         options = []
         
         # Add inventory items
-        for item_name, count in inventory.items():
-            if isinstance(count, int) and count > 0:
-                item_info = self.parent_view.inventory_cog.get_item_info(item_name)
-                rarity = item_info.get('rarity', 'Common') if item_info else 'Common'
-                item_type = item_info.get('type', 'Unknown').title() if item_info else 'Unknown'
-                
-                emoji = "⚔️" if item_type == "Weapon" else "🛡️" if item_type == "Armor" else "💍" if item_type == "Accessory" else "🔰" if item_type == "Shield" else "🧪" if item_type == "Consumable" else "📦"
-                
-                description = f"{item_type} • {rarity}"
-                if count > 1:
-                    description += f" • x{count}"
-                
-                options.append(discord.SelectOption(
-                    label=item_name[:25],  # Discord limit
-                    description=description[:50],  # Discord limit
-                    emoji=emoji,
-                    value=item_name
-                ))
+        for item_name, count, item_info, _ in self.parent_view.entries:
+            rarity = item_info.get('rarity', 'Common')
+            item_type = item_info.get('type', 'Unknown').title()
+            
+            emoji = "⚔️" if item_type == "Weapon" else "🛡️" if item_type == "Armor" else "💍" if item_type == "Accessory" else "🔰" if item_type == "Shield" else "🧪" if item_type == "Consumable" else "📦"
+            
+            description = f"{item_type} • {rarity}"
+            if count > 1:
+                description += f" • x{count}"
+            
+            options.append(discord.SelectOption(
+                label=item_name[:25],  # Discord limit
+                description=description[:50],  # Discord limit
+                emoji=emoji,
+                value=item_name
+            ))
         
         # Add equipment items (for unequipping)
         equipment = hunter.get('equipment', {})
         for slot, item_name in equipment.items():
             if item_name:
-                item_info = self.parent_view.inventory_cog.get_item_info(item_name)
+                item_info = self.parent_view.item_info(item_name)
                 rarity = item_info.get('rarity', 'Common') if item_info else 'Common'
                 
                 emoji = "⚔️" if slot == "weapon" else "🛡️" if slot == "armor" else "💍" if slot == "accessory" else "🔰"
@@ -5,15 +5,15 @@ Narrative encounters cog with interactive dialogue system and monster lore progr
 import discord
 from discord.ext import commands
 from discord.ui import View, Button, Select
-import json
 import random
 from typing import Dict, Any, List
 from data.encounter_data import DIALOGUE_NODES, ENCOUNTERS, ENCOUNTER_ITEMS, get_monster_lore, get_encounter_by_chance
 from utils.encounter_utils import (
-    load_hunters_data, save_hunters_data, check_and_reset_daily_hunts,
+    check_and_reset_daily_hunts,
     initialize_hunter_encounter_data, update_monster_kill_count, 
     apply_encounter_reward, get_active_encounter_buffs, reduce_encounter_buff_duration
 )
+from utils.hunter_store import hunter_store, load_hunters_data
 from utils.dialogue_generator import generate_boss_conversation, generate_encounter_dialogue, generate_combat_taunts
 
 class DialogueView(View):
@@ -51,7 +51,7 @@ class DialogueView(View):
         user_id = str(self.ctx.author.id)
         if user_id in hunters_data:
             hunters_data[user_id] = self.hunter
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
 
     def update_ui(self):
         """Update dialogue buttons based on current node"""
@@ -170,7 +170,7 @@ class ChoiceButton(Button):
                 'node_id': self.view.current_node_id
             }
             hunters_data[user_id] = self.view.hunter
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
             await self.view.send_dialogue_message()
             
         elif outcome_type == "combat":
@@ -179,17 +179,18 @@ class ChoiceButton(Button):
             await self.start_narrative_combat(interaction, monster_id)
             
         elif outcome_type == "reward":
-            # Apply rewards
-            reward_message = apply_encounter_reward(self.view.hunter, self.choice_data)
-            
-            # Handle EXP separately through leveling system
-            if 'exp' in self.choice_data:
-                exp_amount = self.choice_data['exp']
-                from utils.leveling_system import award_exp
-                result = await award_exp(user_id, exp_amount, self.view.bot, "encounter")
+            # Apply rewards and EXP as one update so neither overwrites the other
+            async with hunter_store.transaction(user_id):
+                reward_message = apply_encounter_reward(self.view.hunter, self.choice_data)
                 
-                if result.get("levels_gained", 0) > 0:
-                    reward_message += f" Level up! Now level {result['new_level']}!"
+                # Handle EXP separately through leveling system
+                if 'exp' in self.choice_data:
+                    exp_amount = self.choice_data['exp']
+                    from utils.leveling_system import award_exp
+                    result = await award_exp(user_id, exp_amount, self.view.bot, "encounter")
+                    
+                    if result.get("levels_gained", 0) > 0:
+                        reward_message += f" Level up! Now level {result['new_level']}!"
             
             # Send reward notification
             embed = discord.Embed(
@@ -269,7 +270,7 @@ class ChoiceButton(Button):
         # Save updated hunter data
         hunters_data = load_hunters_data()
         hunters_data[str(interaction.user.id)] = self.view.hunter
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(interaction.user.id)
         
         # End dialogue and start combat
         await self.end_encounter(interaction)
@@ -282,7 +283,7 @@ class ChoiceButton(Button):
         hunters_data = load_hunters_data()
         user_id = str(interaction.user.id)
         hunters_data[user_id] = self.view.hunter
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         # Disable dialogue view
         if self.view.message:
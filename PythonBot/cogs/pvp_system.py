@@ -1,8 +1,11 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.combat_engine import DEFEND, PVP_RULES, Combatant, enemy_turn
+from utils.leaderboard import leaderboards
+from utils.activity import activities
 
 class PvPSystem(commands.Cog):
     def __init__(self, bot):
@@ -10,17 +13,8 @@ class PvPSystem(commands.Cog):
         self.active_battles = {}  # Store active PvP battles
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def calculate_power_level(self, hunter):
         """Calculate hunter's power level for PvP"""
@@ -84,7 +78,8 @@ class PvPSystem(commands.Cog):
             return
         
         # Check if either player is already in battle
-        if challenger.get('battle') or target_hunter.get('battle'):
+        if (challenger.get('battle') or target_hunter.get('battle')
+                or activities.is_busy(challenger_id) or activities.is_busy(target_id)):
             await ctx.send("One of the players is already in battle!")
             return
         
@@ -159,6 +154,8 @@ class PvPSystem(commands.Cog):
                 "max_hp": challenger.get('max_hp', 100),
                 "mp": challenger.get('mp', 50),
                 "max_mp": challenger.get('max_mp', 50),
+                "attack": challenger.get('strength', 10),
+                "defense": challenger.get('defense', 5),
                 "power": self.calculate_power_level(challenger)
             },
             "target": {
@@ -167,6 +164,8 @@ class PvPSystem(commands.Cog):
                 "max_hp": target.get('max_hp', 100),
                 "mp": target.get('mp', 50),
                 "max_mp": target.get('max_mp', 50),
+                "attack": target.get('strength', 10),
+                "defense": target.get('defense', 5),
                 "power": self.calculate_power_level(target)
             },
             "turn": "challenger",
@@ -181,6 +180,50 @@ class PvPSystem(commands.Cog):
         
         await self.update_battle_embed(ctx, battle_key, embed)
     
+    def find_battle(self, user_id):
+        """Return (battle_key, side) for a hunter in an active PvP battle, or (None, None)"""
+        for battle_key, battle in self.active_battles.items():
+            for side in ("challenger", "target"):
+                if battle[side]["id"] == user_id:
+                    return battle_key, side
+        return None, None
+    
+    async def take_turn(self, ctx, user_id, action):
+        """Play a hunter's .attack or .defend in their PvP battle"""
+        battle_key, side = self.find_battle(user_id)
+        if battle_key is None:
+            return
+        
+        battle = self.active_battles[battle_key]
+        if battle["turn"] != side:
+            await ctx.send("It's not your turn!")
+            return
+        
+        other = "target" if side == "challenger" else "challenger"
+        me, foe = battle[side], battle[other]
+        
+        if action == DEFEND:
+            # Guard until the opponent's next attack
+            me["guarding"] = True
+            result = f"🛡️ {ctx.author.name} braces for the next attack!"
+        else:
+            attacker = Combatant(side, me["hp"], me["max_hp"], me.get("attack", 10), me.get("defense", 5))
+            defender = Combatant(other, foe["hp"], foe["max_hp"], foe.get("attack", 10), foe.get("defense", 5))
+            defender, _, events = enemy_turn(defender, attacker, PVP_RULES, defending=foe.pop("guarding", False))
+            foe["hp"] = defender.hp
+            result = f"⚔️ {ctx.author.name} strikes for **{events[0].amount}** damage!"
+        
+        battle["turn"] = other
+        if other == "challenger":
+            battle["round"] += 1
+        
+        embed = discord.Embed(
+            title="⚔️ PvP Battle",
+            description=f"Round {battle['round']}\n{result}",
+            color=discord.Color.dark_red()
+        )
+        await self.update_battle_embed(ctx, battle_key, embed)
+    
     async def update_battle_embed(self, ctx, battle_key, embed=None):
         """Update the battle display"""
         if battle_key not in self.active_battles:
@@ -231,7 +274,7 @@ class PvPSystem(commands.Cog):
             inline=False
         )
         
-        embed.set_footer(text="Use `.attack`, `.defend`, or `.special` for your turn")
+        embed.set_footer(text="Use `.attack` or `.defend` for your turn")
         
         message = await ctx.send(embed=embed)
         
@@ -246,45 +289,36 @@ class PvPSystem(commands.Cog):
         if battle_key not in self.active_battles:
             return
         
-        battle = self.active_battles[battle_key]
+        # Claim the battle before awaiting so it cannot be concluded twice
+        battle = self.active_battles.pop(battle_key)
         challenger_id = battle["challenger"]["id"]
         target_id = battle["target"]["id"]
         
         loser_id = challenger_id if winner_id == target_id else target_id
         
-        # Load current data
-        hunters_data = self.load_hunters_data()
-        
-        winner = hunters_data[winner_id]
-        loser = hunters_data[loser_id]
-        
-        # Update PvP stats
-        if 'pvp_stats' not in winner:
-            winner['pvp_stats'] = {'wins': 0, 'losses': 0, 'rank': 'Unranked'}
-        if 'pvp_stats' not in loser:
-            loser['pvp_stats'] = {'wins': 0, 'losses': 0, 'rank': 'Unranked'}
-        
-        winner['pvp_stats']['wins'] += 1
-        loser['pvp_stats']['losses'] += 1
-        
-        # Track PvP wins for hunter rank progression
-        winner['pvp_wins'] = winner.get('pvp_wins', 0) + 1
-        
-        # Update PvP ranks
-        winner['pvp_stats']['rank'] = self.get_rank_from_wins(winner['pvp_stats']['wins'])
-        loser['pvp_stats']['rank'] = self.get_rank_from_wins(loser['pvp_stats']['wins'])
-        
-        # Award rewards
         gold_reward = random.randint(100, 300)
         exp_reward = random.randint(50, 150)
         
-        winner['gold'] = winner.get('gold', 0) + gold_reward
-        winner['exp'] += exp_reward
+        # Update PvP stats and award rewards, one hunter at a time
+        async with hunter_store.transaction(winner_id) as winner:
+            if 'pvp_stats' not in winner:
+                winner['pvp_stats'] = {'wins': 0, 'losses': 0, 'rank': 'Unranked'}
+            winner['pvp_stats']['wins'] += 1
+        
+            # Track PvP wins for hunter rank progression
+            winner['pvp_wins'] = winner.get('pvp_wins', 0) + 1
+            winner['pvp_stats']['rank'] = self.get_rank_from_wins(winner['pvp_stats']['wins'])
         
-        self.save_hunters_data(hunters_data)
+            winner['gold'] = winner.get('gold', 0) + gold_reward
+            winner['exp'] += exp_reward
+            hunter_store.mark_dirty(winner_id)
         
-        # Clean up battle
-        del self.active_battles[battle_key]
+        async with hunter_store.transaction(loser_id) as loser:
+            if 'pvp_stats' not in loser:
+                loser['pvp_stats'] = {'wins': 0, 'losses': 0, 'rank': 'Unranked'}
+            loser['pvp_stats']['losses'] += 1
+            loser['pvp_stats']['rank'] = self.get_rank_from_wins(loser['pvp_stats']['wins'])
+            hunter_store.mark_dirty(loser_id)
         
         winner_user = self.bot.get_user(int(winner_id))
         loser_user = self.bot.get_user(int(loser_id))
@@ -318,24 +352,7 @@ class PvPSystem(commands.Cog):
     @commands.command(name='rankings')
     async def show_rankings(self, ctx):
         """Show PvP leaderboard"""
-        hunters_data = self.load_hunters_data()
-        
-        # Get all hunters with PvP stats
-        pvp_hunters = []
-        for user_id, hunter in hunters_data.items():
-            if 'pvp_stats' in hunter and hunter['pvp_stats']['wins'] > 0:
-                user = self.bot.get_user(int(user_id))
-                if user:
-                    pvp_hunters.append({
-                        'name': user.name,
-                        'wins': hunter['pvp_stats']['wins'],
-                        'losses': hunter['pvp_stats']['losses'],
-                        'rank': hunter['pvp_stats']['rank'],
-                        'level': hunter.get('level', 1)
-                    })
-        
-        # Sort by wins
-        pvp_hunters.sort(key=lambda x: x['wins'], reverse=True)
+        top_hunters = leaderboards.top('pvp_wins', 10)
         
         embed = discord.Embed(
             title="🏆 PvP Rankings",
@@ -343,17 +360,22 @@ class PvPSystem(commands.Cog):
             color=discord.Color.gold()
         )
         
-        if not pvp_hunters:
+        if not top_hunters:
             embed.add_field(name="No Rankings", value="No hunters have participated in PvP yet!", inline=False)
         else:
             rankings_text = ""
-            for i, hunter in enumerate(pvp_hunters[:10], 1):
-                win_rate = (hunter['wins'] / (hunter['wins'] + hunter['losses'])) * 100
-                rankings_text += f"`{i}.` **{hunter['name']}** ({hunter['rank']})\n"
-                rankings_text += f"    Wins: {hunter['wins']} | Losses: {hunter['losses']} | Win Rate: {win_rate:.1f}%\n\n"
+            for entry in top_hunters:
+                pvp_stats = entry.hunter['pvp_stats']
+                win_rate = (pvp_stats['wins'] / (pvp_stats['wins'] + pvp_stats['losses'])) * 100
+                rankings_text += f"`{entry.position}.` **{leaderboards.display_name(self.bot, entry.user_id)}** ({pvp_stats['rank']})\n"
+                rankings_text += f"    Wins: {pvp_stats['wins']} | Losses: {pvp_stats['losses']} | Win Rate: {win_rate:.1f}%\n\n"
             
             embed.add_field(name="Top 10 Hunters", value=rankings_text[:1024], inline=False)
         
+        position = leaderboards.position(ctx.author.id, 'pvp_wins')
+        if position is not None and position > 10:
+            embed.set_footer(text=f"Your position: #{position} of {leaderboards.size('pvp_wins')}")
+        
         await ctx.send(embed=embed)
 
 async def setup(bot):
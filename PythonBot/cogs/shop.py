@@ -1,8 +1,18 @@
 import discord
 from discord.ext import commands
-import json
 import random
 from discord.ui import View, Select, Button
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.item_index import ItemIndex, find_inventory_key
+from utils.inventory_model import add_instance, add_item, get_inventory, inventory_entries, remove_item
+
+# Tier-based level requirements matching Solo Leveling progression
+TIER_LEVEL_REQUIREMENTS = {
+    "Common": 1,
+    "Rare": 10,
+    "SR": 25,
+    "UR": 50
+}
 
 class ShopView(View):
     """Interactive shop view with category navigation and item purchasing"""
@@ -177,77 +187,44 @@ class ItemSelect(Select):
 
     async def process_purchase(self, interaction, item_name):
         """Process item purchase"""
-        # Load fresh hunter data
-        hunters_data = {}
-        try:
-            with open('hunters_data.json', 'r') as f:
-                hunters_data = json.load(f)
-        except FileNotFoundError:
-            hunters_data = {}
-        
         user_id = str(interaction.user.id)
-        if user_id not in hunters_data:
-            await interaction.response.send_message("Hunter data not found!", ephemeral=True)
-            return
-        
-        hunter = hunters_data[user_id]
-        current_gold = hunter.get('gold', 0)
+        error = None
+        
+        async with hunter_store.transaction(user_id):
+            hunters_data = load_hunters_data()
+            hunter = hunters_data.get(user_id)
+            current_items = self.shop_view.items_data.get(self.shop_view.current_category, {})
+            item_data = current_items.get(item_name)
+        
+            if hunter is None:
+                error = "Hunter data not found!"
+            elif item_data is None:
+                error = "Item not found!"
+            elif hunter.get('gold', 0) < item_data.get('value', 0):
+                error = f"You don't have enough gold! Need {item_data.get('value', 0):,} but have {hunter.get('gold', 0):,}"
+            elif hunter.get('level', 1) < item_data.get('level_req', 1):
+                error = f"You need to be level {item_data.get('level_req', 1)} to buy this item!"
+            else:
+                # Process purchase
+                price = item_data.get('value', 0)
+                hunter['gold'] -= price
         
-        # Find item in current category
-        current_items = self.shop_view.items_data.get(self.shop_view.current_category, {})
-        if item_name not in current_items:
-            await interaction.response.send_message("Item not found!", ephemeral=True)
-            return
+                # Add to inventory; non-stackable items keep only the properties the catalog lacks
+                if item_data.get('stackable', False):
+                    add_item(hunter, item_name)
+                else:
+                    add_instance(hunter, item_data, item_name)
         
-        item_data = current_items[item_name]
-        price = item_data.get('value', 0)
+                hunter_store.mark_dirty(user_id)
+                remaining_gold = hunter['gold']
         
-        # Check affordability
-        if current_gold < price:
-            await interaction.response.send_message(
-                f"You don't have enough gold! Need {price:,} but have {current_gold:,}",
-                ephemeral=True
-            )
-            return
-        
-        # Check level requirement
-        level_req = item_data.get('level_req', 1)
-        if hunter.get('level', 1) < level_req:
-            await interaction.response.send_message(
-                f"You need to be level {level_req} to buy this item!",
-                ephemeral=True
-            )
-            return
-        
-        # Process purchase
-        hunter['gold'] -= price
-        
-        # Add to inventory
-        if 'inventory' not in hunter:
-            hunter['inventory'] = {}
-        
-        if item_data.get('stackable', False):
-            hunter['inventory'][item_name] = hunter['inventory'].get(item_name, 0) + 1
-        else:
-            # For non-stackable items, create unique keys if needed
-            base_name = item_name
-            counter = 1
-            unique_name = base_name
-            while unique_name in hunter['inventory']:
-                unique_name = f"{base_name}_{counter}"
-                counter += 1
-            hunter['inventory'][unique_name] = item_data
-        
-        # Save data
-        try:
-            with open('hunters_data.json', 'w') as f:
-                json.dump(hunters_data, f, indent=4)
-        except Exception as e:
-            await interaction.response.send_message(f"Error saving purchase: {e}", ephemeral=True)
+        # Reply only once the purchase is committed and the hunter lock released
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
             return
         
         # Update shop view
-        self.shop_view.hunter_gold = hunter['gold']
+        self.shop_view.hunter_gold = remaining_gold
         
         # Success message
         tier_emoji = {"UR": "🟡", "SR": "🟣", "Rare": "🔵", "Common": "⚪"}.get(item_data.get('tier', 'Common'), "⚪")
@@ -257,7 +234,7 @@ class ItemSelect(Select):
             description=f"You bought **{item_name}** for {price:,} gold",
             color=discord.Color.green()
         )
-        embed.add_field(name="Remaining Gold", value=f"{hunter['gold']:,} 💰", inline=True)
+        embed.add_field(name="Remaining Gold", value=f"{remaining_gold:,} 💰", inline=True)
         embed.add_field(name="Item Tier", value=f"{tier_emoji} {item_data.get('tier', 'Common')}", inline=True)
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -272,6 +249,7 @@ class Shop(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.items_data = self.load_items_data()
+        self.item_index = ItemIndex(self.items_data)
     
     def load_items_data(self):
         """Load comprehensive items configuration including Solo Leveling and traditional RPG items"""
@@ -488,17 +466,8 @@ class Shop(commands.Cog):
         }
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def get_tier_color_and_emoji(self, tier):
         """Get Discord color and emoji based on Solo Leveling tier"""
@@ -517,13 +486,7 @@ class Shop(commands.Cog):
         # Add items based on hunter level with Solo Leveling tier requirements
         for category, items in self.items_data.items():
             for item_name, item_data in items.items():
-                # Tier-based level requirements matching Solo Leveling progression
-                item_level_req = {
-                    "Common": 1,
-                    "Rare": 10,
-                    "SR": 25,
-                    "UR": 50
-                }.get(item_data.get('tier', 'Common'), 1)
+                item_level_req = TIER_LEVEL_REQUIREMENTS.get(item_data.get('tier', 'Common'), 1)
                 
                 if hunter_level >= item_level_req:
                     shop_items.append((item_name, item_data, category))
@@ -576,19 +539,21 @@ class Shop(commands.Cog):
         hunter = hunters_data[user_id]
         hunter_gold = hunter.get('gold', 0)
         
-        # Find the item in shop inventory
-        shop_inventory = self.generate_shop_inventory(hunter['level'])
+        # Find the item in the shop catalog (by id, name or alias)
+        entry = self.item_index.resolve(item_name)
         item_found = None
         item_data = None
         
-        for shop_item_name, shop_item_data in shop_inventory:
-            if shop_item_name.lower() == item_name.lower():
-                item_found = shop_item_name
-                item_data = shop_item_data
-                break
+        if entry and hunter['level'] >= TIER_LEVEL_REQUIREMENTS.get(entry.info.get('tier', 'Common'), 1):
+            item_found = entry.key
+            item_data = entry.info
         
         if not item_found or not item_data:
-            await ctx.send(f"'{item_name}' is not available in the shop!")
+            message = f"'{item_name}' is not available in the shop!"
+            suggestions = [] if entry else self.item_index.suggest(item_name)
+            if suggestions:
+                message += f" Did you mean {', '.join(f'**{s}**' for s in suggestions)}?"
+            await ctx.send(message)
             return
         
         # At this point item_data is guaranteed to be not None
@@ -602,20 +567,8 @@ class Shop(commands.Cog):
         # Purchase the item
         hunter['gold'] -= item_price
         
-        # Add item to inventory with validation
-        if 'inventory' not in hunter:
-            hunter['inventory'] = {}
-        
-        # Add the item to inventory (new structure)
-        if isinstance(hunter['inventory'], list):
-            # Convert old list format to new dict format
-            old_items = hunter['inventory']
-            hunter['inventory'] = {}
-            for item in old_items:
-                hunter['inventory'][item] = hunter['inventory'].get(item, 0) + 1
-        
         # Add the purchased item
-        hunter['inventory'][item_found] = hunter['inventory'].get(item_found, 0) + 1
+        add_item(hunter, item_found)
         
         # Update quest progress for item purchase
         try:
@@ -625,7 +578,7 @@ class Shop(commands.Cog):
             pass
         
         # Save data
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="🛒 Purchase Successful!",
@@ -663,23 +616,10 @@ class Shop(commands.Cog):
             return
         
         hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
-        
-        # Handle both old list format and new dict format
-        if isinstance(inventory, list):
-            # Convert old list format to new dict format
-            old_items = inventory
-            inventory = {}
-            for item in old_items:
-                inventory[item] = inventory.get(item, 0) + 1
-            hunter['inventory'] = inventory
-        
-        # Find item in inventory (case insensitive)
-        item_found = None
-        for item in inventory.keys():
-            if item.lower() == item_name.lower():
-                item_found = item
-                break
+        inventory = get_inventory(hunter)
+        
+        # Find item in inventory (case insensitive, aliases allowed)
+        item_found = find_inventory_key(inventory, item_name, self.item_index)
         
         if not item_found or inventory.get(item_found, 0) <= 0:
             await ctx.send(f"You don't have '{item_name}' in your inventory!")
@@ -694,10 +634,12 @@ class Shop(commands.Cog):
         
         if not item_data:
             # Try to get from local shop data as fallback
-            for category, items in self.items_data.items():
-                if item_found in items:
-                    item_data = items[item_found]
-                    break
+            item_data = self.item_index.get_info(item_found)
+        
+        if not item_data:
+            # Uncatalogued items carry their own properties
+            entries = inventory_entries(hunter, keys=[item_found])
+            item_data = entries[0].info if entries and entries[0].info else None
         
         if not item_data:
             await ctx.send("Item data not found!")
@@ -708,13 +650,11 @@ class Shop(commands.Cog):
         sell_price = max(1, original_price // 2)
         
         # Remove one item from inventory and add gold
-        inventory[item_found] -= 1
-        if inventory[item_found] <= 0:
-            del inventory[item_found]
+        remove_item(hunter, item_found)
         
         hunter['gold'] = hunter.get('gold', 0) + sell_price
         
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         from utils.theme_utils import get_user_theme_colors
         colors = get_user_theme_colors(ctx.author.id)
@@ -1,39 +1,22 @@
 import discord
 from discord.ext import commands
-import json
 from datetime import datetime
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.inventory_model import get_inventory, remove_item
 
 class SpecialQuests(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     @commands.command(name='special_quests', aliases=['special'])
     async def show_special_quests(self, ctx):
         """Display special quests based on owned keys"""
         user_id = str(ctx.author.id)
         
-        # Check if player is resting
-        from main import check_if_resting
-        is_resting, rest_message = check_if_resting(user_id)
-        if is_resting:
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, rest_message)
-            await ctx.send(embed=embed)
-            return
-        
         hunters_data = self.load_hunters_data()
         
         if user_id not in hunters_data:
@@ -43,7 +26,7 @@ class SpecialQuests(commands.Cog):
             return
         
         hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
+        inventory = get_inventory(hunter)
         
         # Get available keys
         special_keys = ["Shadow Realm Key", "Demon Castle Key", "Ice Monarch Key"]
@@ -128,15 +111,6 @@ class SpecialQuests(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Check if player is resting
-        from main import check_if_resting
-        is_resting, rest_message = check_if_resting(user_id)
-        if is_resting:
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, rest_message)
-            await ctx.send(embed=embed)
-            return
-        
         hunters_data = self.load_hunters_data()
         
         if user_id not in hunters_data:
@@ -145,67 +119,64 @@ class SpecialQuests(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        hunter = hunters_data[user_id]
-        inventory = hunter.get('inventory', {})
-        
-        # Get available keys
-        special_keys = ["Shadow Realm Key", "Demon Castle Key", "Ice Monarch Key"]
-        owned_keys = [key for key in special_keys if inventory.get(key, 0) > 0]
-        
-        # Get available special quests
-        from daily_quest_system import get_available_special_quests
-        available_quests = get_available_special_quests(owned_keys)
-        
-        # Find the quest by name
-        target_quest = None
-        quest_id = None
-        for qid, quest in available_quests.items():
-            if quest['name'].lower() == quest_name.lower():
-                target_quest = quest
-                quest_id = qid
-                break
-        
-        if not target_quest:
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, f"Quest '{quest_name}' not found or you don't have the required key!")
-            await ctx.send(embed=embed)
-            return
-        
-        # Check if already completed
-        quests = hunter.get('quests', {})
-        special_quests = quests.get('special', {})
-        
-        if quest_id in special_quests and special_quests[quest_id].get('completed', False):
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, "You have already completed this special quest!")
-            await ctx.send(embed=embed)
-            return
-        
-        # Consume the key
-        required_key = target_quest['required_key']
-        inventory[required_key] = inventory.get(required_key, 0) - 1
-        if inventory[required_key] <= 0:
-            del inventory[required_key]
-        
-        # Complete the quest automatically (special quests are instant completion)
-        special_quests[quest_id] = {
-            'name': target_quest['name'],
-            'description': target_quest['description'],
-            'type': target_quest['type'],
-            'reward_gold': target_quest['reward_gold'],
-            'reward_exp': target_quest['reward_exp'],
-            'special_reward': target_quest['special_reward'],
-            'completed': True,
-            'claimed': False
-        }
-        
-        # Update hunter data
-        if 'quests' not in hunter:
-            hunter['quests'] = {}
-        hunter['quests']['special'] = special_quests
-        hunter['inventory'] = inventory
-        
-        self.save_hunters_data(hunters_data)
+        async with hunter_store.transaction(user_id) as hunter:
+            inventory = get_inventory(hunter)
+        
+            # Get available keys
+            special_keys = ["Shadow Realm Key", "Demon Castle Key", "Ice Monarch Key"]
+            owned_keys = [key for key in special_keys if inventory.get(key, 0) > 0]
+        
+            # Get available special quests
+            from daily_quest_system import get_available_special_quests
+            available_quests = get_available_special_quests(owned_keys)
+        
+            # Find the quest by name
+            target_quest = None
+            quest_id = None
+            for qid, quest in available_quests.items():
+                if quest['name'].lower() == quest_name.lower():
+                    target_quest = quest
+                    quest_id = qid
+                    break
+        
+            if not target_quest:
+                from utils.theme_utils import get_error_embed
+                embed = get_error_embed(ctx.author.id, f"Quest '{quest_name}' not found or you don't have the required key!")
+                hunter_store.after_commit(user_id, ctx.send, embed=embed)
+                return
+        
+            # Check if already completed
+            quests = hunter.get('quests', {})
+            special_quests = quests.get('special', {})
+        
+            if quest_id in special_quests and special_quests[quest_id].get('completed', False):
+                from utils.theme_utils import get_error_embed
+                embed = get_error_embed(ctx.author.id, "You have already completed this special quest!")
+                hunter_store.after_commit(user_id, ctx.send, embed=embed)
+                return
+        
+            # Consume the key
+            required_key = target_quest['required_key']
+            remove_item(hunter, required_key)
+        
+            # Complete the quest automatically (special quests are instant completion)
+            special_quests[quest_id] = {
+                'name': target_quest['name'],
+                'description': target_quest['description'],
+                'type': target_quest['type'],
+                'reward_gold': target_quest['reward_gold'],
+                'reward_exp': target_quest['reward_exp'],
+                'special_reward': target_quest['special_reward'],
+                'completed': True,
+                'claimed': False
+            }
+        
+            # Update hunter data
+            if 'quests' not in hunter:
+                hunter['quests'] = {}
+            hunter['quests']['special'] = special_quests
+        
+            hunter_store.mark_dirty(user_id)
         
         # Create success embed
         from utils.theme_utils import get_user_theme_colors
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-import json
+from utils.hunter_store import hunter_store, load_hunters_data
 
 class Themes(commands.Cog):
     def __init__(self, bot):
@@ -63,17 +63,8 @@ class Themes(commands.Cog):
         }
     
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
     def get_user_theme(self, user_id):
         """Get user's selected theme or default"""
@@ -144,7 +135,7 @@ class Themes(commands.Cog):
             return
         
         hunters_data[user_id]['theme'] = theme_name
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         theme = self.default_themes[theme_name]
         embed = discord.Embed(
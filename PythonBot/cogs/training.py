@@ -1,27 +1,27 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import time
 from datetime import datetime, timedelta
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.scheduler import scheduler
+from utils.activity import activities, TRAINING
 
 class Training(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.training_sessions = {}  # Track active training sessions
+        # Track active training sessions; kept by the scheduler so they survive restarts
+        self.training_sessions = scheduler.table('training', deadline_key='end_time')
+        # Sessions restored from disk lock their hunters out again until they end
+        for user_id in self.training_sessions:
+            session = self.training_sessions[user_id]
+            remaining = session['end_time'] - time.time()
+            if remaining > 0:
+                activities.begin(user_id, TRAINING, 'Training', remaining, session)
 
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
 
     def get_training_cost(self, stat_level, training_type):
         """Calculate training cost based on current stat level"""
@@ -135,27 +135,34 @@ class Training(commands.Cog):
             return
 
         training_type = training_type.lower()
-        hunter = hunters_data[user_id]
-        
-        current_stat = hunter.get(training_type, 10)
-        cost = self.get_training_cost(current_stat, training_type)
-        duration = self.get_training_duration(training_type)
+        async with hunter_store.transaction(user_id) as hunter:
+            current_stat = hunter.get(training_type, 10)
+            cost = self.get_training_cost(current_stat, training_type)
+            duration = self.get_training_duration(training_type)
         
-        if hunter.get('gold', 0) < cost:
-            await ctx.send(f"Not enough gold! Training {training_type} costs {cost} gold.")
-            return
+            if hunter.get('gold', 0) < cost:
+                hunter_store.after_commit(user_id, ctx.send, f"Not enough gold! Training {training_type} costs {cost} gold.")
+                return
+
+            # Training locks out every other activity, so it cannot start during one
+            activity = activities.current(user_id)
+            if activity is not None:
+                hunter_store.after_commit(user_id, ctx.send, activities.busy_message(activity))
+                return
 
-        # Deduct cost and start training
-        hunter['gold'] = hunter.get('gold', 0) - cost
+            # Deduct cost and start training
+            hunter['gold'] = hunter.get('gold', 0) - cost
         
-        # Add training session
-        self.training_sessions[user_id] = {
-            'type': training_type,
-            'end_time': time.time() + duration,
-            'hunter_level': hunter['level']
-        }
+            # Add training session
+            session = {
+                'type': training_type,
+                'end_time': time.time() + duration,
+                'hunter_level': hunter['level']
+            }
+            self.training_sessions[user_id] = session
+            activities.begin(user_id, TRAINING, 'Training', duration, session)
         
-        self.save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
         
         from utils.theme_utils import get_user_theme_colors
         colors = get_user_theme_colors(ctx.author.id)
@@ -195,20 +202,22 @@ class Training(commands.Cog):
         
         if remaining <= 0:
             # Training completed, award stats
-            hunters_data = self.load_hunters_data()
-            hunter = hunters_data[user_id]
+            async with hunter_store.transaction(user_id) as hunter:
+                # Another .training may have awarded this session while we waited
+                if self.training_sessions.get(user_id) is not session:
+                    return
             
-            stat_gain = self.get_stat_gain(session['hunter_level'], session['type'])
-            old_stat = hunter.get(session['type'], 10)
-            hunter[session['type']] = old_stat + stat_gain
+                stat_gain = self.get_stat_gain(session['hunter_level'], session['type'])
+                old_stat = hunter.get(session['type'], 10)
+                hunter[session['type']] = old_stat + stat_gain
             
-            # Update total stats for power calculation
-            if 'total_stats_gained' not in hunter:
-                hunter['total_stats_gained'] = 0
-            hunter['total_stats_gained'] += stat_gain
+                # Update total stats for power calculation
+                if 'total_stats_gained' not in hunter:
+                    hunter['total_stats_gained'] = 0
+                hunter['total_stats_gained'] += stat_gain
             
-            self.save_hunters_data(hunters_data)
-            del self.training_sessions[user_id]
+                hunter_store.mark_dirty(user_id)
+                del self.training_sessions[user_id]
             
             embed = discord.Embed(
                 title="🎉 Training Complete!",
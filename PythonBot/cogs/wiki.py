@@ -1,8 +1,8 @@
 import discord
 from discord.ext import commands
-import json
 import random
 from typing import Dict, List, Optional
+from utils.game_data import game_data
 
 class WikiView(discord.ui.View):
     """Interactive wiki navigation view"""
@@ -164,16 +164,15 @@ class Wiki(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.wiki_data = self.load_wiki_data()
+    
+    @property
+    def wiki_data(self) -> dict:
+        """Current wiki entries (follows hot reloads of data/wiki_data.json)"""
+        return self.load_wiki_data()
     
     def load_wiki_data(self) -> dict:
         """Load wiki data from JSON file"""
-        try:
-            with open('data/wiki_data.json', 'r') as f:
-                data = json.load(f)
-                return data.get('wiki_entries', {})
-        except FileNotFoundError:
-            return {}
+        return game_data.wiki_entries()
     
     @commands.command(name='wiki', aliases=['w', 'lore'])
     async def wiki_command(self, ctx, *, search_term: str = None):
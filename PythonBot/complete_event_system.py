@@ -3,7 +3,6 @@
 
 import discord
 from discord.ext import commands, tasks
-import json
 import asyncio
 import random
 import time
@@ -335,10 +334,10 @@ async def setup(bot):
 
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
 from datetime import datetime, timedelta
+from utils.hunter_store import hunter_store, load_hunters_data
 
 class EventBossCombatView(discord.ui.View):
     """Interactive combat view for event boss encounters"""
@@ -478,7 +477,7 @@ class EventJoinView(discord.ui.View):
             hunter['in_battle'] = True
             hunter['battle_type'] = 'event_boss'
             hunter['event_id'] = self.event_id
-            self.event_cog.save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
             
             await interaction.followup.send(
                 f"You have joined the **{boss_data['name']}** event! You now have access to {self.event_channel.mention}",
@@ -513,21 +512,9 @@ class EventBosses(commands.Cog):
         self.active_events = {}  # Track active event boss encounters
         
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        try:
-            with open('hunters_data.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving hunters data: {e}")
-
     async def start_event_boss_encounter(self, ctx, boss_data):
         """Start an event boss encounter with private channels and auto-deletion"""
         try:
@@ -7,18 +7,10 @@ import asyncio
 import time
 from datetime import datetime, timedelta
 from utils.leveling_system import award_exp, send_level_up_notification, leveling_system
+from utils.hunter_store import hunter_store, load_hunters_data, save_hunters_data
 from utils.theme_utils import get_user_theme_colors, get_error_embed, get_info_embed, create_progress_bar
 from ui_elements import HelpView, StatusView, CombatView
 
-# Custom JSON encoder to handle Discord objects
-class CustomEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, discord.Colour):
-            return o.value  # Convert discord.Colour to its integer value
-        if isinstance(o, discord.Color):
-            return o.value  # Convert discord.Color to its integer value
-        return json.JSONEncoder.default(self, o)
-
 # Load environment variables
 load_dotenv()
 
@@ -49,29 +41,6 @@ active_event_battles = {}  # Stores event boss encounters with shared combat sta
 
 bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents, help_command=None)
 
-# Load or create hunters data
-def load_hunters_data():
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data(data):
-    """Save hunter data to JSON file using CustomEncoder for Discord objects"""
-    try:
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4, cls=CustomEncoder)
-    except Exception as e:
-        print(f"Error saving hunters_data.json: {e}")
-        # Create backup if save fails
-        try:
-            with open('hunters_data_backup.json', 'w') as backup_f:
-                json.dump(data, backup_f, indent=4, cls=CustomEncoder)
-            print("Data saved to backup file instead")
-        except Exception as backup_e:
-            print(f"Failed to create backup: {backup_e}")
-
 def load_monster_data():
     """Load monster data from JSON file"""
     try:
@@ -541,7 +510,7 @@ async def start(ctx):
     }
     
     hunters_data[user_id] = new_hunter
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     # Send welcome message with embed
     embed = discord.Embed(
@@ -662,7 +631,7 @@ async def status(ctx):
     
     # Save the updated data
     hunters_data[user_id] = hunter
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     # Get user theme colors
     colors = get_user_theme_colors(user_id)
@@ -850,7 +819,7 @@ async def rest(ctx):
     rest_cooldowns[user_id] = time.time()
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     # Send completion message
     complete_embed = discord.Embed(
@@ -938,7 +907,7 @@ async def hunt(ctx):
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     # Create combat view with buttons
     view = CombatView(bot, user_id, monster)
@@ -1084,7 +1053,7 @@ async def attack(ctx):
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     await send_combat_message(ctx, embed, "⚔️ Combat in progress!")
 
@@ -1161,7 +1130,7 @@ async def defend(ctx):
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     await send_combat_message(ctx, embed, "🛡️ Defending in combat!")
 
@@ -1231,7 +1200,7 @@ async def flee(ctx):
             embed.color = discord.Color.dark_red()
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     await send_combat_message(ctx, embed, "🏃 Fleeing from combat!")
 
@@ -1423,7 +1392,7 @@ async def set_jinwoo(ctx, target: discord.Member = None):
     }
     
     hunters_data[user_id] = jinwoo_stats
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     embed = discord.Embed(
         title="👑 Sung Jin-Woo Awakened!",
@@ -1498,7 +1467,7 @@ async def set_level(ctx, user_id: str, level: int):
     else:
         hunter['rank'] = 'E'
     
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     # Get the user object for display
     user = bot.get_user(int(user_id))
@@ -1990,7 +1959,7 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dungeon_cog):
@@ -2075,7 +2044,7 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_gate_battle_defend(ctx, user_id, hunter, hunters_data):
@@ -2125,7 +2094,7 @@ async def handle_gate_battle_defend(ctx, user_id, hunter, hunters_data):
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dungeon_cog):
@@ -2174,7 +2143,7 @@ async def handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dunge
     )
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_gate_battle_flee(ctx, user_id, hunter, hunters_data):
@@ -2218,7 +2187,7 @@ async def handle_gate_battle_flee(ctx, user_id, hunter, hunters_data):
             embed.color = discord.Color.dark_red()
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon_cog):
@@ -2260,7 +2229,7 @@ async def handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon
             embed.color = discord.Color.dark_red()
     
     # Save data
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 async def handle_event_battle_attack(ctx, user_id, hunter, hunters_data):
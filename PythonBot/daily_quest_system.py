@@ -335,17 +335,8 @@ def add_dungeon_key_drop(hunter_data, hunter_rank):
     
     if random.random() < drop_chance:
         key = random.choice(available_keys)
-        inventory = hunter_data.get('inventory', {})
-        
-        # Ensure inventory is in dictionary format
-        if isinstance(inventory, list):
-            old_items = inventory
-            inventory = {}
-            for item in old_items:
-                inventory[item] = inventory.get(item, 0) + 1
-        
-        inventory[key] = inventory.get(key, 0) + 1
-        hunter_data['inventory'] = inventory
+        from utils.inventory_model import add_item
+        add_item(hunter_data, key)
         return key
     
     return None
\ No newline at end of file
@@ -52,6 +52,25 @@ function loadGameData(filename) {
     }
 }
 
+// Leaderboard snapshot the bot keeps up to date (utils/leaderboard.py)
+function loadLeaderboard() {
+    try {
+        const data = fs.readFileSync(path.join(__dirname, '..', 'leaderboard.json'), 'utf8');
+        return JSON.parse(data);
+    } catch (error) {
+        return null;
+    }
+}
+
+// Statistics from the bot's snapshot, computed from scratch only when there is none
+function getStats(huntersData) {
+    const leaderboard = loadLeaderboard();
+    if (leaderboard && leaderboard.stats) {
+        return leaderboard.stats;
+    }
+    return calculateStats(huntersData);
+}
+
 // Calculate hunter statistics
 function calculateStats(huntersData) {
     const hunters = Object.values(huntersData);
@@ -99,7 +118,7 @@ function calculateStats(huntersData) {
 app.get('/', (req, res) => {
     try {
         const huntersData = loadHuntersData();
-        const stats = calculateStats(huntersData);
+        const stats = getStats(huntersData);
         
         // Load game configuration data
         const monstersData = loadGameData('monsters.json');
@@ -165,14 +184,27 @@ app.get('/api/hunters/:userId', (req, res) => {
 // API endpoint to get server statistics
 app.get('/api/stats', (req, res) => {
     try {
-        const huntersData = loadHuntersData();
-        const stats = calculateStats(huntersData);
+        const leaderboard = loadLeaderboard();
+        const stats = leaderboard && leaderboard.stats ? leaderboard.stats : calculateStats(loadHuntersData());
         res.json(stats);
     } catch (error) {
         res.status(500).json({ error: 'Failed to calculate statistics' });
     }
 });
 
+// API endpoint to get one leaderboard (level, exp, gold, pvp_wins, pvp_winrate)
+app.get('/api/leaderboard/:metric', (req, res) => {
+    const leaderboard = loadLeaderboard();
+    if (!leaderboard) {
+        return res.status(503).json({ error: 'Leaderboard not available yet' });
+    }
+    const board = leaderboard.boards[req.params.metric];
+    if (!board) {
+        return res.status(404).json({ error: 'Unknown leaderboard' });
+    }
+    res.json({ metric: req.params.metric, updated_at: leaderboard.updated_at, entries: board });
+});
+
 // API endpoint to update hunter data (admin only)
 app.put('/api/hunters/:userId', (req, res) => {
     try {
@@ -1,24 +1,34 @@
 import discord
 from discord.ext import commands
-import json
 import os
 from dotenv import load_dotenv
 import asyncio
 import time
 from datetime import datetime, timedelta
 from utils.leveling_system import award_exp, send_level_up_notification, leveling_system
+from utils.hunter_store import hunter_store, load_hunters_data, save_hunters_data
+from utils.game_data import game_data
+from utils.item_index import find_inventory_key, get_item_index
+from utils.inventory_model import add_item, get_inventory, migrate_inventories, remove_item
+from utils.spawn_tables import spawn_monster
+from utils.role_sync import role_sync
+from utils.channel_pool import combat_channels
+from utils.leaderboard import METRICS, leaderboards, resolve_metric
+from utils.notifications import notifications, NOTIFY_MODES, get_notify_mode
+from utils.startup import startup
+from utils.scheduler import scheduler
+from utils.ability_cooldowns import ability_cooldowns
+from utils.activity import activities, ActivityBusy, BATTLE_FIELDS, COMBAT, EXPLORATION, HUNT, REST
+from utils.vitals import vitals
+from utils.derived_stats import derived_stats
+from utils.combat_engine import (
+    ATTACK, DEFEND, FLEE, WAIT, PLAYER, ENEMY, HIT, HEAL, GUARD, ESCAPE, ESCAPE_FAILED, VICTORY, DEFEAT, ESCAPED,
+    Action, Combatant, CombatState, resolve_turn, damage_dealt, find_event,
+    HUNT_RULES, COMMAND_HUNT_RULES, FLOOR_RULES, EVENT_BATTLE_RULES,
+)
 from utils.theme_utils import get_user_theme_colors, get_error_embed, get_info_embed, create_progress_bar
 from ui_elements import HelpView, StatusView, CombatView
 
-# Custom JSON encoder to handle Discord objects
-class CustomEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, discord.Colour):
-            return o.value  # Convert discord.Colour to its integer value
-        if isinstance(o, discord.Color):
-            return o.value  # Convert discord.Color to its integer value
-        return json.JSONEncoder.default(self, o)
-
 # Load environment variables
 load_dotenv()
 
@@ -31,75 +41,31 @@ intents.reactions = True  # Enable reaction intent for events
 
 # System message configuration
 # SYSTEM_CHANNEL_ID = 1381439963656355849  # announcements channel for system messages
-COMBAT_CATEGORY_ID = 1382846867418775552  # Category for temporary combat channels
 # PRIVATE_EVENT_CATEGORY_ID = 1382846867418775552  # New category for private event channels
 
 # Global variables
 active_battles = {}
-interactive_battles = {}  # Track interactive button-based battles
-rest_cooldowns = {}  # Track rest command cooldowns (1 minute 30 second cooldown)
-resting_players = {}  # Track players currently resting (90 second resting period)
+interactive_battles = activities.view(HUNT, 'main')  # Track interactive button-based battles
+rest_cooldowns = scheduler.table('rest_cooldown')  # Track rest command cooldowns (5 minute cooldown)
+resting_players = scheduler.table('rest')  # Rest periods, kept so a restart mid-rest still locks the hunter out
 mini_boss_events = {}  # Track active mini boss events
 mystery_gates = {}  # Track ??? gates based on daily kills
 hunt_cooldowns = {}  # Track hunt command cooldowns to prevent spam
 last_hunt_completion = {}  # Track last hunt completion time
-player_combat_channels = {}  # Track active combat channels for each player
-channel_creation_locks = {}  # Track channel creation locks to prevent race conditions
 active_event_battles = {}  # Stores event boss encounters with shared combat state
 
 bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents, help_command=None)
-
-# Load or create hunters data
-def load_hunters_data():
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data(data):
-    """Save hunter data to JSON file using CustomEncoder for Discord objects"""
-    try:
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4, cls=CustomEncoder)
-    except Exception as e:
-        print(f"Error saving hunters_data.json: {e}")
-        # Create backup if save fails
-        try:
-            with open('hunters_data_backup.json', 'w') as backup_f:
-                json.dump(data, backup_f, indent=4, cls=CustomEncoder)
-            print("Data saved to backup file instead")
-        except Exception as backup_e:
-            print(f"Failed to create backup: {backup_e}")
-
-def load_monster_data():
-    """Load monster data from JSON file"""
-    try:
-        with open('data/monsters.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("[ERROR] data/monsters.json not found")
-        return {}
-    except json.JSONDecodeError:
-        print("[ERROR] Invalid JSON in monsters.json")
-        return {}
+role_sync.attach(bot)
+combat_channels.attach(bot)
+leaderboards.attach(bot)
+startup.attach(bot)
+vitals.attach(bot)
+bot.add_check(activities.command_check)
 
 def select_random_monster(hunter_rank):
     """Select a random monster based on hunter rank"""
-    import random
-    
-    monster_data = load_monster_data()
-    monsters = monster_data.get('monsters', {})
-    
-    available_monsters = monsters.get(hunter_rank, [])
-    if not available_monsters:
-        # Fallback to E-Rank if rank not found
-        available_monsters = monsters.get('E-Rank', [])
-    
-    if available_monsters:
-        monster = random.choice(available_monsters).copy()
-        monster['max_hp'] = monster['hp']
-        monster['current_hp'] = monster['hp']
+    monster = spawn_monster(hunter_rank)
+    if monster is not None:
         return monster
     
     # Emergency fallback
@@ -117,37 +83,89 @@ def select_random_monster(hunter_rank):
         "rarity": "common"
     }
 
+def play_battle_turn(hunter, battle, action, rules, defense):
+    """Resolve one command-driven turn (hunt, gate or dungeon floor) and write HP back.
+    
+    ``defense`` is what the mode lets the hunter block with; a defending
+    hunter always guards with agility + intelligence // 2.
+    """
+    monster = battle['monster']
+    player = Combatant(
+        hunter.get('name', 'Hunter'), hunter['hp'], hunter.get('max_hp', 100), hunter['strength'],
+        defense=defense,
+        guard=hunter['agility'] + hunter['intelligence'] // 2,
+        flee_chance=min(0.9, 0.5 + hunter['agility'] * 0.02),
+    )
+    enemy = Combatant(monster['name'], battle['monster_hp'], monster['hp'], monster['attack'], monster.get('defense', 0))
+    state, events = resolve_turn(CombatState(player, enemy), Action(action), rules)
+    hunter['hp'] = state.player.hp
+    battle['monster_hp'] = state.enemy.hp
+    return state, events
+
 async def process_interactive_combat(ctx, user_id, hunter, monster, combat_view):
     """Process interactive combat turn"""
-    import random
     import time
     
-    hunters_data = load_hunters_data()
     colors = get_user_theme_colors(user_id)
     turn_info = ""
     combat_ended = False
     
-    # Process player action
-    if combat_view.player_action == "attack":
-        # Calculate player damage using strength as attack stat
-        base_attack = hunter.get('strength', 10)
-        player_damage = max(1, base_attack + random.randint(-5, 5) - monster.get('defense', 0))
-        monster['current_hp'] = max(0, monster['current_hp'] - player_damage)
-        turn_info += f"⚔️ You deal {player_damage} damage!\n"
-        
-        if monster['current_hp'] <= 0:
+    # Apply the turn to the live record under the hunter's lock so concurrent
+    # button clicks and award_exp cannot overwrite each other
+    async with hunter_store.transaction(user_id) as live_hunter:
+        if live_hunter is not None:
+            hunter = live_hunter
+        
+        # Items are used before the exchange so a potion can still save you from the hit
+        if combat_view.player_action == "use_item":
+            # Process item usage
+            if combat_view.item_used:
+                # Remove item from inventory
+                used_key = find_inventory_key(get_inventory(hunter), combat_view.item_used, get_item_index())
+                if used_key is not None:
+                    remove_item(hunter, used_key)
+                
+                    # Apply item effect (health potion example)
+                    if 'health' in combat_view.item_used.lower():
+                        heal_amount = 50
+                        old_hp = hunter['hp']
+                        hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + heal_amount)
+                        actual_heal = hunter['hp'] - old_hp
+                        turn_info += f"💊 Used {combat_view.item_used}! Restored {actual_heal} HP\n"
+                else:
+                    turn_info += f"❌ {combat_view.item_used} not found in inventory!\n"
+        
+        action = {"attack": ATTACK, "defend": DEFEND, "flee": FLEE}.get(combat_view.player_action, WAIT)
+        player = Combatant(hunter.get('name', 'Hunter'), hunter['hp'], hunter.get('max_hp', 100),
+                           hunter.get('strength', 10), hunter.get('defense', 0), flee_chance=0.6)
+        enemy = Combatant(monster['name'], monster['current_hp'], monster.get('hp', monster['current_hp']),
+                          monster.get('attack', 10), monster.get('defense', 0))
+        state, events = resolve_turn(CombatState(player, enemy), Action(action), HUNT_RULES)
+        hunter['hp'] = state.player.hp
+        monster['current_hp'] = state.enemy.hp
+        
+        for event in events:
+            if event.kind == HIT and event.actor == PLAYER:
+                turn_info += f"⚔️ You deal {event.amount} damage!\n"
+            elif event.kind == GUARD:
+                turn_info += f"🛡️ You raised your shield to defend!\n"
+            elif event.kind == ESCAPE:
+                turn_info += f"🏃 You successfully fled the battle and escaped to safety!\n"
+            elif event.kind == ESCAPE_FAILED:
+                turn_info += f"❌ You attempted to flee, but the {monster['name']} blocked your path!\n"
+            elif event.kind == HIT:
+                turn_info += f"💥 {monster['name']} attacks for {event.amount} damage!\n"
+        
+        if state.outcome == VICTORY:
             # Monster defeated
             exp_gained = monster['exp_reward']
             gold_gained = monster['gold_reward']
             
             # Award experience and update hunter
             level_data = await award_exp(user_id, exp_gained, bot)
-            hunters_data = load_hunters_data()
-            hunter = hunters_data[user_id]
             
             # Award gold
             hunter['gold'] = hunter.get('gold', 0) + gold_gained
-            save_hunters_data(hunters_data)
             
             # Update daily kills for mystery gate access
             update_daily_kills(hunter)
@@ -156,7 +174,6 @@ async def process_interactive_combat(ctx, user_id, hunter, monster, combat_view)
             try:
                 from daily_quest_system import update_quest_progress
                 update_quest_progress(hunter, "kill_monsters", 1)
-                save_hunters_data(hunters_data)
             except Exception as e:
                 print(f"Error updating quest progress: {e}")
             
@@ -203,74 +220,16 @@ async def process_interactive_combat(ctx, user_id, hunter, monster, combat_view)
             
             combat_ended = True
             
-    elif combat_view.player_action == "defend":
-        turn_info += f"🛡️ You raised your shield to defend!\n"
-        
-        # Apply defense logic with damage reduction
-        base_monster_damage = monster.get('damage', 20)
-        defense_multiplier = 0.5  # 50% damage reduction when defending
-        final_monster_damage = int(base_monster_damage * defense_multiplier)
-        
-        turn_info += f"👹 The {monster['name']} attacked you for {final_monster_damage} damage (reduced by defense)!\n"
-        
-    elif combat_view.player_action == "flee":
-        import random
-        
-        # 60% chance to successfully flee
-        if random.random() < 0.6:
-            turn_info += f"🏃 You successfully fled the battle and escaped to safety!\n"
+        elif state.outcome == ESCAPED:
             combat_ended = True
-        else:
-            turn_info += f"❌ You attempted to flee, but the {monster['name']} blocked your path!\n"
-            
-            # Monster gets a free attack when flee fails
-            base_monster_damage = monster.get('damage', 20)
-            turn_info += f"👹 The {monster['name']} attacked you for {base_monster_damage} damage!\n"
         
-    elif combat_view.player_action == "use_item":
-        # Process item usage
-        if combat_view.item_used:
-            hunters_data = load_hunters_data()
-            hunter = hunters_data[user_id]
-            
-            # Remove item from inventory
-            inventory = hunter.get('inventory', [])
-            if combat_view.item_used in inventory:
-                inventory.remove(combat_view.item_used)
-                
-                # Apply item effect (health potion example)
-                if 'health' in combat_view.item_used.lower():
-                    heal_amount = 50
-                    old_hp = hunter['hp']
-                    hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + heal_amount)
-                    actual_heal = hunter['hp'] - old_hp
-                    turn_info += f"💊 Used {combat_view.item_used}! Restored {actual_heal} HP\n"
-                
-                save_hunters_data(hunters_data)
-            else:
-                turn_info += f"❌ {combat_view.item_used} not found in inventory!\n"
-    
-    # Monster's turn (if combat continues and player didn't flee)
-    if not combat_ended and combat_view.player_action != "flee":
-        monster_damage = max(1, monster.get('attack', 10) + random.randint(-3, 3) - hunter.get('defense', 0))
-        
-        # Reduce damage if player defended
-        if combat_view.player_action == "defend":
-            monster_damage = max(1, monster_damage // 2)
-        
-        hunter['hp'] = max(0, hunter['hp'] - monster_damage)
-        turn_info += f"💥 {monster['name']} attacks for {monster_damage} damage!\n"
-        
-        # Check if player is defeated
-        if hunter['hp'] <= 0:
+        elif state.outcome == DEFEAT:
             turn_info += f"💀 **You have been defeated by {monster['name']}!**\n"
             turn_info += f"⚰️ You will respawn in 3 minutes..."
             
             # Set respawn timer
             hunter['death_time'] = time.time()
             hunter['hp'] = 1  # Prevent negative HP
-            
-            save_hunters_data(hunters_data)
             combat_ended = True
     
     # Update combat embed
@@ -294,14 +253,9 @@ async def process_interactive_combat(ctx, user_id, hunter, monster, combat_view)
         if monster['current_hp'] <= 0 and 'victory_embed' in locals():
             try:
                 # Send victory message only to private combat channel
-                user_id = str(ctx.author.id)
-                if user_id in player_combat_channels:
-                    channel_id = player_combat_channels[user_id]
-                    if isinstance(channel_id, str):
-                        channel_id = int(channel_id)
-                    private_channel = bot.get_channel(channel_id)
-                    if private_channel:
-                        await private_channel.send(embed=victory_embed)
+                private_channel = combat_channels.get(ctx.author.id)
+                if private_channel:
+                    await private_channel.send(embed=victory_embed)
                 # No fallback to original channel - victory only in private arena
             except Exception as e:
                 print(f"[ERROR] Failed to send victory message to private channel: {e}")
@@ -320,105 +274,14 @@ async def process_interactive_combat(ctx, user_id, hunter, monster, combat_view)
             
         return False
 
-# Load or create combat channels data
-def load_combat_channels():
-    try:
-        with open('data/combat_channels.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_combat_channels():
-    os.makedirs('data', exist_ok=True)
-    with open('data/combat_channels.json', 'w') as f:
-        json.dump(player_combat_channels, f, indent=4)
-
-async def create_private_combat_channel(ctx):
-    """Create a private temporary combat channel for a player"""
-    try:
-        user = ctx.author
-        guild = ctx.guild
-        COMBAT_CATEGORY_ID = 1382846867418775552
-        
-        # Try to get category with fallback
-        category = discord.utils.get(guild.categories, id=COMBAT_CATEGORY_ID)
-        
-        if category is None:
-            try:
-                fetched_channel = await bot.fetch_channel(COMBAT_CATEGORY_ID)
-                if isinstance(fetched_channel, discord.CategoryChannel):
-                    category = fetched_channel
-            except Exception as e:
-                print(f"[ERROR] Failed to fetch category: {e}")
-                return None
-        
-        if category is None:
-            print(f"[ERROR] Category {COMBAT_CATEGORY_ID} not found")
-            return None
-        
-        # Create permission overwrites
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(view_channel=False),
-            user: discord.PermissionOverwrite(view_channel=True, send_messages=True),
-            guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True)
-        }
-        
-        # Add moderator permissions if needed
-        for role in guild.roles:
-            if any(perm_name in role.name.lower() for perm_name in ['mod', 'admin', 'staff']):
-                overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
-        
-        # Clean username for channel name with possessive format
-        username = user.display_name
-        # Remove problematic characters but keep spaces for natural naming
-        import re
-        username = re.sub(r'[^\w\s\-]', '', username)
-        if len(username) > 20:
-            username = username[:20]
-        channel_name = f"{username}'s Private adventure"
-        
-        print(f"[DEBUG] Creating channel for {user.display_name} in category: {category.name if category else 'None'}")
-        
-        # Create the combat channel
-        combat_channel = await guild.create_text_channel(
-            name=channel_name,
-            category=category,
-            overwrites=overwrites,
-            topic=f"Private combat arena for {user.display_name}.",
-            reason=f"Created by bot for private combat session."
-        )
-        
-        # Store channel for potential cleanup
-        if not hasattr(bot, 'temp_combat_channels'):
-            bot.temp_combat_channels = set()
-        bot.temp_combat_channels.add(combat_channel.id)
-        
-        return combat_channel
-        
-    except discord.Forbidden:
-        print(f"[ERROR] Missing permissions to create the channel.")
-        try:
-            await user.send("❌ I don't have permission to create your private combat channel. Please notify a server admin.")
-        except:
-            pass
-        return None
-    except Exception as e:
-        print(f"[ERROR] Failed to create private combat channel: {e}")
-        return None
-
 async def send_system_message(embed, channel_override=None, user_id=None):
     """Send system messages to designated channel, or private combat channel if user_id provided"""
     # If user_id provided, try to send to their private combat channel
     if user_id:
-        user_key = str(user_id)
-        if user_key in player_combat_channels:
-            channel_id = player_combat_channels[user_key]
-            if isinstance(channel_id, str):
-                channel_id = int(channel_id)
-            private_channel = bot.get_channel(channel_id)
-            if private_channel:
-                await private_channel.send(embed=embed)
-                return
+        private_channel = combat_channels.get(user_id)
+        if private_channel:
+            await private_channel.send(embed=embed)
+            return
     
     # Fallback to system channel or override
     target_channel = bot.get_channel(SYSTEM_CHANNEL_ID)
@@ -428,226 +291,117 @@ async def send_system_message(embed, channel_override=None, user_id=None):
         await channel_override.send(embed=embed)
 
 async def create_combat_channel(user):
-    """Create a persistent private combat channel for a player"""
-    guild = user.guild
-    user_key = str(user.id)
-    
-    # Define the combat category ID
-    COMBAT_CATEGORY_ID = 1382846867418775552
-    
-    # Prevent race conditions with async lock
-    if user_key in channel_creation_locks:
-        # Wait for existing channel creation to complete
-        while user_key in channel_creation_locks:
-            await asyncio.sleep(0.1)
-        # Check again if channel was created while waiting
-        if user_key in player_combat_channels:
-            channel_id = player_combat_channels[user_key]
-            if isinstance(channel_id, str):
-                channel_id = int(channel_id)
-            existing_channel = bot.get_channel(channel_id)
-            if existing_channel:
-                return existing_channel
-    
-    # Set lock to prevent duplicate creation
-    channel_creation_locks[user_key] = True
-    
-    try:
-        # Check if player already has a combat channel
-        if user_key in player_combat_channels:
-            channel_id = player_combat_channels[user_key]
-            
-            # Ensure channel_id is an integer
-            if isinstance(channel_id, str):
-                channel_id = int(channel_id)
-                
-            existing_channel = bot.get_channel(channel_id)
-            
-            if existing_channel:
-                return existing_channel
-            else:
-                # Channel was deleted externally, remove from tracking and save
-                del player_combat_channels[user_key]
-                save_combat_channels()
-        
-        # Get the combat category
-        category = None
-        try:
-            category_channel = bot.get_channel(COMBAT_CATEGORY_ID)
-            if category_channel and isinstance(category_channel, discord.CategoryChannel):
-                category = category_channel
-            else:
-                print(f"Combat category ID {COMBAT_CATEGORY_ID} not found, creating without category")
-        except Exception as e:
-            print(f"Error getting combat category: {e}")
-        
-        # Create channel with permissions
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(read_messages=False),
-            user: discord.PermissionOverwrite(read_messages=True, send_messages=True),
-            guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
-        }
-        
-        # Add moderator permissions if they exist
-        for role in guild.roles:
-            if any(perm_name in role.name.lower() for perm_name in ['mod', 'admin', 'staff']):
-                overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-        
-        # Use username for permanent adventure channel name
-        username = user.display_name.lower().replace(' ', '-')
-        # Remove special characters and keep alphanumeric and hyphens only
-        import re
-        username = re.sub(r'[^a-z0-9\-]', '', username)
-        # Limit length
-        if len(username) > 20:
-            username = username[:20]
-        channel_name = f"{username}-private-adventure"
-        
-        combat_channel = await guild.create_text_channel(
-            name=channel_name,
-            category=category,
-            overwrites=overwrites,
-            topic=f"Private adventure channel for {user.display_name}. Persistent channel.",
-            reason="Permanent private adventure channel"
-        )
-        
-        # Store the channel for future use
-        player_combat_channels[user_key] = combat_channel.id
-        save_combat_channels()  # Persist the channel data
-        
-        # Send welcome message to the combat channel
-        welcome_embed = discord.Embed(
-            title="🌀 Private Adventure Entrance",
-            description=f"Welcome {user.mention}! You have entered your personal adventure space: **{user.display_name}'s Adventure**",
-            color=discord.Color.purple()
-        )
-        welcome_embed.add_field(
-            name="Adventure Commands",
-            value="Use `.attack`, `.defend`, or `.flee` to battle!\nThis adventure space remains open for future quests.",
-            inline=False
-        )
-        await combat_channel.send("⚔️ Your private adventure has begun. This channel is permanent and tied to your ID.")
-        await combat_channel.send(embed=welcome_embed)
-        
+    """Lease a private adventure channel for a player from the warm channel pool"""
+    newly_opened = combat_channels.get(user.id) is None
+    combat_channel = await combat_channels.lease(user.guild, user.id, [user])
+    if combat_channel is None or not newly_opened:
         return combat_channel
-        
-    except discord.Forbidden:
-        print(f"Failed to create combat channel - missing permissions")
-        return None
-    except Exception as e:
-        print(f"Error creating combat channel: {e}")
-        return None
-    finally:
-        # Always release lock
-        if user_key in channel_creation_locks:
-            del channel_creation_locks[user_key]
+    
+    # Send welcome message to the combat channel
+    welcome_embed = discord.Embed(
+        title="🌀 Private Adventure Entrance",
+        description=f"Welcome {user.mention}! You have entered your personal adventure space: **{user.display_name}'s Adventure**",
+        color=discord.Color.purple()
+    )
+    welcome_embed.add_field(
+        name="Adventure Commands",
+        value="Use `.attack`, `.defend`, or `.flee` to battle!\nThis adventure space stays open while you keep adventuring.",
+        inline=False
+    )
+    await combat_channel.send(f"⚔️ {user.mention} Your private adventure has begun.", embed=welcome_embed)
+    return combat_channel
 
 async def send_combat_completion_message(user_id, victory_data=None):
     """Send completion message to combat channel without deletion"""
-    user_key = str(user_id)
-    if user_key in player_combat_channels:
-        channel_id = player_combat_channels[user_key]
-        channel = bot.get_channel(channel_id)
-        
-        if channel:
-            try:
-                if victory_data:
-                    # Create detailed victory screen with rewards
-                    from utils.theme_utils import get_user_theme_colors
-                    colors = get_user_theme_colors(user_id)
-                    
-                    final_embed = discord.Embed(
-                        title="🎉 Victory Achieved!",
-                        description=f"You have successfully defeated the {victory_data.get('monster_name', 'enemy')}!",
-                        color=discord.Color(colors.get('success', colors['primary']))
+    channel = combat_channels.get(user_id)
+    if channel:
+        try:
+            if victory_data:
+                # Create detailed victory screen with rewards
+                from utils.theme_utils import get_user_theme_colors
+                colors = get_user_theme_colors(user_id)
+                
+                final_embed = discord.Embed(
+                    title="🎉 Victory Achieved!",
+                    description=f"You have successfully defeated the {victory_data.get('monster_name', 'enemy')}!",
+                    color=discord.Color(colors.get('success', colors['primary']))
+                )
+                
+                # Add reward information
+                reward_text = ""
+                if victory_data.get('gold_gained', 0) > 0:
+                    reward_text += f"💰 **{victory_data['gold_gained']:,} Gold**\n"
+                if victory_data.get('exp_gained', 0) > 0:
+                    reward_text += f"⭐ **{victory_data['exp_gained']:,} EXP**\n"
+                
+                if reward_text:
+                    final_embed.add_field(
+                        name="🏆 Battle Rewards",
+                        value=reward_text.strip(),
+                        inline=False
                     )
-                    
-                    # Add reward information
-                    reward_text = ""
-                    if victory_data.get('gold_gained', 0) > 0:
-                        reward_text += f"💰 **{victory_data['gold_gained']:,} Gold**\n"
-                    if victory_data.get('exp_gained', 0) > 0:
-                        reward_text += f"⭐ **{victory_data['exp_gained']:,} EXP**\n"
-                    
-                    if reward_text:
-                        final_embed.add_field(
-                            name="🏆 Battle Rewards",
-                            value=reward_text.strip(),
-                            inline=False
-                        )
-                    
-                    # Add level up information if applicable
-                    if victory_data.get('level_up_data'):
-                        level_data = victory_data['level_up_data']
-                        if level_data.get('levels_gained', 0) > 0:
-                            level_text = f"Level: {level_data['old_level']} → **{level_data['new_level']}**"
-                            if level_data.get('rank_changed'):
-                                level_text += f"\nRank: {level_data['old_rank']} → **{level_data['new_rank']}**"
-                            
-                            final_embed.add_field(
-                                name="🆙 Level Progress",
-                                value=level_text,
-                                inline=False
-                            )
-                    
-                    # Add current stats
-                    if victory_data.get('hunter_stats'):
-                        stats = victory_data['hunter_stats']
-                        stats_text = f"Level: {stats.get('level', 1)}\n"
-                        stats_text += f"HP: {stats.get('hp', 0)}/{stats.get('max_hp', 100)}\n"
-                        stats_text += f"Gold: {stats.get('gold', 0):,}"
+                
+                # Add level up information if applicable
+                if victory_data.get('level_up_data'):
+                    level_data = victory_data['level_up_data']
+                    if level_data.get('levels_gained', 0) > 0:
+                        level_text = f"Level: {level_data['old_level']} → **{level_data['new_level']}**"
+                        if level_data.get('rank_changed'):
+                            level_text += f"\nRank: {level_data['old_rank']} → **{level_data['new_rank']}**"
                         
                         final_embed.add_field(
-                            name="📊 Current Status",
-                            value=stats_text,
-                            inline=True
-                        )
-                    
-                    # Add additional information if provided
-                    if victory_data.get('additional_info'):
-                        final_embed.add_field(
-                            name="📋 Additional Details",
-                            value=victory_data['additional_info'],
+                            name="🆙 Level Progress",
+                            value=level_text,
                             inline=False
                         )
+                
+                # Add current stats
+                if victory_data.get('hunter_stats'):
+                    stats = victory_data['hunter_stats']
+                    stats_text = f"Level: {stats.get('level', 1)}\n"
+                    stats_text += f"HP: {stats.get('hp', 0)}/{stats.get('max_hp', 100)}\n"
+                    stats_text += f"Gold: {stats.get('gold', 0):,}"
                     
-                    final_embed.set_footer(text="Your adventure continues! This channel remains open for future battles.")
-                    
-                else:
-                    # Generic completion message for non-victory scenarios
-                    final_embed = discord.Embed(
-                        title="🏆 Adventure Challenge Complete",
-                        description="The battle has ended. Your adventure space remains open for future quests.",
-                        color=discord.Color.gold()
+                    final_embed.add_field(
+                        name="📊 Current Status",
+                        value=stats_text,
+                        inline=True
                     )
                 
-                await channel.send(embed=final_embed)
-            except Exception as e:
-                print(f"Error sending completion message: {e}")
+                # Add additional information if provided
+                if victory_data.get('additional_info'):
+                    final_embed.add_field(
+                        name="📋 Additional Details",
+                        value=victory_data['additional_info'],
+                        inline=False
+                    )
+                
+                final_embed.set_footer(text="Your adventure continues! This channel remains open for future battles.")
+                
+            else:
+                # Generic completion message for non-victory scenarios
+                final_embed = discord.Embed(
+                    title="🏆 Adventure Challenge Complete",
+                    description="The battle has ended. Your adventure space remains open for future quests.",
+                    color=discord.Color.gold()
+                )
+            
+            await channel.send(embed=final_embed)
+        except Exception as e:
+            print(f"Error sending completion message: {e}")
 
 async def send_combat_message(ctx, embed, redirect_message=None):
     """Send combat messages to player's private combat channel"""
     user_id = str(ctx.author.id)
     
     # Check if player already has a combat channel
-    if user_id in player_combat_channels:
-        channel_id = player_combat_channels[user_id]
-        
-        # Ensure channel_id is an integer
-        if isinstance(channel_id, str):
-            channel_id = int(channel_id)
-        
-        combat_channel = bot.get_channel(channel_id)
-        
-        if combat_channel:
-            await combat_channel.send(embed=embed)
-            return combat_channel
-        else:
-            # Channel was deleted, remove from tracking and save
-            del player_combat_channels[user_id]
-            save_combat_channels()
+    combat_channel = combat_channels.get(user_id)
+    if combat_channel:
+        combat_channels.touch(user_id)
+        await combat_channel.send(embed=embed)
+        return combat_channel
     
-    # Create new combat channel for the player
+    # Lease a combat channel for the player
     combat_channel = await create_combat_channel(ctx.author)
     
     if combat_channel:
@@ -667,15 +421,6 @@ async def send_combat_message(ctx, embed, redirect_message=None):
         await ctx.send(embed=embed)
         return ctx.channel
 
-def is_combat_command(ctx, hunter):
-    """Check if this is a combat-related command"""
-    return any([
-        hunter.get('battle'),
-        hunter.get('gate_battle'), 
-        hunter.get('dungeon_battle'),
-        ctx.command.name in ['attack', 'defend', 'flee', 'hunt']
-    ])
-
 def get_daily_kill_requirement(hunter_level):
     """Calculate daily kill requirement for mystery gates"""
     base_requirement = 20
@@ -701,17 +446,8 @@ def update_daily_kills(hunter, kills=1):
     
     hunter['daily_kills'][today] += kills
 
-def check_for_active_doorway(user_id):
-    """Check if user has an active doorway exploration"""
-    gates_cog = bot.get_cog('Gates')
-    if gates_cog and hasattr(gates_cog, 'active_explorations'):
-        if user_id in gates_cog.active_explorations:
-            doorway_name = gates_cog.active_explorations[user_id].get('gate_name', 'Unknown Doorway')
-            return True, doorway_name
-    return False, None
-
 async def load_cogs():
-    """Load all cog files from the cogs directory"""
+    """Load all cog files from the cogs directory concurrently"""
     try:
         # Create cogs directory if it doesn't exist
         if not os.path.exists('./cogs'):
@@ -720,108 +456,91 @@ async def load_cogs():
         # List of expected cogs, replaced global_events and starting_event with event_management
         cog_files = ['gates', 'inventory', 'shop', 'pvp_system', 'dungeon_raids', 'themes', 'daily_quests', 'weekly_quests', 'special_quests', 'training', 'event_management', 'sololeveling_info', 'narrative_encounters', 'dungeon_management']
         
-        for cog_name in cog_files:
+        async def load_cog(cog_name):
             try:
                 await bot.load_extension(f'cogs.{cog_name}')
                 print(f'Loaded cog: {cog_name}')
             except Exception as e:
                 print(f'Failed to load cog {cog_name}: {e}')
+        
+        await asyncio.gather(*(load_cog(cog_name) for cog_name in cog_files))
     except Exception as e:
         print(f'Error loading cogs: {e}')
 
-def reset_stuck_players():
-    """Reset all players' battle and exploration states"""
-    try:
-        hunters_data = load_hunters_data()
-        reset_count = 0
-        
-        for user_id, hunter in hunters_data.items():
-            # Reset all battle states
-            if hunter.get('battle'):
-                hunter['battle'] = None
-                reset_count += 1
-            
-            if hunter.get('gate_battle'):
-                hunter['gate_battle'] = None
-                reset_count += 1
-            
-            if hunter.get('dungeon_battle'):
-                hunter['dungeon_battle'] = None
-                reset_count += 1
-            
-            # Ensure HP is not 0 to prevent stuck states
-            if hunter.get('hp', 100) <= 0:
-                hunter['hp'] = hunter.get('max_hp', 100)
-                reset_count += 1
-            
-            # Add defense stat to existing players if missing
-            if 'defense' not in hunter:
-                hunter['defense'] = 5  # Base defense
-                reset_count += 1
-        
-        if reset_count > 0:
-            save_hunters_data(hunters_data)
-            print(f"Reset {reset_count} stuck player states")
-                
-    except Exception as e:
-        print(f"Error resetting stuck players: {e}")
+async def reset_stuck_players():
+    """Startup maintenance: clear battle flags the last run left behind and repair stuck hunters"""
+    reset_count = 0
+    for user_id, hunter in load_hunters_data().items():
+        changed = False
+        
+        # A restart ends every fight; hunters already fighting again keep theirs
+        activity = activities.current(user_id)
+        if activity is None or activity.kind not in COMBAT:
+            for field in BATTLE_FIELDS:
+                if hunter.get(field):
+                    hunter[field] = None
+                    changed = True
+        
+        # Ensure HP is not 0 to prevent stuck states
+        if hunter.get('hp', 100) <= 0:
+            hunter['hp'] = hunter.get('max_hp', 100)
+            changed = True
+        
+        # Add defense stat to existing players if missing
+        if 'defense' not in hunter:
+            hunter['defense'] = 5  # Base defense
+            changed = True
+        
+        if changed:
+            hunter_store.mark_dirty(user_id)
+            reset_count += 1
+    
+    if reset_count > 0:
+        print(f"Reset {reset_count} stuck player states")
+
+async def warm_channel_pools():
+    """Startup maintenance: sort existing adventure channels and fill the warm pool"""
+    # Saved adventure channels are checked lazily on first use; duplicate
+    # cleanup and pool refills run in each guild's background task
+    for guild in bot.guilds:
+        combat_channels.warm(guild)
+
+async def compact_inventories():
+    """Startup maintenance: move legacy inventories (lists, "Name_1" item copies) to the compact layout"""
+    migrate_inventories(hunter_store)
+
+async def write_dashboard_snapshot():
+    """Startup maintenance: give the dashboard fresh leaderboards"""
+    leaderboards.write_snapshot()
+
+async def start_event_loop():
+    """Start the automated event loop once cogs are loaded and the bot is ready"""
+    event_cog = bot.get_cog('EventManagement')
+    event_loop = getattr(event_cog, 'event_loop', None)
+    if event_loop is not None and not event_loop.is_running():
+        event_loop.start()
+        print("Event management loop started")
 
-async def cleanup_duplicate_channels():
-    """Clean up any duplicate adventure channels that may exist"""
-    try:
-        for guild in bot.guilds:
-            adventure_channels = []
-            
-            # Find all channels that end with "-adventure"
-            for channel in guild.text_channels:
-                if channel.name.endswith('-adventure'):
-                    adventure_channels.append(channel)
-            
-            if len(adventure_channels) <= 1:
-                continue
-                
-            # Group channels by user (based on channel name pattern)
-            user_channels = {}
-            for channel in adventure_channels:
-                # Extract username from channel name (remove "-adventure" suffix)
-                username = channel.name[:-10]  # Remove "-adventure"
-                if username not in user_channels:
-                    user_channels[username] = []
-                user_channels[username].append(channel)
-            
-            # For each user with multiple channels, keep only the one in player_combat_channels
-            for username, channels in user_channels.items():
-                if len(channels) <= 1:
-                    continue
-                
-                print(f"Found {len(channels)} duplicate adventure channels for {username}")
-                
-                # Find which channel is tracked in player_combat_channels
-                tracked_channel = None
-                for user_id, channel_id in player_combat_channels.items():
-                    for channel in channels:
-                        if channel.id == channel_id:
-                            tracked_channel = channel
-                            break
-                    if tracked_channel:
-                        break
-                
-                # If no tracked channel found, keep the most recent one
-                if not tracked_channel:
-                    tracked_channel = max(channels, key=lambda c: c.created_at)
-                    print(f"No tracked channel found for {username}, keeping most recent")
-                
-                # Delete all other channels
-                for channel in channels:
-                    if channel != tracked_channel:
-                        try:
-                            await channel.delete(reason="Cleaning up duplicate adventure channel")
-                            print(f"Deleted duplicate channel: {channel.name}")
-                        except Exception as e:
-                            print(f"Failed to delete duplicate channel {channel.name}: {e}")
-                            
-    except Exception as e:
-        print(f"Error during duplicate channel cleanup: {e}")
+@bot.event
+async def setup_hook():
+    """Runs once per process, before login: read data, then load every cog concurrently"""
+    # Create necessary directories if they don't exist
+    os.makedirs('data', exist_ok=True)
+    
+    # Read hunter data and static game data on the I/O pool before anything touches them
+    await startup.stage('data', hunter_store.load_async(), game_data.preload(), scheduler.load(),
+                        ability_cooldowns.load())
+    restore_rest_lockouts()
+    if not os.path.exists(hunter_store.path):
+        save_hunters_data()
+    await startup.stage('cogs', load_cogs())
+    
+    # Maintenance waits until the bot is ready and never delays it
+    startup.defer('cleanup', reset_stuck_players)
+    startup.defer('channels', warm_channel_pools)
+    startup.defer('inventories', compact_inventories)
+    startup.defer('leaderboard', write_dashboard_snapshot)
+    startup.defer('event-loop', start_event_loop)
 
 @bot.event
 async def on_ready():
@@ -831,55 +550,9 @@ async def on_ready():
     # Set custom bot status
     await bot.change_presence(activity=discord.Game(name=".help"))
     
-    # Load saved combat channels and validate they still exist
-    global player_combat_channels
-    player_combat_channels = load_combat_channels()
-    
-    # Clean up deleted channels from storage
-    channels_to_remove = []
-    for user_id, channel_id in player_combat_channels.items():
-        channel = bot.get_channel(channel_id)
-        if not channel:
-            channels_to_remove.append(user_id)
-    
-    for user_id in channels_to_remove:
-        del player_combat_channels[user_id]
-    
-    if channels_to_remove:
-        save_combat_channels()
-        print(f"Cleaned up {len(channels_to_remove)} deleted channels")
-    
-    print(f"Loaded {len(player_combat_channels)} saved combat channels")
-    
-    # Clean up any duplicate adventure channels that may exist
-    await cleanup_duplicate_channels()
-    
-    # Reset all stuck player states on startup
-    reset_stuck_players()
-    
-    await load_cogs()
-    print('Bot is ready!')
-
-    # Create necessary directories and files if they don't exist
-    if not os.path.exists('data'):
-        os.makedirs('data')
-        
-    if not os.path.exists('hunters_data.json'):
-        save_hunters_data({})
-    
-    # Clear active explorations and raids from cogs after loading
-    for cog_name in bot.cogs:
-        cog = bot.get_cog(cog_name)
-        if hasattr(cog, 'active_explorations'):
-            cog.active_explorations.clear()
-        if hasattr(cog, 'active_raids'):
-            cog.active_raids.clear()
-    
-    # Start the event loop after the bot is ready and cogs are loaded
-    event_cog = bot.get_cog('EventManagement')
-    if event_cog:
-        event_cog.event_loop.start()  # Start the automated event loop
-        print("Event management loop started")
+    # on_ready fires again after every reconnect; startup work only runs the first time
+    if startup.mark_ready():
+        print('Bot is ready!')
 
 @bot.command(name='start', aliases=['awaken'])
 async def start(ctx):
@@ -906,7 +579,7 @@ async def start(ctx):
         "agility": 10,
         "intelligence": 10,
         "defense": 5,
-        "inventory": [],
+        "inventory": {},
         "shadows": [],
         "equipment": {
             "weapon": None,
@@ -914,7 +587,6 @@ async def start(ctx):
             "accessory": None
         },
         "abilities": ["power_strike", "heal"],
-        "active_cooldowns": {},
         "temp_buffs": {},
         "gold": 100,
         "quests": {
@@ -930,7 +602,7 @@ async def start(ctx):
         }
     }
 
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     embed = discord.Embed(
         title="🌟 Welcome, New Hunter!",
@@ -952,50 +624,32 @@ async def start(ctx):
     
     await ctx.send(embed=embed)
 
-def apply_passive_regeneration(hunter):
-    """Apply passive health and mana regeneration when out of combat"""
-    if hunter.get('battle') is None:  # Only regen when not in battle
-        max_hp = hunter.get('max_hp', 100)
-        max_mp = hunter.get('max_mp', 50)
-        
-        # Regenerate 5% of max HP and MP per status check
-        regen_hp = max(1, max_hp // 20)  # 5% HP
-        regen_mp = max(1, max_mp // 20)  # 5% MP
-        
-        hunter['hp'] = min(max_hp, hunter.get('hp', 0) + regen_hp)
-        hunter['mp'] = min(max_mp, hunter.get('mp', 0) + regen_mp)
-        
-        return regen_hp, regen_mp
-    return 0, 0
-
-def check_if_resting(user_id):
-    """Check if a player is currently resting"""
-    if user_id in resting_players:
-        rest_end_time = resting_players[user_id]
-        if time.time() < rest_end_time:
-            remaining_time = int(rest_end_time - time.time())
-            minutes = remaining_time // 60
-            seconds = remaining_time % 60
-            return True, f"You are currently resting. Please wait {minutes}:{seconds:02d} before using commands."
-        else:
-            # Rest period is over
-            del resting_players[user_id]
-    return False, None
+async def reject_if_busy(ctx, user_id, *kinds):
+    """Tell the user and return True if an activity (one of ``kinds``, or any) holds them"""
+    activity = activities.current(user_id)
+    if activity is None or (kinds and activity.kind not in kinds):
+        return False
+    from utils.theme_utils import get_error_embed
+    embed = get_error_embed(ctx.author.id, activities.busy_message(activity))
+    await ctx.send(embed=embed)
+    return True
 
 def check_rest_cooldown(user_id):
     """Check if rest command is on cooldown"""
-    if user_id in rest_cooldowns:
-        cooldown_end = rest_cooldowns[user_id]
-        if time.time() < cooldown_end:
-            remaining_time = int(cooldown_end - time.time())
-            minutes = remaining_time // 60
-            seconds = remaining_time % 60
-            return True, f"Rest command is on cooldown. Please wait {minutes}:{seconds:02d}"
-        else:
-            # Cooldown is over
-            del rest_cooldowns[user_id]
+    remaining_time = int(rest_cooldowns.remaining(user_id))
+    if remaining_time > 0:
+        minutes = remaining_time // 60
+        seconds = remaining_time % 60
+        return True, f"Rest command is on cooldown. Please wait {minutes}:{seconds:02d}"
     return False, None
 
+def restore_rest_lockouts():
+    """Lock hunters who were resting when the bot stopped out again for the rest of their rest period"""
+    for user_id in resting_players:
+        remaining = resting_players.remaining(user_id)
+        if remaining > 0:
+            activities.begin(user_id, REST, 'main', remaining)
+
 def check_if_training(user_id):
     """Check if a player is currently training"""
     # Get training cog instance
@@ -1047,73 +701,18 @@ def complete_training_session(user_id, training_cog, session):
     hunter['total_stats_gained'] += stat_gain
     
     # Recalculate stats with equipment bonuses
-    update_hunter_equipment_stats(hunter)
+    derived_stats.apply(hunter)
     
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     del training_cog.training_sessions[user_id]
 
-def update_hunter_equipment_stats(hunter):
-    """Update hunter stats with equipment bonuses"""
-    # Initialize base stats if they don't exist
-    if 'base_strength' not in hunter:
-        hunter['base_strength'] = hunter.get('strength', 10)
-    if 'base_agility' not in hunter:
-        hunter['base_agility'] = hunter.get('agility', 10)
-    if 'base_intelligence' not in hunter:
-        hunter['base_intelligence'] = hunter.get('intelligence', 10)
-    if 'base_defense' not in hunter:
-        hunter['base_defense'] = hunter.get('defense', 5)
-    
-    # Reset to base stats
-    hunter['strength'] = hunter['base_strength']
-    hunter['agility'] = hunter['base_agility']
-    hunter['intelligence'] = hunter['base_intelligence']
-    hunter['defense'] = hunter['base_defense']  # Start with base defense
-    
-    # Load item data to get equipment bonuses
-    try:
-        import json
-        with open('data/items.json', 'r') as f:
-            items_data = json.load(f)
-    except FileNotFoundError:
-        return
-    
-    # Add equipment bonuses
-    equipment = hunter.get('equipment', {})
-    for item_name in equipment.values():
-        if item_name:
-            # Find item in all categories
-            item_info = None
-            for category in items_data.values():
-                if item_name in category:
-                    item_info = category[item_name]
-                    break
-            
-            if item_info:
-                hunter['strength'] += item_info.get('strength', 0)
-                hunter['agility'] += item_info.get('agility', 0)
-                hunter['intelligence'] += item_info.get('intelligence', 0)
-                hunter['defense'] += item_info.get('defense', 0)
-
 @bot.command(name='status')
 async def status(ctx):
     """Check your hunter status"""
     user_id = str(ctx.author.id)
     
-    # Check for active doorway
-    has_doorway, doorway_name = check_for_active_doorway(user_id)
-    if has_doorway:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, f"You already have an open doorway ({doorway_name}) where you can continue your adventure! Complete your current exploration first.")
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
+    # Resting and training are refused by the global activity check; an open doorway blocks status too
+    if await reject_if_busy(ctx, user_id, EXPLORATION):
         return
     
     # Check if training completed (this will auto-apply stat gains)
@@ -1130,11 +729,11 @@ async def status(ctx):
     hunter = hunters_data[user_id]
     print(f"[DEBUG] Status - Loaded data for {user_id}: EXP: {hunter.get('exp', 0)}, Level: {hunter.get('level', 1)}, Rank: {hunter.get('rank', 'E')}")
     
-    # Ensure equipment stats are current before calculating status
-    update_hunter_equipment_stats(hunter)
+    # Ensure equipment stats are current before calculating status (cached per loadout)
+    derived_stats.apply(hunter)
     
-    # Apply passive regeneration when checking status
-    regen_hp, regen_mp = apply_passive_regeneration(hunter)
+    # Passive regeneration is derived from when HP/MP were last stored; nothing to write
+    current_hp, current_mp = vitals.current(user_id, hunter)
 
     # Calculate progress bars
     def create_progress_bar(current, maximum, length=10):
@@ -1154,74 +753,22 @@ async def status(ctx):
     old_level = hunter.get('level', 1)
     old_rank = hunter.get('rank', 'E')
     
-    # Always update level and rank to match current EXP
-    hunter['level'] = current_level
+    # Always update level and rank to match current EXP; only a change is saved
     new_rank = leveling_system.get_rank_for_level(current_level)
-    hunter['rank'] = new_rank
-    print(f"[DEBUG] Status - After level/rank update: Level: {hunter['level']}, Rank: {hunter['rank']}")
-    save_hunters_data(hunters_data)
+    if old_level != current_level or old_rank != new_rank:
+        hunter['level'] = current_level
+        hunter['rank'] = new_rank
+        print(f"[DEBUG] Status - After level/rank update: Level: {hunter['level']}, Rank: {hunter['rank']}")
+        hunter_store.mark_dirty(user_id)
     
     # Handle rank promotion only if rank actually changed
     if old_rank != new_rank:
         print(f"[DEBUG] Rank change detected for {ctx.author}: {old_rank} -> {new_rank}")
-        print(f"[DEBUG] Available guild roles: {[role.name for role in ctx.guild.roles]}")
         
-        # Enhanced rank promotion with iterative role removal
+        # Role edit and promotion DM are queued and rate limited per guild
         try:
-            from utils.leveling_system import get_rank_role_name, RANK_ROLES
-            
-            guild = ctx.guild
-            new_rank_name = get_rank_role_name(current_level)
-            
-            # Find or create new rank role
-            new_rank_role = discord.utils.get(guild.roles, name=new_rank_name)
-            if new_rank_role is None:
-                try:
-                    new_rank_role = await guild.create_role(
-                        name=new_rank_name,
-                        reason="Auto-created rank role for leveling system"
-                    )
-                    print(f"[DEBUG] Created new rank role: {new_rank_name}")
-                except discord.Forbidden:
-                    print(f"[DEBUG] Insufficient permissions to create role: {new_rank_name}")
-                    pass
-                except Exception as e:
-                    print(f"[DEBUG] Error creating role {new_rank_name}: {e}")
-                    pass
-            
-            # Remove ALL existing rank roles from user iteratively
-            rank_names = list(RANK_ROLES.values())
-            roles_to_remove = [r for r in ctx.author.roles if r.name in rank_names]
-            
-            # Remove roles one by one to prevent bulk removal issues
-            for role in roles_to_remove:
-                try:
-                    await ctx.author.remove_roles(role, reason="Rank update - removing old rank")
-                    print(f"[DEBUG] Removed role: {role.name}")
-                except discord.Forbidden:
-                    print(f"[DEBUG] No permission to remove role: {role.name}")
-                    pass
-                except Exception as e:
-                    print(f"[DEBUG] Error removing role {role.name}: {e}")
-                    pass
-            
-            # Assign new role if it exists
-            if new_rank_role:
-                try:
-                    await ctx.author.add_roles(new_rank_role, reason="Rank promotion")
-                    print(f"[DEBUG] Added new role: {new_rank_role.name}")
-                except discord.Forbidden:
-                    print(f"[DEBUG] No permission to add role: {new_rank_role.name}")
-                    pass
-                except Exception as e:
-                    print(f"[DEBUG] Error adding role {new_rank_role.name}: {e}")
-                    pass
-            
-            # Send DM notification
-            try:
-                await ctx.author.send(f"🎉 Congratulations! You've been promoted to **{new_rank_name}** (Level {current_level})!")
-            except discord.Forbidden:
-                pass
+            if isinstance(ctx.author, discord.Member):
+                role_sync.request(ctx.author, current_level)
             
             # Send rank promotion announcement
             if str(ctx.author.id) == "562670505782542366":
@@ -1275,11 +822,11 @@ async def status(ctx):
     )
 
     # Health and Mana bars
-    hp_bar = create_progress_bar(hunter['hp'], hunter.get('max_hp', 100))
-    mp_bar = create_progress_bar(hunter['mp'], hunter.get('max_mp', 50))
+    hp_bar = create_progress_bar(current_hp, hunter.get('max_hp', 100))
+    mp_bar = create_progress_bar(current_mp, hunter.get('max_mp', 50))
     status_embed.add_field(
         name="Health & Mana",
-        value=f"❤️ HP: {hp_bar} {hunter['hp']}/{hunter.get('max_hp', 100)}\n💠 MP: {mp_bar} {hunter['mp']}/{hunter.get('max_mp', 50)}",
+        value=f"❤️ HP: {hp_bar} {current_hp}/{hunter.get('max_hp', 100)}\n💠 MP: {mp_bar} {current_mp}/{hunter.get('max_mp', 50)}",
         inline=False
     )
 
@@ -1310,7 +857,7 @@ async def status(ctx):
     # Additional Info
     status_embed.add_field(
         name="Resources",
-        value=f"🪙 Gold: {hunter.get('gold', 0)}\n📦 Items: {len(hunter.get('inventory', []))}\n🎨 Theme: {hunter.get('theme', 'dark').title()}",
+        value=f"🪙 Gold: {hunter.get('gold', 0)}\n📦 Items: {sum(get_inventory(hunter).values())}\n🎨 Theme: {hunter.get('theme', 'dark').title()}",
         inline=True
     )
 
@@ -1322,15 +869,7 @@ async def status(ctx):
         inline=True
     )
 
-    # Add regeneration message if applicable
-    regen_message = ""
-    if regen_hp > 0 or regen_mp > 0:
-        regen_message = f"\n🔄 Regenerated: +{regen_hp} HP, +{regen_mp} MP"
-    
-    status_embed.set_footer(text=f"Use .help to see available commands{regen_message}")
-    
-    # Save data after regeneration
-    save_hunters_data(hunters_data)
+    status_embed.set_footer(text="Use .help to see available commands")
     
     # Create and send interactive status view
     status_view = StatusView(bot, ctx.author.id, initial_page="main")
@@ -1343,20 +882,8 @@ async def rest(ctx):
     """Rest to fully restore health and mana (5 minute cooldown, 90 second rest period)"""
     user_id = str(ctx.author.id)
 
-    # Check for active doorway
-    has_doorway, doorway_name = check_for_active_doorway(user_id)
-    if has_doorway:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, f"You already have an open doorway ({doorway_name}) where you can continue your adventure! Complete your current exploration first.")
-        await ctx.send(embed=embed)
-        return
-
-    # Check if player is already resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
+    # Can't rest in the middle of a hunt, gate, raid or event (or while already resting)
+    if await reject_if_busy(ctx, user_id):
         return
 
     # Check if rest command is on cooldown
@@ -1405,10 +932,11 @@ async def rest(ctx):
     hunter['mp'] = max_mp
     
     # Set rest cooldown (5 minutes = 300 seconds)
-    rest_cooldowns[user_id] = time.time() + 300
+    rest_cooldowns.start(user_id, 300)
     
     # Set resting period (90 seconds)
-    resting_players[user_id] = time.time() + 90
+    resting_players.start(user_id, 90)
+    activities.begin(user_id, REST, 'main', 90)
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
@@ -1433,7 +961,7 @@ async def rest(ctx):
     
     embed.set_footer(text="You are now resting peacefully...")
     
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     await ctx.send(embed=embed)
 
 @bot.command(name='hunt')
@@ -1441,28 +969,8 @@ async def hunt(ctx):
     """Start interactive hunting with button-based combat in a private channel"""
     user_id = str(ctx.author.id)
     
-    # Check for active doorway
-    has_doorway, doorway_name = check_for_active_doorway(user_id)
-    if has_doorway:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, f"You already have an open doorway ({doorway_name}) where you can continue your adventure! Complete your current exploration first.")
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is training
-    is_training, training_message = check_if_training(user_id)
-    if is_training:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, training_message)
-        await ctx.send(embed=embed)
+    # One lookup covers doorways, raids, events, resting, training and running hunts
+    if await reject_if_busy(ctx, user_id):
         return
     
     hunters_data = load_hunters_data()
@@ -1475,88 +983,6 @@ async def hunt(ctx):
 
     hunter = hunters_data[user_id]
     
-    # Check if already in interactive battle
-    if user_id in interactive_battles:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "You are already in an interactive battle! Use the buttons to continue fighting.")
-        await ctx.send(embed=embed)
-        return
-    
-    # Enhanced channel management - check for existing valid channel
-    adventure_channel = None
-    stored_channel_id = hunter.get('private_adventure_channel_id')
-    
-    print(f"[DEBUG] Stored channel ID for user {user_id}: {stored_channel_id}")
-    
-    if stored_channel_id:
-        # Try to fetch the channel from Discord's cache/API
-        adventure_channel = bot.get_channel(stored_channel_id)
-        print(f"[DEBUG] Found existing channel: {adventure_channel}")
-        
-        if adventure_channel:
-            print(f"[DEBUG] Channel category ID: {adventure_channel.category_id}, Expected: {COMBAT_CATEGORY_ID}")
-            # Channel exists, check if it's in the correct category
-            if adventure_channel.category_id != COMBAT_CATEGORY_ID:
-                print(f"[DEBUG] Channel in wrong category, clearing and creating new one")
-                await ctx.send("Your previous private adventure channel was moved. Creating a new one.", delete_after=10)
-                adventure_channel = None
-                hunter['private_adventure_channel_id'] = None
-                if user_id in player_combat_channels:
-                    del player_combat_channels[user_id]
-                    save_combat_channels()
-                hunters_data[user_id] = hunter
-                save_hunters_data(hunters_data)
-            else:
-                print(f"[DEBUG] Reusing existing valid channel: {adventure_channel.name}")
-                # Channel is valid, ensure permissions and use it
-                try:
-                    await adventure_channel.set_permissions(ctx.author, read_messages=True, send_messages=True)
-                    await adventure_channel.set_permissions(ctx.guild.me, read_messages=True, send_messages=True)
-                except discord.Forbidden:
-                    pass  # Continue anyway if permissions fail
-                
-                # Update combat channels tracking
-                player_combat_channels[user_id] = adventure_channel.id
-                save_combat_channels()
-                
-                # Send reuse notification
-                await ctx.send(f"Continuing your adventure in {adventure_channel.mention}!", delete_after=5)
-                # Skip channel creation since we're reusing existing one
-                print(f"[DEBUG] Successfully reusing channel, skipping creation")
-        else:
-            print(f"[DEBUG] Stored channel ID {stored_channel_id} not found, clearing data")
-            # Channel no longer exists
-            hunter['private_adventure_channel_id'] = None
-            if user_id in player_combat_channels:
-                del player_combat_channels[user_id]
-                save_combat_channels()
-            hunters_data[user_id] = hunter
-            save_hunters_data(hunters_data)
-    
-    # Check legacy player_combat_channels for existing channel
-    elif user_id in player_combat_channels:
-        channel_id = player_combat_channels[user_id]
-        if isinstance(channel_id, str):
-            channel_id = int(channel_id)
-        existing_channel = bot.get_channel(channel_id)
-        
-        if existing_channel and existing_channel.category_id == COMBAT_CATEGORY_ID:
-            adventure_channel = existing_channel
-            # Update hunter data with the channel ID
-            hunter['private_adventure_channel_id'] = adventure_channel.id
-            save_hunters_data(hunters_data)
-        else:
-            # Channel no longer exists or wrong category
-            del player_combat_channels[user_id]
-            save_combat_channels()
-    
-    # Check if already in legacy battles
-    if hunter.get('battle') or hunter.get('gate_battle') or hunter.get('dungeon_battle'):
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "You are already in battle! Complete your current fight first.")
-        await ctx.send(embed=embed)
-        return
-    
     # Check hunt cooldown to prevent spam
     current_time = time.time()
     if user_id in hunt_cooldowns:
@@ -1578,48 +1004,43 @@ async def hunt(ctx):
         await ctx.send(embed=embed)
         return
     
-    # Create or reuse adventure channel
+    # Claim the hunt before the first await, so nothing else can start while the arena opens
+    try:
+        interactive_battles[user_id] = {'hunter': hunter, 'monster': monster}
+    except ActivityBusy as busy:
+        await ctx.send(embed=get_error_embed(ctx.author.id, str(busy)))
+        return
+    
+    # Lease (or keep) the hunter's adventure channel; a kept lease with the right access costs no API call
+    reusing = combat_channels.get(user_id) is not None
+    adventure_channel = await combat_channels.lease(ctx.guild, user_id, [ctx.author])
     if not adventure_channel:
-        print(f"[DEBUG] No existing channel found, creating new one")
-        # Create new private combat channel
-        try:
-            adventure_channel = await create_private_combat_channel(ctx)
-            if not adventure_channel:
-                from utils.theme_utils import get_error_embed
-                embed = get_error_embed(ctx.author.id, "Failed to create private combat channel. Please try again.")
-                await ctx.send(embed=embed)
-                return
-            
-            # Update hunter data with new channel ID
-            hunter['private_adventure_channel_id'] = adventure_channel.id
-            hunters_data[user_id] = hunter
-            save_hunters_data(hunters_data)
-            print(f"[DEBUG] Created new channel {adventure_channel.id} and stored in hunter data")
-            
-            # Send redirect message in original channel
-            from utils.theme_utils import get_user_theme_colors
-            colors = get_user_theme_colors(ctx.author.id)
-            redirect_embed = discord.Embed(
-                title="⚔️ Private Combat Arena Created!",
-                description=f"Your personal combat has started in {adventure_channel.mention}",
-                color=discord.Color(colors['success'])
-            )
-            await ctx.send(embed=redirect_embed)
-            
-            # Send welcome message in combat channel
-            from utils.theme_utils import get_info_embed
-            welcome_embed = get_info_embed(
-                "🏟️ Welcome to Your Private Combat Arena!",
-                f"{ctx.author.mention} You venture into the dangerous territories in search of monsters to hunt..."
-            )
-            await adventure_channel.send(embed=welcome_embed)
-        except Exception as e:
-            from utils.theme_utils import get_error_embed
-            embed = get_error_embed(ctx.author.id, f"Failed to create combat channel: {str(e)}")
-            await ctx.send(embed=embed)
-            return
+        del interactive_battles[user_id]
+        from utils.theme_utils import get_error_embed
+        embed = get_error_embed(ctx.author.id, "Failed to open your private combat channel. Please try again.")
+        await ctx.send(embed=embed)
+        return
+    
+    if not reusing:
+        # Send redirect message in original channel
+        from utils.theme_utils import get_user_theme_colors
+        colors = get_user_theme_colors(ctx.author.id)
+        redirect_embed = discord.Embed(
+            title="⚔️ Private Combat Arena Opened!",
+            description=f"Your personal combat has started in {adventure_channel.mention}",
+            color=discord.Color(colors['success'])
+        )
+        await ctx.send(embed=redirect_embed)
+        
+        # Send welcome message in combat channel
+        from utils.theme_utils import get_info_embed
+        welcome_embed = get_info_embed(
+            "🏟️ Welcome to Your Private Combat Arena!",
+            f"{ctx.author.mention} You venture into the dangerous territories in search of monsters to hunt..."
+        )
+        await adventure_channel.send(embed=welcome_embed)
     else:
-        print(f"[DEBUG] Reusing existing channel {adventure_channel.id}")
+        await ctx.send(f"Continuing your adventure in {adventure_channel.mention}!", delete_after=5)
         # Using existing channel - send hunt start message
         from utils.theme_utils import get_info_embed
         hunt_embed = get_info_embed(
@@ -1643,13 +1064,11 @@ async def hunt(ctx):
     combat_view.message = combat_message
     
     # Store battle state
-    interactive_battles[user_id] = {
-        'hunter': hunter,
-        'monster': monster,
+    interactive_battles[user_id].update({
         'combat_view': combat_view,
         'combat_message': combat_message,
         'combat_channel': adventure_channel
-    }
+    })
     
     # Start interactive combat loop
     while not combat_view.combat_ended:
@@ -1709,420 +1128,367 @@ async def attack(ctx):
     """Attack the current monster"""
     user_id = str(ctx.author.id)
     
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is training
-    is_training, training_message = check_if_training(user_id)
-    if is_training:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, training_message)
-        await ctx.send(embed=embed)
-        return
-    
-    hunters_data = load_hunters_data()
+    async with hunter_store.transaction(user_id):
+        hunters_data = load_hunters_data()
 
-    if user_id not in hunters_data:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
-        await ctx.send(embed=embed)
-        return
+        if user_id not in hunters_data:
+            from utils.theme_utils import get_error_embed
+            embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            return
 
-    hunter = hunters_data[user_id]
+        hunter = hunters_data[user_id]
     
-    # Check for event battle first
-    if hunter.get('event_battle'):
-        await handle_event_battle_attack(ctx, user_id, hunter, hunters_data)
-        return
+        # Check for PvP battle
+        pvp_cog = bot.get_cog('PvPSystem')
+        if pvp_cog and pvp_cog.find_battle(user_id)[0]:
+            hunter_store.after_commit(user_id, pvp_cog.take_turn, ctx, user_id, ATTACK)
+            return
     
-    # Check for gate battle
-    if hunter.get('gate_battle'):
-        await handle_gate_battle_attack(ctx, user_id, hunter, hunters_data)
-        return
+        # Check for event battle
+        if hunter.get('event_battle'):
+            await handle_event_battle_attack(ctx, user_id, hunter, hunters_data)
+            return
     
-    # Check for dungeon battle
-    dungeon_cog = bot.get_cog('DungeonRaids')
-    if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
-        if hunter.get('dungeon_battle'):
-            await handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dungeon_cog)
+        # Check for gate battle
+        if hunter.get('gate_battle'):
+            await handle_gate_battle_attack(ctx, user_id, hunter, hunters_data)
             return
     
-    # Regular hunt battle
-    battle = hunter.get('battle')
+        # Check for dungeon battle
+        dungeon_cog = bot.get_cog('DungeonRaids')
+        if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
+            if hunter.get('dungeon_battle'):
+                await handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dungeon_cog)
+                return
     
-    if not battle:
-        await ctx.send("You're not in battle! Use `.hunt` to find monsters.")
-        return
+        # Regular hunt battle
+        battle = hunter.get('battle')
+    
+        if not battle:
+            hunter_store.after_commit(user_id, ctx.send, "You're not in battle! Use `.hunt` to find monsters.")
+            return
 
-    if battle['turn'] != 'hunter':
-        await ctx.send("It's not your turn!")
-        return
+        if battle['turn'] != 'hunter':
+            hunter_store.after_commit(user_id, ctx.send, "It's not your turn!")
+            return
 
-    # Calculate damage
-    import random
-    base_damage = hunter['strength'] + random.randint(1, 10)
-    monster_defense = battle['monster']['defense']
-    damage = max(1, base_damage - monster_defense)
-    
-    # Apply damage to monster
-    battle['monster_hp'] = max(0, battle['monster_hp'] - damage)
+        state, events = play_battle_turn(
+            hunter, battle, ATTACK, COMMAND_HUNT_RULES,
+            defense=hunter.get('defense', 5) + hunter['agility'] // 3  # Defense stat + agility bonus
+        )
+        damage = damage_dealt(events, PLAYER)
     
-    from utils.theme_utils import get_user_theme_colors, create_progress_bar
-    colors = get_user_theme_colors(ctx.author.id)
+        from utils.theme_utils import get_user_theme_colors, create_progress_bar
+        colors = get_user_theme_colors(ctx.author.id)
     
-    embed = discord.Embed(
-        title="⚔️ Attack!",
-        description=f"You attack the {battle['monster']['name']} for {damage} damage!",
-        color=discord.Color(colors['warning'])
-    )
+        embed = discord.Embed(
+            title="⚔️ Attack!",
+            description=f"You attack the {battle['monster']['name']} for {damage} damage!",
+            color=discord.Color(colors['warning'])
+        )
     
-    # Check if monster is defeated
-    if battle['monster_hp'] <= 0:
-        # Monster defeated - Calculate EXP using Solo Leveling lore-accurate system
-        from utils.leveling_system import leveling_system
-        monster_rank = battle['monster'].get('rank', 'E')
-        exp_gained = leveling_system.calculate_exp_gain('hunt', monster_rank, 'normal')
-        gold_gained = battle['monster']['gold_reward']
+        # Check if monster is defeated
+        if state.outcome == VICTORY:
+            # Monster defeated - Calculate EXP using Solo Leveling lore-accurate system
+            from utils.leveling_system import leveling_system
+            monster_rank = battle['monster'].get('rank', 'E')
+            exp_gained = leveling_system.calculate_exp_gain('hunt', monster_rank, 'normal')
+            gold_gained = battle['monster']['gold_reward']
         
-        # Award EXP using new leveling system
-        print(f"[DEBUG] Hunt - Before award_exp: User {user_id} has EXP: {hunter.get('exp', 0)}, Level: {hunter.get('level', 1)}")
-        level_up_data = await award_exp(user_id, exp_gained, bot, "hunt")
-        print(f"[DEBUG] Level up data: {level_up_data}")
+            # Award EXP using new leveling system
+            print(f"[DEBUG] Hunt - Before award_exp: User {user_id} has EXP: {hunter.get('exp', 0)}, Level: {hunter.get('level', 1)}")
+            level_up_data = await award_exp(user_id, exp_gained, bot, "hunt")
+            print(f"[DEBUG] Level up data: {level_up_data}")
         
-        # CRITICAL: Reload hunters_data after award_exp to get fresh data
-        print(f"[DEBUG] Hunt - Reloading hunters_data after award_exp...")
-        hunters_data = load_hunters_data()
-        hunter = hunters_data[user_id]
-        print(f"[DEBUG] Hunt - After reload: User {user_id} has EXP: {hunter.get('exp', 0)}, Level: {hunter.get('level', 1)}")
+            # CRITICAL: Reload hunters_data after award_exp to get fresh data
+            print(f"[DEBUG] Hunt - Reloading hunters_data after award_exp...")
+            hunters_data = load_hunters_data()
+            hunter = hunters_data[user_id]
+            print(f"[DEBUG] Hunt - After reload: User {user_id} has EXP: {hunter.get('exp', 0)}, Level: {hunter.get('level', 1)}")
         
-        hunter['gold'] = hunter.get('gold', 0) + gold_gained
-        hunter['last_defeated_monster'] = battle['monster'].copy()
+            hunter['gold'] = hunter.get('gold', 0) + gold_gained
+            hunter['last_defeated_monster'] = battle['monster'].copy()
         
-        # Update quest progress and daily kills
-        try:
-            from daily_quest_system import update_quest_progress
-            update_quest_progress(hunter, "kill_monsters", 1)
-            update_quest_progress(hunter, "earn_gold", gold_gained)
+            # Update quest progress and daily kills
+            try:
+                from daily_quest_system import update_quest_progress
+                update_quest_progress(hunter, "kill_monsters", 1)
+                update_quest_progress(hunter, "earn_gold", gold_gained)
             
-            # Update daily kills for mystery gate access
-            update_daily_kills(hunter, 1)
-        except:
-            pass
+                # Update daily kills for mystery gate access
+                update_daily_kills(hunter, 1)
+            except:
+                pass
         
-        # Handle level up notifications
-        level_up_msg = ""
-        if level_up_data.get("levels_gained", 0) > 0:
-            level_up_msg = f"\n🎉 **LEVEL UP!** You are now level {level_up_data['new_level']}!"
+            # Handle level up notifications
+            level_up_msg = ""
+            if level_up_data.get("levels_gained", 0) > 0:
+                level_up_msg = f"\n🎉 **LEVEL UP!** You are now level {level_up_data['new_level']}!"
             
-            # Send level up notification to user
-            await send_level_up_notification(ctx.author, level_up_data)
+                # Send level up notification to user
+                hunter_store.after_commit(user_id, send_level_up_notification, ctx.author, level_up_data)
             
-            # Send level up announcement to system channel
-            level_embed = discord.Embed(
-                title="🌟 Level Up!",
-                description=f"{ctx.author.mention} reached **Level {level_up_data['new_level']}**!",
-                color=discord.Color.gold()
-            )
-            level_embed.add_field(
-                name="New Rank",
-                value=f"**{level_up_data['new_rank']}**",
-                inline=True
-            )
-            level_embed.add_field(
-                name="EXP Gained",
-                value=f"+{level_up_data['exp_gained']} EXP",
-                inline=True
+                # Send level up announcement to system channel
+                level_embed = discord.Embed(
+                    title="🌟 Level Up!",
+                    description=f"{ctx.author.mention} reached **Level {level_up_data['new_level']}**!",
+                    color=discord.Color.gold()
+                )
+                level_embed.add_field(
+                    name="New Rank",
+                    value=f"**{level_up_data['new_rank']}**",
+                    inline=True
+                )
+                level_embed.add_field(
+                    name="EXP Gained",
+                    value=f"+{level_up_data['exp_gained']} EXP",
+                    inline=True
+                )
+                hunter_store.after_commit(user_id, send_system_message, level_embed, user_id=user_id)
+            
+                # Add rank announcement to global events if rank changed
+                if level_up_data.get("rank_changed", False):
+                    global_events_cog = bot.get_cog('GlobalEvents')
+                    if global_events_cog and hasattr(global_events_cog, 'add_rank_announcement'):
+                        # Reload hunter data to get updated stats
+                        updated_hunters_data = load_hunters_data()
+                        updated_hunter = updated_hunters_data[user_id]
+                        progress_info = f"Level {updated_hunter['level']} • {updated_hunter['strength']} STR • {updated_hunter['agility']} AGI • {updated_hunter['intelligence']} INT"
+                        global_events_cog.add_rank_announcement(ctx.author.display_name, level_up_data['new_rank'], updated_hunter['level'], progress_info)
+        
+            embed.title = "🏆 Victory!"
+            embed.description = f"You defeated the {battle['monster']['name']}!"
+            embed.color = discord.Color(colors['success'])
+            embed.add_field(
+                name="Rewards",
+                value=f"💰 {gold_gained} Gold\n⭐ {exp_gained} EXP{level_up_msg}",
+                inline=False
             )
-            await send_system_message(level_embed, user_id=user_id)
-            
-            # Add rank announcement to global events if rank changed
-            if level_up_data.get("rank_changed", False):
-                global_events_cog = bot.get_cog('GlobalEvents')
-                if global_events_cog and hasattr(global_events_cog, 'add_rank_announcement'):
-                    # Reload hunter data to get updated stats
-                    updated_hunters_data = load_hunters_data()
-                    updated_hunter = updated_hunters_data[user_id]
-                    progress_info = f"Level {updated_hunter['level']} • {updated_hunter['strength']} STR • {updated_hunter['agility']} AGI • {updated_hunter['intelligence']} INT"
-                    global_events_cog.add_rank_announcement(ctx.author.display_name, level_up_data['new_rank'], updated_hunter['level'], progress_info)
         
-        embed.title = "🏆 Victory!"
-        embed.description = f"You defeated the {battle['monster']['name']}!"
-        embed.color = discord.Color(colors['success'])
-        embed.add_field(
-            name="Rewards",
-            value=f"💰 {gold_gained} Gold\n⭐ {exp_gained} EXP{level_up_msg}",
-            inline=False
-        )
+            # Clear battle and set completion time to prevent exploit
+            hunter['battle'] = None
+            last_hunt_completion[user_id] = time.time()
         
-        # Clear battle and set completion time to prevent exploit
-        hunter['battle'] = None
-        last_hunt_completion[user_id] = time.time()
-        
-        # Prepare victory data for completion message
-        victory_data = {
-            'monster_name': battle['monster']['name'],
-            'gold_gained': gold_gained,
-            'exp_gained': exp_gained,
-            'level_up_data': level_up_data if level_up_data.get("levels_gained", 0) > 0 else None,
-            'hunter_stats': {
-                'level': hunter['level'],
-                'hp': hunter['hp'],
-                'max_hp': hunter['max_hp'],
-                'gold': hunter['gold']
+            # Prepare victory data for completion message
+            victory_data = {
+                'monster_name': battle['monster']['name'],
+                'gold_gained': gold_gained,
+                'exp_gained': exp_gained,
+                'level_up_data': level_up_data if level_up_data.get("levels_gained", 0) > 0 else None,
+                'hunter_stats': {
+                    'level': hunter['level'],
+                    'hp': hunter['hp'],
+                    'max_hp': hunter['max_hp'],
+                    'gold': hunter['gold']
+                }
             }
-        }
-        
-        # Send completion message to combat channel
-        await send_combat_completion_message(user_id, victory_data)
-    else:
-        # Monster's turn to attack
-        monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-        hunter_defense = hunter.get('defense', 5) + (hunter['agility'] // 3)  # Defense stat + agility bonus
-        final_damage = max(1, monster_damage - hunter_defense)
-        
-        hunter['hp'] = max(0, hunter['hp'] - final_damage)
         
-        monster_bar = create_progress_bar(battle['monster_hp'], battle['monster']['hp'])
-        embed.add_field(
-            name="Monster Status",
-            value=f"👹 **{battle['monster']['name']}**\n❤️ HP: {battle['monster_hp']}/{battle['monster']['hp']}\n{monster_bar}",
-            inline=False
-        )
+            # Send completion message to combat channel
+            hunter_store.after_commit(user_id, send_combat_completion_message, user_id, victory_data)
+        else:
+            # Monster's turn to attack
+            final_damage = damage_dealt(events, ENEMY)
         
-        embed.add_field(
-            name="Monster Counter-Attack!",
-            value=f"The {battle['monster']['name']} attacks you for {final_damage} damage!\n❤️ Your HP: {hunter['hp']}/{hunter.get('max_hp', 100)}",
-            inline=False
-        )
+            monster_bar = create_progress_bar(battle['monster_hp'], battle['monster']['hp'])
+            embed.add_field(
+                name="Monster Status",
+                value=f"👹 **{battle['monster']['name']}**\n❤️ HP: {battle['monster_hp']}/{battle['monster']['hp']}\n{monster_bar}",
+                inline=False
+            )
         
-        # Check if hunter is defeated
-        if hunter['hp'] <= 0:
-            embed.title = "💀 Defeated!"
-            embed.description = f"You were defeated by the {battle['monster']['name']}! You respawn with full health."
-            embed.color = discord.Color.dark_red()
-            embed.add_field(name="Result", value="Battle lost - no rewards gained", inline=False)
-            embed.add_field(name="Respawn", value="Your health has been fully restored!", inline=False)
+            embed.add_field(
+                name="Monster Counter-Attack!",
+                value=f"The {battle['monster']['name']} attacks you for {final_damage} damage!\n❤️ Your HP: {hunter['hp']}/{hunter.get('max_hp', 100)}",
+                inline=False
+            )
+        
+            # Check if hunter is defeated
+            if state.outcome == DEFEAT:
+                embed.title = "💀 Defeated!"
+                embed.description = f"You were defeated by the {battle['monster']['name']}! You respawn with full health."
+                embed.color = discord.Color.dark_red()
+                embed.add_field(name="Result", value="Battle lost - no rewards gained", inline=False)
+                embed.add_field(name="Respawn", value="Your health has been fully restored!", inline=False)
             
-            # No penalties, just no rewards - respawn with full health
-            hunter['hp'] = hunter.get('max_hp', 100)  # Full health restoration
-            hunter['battle'] = None
+                # No penalties, just no rewards - respawn with full health
+                hunter['hp'] = hunter.get('max_hp', 100)  # Full health restoration
+                hunter['battle'] = None
             
-            # Send completion message to combat channel
-            await send_combat_completion_message(user_id)
+                # Send completion message to combat channel
+                hunter_store.after_commit(user_id, send_combat_completion_message, user_id)
     
-    save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
     
-    # Send to combat channel for all battle-related responses
-    await send_combat_message(ctx, embed)
+        # Send to combat channel for all battle-related responses
+        hunter_store.after_commit(user_id, send_combat_message, ctx, embed)
 
 @bot.command(name='defend')
 async def defend(ctx):
     """Defend against monster attack"""
     user_id = str(ctx.author.id)
     
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is training
-    is_training, training_message = check_if_training(user_id)
-    if is_training:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, training_message)
-        await ctx.send(embed=embed)
-        return
-    
-    hunters_data = load_hunters_data()
+    async with hunter_store.transaction(user_id):
+        hunters_data = load_hunters_data()
 
-    if user_id not in hunters_data:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
-        await ctx.send(embed=embed)
-        return
+        if user_id not in hunters_data:
+            from utils.theme_utils import get_error_embed
+            embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            return
 
-    hunter = hunters_data[user_id]
+        hunter = hunters_data[user_id]
     
-    # Check for gate battle first
-    if hunter.get('gate_battle'):
-        await handle_gate_battle_defend(ctx, user_id, hunter, hunters_data)
-        return
+        # Check for PvP battle
+        pvp_cog = bot.get_cog('PvPSystem')
+        if pvp_cog and pvp_cog.find_battle(user_id)[0]:
+            hunter_store.after_commit(user_id, pvp_cog.take_turn, ctx, user_id, DEFEND)
+            return
     
-    # Check for dungeon battle
-    dungeon_cog = bot.get_cog('DungeonRaids')
-    if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
-        if hunter.get('dungeon_battle'):
-            await handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dungeon_cog)
+        # Check for gate battle
+        if hunter.get('gate_battle'):
+            await handle_gate_battle_defend(ctx, user_id, hunter, hunters_data)
             return
     
-    # Regular hunt battle
-    battle = hunter.get('battle')
+        # Check for dungeon battle
+        dungeon_cog = bot.get_cog('DungeonRaids')
+        if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
+            if hunter.get('dungeon_battle'):
+                await handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dungeon_cog)
+                return
     
-    if not battle:
-        await ctx.send("You're not in battle! Use `.hunt` to find monsters.")
-        return
+        # Regular hunt battle
+        battle = hunter.get('battle')
+    
+        if not battle:
+            hunter_store.after_commit(user_id, ctx.send, "You're not in battle! Use `.hunt` to find monsters.")
+            return
 
-    if battle['turn'] != 'hunter':
-        await ctx.send("It's not your turn!")
-        return
+        if battle['turn'] != 'hunter':
+            hunter_store.after_commit(user_id, ctx.send, "It's not your turn!")
+            return
 
-    import random
-    
-    # Defending reduces incoming damage and may restore some HP/MP
-    monster_damage = battle['monster']['attack']
-    defense_reduction = hunter['agility'] + hunter['intelligence'] // 2
-    reduced_damage = max(1, monster_damage - defense_reduction)
+        # Defending reduces incoming damage and may restore some HP
+        monster_damage = battle['monster']['attack']
+        state, events = play_battle_turn(hunter, battle, DEFEND, COMMAND_HUNT_RULES, defense=hunter.get('defense', 5))
+        reduced_damage = damage_dealt(events, ENEMY)
     
-    hunter['hp'] = max(0, hunter['hp'] - reduced_damage)
-    
-    # Small chance to restore HP/MP when defending
-    if random.random() < 0.3:  # 30% chance
-        heal_amount = random.randint(5, 15)
-        hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + heal_amount)
-        heal_msg = f"\nYou recovered {heal_amount} HP while defending!"
-    else:
-        heal_msg = ""
+        heal = find_event(events, HEAL)
+        heal_msg = f"\nYou recovered {heal.amount} HP while defending!" if heal else ""
 
-    embed = discord.Embed(
-        title="🛡️ Defend!",
-        description=f"You brace for the {battle['monster']['name']}'s attack!",
-        color=discord.Color.blue()
-    )
+        embed = discord.Embed(
+            title="🛡️ Defend!",
+            description=f"You brace for the {battle['monster']['name']}'s attack!",
+            color=discord.Color.blue()
+        )
     
-    embed.add_field(
-        name="Defense Result",
-        value=f"Reduced damage to {reduced_damage} (from {monster_damage})!\n❤️ Your HP: {hunter['hp']}/{hunter.get('max_hp', 100)}{heal_msg}",
-        inline=False
-    )
+        embed.add_field(
+            name="Defense Result",
+            value=f"Reduced damage to {reduced_damage} (from {monster_damage})!\n❤️ Your HP: {hunter['hp']}/{hunter.get('max_hp', 100)}{heal_msg}",
+            inline=False
+        )
     
-    embed.add_field(
-        name="Monster Status",
-        value=f"❤️ HP: {battle['monster_hp']}/{battle['monster']['hp']}",
-        inline=True
-    )
+        embed.add_field(
+            name="Monster Status",
+            value=f"❤️ HP: {battle['monster_hp']}/{battle['monster']['hp']}",
+            inline=True
+        )
     
-    # Check if hunter is defeated
-    if hunter['hp'] <= 0:
-        embed.title = "💀 Defeated!"
-        embed.description = f"Even while defending, the {battle['monster']['name']} was too strong! You respawn with full health."
-        embed.color = discord.Color.dark_red()
-        embed.add_field(name="Result", value="Battle lost - no rewards gained", inline=False)
-        embed.add_field(name="Respawn", value="Your health has been fully restored!", inline=False)
+        # Check if hunter is defeated
+        if state.outcome == DEFEAT:
+            embed.title = "💀 Defeated!"
+            embed.description = f"Even while defending, the {battle['monster']['name']} was too strong! You respawn with full health."
+            embed.color = discord.Color.dark_red()
+            embed.add_field(name="Result", value="Battle lost - no rewards gained", inline=False)
+            embed.add_field(name="Respawn", value="Your health has been fully restored!", inline=False)
         
-        # No penalties, just no rewards - respawn with full health
-        hunter['hp'] = hunter.get('max_hp', 100)  # Full health restoration
-        hunter['battle'] = None
+            # No penalties, just no rewards - respawn with full health
+            hunter['hp'] = hunter.get('max_hp', 100)  # Full health restoration
+            hunter['battle'] = None
         
-        # Send completion message to combat channel
-        await send_combat_completion_message(user_id)
+            # Send completion message to combat channel
+            hunter_store.after_commit(user_id, send_combat_completion_message, user_id)
     
-    save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
     
-    # Send to combat channel for all defend-related responses
-    await send_combat_message(ctx, embed)
+        # Send to combat channel for all defend-related responses
+        hunter_store.after_commit(user_id, send_combat_message, ctx, embed)
 
 @bot.command(name='flee')
 async def flee(ctx):
     """Flee from battle"""
     user_id = str(ctx.author.id)
     
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
-        return
-    
-    # Check if player is training
-    is_training, training_message = check_if_training(user_id)
-    if is_training:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, training_message)
-        await ctx.send(embed=embed)
-        return
-    
-    hunters_data = load_hunters_data()
+    async with hunter_store.transaction(user_id):
+        hunters_data = load_hunters_data()
 
-    if user_id not in hunters_data:
-        await ctx.send("You need to start your journey first! Use `.start`")
-        return
+        if user_id not in hunters_data:
+            hunter_store.after_commit(user_id, ctx.send, "You need to start your journey first! Use `.start`")
+            return
 
-    hunter = hunters_data[user_id]
-    
-    # Check for gate battle first
-    if hunter.get('gate_battle'):
-        await handle_gate_battle_flee(ctx, user_id, hunter, hunters_data)
-        return
+        hunter = hunters_data[user_id]
     
-    # Check for dungeon battle
-    dungeon_cog = bot.get_cog('DungeonRaids')
-    if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
-        if hunter.get('dungeon_battle'):
-            await handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon_cog)
+        # Check for gate battle first
+        if hunter.get('gate_battle'):
+            await handle_gate_battle_flee(ctx, user_id, hunter, hunters_data)
             return
     
-    # Regular hunt battle
-    battle = hunter.get('battle')
+        # Check for dungeon battle
+        dungeon_cog = bot.get_cog('DungeonRaids')
+        if dungeon_cog and hasattr(dungeon_cog, 'active_raids') and user_id in dungeon_cog.active_raids:
+            if hunter.get('dungeon_battle'):
+                await handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon_cog)
+                return
     
-    if not battle:
-        await ctx.send("You're not in battle!")
-        return
-
-    import random
+        # Regular hunt battle
+        battle = hunter.get('battle')
     
-    # Flee success chance based on agility
-    flee_chance = 0.5 + (hunter['agility'] * 0.02)  # Base 50% + agility bonus
-    flee_chance = min(0.9, flee_chance)  # Cap at 90%
+        if not battle:
+            hunter_store.after_commit(user_id, ctx.send, "You're not in battle!")
+            return
+
+        # Flee success chance is 50% + 2% per agility, capped at 90%
+        state, events = play_battle_turn(hunter, battle, FLEE, COMMAND_HUNT_RULES, defense=hunter.get('defense', 5))
     
-    if random.random() < flee_chance:
-        # Successful flee
-        hunter['battle'] = None
+        if state.outcome == ESCAPED:
+            # Successful flee
+            hunter['battle'] = None
         
-        embed = discord.Embed(
-            title="🏃 Escaped!",
-            description=f"You successfully fled from the {battle['monster']['name']}!",
-            color=discord.Color.yellow()
-        )
-        embed.add_field(name="Result", value="You escaped without rewards, but you're safe!", inline=False)
-    else:
-        # Failed flee - monster gets free attack
-        monster_damage = battle['monster']['attack'] + random.randint(1, 10)
-        hunter['hp'] = max(0, hunter['hp'] - monster_damage)
+            embed = discord.Embed(
+                title="🏃 Escaped!",
+                description=f"You successfully fled from the {battle['monster']['name']}!",
+                color=discord.Color.yellow()
+            )
+            embed.add_field(name="Result", value="You escaped without rewards, but you're safe!", inline=False)
+        else:
+            # Failed flee - monster gets free attack
+            monster_damage = damage_dealt(events, ENEMY)
         
-        embed = discord.Embed(
-            title="🏃 Flee Failed!",
-            description=f"You couldn't escape! The {battle['monster']['name']} attacks as you try to flee!",
-            color=discord.Color.red()
-        )
-        embed.add_field(
-            name="Attack of Opportunity",
-            value=f"You took {monster_damage} damage!\n❤️ HP: {hunter['hp']}/{hunter.get('max_hp', 100)}",
-            inline=False
-        )
+            embed = discord.Embed(
+                title="🏃 Flee Failed!",
+                description=f"You couldn't escape! The {battle['monster']['name']} attacks as you try to flee!",
+                color=discord.Color.red()
+            )
+            embed.add_field(
+                name="Attack of Opportunity",
+                value=f"You took {monster_damage} damage!\n❤️ HP: {hunter['hp']}/{hunter.get('max_hp', 100)}",
+                inline=False
+            )
         
-        if hunter['hp'] <= 0:
-            embed.add_field(name="Defeated", value="You were caught and defeated while fleeing!", inline=False)
-            hunter['exp'] = max(0, hunter['exp'] - 75)  # Higher penalty for failed flee
-            hunter['gold'] = max(0, hunter.get('gold', 0) - 50)
-            hunter['hp'] = 1
-            hunter['battle'] = None
+            if state.outcome == DEFEAT:
+                embed.add_field(name="Defeated", value="You were caught and defeated while fleeing!", inline=False)
+                hunter['exp'] = max(0, hunter['exp'] - 75)  # Higher penalty for failed flee
+                hunter['gold'] = max(0, hunter.get('gold', 0) - 50)
+                hunter['hp'] = 1
+                hunter['battle'] = None
             
-            # Send completion message to combat channel
-            await send_combat_completion_message(user_id)
+                # Send completion message to combat channel
+                hunter_store.after_commit(user_id, send_combat_completion_message, user_id)
     
-    save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
     
-    # Send to combat channel for all flee-related responses
-    await send_combat_message(ctx, embed)
+        # Send to combat channel for all flee-related responses
+        hunter_store.after_commit(user_id, send_combat_message, ctx, embed)
 
 
 
@@ -2133,118 +1499,108 @@ async def claim_quest_rewards(ctx):
     """Claim rewards for completed quests"""
     user_id = str(ctx.author.id)
     
-    # Check if player is resting
-    is_resting, rest_message = check_if_resting(user_id)
-    if is_resting:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, rest_message)
-        await ctx.send(embed=embed)
-        return
-    
-    hunters_data = load_hunters_data()
+    async with hunter_store.transaction(user_id):
+        hunters_data = load_hunters_data()
 
-    if user_id not in hunters_data:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
-        await ctx.send(embed=embed)
-        return
+        if user_id not in hunters_data:
+            from utils.theme_utils import get_error_embed
+            embed = get_error_embed(ctx.author.id, "You need to start your journey first! Use `.start`")
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            return
 
-    hunter = hunters_data[user_id]
-    quests = hunter.get('quests', {})
-    daily_quests = quests.get('daily', {})
-    weekly_quests = quests.get('weekly', {})
-    special_quests = quests.get('special', {})
-    
-    claimed_rewards = {'gold': 0, 'exp': 0}
-    claimed_quests = []
-    special_items = []
-    
-    # Check daily quests
-    for quest_id, quest in daily_quests.items():
-        if quest.get('completed', False) and not quest.get('claimed', False):
-            claimed_rewards['gold'] += quest.get('reward_gold', 0)
-            claimed_rewards['exp'] += quest.get('reward_exp', 0)
-            quest['claimed'] = True
-            claimed_quests.append(f"Daily: {quest['name']}")
-    
-    # Check weekly quests
-    for quest_id, quest in weekly_quests.items():
-        if quest.get('completed', False) and not quest.get('claimed', False):
-            claimed_rewards['gold'] += quest.get('reward_gold', 0)
-            claimed_rewards['exp'] += quest.get('reward_exp', 0)
-            quest['claimed'] = True
-            claimed_quests.append(f"Weekly: {quest['name']}")
-            
-            # Add special reward to inventory if present
-            if quest.get('special_reward'):
-                special_items.append(quest['special_reward'])
-    
-    # Check special quests
-    for quest_id, quest in special_quests.items():
-        if quest.get('completed', False) and not quest.get('claimed', False):
-            claimed_rewards['gold'] += quest.get('reward_gold', 0)
-            claimed_rewards['exp'] += quest.get('reward_exp', 0)
-            quest['claimed'] = True
-            claimed_quests.append(f"Special: {quest['name']}")
-            
-            # Add special reward to inventory if present
-            if quest.get('special_reward'):
-                special_items.append(quest['special_reward'])
-    
-    # Add special items to inventory
-    if special_items:
-        if 'inventory' not in hunter:
-            hunter['inventory'] = {}
+        hunter = hunters_data[user_id]
+        quests = hunter.get('quests', {})
+        daily_quests = quests.get('daily', {})
+        weekly_quests = quests.get('weekly', {})
+        special_quests = quests.get('special', {})
+    
+        claimed_rewards = {'gold': 0, 'exp': 0}
+        claimed_quests = []
+        special_items = []
+    
+        # Check daily quests
+        for quest_id, quest in daily_quests.items():
+            if quest.get('completed', False) and not quest.get('claimed', False):
+                claimed_rewards['gold'] += quest.get('reward_gold', 0)
+                claimed_rewards['exp'] += quest.get('reward_exp', 0)
+                quest['claimed'] = True
+                claimed_quests.append(f"Daily: {quest['name']}")
+    
+        # Check weekly quests
+        for quest_id, quest in weekly_quests.items():
+            if quest.get('completed', False) and not quest.get('claimed', False):
+                claimed_rewards['gold'] += quest.get('reward_gold', 0)
+                claimed_rewards['exp'] += quest.get('reward_exp', 0)
+                quest['claimed'] = True
+                claimed_quests.append(f"Weekly: {quest['name']}")
+            
+                # Add special reward to inventory if present
+                if quest.get('special_reward'):
+                    special_items.append(quest['special_reward'])
+    
+        # Check special quests
+        for quest_id, quest in special_quests.items():
+            if quest.get('completed', False) and not quest.get('claimed', False):
+                claimed_rewards['gold'] += quest.get('reward_gold', 0)
+                claimed_rewards['exp'] += quest.get('reward_exp', 0)
+                quest['claimed'] = True
+                claimed_quests.append(f"Special: {quest['name']}")
+            
+                # Add special reward to inventory if present
+                if quest.get('special_reward'):
+                    special_items.append(quest['special_reward'])
+    
+        # Add special items to inventory
         for item in special_items:
-            hunter['inventory'][item] = hunter['inventory'].get(item, 0) + 1
+            add_item(hunter, item)
     
-    if not claimed_quests:
-        from utils.theme_utils import get_error_embed
-        embed = get_error_embed(ctx.author.id, "No completed quests to claim!")
-        await ctx.send(embed=embed)
-        return
+        if not claimed_quests:
+            from utils.theme_utils import get_error_embed
+            embed = get_error_embed(ctx.author.id, "No completed quests to claim!")
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            return
     
-    # Award rewards using new leveling system
-    hunter['gold'] = hunter.get('gold', 0) + claimed_rewards['gold']
+        # Award rewards using new leveling system
+        hunter['gold'] = hunter.get('gold', 0) + claimed_rewards['gold']
     
-    level_up_msg = ""
-    if claimed_rewards['exp'] > 0:
-        level_up_data = await award_exp(user_id, claimed_rewards['exp'], bot, "quest_complete")
+        level_up_msg = ""
+        if claimed_rewards['exp'] > 0:
+            level_up_data = await award_exp(user_id, claimed_rewards['exp'], bot, "quest_complete")
         
-        # Handle level up notifications
-        if level_up_data.get("levels_gained", 0) > 0:
-            await send_level_up_notification(ctx.author, level_up_data)
-            level_up_msg = f"\n🎉 **LEVEL UP!** You are now level {level_up_data['new_level']}!"
+            # Handle level up notifications
+            if level_up_data.get("levels_gained", 0) > 0:
+                hunter_store.after_commit(user_id, send_level_up_notification, ctx.author, level_up_data)
+                level_up_msg = f"\n🎉 **LEVEL UP!** You are now level {level_up_data['new_level']}!"
     
-    save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
     
-    from utils.theme_utils import get_user_theme_colors
-    colors = get_user_theme_colors(ctx.author.id)
+        from utils.theme_utils import get_user_theme_colors
+        colors = get_user_theme_colors(ctx.author.id)
     
-    embed = discord.Embed(
-        title="🎁 Quest Rewards Claimed!",
-        description="You have successfully claimed your quest rewards",
-        color=discord.Color(colors['accent'])
-    )
+        embed = discord.Embed(
+            title="🎁 Quest Rewards Claimed!",
+            description="You have successfully claimed your quest rewards",
+            color=discord.Color(colors['accent'])
+        )
     
-    embed.add_field(
-        name="Completed Quests",
-        value="\n".join(f"✅ {quest}" for quest in claimed_quests),
-        inline=False
-    )
+        embed.add_field(
+            name="Completed Quests",
+            value="\n".join(f"✅ {quest}" for quest in claimed_quests),
+            inline=False
+        )
     
-    reward_text = f"💰 {claimed_rewards['gold']} Gold\n⭐ {claimed_rewards['exp']} EXP"
-    if special_items:
-        reward_text += f"\n🎁 {', '.join(special_items)}"
-    reward_text += level_up_msg
+        reward_text = f"💰 {claimed_rewards['gold']} Gold\n⭐ {claimed_rewards['exp']} EXP"
+        if special_items:
+            reward_text += f"\n🎁 {', '.join(special_items)}"
+        reward_text += level_up_msg
     
-    embed.add_field(
-        name="Rewards Received",
-        value=reward_text,
-        inline=False
-    )
+        embed.add_field(
+            name="Rewards Received",
+            value=reward_text,
+            inline=False
+        )
     
-    await ctx.send(embed=embed)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 @bot.command(name='reset_stuck')
 async def reset_stuck_command(ctx):
@@ -2255,8 +1611,6 @@ async def reset_stuck_command(ctx):
         await ctx.send("You don't have permission to use this command.")
         return
     
-    reset_stuck_players()
-    
     # Clear active explorations and raids from cogs
     for cog_name in bot.cogs:
         cog = bot.get_cog(cog_name)
@@ -2267,6 +1621,8 @@ async def reset_stuck_command(ctx):
             cleared_raids = len(cog.active_raids)
             cog.active_raids.clear()
     
+    await reset_stuck_players()
+    
     await ctx.send("✅ All stuck player states have been reset! Players can now use commands normally.")
 
 @bot.command(name='my_adventure')
@@ -2275,31 +1631,25 @@ async def my_adventure(ctx):
     user_id = str(ctx.author.id)
     
     # Check if player has an adventure channel
-    if user_id in player_combat_channels:
-        channel_id = player_combat_channels[user_id]
-        adventure_channel = bot.get_channel(channel_id)
-        
-        if adventure_channel:
-            from utils.theme_utils import get_info_embed
-            embed = get_info_embed(
-                "🌀 Your Personal Adventure",
-                f"Your adventure space: {adventure_channel.mention}\n\n"
-                f"All your battles and adventures take place in this private channel. "
-                f"Only you can access this dimensional space where you can:\n\n"
-                f"⚔️ Fight monsters with `.hunt`\n"
-                f"🚪 Explore gates with `.gates`\n"
-                f"🏰 Raid dungeons with `.dungeons`\n"
-                f"🛡️ Use combat commands: `.attack`, `.defend`, `.flee`\n\n"
-                f"Visit your adventure channel to continue any active battles!"
-            )
-            await ctx.send(embed=embed)
-            return
-        else:
-            # Channel was deleted, remove from tracking
-            del player_combat_channels[user_id]
-            save_combat_channels()
+    adventure_channel = combat_channels.get(user_id)
+    if adventure_channel:
+        combat_channels.touch(user_id)
+        from utils.theme_utils import get_info_embed
+        embed = get_info_embed(
+            "🌀 Your Personal Adventure",
+            f"Your adventure space: {adventure_channel.mention}\n\n"
+            f"All your battles and adventures take place in this private channel. "
+            f"Only you can access this dimensional space where you can:\n\n"
+            f"⚔️ Fight monsters with `.hunt`\n"
+            f"🚪 Explore gates with `.gates`\n"
+            f"🏰 Raid dungeons with `.dungeons`\n"
+            f"🛡️ Use combat commands: `.attack`, `.defend`, `.flee`\n\n"
+            f"Visit your adventure channel to continue any active battles!"
+        )
+        await ctx.send(embed=embed)
+        return
     
-    # Create a new adventure channel for the player
+    # Lease a new adventure channel for the player
     try:
         adventure_channel = await create_combat_channel(ctx.author)
         if adventure_channel:
@@ -2361,7 +1711,7 @@ async def set_jinwoo(ctx, target: discord.Member = None):
             'intelligence': 10,
             'defense': 5,
             'gold': 0,
-            'inventory': [],
+            'inventory': {},
             'equipment': {'weapon': None, 'armor': None, 'accessory': None},
             'theme': 'shadow'
         }
@@ -2404,7 +1754,7 @@ async def set_jinwoo(ctx, target: discord.Member = None):
     if 'dungeon_battle' in hunter:
         del hunter['dungeon_battle']
     
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     await ctx.send(f"✅ {target.mention} has been set as **Sung Jinwoo, the Shadow Monarch**!\n"
                    f"Level 100 • Monarch Rank • 2500 HP • 1500 MP\n"
@@ -2438,7 +1788,7 @@ async def set_level(ctx, user_id: str, level: int):
             'intelligence': 10,
             'defense': 5,
             'gold': 0,
-            'inventory': [],
+            'inventory': {},
             'equipment': {'weapon': None, 'armor': None, 'accessory': None},
             'theme': 'default'
         }
@@ -2469,7 +1819,7 @@ async def set_level(ctx, user_id: str, level: int):
     hunter['intelligence'] = hunter.get('base_intelligence', 10) + stat_gain
     hunter['defense'] = hunter.get('base_defense', 5) + stat_gain
     
-    save_hunters_data(hunters_data)
+    hunter_store.mark_dirty(user_id)
     
     try:
         user = bot.get_user(int(user_id))
@@ -2536,30 +1886,84 @@ async def migrate_exp_system(ctx):
         return
     
     hunters_data = load_hunters_data()
-    migrated_count = 0
+    hunters = list(hunters_data.values())
     
-    for user_id, hunter in hunters_data.items():
-        # Convert old EXP system to new system
-        old_level = hunter.get('level', 1)
-        old_exp = hunter.get('exp', 0)
-        
-        # Calculate appropriate total EXP for their current level
-        if old_level <= 1:
-            new_total_exp = 0
-        else:
-            # Give them EXP equivalent to their level achievement
-            new_total_exp = leveling_system._exp_table.get(old_level, 0)
-        
-        # Update their data
+    # Give everyone the total EXP that starts the level they had reached
+    new_totals = [
+        leveling_system._exp_table.get(hunter.get('level', 1), 0) if hunter.get('level', 1) > 1 else 0
+        for hunter in hunters
+    ]
+    
+    # Levels and ranks for every hunter in one batch
+    batch = leveling_system.batch_levels(new_totals)
+    for hunter, new_total_exp, level, rank in zip(hunters, new_totals, batch.levels, batch.ranks):
         hunter['exp'] = new_total_exp
-        hunter['level'] = leveling_system.get_level_from_exp(new_total_exp)
-        hunter['rank'] = leveling_system.get_rank_for_level(hunter['level'])
-        
-        migrated_count += 1
+        hunter['level'] = level
+        hunter['rank'] = rank
+    migrated_count = len(hunters)
     
     save_hunters_data(hunters_data)
+    
+    # Bring everyone's rank role in line; the sync service paces the edits per guild
+    for user_id, level in zip(hunters_data.keys(), batch.levels):
+        role_sync.request_for_user(bot, user_id, level, notify=False)
     await ctx.send(f"✅ Migrated {migrated_count} players to the new EXP system!")
 
+@bot.command(name='notifications', aliases=['dms'])
+async def notification_settings(ctx, mode: str = ""):
+    """Choose which EXP and level-up DMs you get: all, levels or off"""
+    user_id = str(ctx.author.id)
+    if hunter_store.get(user_id) is None:
+        await ctx.send("You need to start your journey first! Use `.start`")
+        return
+    
+    mode = mode.lower()
+    if not mode:
+        await ctx.send(f"🔔 DM notifications: **{get_notify_mode(user_id)}**\n"
+                       f"Use `.notifications all`, `.notifications levels` (level-ups and promotions only) or `.notifications off`.")
+        return
+    if mode not in NOTIFY_MODES:
+        await ctx.send(f"Unknown mode '{mode}'. Choose one of: {', '.join(NOTIFY_MODES)}")
+        return
+    
+    async with hunter_store.transaction(user_id) as hunter:
+        hunter['dm_notifications'] = mode
+    await ctx.send(f"🔔 DM notifications set to **{mode}**.")
+
+@bot.command(name='leaderboard', aliases=['lb', 'top'])
+async def show_leaderboard(ctx, metric: str = "level", page: int = 1):
+    """Show the top hunters by level, exp, gold, pvp_wins or pvp_winrate"""
+    board = resolve_metric(metric)
+    if board is None:
+        await ctx.send(f"Unknown leaderboard '{metric}'. Choose one of: {', '.join(METRICS)}")
+        return
+    
+    page_size = 10
+    total = leaderboards.size(board)
+    pages = max(1, (total + page_size - 1) // page_size)
+    page = min(max(page, 1), pages)
+    entries = leaderboards.top(board, page_size, (page - 1) * page_size)
+    colors = get_user_theme_colors(ctx.author.id)
+    
+    embed = discord.Embed(
+        title=f"🏆 {METRICS[board].title} Leaderboard",
+        color=discord.Color(colors['accent'])
+    )
+    if entries:
+        embed.description = "\n".join(
+            f"`{entry.position}.` **{leaderboards.display_name(bot, entry.user_id)}** — {METRICS[board].value(entry.hunter)}"
+            for entry in entries
+        )
+    else:
+        embed.description = "No hunters on this leaderboard yet!"
+    
+    position = leaderboards.position(ctx.author.id, board)
+    footer = f"Page {page}/{pages}"
+    if position is not None:
+        footer += f" • Your position: #{position} of {total}"
+    embed.set_footer(text=footer)
+    await ctx.send(embed=embed)
+
 @bot.command(name='exp_info', aliases=['leveling'])
 async def exp_info(ctx):
     """Display detailed leveling system information"""
@@ -2724,7 +2128,7 @@ async def commands_help(ctx):
     # PvP & Social Features
     embed.add_field(
         name="🥊 **PVP & SOCIAL**",
-        value="```\n.pvp @user → Challenge hunter\n.rankings  → Leaderboards\n.themes    → Customize UI\n.set_theme <name>```",
+        value="```\n.pvp @user → Challenge hunter\n.rankings  → PvP rankings\n.leaderboard <metric> → Top hunters\n.themes    → Customize UI\n.set_theme <name>```",
         inline=True
     )
     
@@ -2885,7 +2289,7 @@ async def check_rank(ctx):
             # Check if ready for rank up
             old_rank = hunter.get('rank', 'E')
             if check_rank_up(hunter):
-                save_hunters_data(hunters_data)
+                hunter_store.mark_dirty(user_id)
                 
                 # Add global rank announcement
                 events_cog = bot.get_cog('GlobalEvents')
@@ -2930,13 +2334,8 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
             'total_gold': 0
         }
     
-    # Calculate damage
-    import random
-    base_damage = hunter['strength'] + random.randint(1, 10)
-    damage = max(1, base_damage)
-    
-    # Apply damage to monster
-    battle['monster_hp'] = max(0, battle['monster_hp'] - damage)
+    state, events = play_battle_turn(hunter, battle, ATTACK, FLOOR_RULES, defense=hunter['agility'] // 2)
+    damage = damage_dealt(events, PLAYER)
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
@@ -2953,7 +2352,7 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
         return f"{bar} {current}/{maximum}"
     
     # Check if monster is defeated
-    if battle['monster_hp'] <= 0:
+    if state.outcome == VICTORY:
         # Monster defeated - advance to next floor or complete
         gates_cog = bot.get_cog('Gates')
         if gates_cog and hasattr(gates_cog, 'active_explorations') and user_id in gates_cog.active_explorations:
@@ -2986,26 +2385,25 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
             
             # Check if this was the boss floor
             if battle['is_boss']:
-                save_hunters_data(hunters_data)
-                await ctx.send(embed=embed)
-                await gates_cog.complete_gate_exploration(ctx, user_id, True)
+                hunter_store.mark_dirty(user_id)
+                hunter_store.after_commit(user_id, ctx.send, embed=embed)
+                hunter_store.after_commit(user_id, gates_cog.complete_gate_exploration, ctx, user_id, True)
             else:
                 # Advance to next floor
                 exploration['current_floor'] += 1
-                save_hunters_data(hunters_data)
-                await ctx.send(embed=embed)
-                await asyncio.sleep(2)
-                # Validate exploration still exists before proceeding
-                if user_id in gates_cog.active_explorations:
-                    await gates_cog.process_gate_floor(ctx, user_id)
+                hunter_store.mark_dirty(user_id)
+                hunter_store.after_commit(user_id, ctx.send, embed=embed)
+                
+                async def next_floor():
+                    await asyncio.sleep(2)
+                    # Validate exploration still exists before proceeding
+                    if user_id in gates_cog.active_explorations:
+                        await gates_cog.process_gate_floor(ctx, user_id)
+                hunter_store.after_commit(user_id, next_floor)
         return
     
-    # Monster still alive - monster counter-attacks
-    monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-    hunter_defense = hunter['agility'] // 2
-    final_damage = max(1, monster_damage - hunter_defense)
-    
-    hunter['hp'] = max(0, hunter['hp'] - final_damage)
+    # Monster still alive - monster counter-attacked
+    final_damage = damage_dealt(events, ENEMY)
     
     monster_bar = create_progress_bar(battle['monster_hp'], battle['monster']['hp'])
     hunter_bar = create_progress_bar(hunter['hp'], hunter.get('max_hp', 100))
@@ -3023,7 +2421,7 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
     )
     
     # Check if hunter is defeated
-    if hunter['hp'] <= 0:
+    if state.outcome == DEFEAT:
         embed.title = "💀 Defeated!"
         embed.description = f"You were defeated by the {battle['monster']['name']}!"
         embed.color = discord.Color.dark_red()
@@ -3033,9 +2431,9 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
         if gates_cog and hasattr(gates_cog, 'active_explorations') and user_id in gates_cog.active_explorations:
             del hunter['gate_battle']
             hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-            save_hunters_data(hunters_data)
-            await ctx.send(embed=embed)
-            await gates_cog.complete_gate_exploration(ctx, user_id, False)
+            hunter_store.mark_dirty(user_id)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            hunter_store.after_commit(user_id, gates_cog.complete_gate_exploration, ctx, user_id, False)
             return
     else:
         # Battle continues - show combat commands
@@ -3045,8 +2443,8 @@ async def handle_gate_battle_attack(ctx, user_id, hunter, hunters_data):
             inline=False
         )
     
-    save_hunters_data(hunters_data)
-    await ctx.send(embed=embed)
+    hunter_store.mark_dirty(user_id)
+    hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dungeon_cog):
     """Handle attack command for dungeon battles"""
@@ -3059,13 +2457,8 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
     if not battle:
         return
     
-    # Calculate damage
-    import random
-    base_damage = hunter['strength'] + random.randint(1, 10)
-    damage = max(1, base_damage)
-    
-    # Apply damage to monster
-    battle['monster_hp'] = max(0, battle['monster_hp'] - damage)
+    state, events = play_battle_turn(hunter, battle, ATTACK, FLOOR_RULES, defense=hunter['agility'] // 2)
+    damage = damage_dealt(events, PLAYER)
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
@@ -3082,7 +2475,7 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
         return f"{bar} {current}/{maximum}"
     
     # Check if monster is defeated
-    if battle['monster_hp'] <= 0:
+    if state.outcome == VICTORY:
         # Monster defeated - advance to next floor or complete
         exp_gained = battle['monster']['exp_reward']
         gold_gained = battle['monster']['gold_reward']
@@ -3110,24 +2503,23 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
         
         # Check if this was the boss floor
         if battle['is_boss']:
-            save_hunters_data(hunters_data)
-            await ctx.send(embed=embed)
-            await dungeon_cog.complete_raid(ctx, user_id, True)
+            hunter_store.mark_dirty(user_id)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            hunter_store.after_commit(user_id, dungeon_cog.complete_raid, ctx, user_id, True)
         else:
             # Advance to next floor
             raid['current_floor'] += 1
-            save_hunters_data(hunters_data)
-            await ctx.send(embed=embed)
-            await asyncio.sleep(2)
-            await dungeon_cog.process_floor(ctx, user_id)
+            hunter_store.mark_dirty(user_id)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            
+            async def next_floor():
+                await asyncio.sleep(2)
+                await dungeon_cog.process_floor(ctx, user_id)
+            hunter_store.after_commit(user_id, next_floor)
         return
     
-    # Monster still alive - monster counter-attacks
-    monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-    hunter_defense = hunter['agility'] // 2
-    final_damage = max(1, monster_damage - hunter_defense)
-    
-    hunter['hp'] = max(0, hunter['hp'] - final_damage)
+    # Monster still alive - monster counter-attacked
+    final_damage = damage_dealt(events, ENEMY)
     
     monster_bar = create_progress_bar(battle['monster_hp'], battle['monster']['hp'])
     hunter_bar = create_progress_bar(hunter['hp'], hunter.get('max_hp', 100))
@@ -3145,7 +2537,7 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
     )
     
     # Check if hunter is defeated
-    if hunter['hp'] <= 0:
+    if state.outcome == DEFEAT:
         embed.title = "💀 Defeated!"
         embed.description = f"You were defeated by the {battle['monster']['name']}!"
         embed.color = discord.Color.dark_red()
@@ -3153,9 +2545,9 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
         # Complete dungeon raid as failure
         del hunter['dungeon_battle']
         hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-        save_hunters_data(hunters_data)
-        await ctx.send(embed=embed)
-        await dungeon_cog.complete_raid(ctx, user_id, False)
+        hunter_store.mark_dirty(user_id)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
+        hunter_store.after_commit(user_id, dungeon_cog.complete_raid, ctx, user_id, False)
         return
     else:
         # Battle continues - show combat commands
@@ -3165,28 +2557,19 @@ async def handle_dungeon_battle_attack(ctx, user_id, hunter, hunters_data, dunge
             inline=False
         )
     
-    save_hunters_data(hunters_data)
-    await ctx.send(embed=embed)
+    hunter_store.mark_dirty(user_id)
+    hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_gate_battle_defend(ctx, user_id, hunter, hunters_data):
     """Handle defend command for gate battles"""
     battle = hunter['gate_battle']
     
-    import random
-    
-    # Defending reduces incoming damage and may restore some HP/MP
-    monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-    defense_reduction = hunter['agility'] + hunter['intelligence'] // 2
-    reduced_damage = max(1, monster_damage - defense_reduction)
+    # Defending reduces incoming damage and may restore some HP
+    state, events = play_battle_turn(hunter, battle, DEFEND, FLOOR_RULES, defense=hunter['agility'] // 2)
+    reduced_damage = damage_dealt(events, ENEMY)
     
-    hunter['hp'] = max(0, hunter['hp'] - reduced_damage)
-    
-    # Small chance to restore HP/MP when defending
-    heal_msg = ""
-    if random.random() < 0.3:  # 30% chance
-        heal_amount = random.randint(5, 15)
-        hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + heal_amount)
-        heal_msg = f"\nYou recovered {heal_amount} HP while defending!"
+    heal = find_event(events, HEAL)
+    heal_msg = f"\nYou recovered {heal.amount} HP while defending!" if heal else ""
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
@@ -3218,7 +2601,7 @@ async def handle_gate_battle_defend(ctx, user_id, hunter, hunters_data):
     )
     
     # Check if hunter is defeated
-    if hunter['hp'] <= 0:
+    if state.outcome == DEFEAT:
         embed.title = "💀 Defeated!"
         embed.description = f"You were defeated by the {battle['monster']['name']}!"
         embed.color = discord.Color.dark_red()
@@ -3228,33 +2611,24 @@ async def handle_gate_battle_defend(ctx, user_id, hunter, hunters_data):
         if gates_cog and hasattr(gates_cog, 'active_explorations') and user_id in gates_cog.active_explorations:
             del hunter['gate_battle']
             hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-            save_hunters_data(hunters_data)
-            await ctx.send(embed=embed)
-            await gates_cog.complete_gate_exploration(ctx, user_id, False)
+            hunter_store.mark_dirty(user_id)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            hunter_store.after_commit(user_id, gates_cog.complete_gate_exploration, ctx, user_id, False)
             return
     
-    save_hunters_data(hunters_data)
-    await ctx.send(embed=embed)
+    hunter_store.mark_dirty(user_id)
+    hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dungeon_cog):
     """Handle defend command for dungeon battles"""
     battle = hunter['dungeon_battle']
     
-    import random
+    # Defending reduces incoming damage and may restore some HP
+    state, events = play_battle_turn(hunter, battle, DEFEND, FLOOR_RULES, defense=hunter['agility'] // 2)
+    reduced_damage = damage_dealt(events, ENEMY)
     
-    # Defending reduces incoming damage and may restore some HP/MP
-    monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-    defense_reduction = hunter['agility'] + hunter['intelligence'] // 2
-    reduced_damage = max(1, monster_damage - defense_reduction)
-    
-    hunter['hp'] = max(0, hunter['hp'] - reduced_damage)
-    
-    # Small chance to restore HP/MP when defending
-    heal_msg = ""
-    if random.random() < 0.3:  # 30% chance
-        heal_amount = random.randint(5, 15)
-        hunter['hp'] = min(hunter.get('max_hp', 100), hunter['hp'] + heal_amount)
-        heal_msg = f"\nYou recovered {heal_amount} HP while defending!"
+    heal = find_event(events, HEAL)
+    heal_msg = f"\nYou recovered {heal.amount} HP while defending!" if heal else ""
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
@@ -3286,7 +2660,7 @@ async def handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dunge
     )
     
     # Check if hunter is defeated
-    if hunter['hp'] <= 0:
+    if state.outcome == DEFEAT:
         embed.title = "💀 Defeated!"
         embed.description = f"You were defeated by the {battle['monster']['name']}!"
         embed.color = discord.Color.dark_red()
@@ -3294,33 +2668,30 @@ async def handle_dungeon_battle_defend(ctx, user_id, hunter, hunters_data, dunge
         # Complete dungeon raid as failure
         del hunter['dungeon_battle']
         hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-        save_hunters_data(hunters_data)
-        await ctx.send(embed=embed)
-        await dungeon_cog.complete_raid(ctx, user_id, False)
+        hunter_store.mark_dirty(user_id)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
+        hunter_store.after_commit(user_id, dungeon_cog.complete_raid, ctx, user_id, False)
         return
     
-    save_hunters_data(hunters_data)
-    await ctx.send(embed=embed)
+    hunter_store.mark_dirty(user_id)
+    hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_gate_battle_flee(ctx, user_id, hunter, hunters_data):
     """Handle flee command for gate battles"""
     battle = hunter['gate_battle']
     
-    import random
-    
-    # Flee success chance based on agility
-    flee_chance = 0.5 + (hunter['agility'] * 0.02)  # Base 50% + agility bonus
-    flee_chance = min(0.9, flee_chance)  # Cap at 90%
+    # Flee success chance is 50% + 2% per agility, capped at 90%
+    state, events = play_battle_turn(hunter, battle, FLEE, FLOOR_RULES, defense=hunter['agility'] // 2)
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
     
-    if random.random() < flee_chance:
+    if state.outcome == ESCAPED:
         # Successful flee - complete gate exploration as failure
         gates_cog = bot.get_cog('Gates')
         if gates_cog and hasattr(gates_cog, 'active_explorations') and user_id in gates_cog.active_explorations:
             del hunter['gate_battle']
-            save_hunters_data(hunters_data)
+            hunter_store.mark_dirty(user_id)
             
             embed = discord.Embed(
                 title="🏃 Escaped!",
@@ -3328,12 +2699,11 @@ async def handle_gate_battle_flee(ctx, user_id, hunter, hunters_data):
                 color=discord.Color.yellow()
             )
             embed.add_field(name="Result", value="You escaped but failed to complete the gate exploration.", inline=False)
-            await ctx.send(embed=embed)
-            await gates_cog.complete_gate_exploration(ctx, user_id, False)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            hunter_store.after_commit(user_id, gates_cog.complete_gate_exploration, ctx, user_id, False)
     else:
         # Failed flee - monster gets free attack
-        monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-        hunter['hp'] = max(0, hunter['hp'] - monster_damage)
+        monster_damage = damage_dealt(events, ENEMY)
         
         embed = discord.Embed(
             title="❌ Flee Failed!",
@@ -3347,37 +2717,34 @@ async def handle_gate_battle_flee(ctx, user_id, hunter, hunters_data):
         )
         
         # Check if hunter is defeated
-        if hunter['hp'] <= 0:
+        if state.outcome == DEFEAT:
             embed.add_field(name="💀 Defeated!", value="You were defeated while trying to flee!", inline=False)
             gates_cog = bot.get_cog('Gates')
             if gates_cog and hasattr(gates_cog, 'active_explorations') and user_id in gates_cog.active_explorations:
                 del hunter['gate_battle']
                 hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-                save_hunters_data(hunters_data)
-                await ctx.send(embed=embed)
-                await gates_cog.complete_gate_exploration(ctx, user_id, False)
+                hunter_store.mark_dirty(user_id)
+                hunter_store.after_commit(user_id, ctx.send, embed=embed)
+                hunter_store.after_commit(user_id, gates_cog.complete_gate_exploration, ctx, user_id, False)
                 return
         
-        save_hunters_data(hunters_data)
-        await ctx.send(embed=embed)
+        hunter_store.mark_dirty(user_id)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon_cog):
     """Handle flee command for dungeon battles"""
     battle = hunter['dungeon_battle']
     
-    import random
-    
-    # Flee success chance based on agility
-    flee_chance = 0.5 + (hunter['agility'] * 0.02)  # Base 50% + agility bonus
-    flee_chance = min(0.9, flee_chance)  # Cap at 90%
+    # Flee success chance is 50% + 2% per agility, capped at 90%
+    state, events = play_battle_turn(hunter, battle, FLEE, FLOOR_RULES, defense=hunter['agility'] // 2)
     
     from utils.theme_utils import get_user_theme_colors
     colors = get_user_theme_colors(ctx.author.id)
     
-    if random.random() < flee_chance:
+    if state.outcome == ESCAPED:
         # Successful flee - complete dungeon raid as failure
         del hunter['dungeon_battle']
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         embed = discord.Embed(
             title="🏃 Escaped!",
@@ -3385,12 +2752,11 @@ async def handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon
             color=discord.Color.yellow()
         )
         embed.add_field(name="Result", value="You escaped but failed to complete the dungeon raid.", inline=False)
-        await ctx.send(embed=embed)
-        await dungeon_cog.complete_raid(ctx, user_id, False)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
+        hunter_store.after_commit(user_id, dungeon_cog.complete_raid, ctx, user_id, False)
     else:
         # Failed flee - monster gets free attack
-        monster_damage = battle['monster']['attack'] + random.randint(1, 5)
-        hunter['hp'] = max(0, hunter['hp'] - monster_damage)
+        monster_damage = damage_dealt(events, ENEMY)
         
         embed = discord.Embed(
             title="❌ Flee Failed!",
@@ -3404,42 +2770,42 @@ async def handle_dungeon_battle_flee(ctx, user_id, hunter, hunters_data, dungeon
         )
         
         # Check if hunter is defeated
-        if hunter['hp'] <= 0:
+        if state.outcome == DEFEAT:
             embed.add_field(name="💀 Defeated!", value="You were defeated while trying to flee!", inline=False)
             del hunter['dungeon_battle']
             hunter['hp'] = hunter.get('max_hp', 100)  # Respawn with full health
-            save_hunters_data(hunters_data)
-            await ctx.send(embed=embed)
-            await dungeon_cog.complete_raid(ctx, user_id, False)
+            hunter_store.mark_dirty(user_id)
+            hunter_store.after_commit(user_id, ctx.send, embed=embed)
+            hunter_store.after_commit(user_id, dungeon_cog.complete_raid, ctx, user_id, False)
             return
         
-        save_hunters_data(hunters_data)
-        await ctx.send(embed=embed)
+        hunter_store.mark_dirty(user_id)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 async def handle_event_battle_attack(ctx, user_id, hunter, hunters_data):
     """Handle attack command for event battles"""
     event_battle = hunter.get('event_battle')
     if not event_battle:
-        await ctx.send("You're not in an event battle!")
+        hunter_store.after_commit(user_id, ctx.send, "You're not in an event battle!")
         return
     
     boss = event_battle['boss']
     
     if boss['current_hp'] <= 0:
-        await ctx.send("The boss is already defeated!")
+        hunter_store.after_commit(user_id, ctx.send, "The boss is already defeated!")
         return
     
     from utils.theme_utils import get_user_theme_colors, create_progress_bar
     colors = get_user_theme_colors(ctx.author.id)
     
-    # Calculate damage
-    import random
-    base_damage = hunter['strength'] + random.randint(10, 30)
-    boss_defense = boss['defense']
-    damage = max(1, base_damage - boss_defense)
+    player = Combatant(hunter.get('name', 'Hunter'), hunter['hp'], hunter.get('max_hp', 100),
+                       hunter['strength'], hunter.get('defense', 0))
+    enemy = Combatant(boss['name'], boss['current_hp'], boss['max_hp'], boss['attack'], boss['defense'])
+    state, events = resolve_turn(CombatState(player, enemy), Action(ATTACK), EVENT_BATTLE_RULES)
+    damage = damage_dealt(events, PLAYER)
     
     # Apply damage to boss
-    boss['current_hp'] = max(0, boss['current_hp'] - damage)
+    boss['current_hp'] = state.enemy.hp
     
     embed = discord.Embed(
         title="⚔️ Attack!",
@@ -3498,7 +2864,7 @@ async def handle_event_battle_attack(ctx, user_id, hunter, hunters_data):
         # Clear event battle
         hunter['event_battle'] = None
         hunters_data[user_id] = hunter
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
         # Clear from GlobalEvents cog
         global_events_cog = bot.get_cog('GlobalEvents')
@@ -3506,15 +2872,14 @@ async def handle_event_battle_attack(ctx, user_id, hunter, hunters_data):
             if user_id in global_events_cog.event_battles:
                 del global_events_cog.event_battles[user_id]
         
-        await ctx.send(embed=embed)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
         return
     
     else:
-        # Boss counter-attacks
-        boss_damage = boss['attack'] - hunter.get('defense', 0)
-        boss_damage = max(boss_damage // 3, 10)  # Reduce boss damage for balance
+        # Boss counter-attacks for a third of its attack, at least 10
+        boss_damage = damage_dealt(events, ENEMY)
         
-        hunter['hp'] = max(1, hunter['hp'] - boss_damage)
+        hunter['hp'] = max(1, state.player.hp)
         
         embed.add_field(
             name="💥 Boss Counter-Attack",
@@ -3543,9 +2908,9 @@ async def handle_event_battle_attack(ctx, user_id, hunter, hunters_data):
         
         # Update hunter data
         hunters_data[user_id] = hunter
-        save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
         
-        await ctx.send(embed=embed)
+        hunter_store.after_commit(user_id, ctx.send, embed=embed)
 
 # Error handling
 @bot.event
@@ -3554,6 +2919,11 @@ async def on_command_error(ctx, error):
         await ctx.send("Command not found! Use `.commands` to see available commands.")
     elif isinstance(error, commands.MissingRequiredArgument):
         await ctx.send(f"Missing required argument! Use `.commands` for command usage.")
+    elif isinstance(error, ActivityBusy):
+        await ctx.send(embed=get_error_embed(ctx.author.id, str(error)))
+    elif isinstance(error, commands.CommandInvokeError) and isinstance(error.original, ActivityBusy):
+        # Another activity claimed the hunter while the command was running
+        await ctx.send(embed=get_error_embed(ctx.author.id, str(error.original)))
     else:
         print(f"An error occurred: {error}")
         await ctx.send("An error occurred while processing your command.")
@@ -3565,8 +2935,15 @@ async def main():
         print("Error: DISCORD_TOKEN not found in environment variables!")
         return
     
-    async with bot:
-        await bot.start(token)
+    try:
+        async with bot:
+            await bot.start(token)
+    finally:
+        # Send buffered DMs and write any pending hunter changes before the process exits
+        await notifications.flush()
+        await hunter_store.flush_async()
+        await scheduler.flush_async()
+        await ability_cooldowns.flush_async()
 
 if __name__ == "__main__":
     asyncio.run(main())
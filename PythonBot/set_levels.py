@@ -1,22 +1,11 @@
 #!/usr/bin/env python3
-import json
 import sys
 import os
 
 # Add the current directory to the path to import the leveling system
 sys.path.append('.')
 from utils.leveling_system import LevelingSystem
-
-def load_hunters_data():
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data(data):
-    with open('hunters_data.json', 'w') as f:
-        json.dump(data, f, indent=2)
+from utils.hunter_store import load_hunters_data, save_hunters_data
 
 # Initialize leveling system
 leveling_system = LevelingSystem()
@@ -49,7 +38,7 @@ for user_id, level in users_to_set.items():
             'intelligence': 10,
             'defense': 5,
             'gold': 0,
-            'inventory': [],
+            'inventory': {},
             'equipment': {'weapon': None, 'armor': None, 'accessory': None},
             'theme': 'default'
         }
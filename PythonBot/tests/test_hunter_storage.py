@@ -0,0 +1,120 @@
+"""Hunter saves reach the backends as single-hunter writes, and failed writes are retried in full."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hunter_storage import JournalBackend, SqliteBackend  # noqa: E402
+from utils.hunter_store import HunterStore  # noqa: E402
+
+
+def make_hunters(count):
+    return {
+        str(i): {
+            'level': 5, 'exp': 100 * i, 'rank': 'E', 'gold': 50, 'hp': 100, 'max_hp': 100,
+            'inventory': {'Health Potion': 2},
+            'equipment': {'weapon': None},
+            'quests': {'daily': {}},
+        }
+        for i in range(count)
+    }
+
+
+def record_saves(backend):
+    """Wrap backend.save to collect the dirty_ids of every call"""
+    calls = []
+    save = backend.save
+
+    def recording_save(data, dirty_ids=None):
+        calls.append(None if dirty_ids is None else set(dirty_ids))
+        save(data, dirty_ids)
+
+    backend.save = recording_save
+    return calls
+
+
+def test_sqlite_mark_dirty_writes_one_row(tmp_path):
+    backend = SqliteBackend(str(tmp_path / 'hunters.db'))
+    backend.save(make_hunters(20))
+    store = HunterStore(backend)
+    store.load()
+    calls = record_saves(backend)
+
+    before = backend.conn.total_changes
+    store.get('7')['gold'] += 10
+    store.mark_dirty('7')  # No running loop, so this flushes inline
+
+    assert calls == [{'7'}]
+    assert backend.conn.total_changes - before == 1
+    assert backend.conn.execute("SELECT gold FROM hunters WHERE user_id = '7'").fetchone() == (60,)
+    backend.close()
+
+
+def test_journal_mark_dirty_appends_one_entry(tmp_path):
+    backend = JournalBackend(str(tmp_path / 'hunters.json'))
+    backend.save(make_hunters(20))
+    backend.compact()
+    store = HunterStore(backend)
+    store.load()
+    calls = record_saves(backend)
+
+    store.get('7')['gold'] += 10
+    store.mark_dirty('7')
+
+    assert calls == [{'7'}]
+    with open(backend.journal_path) as f:
+        lines = f.read().splitlines()
+    assert lines == ['{"id":"7","set":{"gold":60}}']
+    backend.close()
+
+
+def test_sqlite_top_hunters_by_metric(tmp_path):
+    backend = SqliteBackend(str(tmp_path / 'hunters.db'))
+    backend.save(make_hunters(5))
+    assert backend.top_hunters('exp', limit=2) == [('4', 400), ('3', 300)]
+    assert [user_id for user_id, _ in backend.top_hunters('level', limit=5)] == ['4', '3', '2', '1', '0']
+    backend.close()
+
+
+def test_sqlite_retry_after_failed_batch_rewrites_rows(tmp_path):
+    backend = SqliteBackend(str(tmp_path / 'hunters.db'))
+    data = make_hunters(10)
+    backend.save(data)
+
+    # '7' cannot be encoded, so the whole batch rolls back after '3' was written
+    data['3']['gold'] = 999
+    data['7']['bad'] = object()
+    with pytest.raises(TypeError):
+        backend.save(data, ['3', '7'])
+    assert backend.conn.execute("SELECT gold FROM hunters WHERE user_id = '3'").fetchone() == (50,)
+
+    del data['7']['bad']
+    backend.save(data, ['3', '7'])
+    assert backend.conn.execute("SELECT gold FROM hunters WHERE user_id = '3'").fetchone() == (999,)
+    backend.close()
+
+
+def test_journal_retry_after_failed_fsync_rewrites_entry(tmp_path, monkeypatch):
+    backend = JournalBackend(str(tmp_path / 'hunters.json'))
+    data = make_hunters(10)
+    backend.save(data)
+    backend.compact()
+
+    def failing_fsync(fd):
+        raise OSError(28, "No space left on device")
+
+    data['3']['gold'] = 999
+    monkeypatch.setattr(os, 'fsync', failing_fsync)
+    with pytest.raises(OSError):
+        backend.save(data, ['3'])
+    monkeypatch.undo()
+
+    # The failed entry may or may not have reached the disk; the retry must write it again
+    backend.save(data, ['3'])
+    with open(backend.journal_path) as f:
+        lines = f.read().splitlines()
+    assert lines == ['{"id":"3","set":{"gold":999}}'] * 2
+    backend.close()
@@ -0,0 +1,67 @@
+"""Every legacy inventory layout compacts to {item key: count} plus rolled instances."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.inventory_model import INSTANCES_FIELD, UNKNOWN_ITEM, compact_inventory  # noqa: E402
+from utils.item_index import ItemIndex  # noqa: E402
+
+DAGGER = {'type': 'weapon', 'strength': 3, 'value': 50, 'rarity': 'Common'}
+POTION = {'name': 'Health Potion', 'type': 'consumable', 'heal': 50, 'aliases': ['hp potion']}
+
+INDEX = ItemIndex({
+    'weapons': {'Rusty Dagger': DAGGER},
+    'consumables': {'Health Potion': POTION},
+})
+
+
+def test_list_of_names_and_item_dicts():
+    hunter = {'inventory': ['Rusty Dagger', dict(DAGGER), {'name': 'rusty dagger', **DAGGER}, 'HP Potion']}
+
+    assert compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Rusty Dagger': 3, 'Health Potion': 1}
+    assert INSTANCES_FIELD not in hunter
+
+
+def test_nameless_dicts_never_make_an_empty_key():
+    hunter = {'inventory': [{'id': 'rusty_dagger', **DAGGER}, {'type': 'junk'}]}
+
+    compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Rusty Dagger': 1, UNKNOWN_ITEM: 1}
+    assert hunter[INSTANCES_FIELD] == {UNKNOWN_ITEM: [{'type': 'junk'}]}
+
+
+def test_copy_keys_fold_into_one_stack():
+    hunter = {'inventory': {'Rusty Dagger': dict(DAGGER), 'Rusty Dagger_1': dict(DAGGER),
+                            'Rusty Dagger_2': {**DAGGER, 'strength': 7}}}
+
+    compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Rusty Dagger': 3}
+    assert hunter[INSTANCES_FIELD] == {'Rusty Dagger': [{'strength': 7}]}
+
+
+def test_string_and_missing_counts():
+    hunter = {'inventory': {'Health Potion': '3', 'hp potion': 2, 'Rusty Dagger': None, 'Mystery': 'lots'}}
+
+    compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Health Potion': 5}
+
+
+def test_existing_instances_merge_and_are_trimmed_to_the_count():
+    hunter = {
+        'inventory': ['Rusty Dagger', {'name': 'Rusty Dagger', **DAGGER, 'strength': 9}],
+        INSTANCES_FIELD: {'Rusty Dagger': [{'strength': 5}, {'strength': 6}], 'Sold Item': [{'value': 1}]},
+    }
+
+    compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Rusty Dagger': 2}
+    assert hunter[INSTANCES_FIELD] == {'Rusty Dagger': [{'strength': 9}, {'strength': 5}]}
+
+
+def test_compact_layout_is_left_alone():
+    hunter = {'inventory': {'Rusty Dagger': 2}, INSTANCES_FIELD: {'Rusty Dagger': [{'strength': 5}]}}
+
+    assert not compact_inventory(hunter, INDEX)
+    assert hunter['inventory'] == {'Rusty Dagger': 2}
@@ -0,0 +1,98 @@
+"""Leaderboards re-index only the hunters the store reports as changed."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hunter_storage import StorageBackend  # noqa: E402
+from utils.hunter_store import HunterStore  # noqa: E402
+from utils.leaderboard import Leaderboards  # noqa: E402
+
+
+class MemoryBackend(StorageBackend):
+    path = 'memory'
+
+    def __init__(self, hunters, fail=False):
+        self.hunters = hunters
+        self.fail = fail
+
+    def load_all(self):
+        return self.hunters
+
+    def save(self, data, dirty_ids=None):
+        if self.fail:
+            raise OSError("disk full")
+
+
+def make_store(fail=False):
+    hunters = {str(i): {'level': i + 1, 'exp': 0, 'gold': 10 * i} for i in range(50)}
+    return HunterStore(MemoryBackend(hunters, fail), flush_delay=0)
+
+
+def count_reindexes(boards):
+    calls = []
+    reindex = boards._reindex
+
+    def counting(user_id, hunter):
+        calls.append(user_id)
+        reindex(user_id, hunter)
+
+    boards._reindex = counting
+    return calls
+
+
+def test_single_hunter_change_reindexes_one_hunter(tmp_path):
+    store = make_store()
+    boards = Leaderboards(store, str(tmp_path / 'leaderboard.json'))
+    assert boards.top('gold', 1)[0].user_id == '49'
+    calls = count_reindexes(boards)
+
+    store.get('3')['gold'] = 10_000
+    store.mark_dirty('3')
+
+    assert boards.top('gold', 1)[0].user_id == '3'
+    assert calls == ['3']
+
+
+def test_failed_write_retry_does_not_rescan(tmp_path):
+    store = make_store(fail=True)
+    boards = Leaderboards(store, str(tmp_path / 'leaderboard.json'))
+    boards.sync()
+    calls = count_reindexes(boards)
+    changes = []
+    store.add_listener(changes.append)
+
+    async def change_and_flush():
+        store.get('3')['gold'] = 10_000
+        store.mark_dirty('3')
+        assert not await store.flush_async()
+        store._flush_handle.cancel()
+        store._flush_handle = None
+
+    asyncio.run(change_and_flush())
+    boards.sync()
+
+    assert changes == ['3']  # The retry is not reported as another change
+    assert calls == ['3']
+
+
+def test_snapshot_resolves_names_through_the_bot(tmp_path):
+    class User:
+        def __init__(self, user_id):
+            self.name = f"hunter{user_id}"
+
+    class Bot:
+        def add_listener(self, func, name):
+            pass
+
+        def get_user(self, user_id):
+            return User(user_id) if user_id != 48 else None
+
+    store = make_store()
+    boards = Leaderboards(store, str(tmp_path / 'leaderboard.json'))
+    boards.attach(Bot())
+
+    names = [row['name'] for row in boards.snapshot()['boards']['gold'][:3]]
+    assert names == ['hunter49', 'Hunter 48', 'hunter47']
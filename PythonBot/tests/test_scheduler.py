@@ -0,0 +1,45 @@
+"""Persisted timers skip what has elapsed, and shutdown flushes always reach the disk."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.scheduler import Scheduler  # noqa: E402
+
+
+def read_timers(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_elapsed_plain_timers_are_not_saved_or_restored(tmp_path):
+    path = str(tmp_path / 'timers.json')
+    with open(path, 'w') as f:
+        json.dump({'rest': {'1': [time.time() - 60, None], '2': [time.time() + 600, None]}}, f)
+
+    scheduler = Scheduler(path)
+    asyncio.run(scheduler.load())
+    rest = scheduler.table('rest')
+    assert '1' not in rest and '2' in rest
+
+    rest.set('3', time.time() - 1)
+    assert set(scheduler._dump()['rest']) == {'2'}
+
+
+def test_flush_async_writes_after_a_background_flush(tmp_path):
+    path = str(tmp_path / 'timers.json')
+    scheduler = Scheduler(path)
+    rest = scheduler.table('rest')
+
+    async def change_and_exit():
+        rest.start('1', 600)
+        rest.start('2', 600)
+        scheduler.flush()  # The debounced write, still in flight when shutdown starts
+        await scheduler.flush_async()
+
+    asyncio.run(change_and_exit())
+    assert set(read_timers(path)['rest']) == {'1', '2'}
@@ -0,0 +1,81 @@
+"""HP/MP regeneration is derived from a timestamp and paused during fights."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hunter_storage import JsonFileBackend  # noqa: E402
+from utils.hunter_store import HunterStore  # noqa: E402
+from utils.vitals import STAMP_FIELD, Vitals  # noqa: E402
+
+MINUTE = 60.0
+
+
+class Activities:
+    """Stands in for the activity registry: users in ``fighting`` hold a combat activity"""
+
+    def __init__(self):
+        self.fighting = set()
+
+    def in_combat(self, user_id, hunter=None):
+        return str(user_id) in self.fighting or bool(hunter and hunter.get('battle'))
+
+
+def make_vitals(tmp_path, hp=50, mp=25, stamp=0.0):
+    store = HunterStore(JsonFileBackend(str(tmp_path / 'hunters.json')))
+    store.load()
+    hunter = store.put('1', {'hp': hp, 'max_hp': 100, 'mp': mp, 'max_mp': 50, STAMP_FIELD: stamp})
+    activities = Activities()
+    return Vitals(store, activities), activities, hunter
+
+
+def test_settle_regenerates_out_of_combat(tmp_path):
+    vitals, _, hunter = make_vitals(tmp_path)
+
+    # 5% of max per minute: 2 minutes is +10 HP and +5 MP
+    assert vitals.current('1', hunter, now=2 * MINUTE) == (60, 30)
+    assert vitals.settle('1', hunter, now=2 * MINUTE) == (10, 5)
+    assert (hunter['hp'], hunter['mp'], hunter[STAMP_FIELD]) == (60, 30, 2 * MINUTE)
+
+
+def test_no_regeneration_while_fighting(tmp_path):
+    vitals, activities, hunter = make_vitals(tmp_path)
+    activities.fighting.add('1')
+
+    assert vitals.current('1', hunter, now=4 * MINUTE) == (50, 25)
+    assert vitals.settle('1', hunter, now=4 * MINUTE) == (0, 0)
+    assert hunter['hp'] == 50
+
+
+def test_saved_battle_pauses_regeneration(tmp_path):
+    vitals, _, hunter = make_vitals(tmp_path)
+    hunter['battle'] = {'monster': 'Goblin'}
+
+    assert vitals.settle('1', hunter, now=4 * MINUTE) == (0, 0)
+
+
+def test_regeneration_restarts_when_the_fight_ends(tmp_path):
+    vitals, activities, hunter = make_vitals(tmp_path)
+    activities.fighting.add('1')
+    vitals.settle('1', hunter, now=1 * MINUTE)
+
+    # The fight runs ten minutes; none of it may count once it is over
+    activities.fighting.clear()
+    assert vitals.current('1', hunter, now=11 * MINUTE) == (50, 25)
+    assert vitals.settle('1', hunter, now=11 * MINUTE) == (0, 0)
+    assert hunter[STAMP_FIELD] == 11 * MINUTE
+    assert vitals.settle('1', hunter, now=13 * MINUTE) == (10, 5)
+
+
+def test_first_save_after_restart_keeps_accrued_regeneration(tmp_path):
+    vitals, _, hunter = make_vitals(tmp_path, stamp=0.0)
+    vitals.store.add_listener(vitals._on_hunter_changed)
+
+    # A gold-only purchase is the first thing this process sees of the hunter,
+    # long after the stored stamp: the regeneration since then must survive it
+    hunter['gold'] = 10
+    vitals.store.mark_dirty('1')
+
+    assert (hunter['hp'], hunter['mp']) == (100, 50)
+    assert hunter[STAMP_FIELD] > 0.0
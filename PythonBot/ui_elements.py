@@ -1,6 +1,5 @@
 import discord
 from discord.ext import commands
-import json
 import math
 import asyncio
 from datetime import datetime, timedelta
@@ -8,19 +7,9 @@ from datetime import datetime, timedelta
 # Import leveling system and theme utilities
 from utils.leveling_system import leveling_system, get_rank_role_name, RANK_ROLES
 from utils.theme_utils import get_user_theme_colors, get_error_embed, get_info_embed
-
-def load_hunters_data_ui():
-    """Load hunter data within UI elements"""
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data_ui(data):
-    """Save hunter data within UI elements"""
-    with open('hunters_data.json', 'w') as f:
-        json.dump(data, f, indent=4)
+from utils.hunter_store import load_hunters_data
+from utils.inventory_model import get_inventory
+from utils.vitals import vitals
 
 def create_progress_bar(current, maximum, length=10):
     """Create a visual progress bar"""
@@ -51,7 +40,7 @@ class HelpView(discord.ui.View):
                 {"name": "🌀 Gates & Dungeons", "value": "`.gates` - List dimensional gates\n`.enter_gate [name]` - Enter a specific gate\n`.dungeons` - List available dungeons\n`.raid [name]` - Start a dungeon raid"},
                 {"name": "📋 Quests & Training", "value": "`.daily` - View daily quests\n`.weekly` - View weekly quests\n`.special` - View special quests\n`.train [type]` - Start training session"},
                 {"name": "⚡ PvP & Events", "value": "`.challenge [user]` - Challenge to PvP\n`.rankings` - View PvP leaderboard\n`.events` - Current global events"},
-                {"name": "🎨 Customization", "value": "`.themes` - View available themes\n`.theme [name]` - Set your theme\n`.preview [theme]` - Preview a theme"},
+                {"name": "🎨 Customization", "value": "`.themes` - View available themes\n`.theme [name]` - Set your theme\n`.preview [theme]` - Preview a theme\n`.notifications [all|levels|off]` - Choose your DMs"},
                 {"name": "📖 Solo Leveling Info", "value": "`.weaponsinfo` - All weapons and artifacts\n`.bossinfo` - Shadow army and boss details\n`.gatesinfo` - Dimensional gates information\n`.dungeonsinfo` - Instance dungeons guide\n`.slquickref` - Quick reference guide"}
             ],
             "Admin Commands": [
@@ -157,7 +146,7 @@ class StatusView(discord.ui.View):
     
     async def get_main_profile_embed(self, user_id):
         """Generate main profile embed"""
-        hunters_data = load_hunters_data_ui()
+        hunters_data = load_hunters_data()
         hunter = hunters_data.get(str(user_id))
         
         if not hunter:
@@ -178,9 +167,10 @@ class StatusView(discord.ui.View):
         exp_progress = total_exp - current_level_exp
         exp_needed = next_level_exp - current_level_exp
         
-        # Create progress bars
-        hp_bar = create_progress_bar(hunter.get('hp', 100), hunter.get('max_hp', 100), 12)
-        mp_bar = create_progress_bar(hunter.get('mp', 50), hunter.get('max_mp', 50), 12)
+        # Create progress bars (HP/MP include regeneration since they were last stored)
+        hp, mp = vitals.current(user_id, hunter)
+        hp_bar = create_progress_bar(hp, hunter.get('max_hp', 100), 12)
+        mp_bar = create_progress_bar(mp, hunter.get('max_mp', 50), 12)
         exp_bar = create_progress_bar(exp_progress, exp_needed, 12)
         
         embed = discord.Embed(
@@ -204,8 +194,8 @@ class StatusView(discord.ui.View):
         # Health and Mana
         embed.add_field(
             name="💚 Health & Mana",
-            value=f"**HP:** {hunter.get('hp', 100)}/{hunter.get('max_hp', 100)}\n{hp_bar}\n"
-                  f"**MP:** {hunter.get('mp', 50)}/{hunter.get('max_mp', 50)}\n{mp_bar}",
+            value=f"**HP:** {hp}/{hunter.get('max_hp', 100)}\n{hp_bar}\n"
+                  f"**MP:** {mp}/{hunter.get('max_mp', 50)}\n{mp_bar}",
             inline=True
         )
         
@@ -252,7 +242,7 @@ class StatusView(discord.ui.View):
         embed.add_field(
             name="🎯 Current Status",
             value=f"**Activity:** {status_text}\n"
-                  f"**Inventory:** {len(hunter.get('inventory', []))} items\n"
+                  f"**Inventory:** {sum(get_inventory(hunter).values())} items\n"
                   f"**Daily Kills:** {hunter.get('daily_kills', 0)}",
             inline=True
         )
@@ -262,7 +252,7 @@ class StatusView(discord.ui.View):
     
     async def get_equipment_embed(self, user_id):
         """Generate equipment details embed"""
-        hunters_data = load_hunters_data_ui()
+        hunters_data = load_hunters_data()
         hunter = hunters_data.get(str(user_id))
         
         if not hunter:
@@ -336,7 +326,7 @@ class StatusView(discord.ui.View):
     
     async def get_stats_embed(self, user_id):
         """Generate detailed statistics embed"""
-        hunters_data = load_hunters_data_ui()
+        hunters_data = load_hunters_data()
         hunter = hunters_data.get(str(user_id))
         
         if not hunter:
@@ -389,16 +379,17 @@ class StatusView(discord.ui.View):
         # Health and Mana breakdown
         base_hp = 100 + (hunter.get('level', 1) - 1) * 25
         base_mp = 50 + (hunter.get('level', 1) - 1) * 15
+        hp, mp = vitals.current(user_id, hunter)
         
         embed.add_field(
             name="❤️ Health Points",
-            value=f"**Current:** {hunter.get('hp', 100)}\n**Maximum:** {hunter.get('max_hp', 100)}\n**Base for Level:** {base_hp}",
+            value=f"**Current:** {hp}\n**Maximum:** {hunter.get('max_hp', 100)}\n**Base for Level:** {base_hp}",
             inline=True
         )
         
         embed.add_field(
             name="💙 Mana Points",
-            value=f"**Current:** {hunter.get('mp', 50)}\n**Maximum:** {hunter.get('max_mp', 50)}\n**Base for Level:** {base_mp}",
+            value=f"**Current:** {mp}\n**Maximum:** {hunter.get('max_mp', 50)}\n**Base for Level:** {base_mp}",
             inline=True
         )
         
@@ -419,7 +410,7 @@ class StatusView(discord.ui.View):
     
     async def get_progression_embed(self, user_id):
         """Generate progression and achievements embed"""
-        hunters_data = load_hunters_data_ui()
+        hunters_data = load_hunters_data()
         hunter = hunters_data.get(str(user_id))
         
         if not hunter:
@@ -673,7 +664,7 @@ class CombatView(discord.ui.View):
 
     async def item_button_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Do not defer; respond immediately for error/info cases
-        hunters_data = load_hunters_data_ui()
+        hunters_data = load_hunters_data()
         hunter = hunters_data.get(self.user_id)
         if not hunter or not hunter.get('inventory'):
             await interaction.response.send_message("You have no items currently", ephemeral=False)
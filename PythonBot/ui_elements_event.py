@@ -1,11 +1,15 @@
 import discord
 from discord.ui import View, Button
-import json
-import random
 import asyncio
 from datetime import datetime
 from utils.leveling_system import award_exp
 from utils.theme_utils import get_user_theme_colors, get_info_embed
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.channel_pool import close_channel
+from utils.combat_engine import (
+    ATTACK, DEFEND, FLEE, SKILL, PLAYER, ENEMY, HEAL,
+    RAID_RULES, RAID_SPECIAL, Action, Combatant, CombatState, damage_dealt, find_event, resolve_turn,
+)
 
 class EventCombatView(View):
     """Shared combat view for event boss encounters with multiple participants"""
@@ -21,20 +25,20 @@ class EventCombatView(View):
         self.add_combat_buttons()
 
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
     
-    def save_hunters_data(self, data):
-        """Save hunter data to JSON file"""
-        try:
-            with open('hunters_data.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving hunters data: {e}")
+    def play_turn(self, hunter, event_state, action):
+        """Resolve one participant's exchange with the boss and write HP back"""
+        boss_data = event_state['boss_data']
+        player = Combatant(hunter.get('name', 'Hunter'), hunter.get('hp', 100), hunter.get('max_hp', 100),
+                           hunter.get('attack', 10), hunter.get('defense', 0), flee_chance=1.0)
+        boss = Combatant(boss_data['name'], event_state['current_boss_hp'], boss_data.get('hp', event_state['current_boss_hp']),
+                         boss_data['attack'], boss_data.get('defense', 0))
+        state, events = resolve_turn(CombatState(player, boss), action, RAID_RULES)
+        hunter['hp'] = state.player.hp
+        event_state['current_boss_hp'] = state.enemy.hp
+        return state, events
 
     async def on_timeout(self):
         """Handle view timeout"""
@@ -148,27 +152,21 @@ class EventCombatView(View):
             await interaction.response.send_message("You are defeated and cannot attack!", ephemeral=True)
             return
 
-        # Calculate player damage
-        base_attack = hunter.get('attack', 10)
-        damage_dealt = max(1, random.randint(int(base_attack * 0.8), int(base_attack * 1.2)) - boss_data.get('defense', 0))
-        event_state['current_boss_hp'] -= damage_dealt
-        event_state['current_boss_hp'] = max(0, event_state['current_boss_hp'])
-
-        # Boss counter-attack on the attacker
-        boss_damage = max(1, random.randint(int(boss_data['attack'] * 0.8), int(boss_data['attack'] * 1.2)) - hunter.get('defense', 0))
-        hunter['hp'] -= boss_damage
-        hunter['hp'] = max(0, hunter['hp'])
+        # Player attacks, then the boss counter-attacks the attacker if it is still standing
+        state, events = self.play_turn(hunter, event_state, Action(ATTACK))
+        boss_damage = damage_dealt(events, ENEMY)
 
         # Update hunter data
         hunters_data[user_id] = hunter
         event_state['participants'][user_id] = hunter
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
 
         # Provide individual feedback
-        feedback_message = f"You attacked {boss_data['name']} for **{damage_dealt}** damage!"
-        if hunter['hp'] > 0:
+        feedback_message = f"You attacked {boss_data['name']} for **{damage_dealt(events, PLAYER)}** damage!"
+        # No retaliation when this hit finished the boss
+        if boss_damage and hunter['hp'] > 0:
             feedback_message += f"\n{boss_data['name']} retaliated for **{boss_damage}** damage. Your HP: {hunter['hp']}/{hunter.get('max_hp', 100)}"
-        else:
+        elif boss_damage:
             feedback_message += f"\n{boss_data['name']} retaliated for **{boss_damage}** damage. You were defeated!"
 
         await interaction.response.send_message(feedback_message, ephemeral=True)
@@ -202,19 +200,15 @@ class EventCombatView(View):
             await interaction.response.send_message("You are defeated and cannot defend!", ephemeral=True)
             return
 
-        # Defending reduces incoming damage
-        boss_damage = max(1, int((random.randint(int(boss_data['attack'] * 0.8), int(boss_data['attack'] * 1.2)) - hunter.get('defense', 0)) * 0.5))
-        hunter['hp'] -= boss_damage
-        hunter['hp'] = max(0, hunter['hp'])
-
-        # Small HP recovery when defending
-        heal_amount = random.randint(5, 15)
-        hunter['hp'] = min(hunter['hp'] + heal_amount, hunter.get('max_hp', 100))
+        # Defending halves incoming damage and recovers a little HP
+        state, events = self.play_turn(hunter, event_state, Action(DEFEND))
+        boss_damage = damage_dealt(events, ENEMY)
+        heal_amount = find_event(events, HEAL).amount
 
         # Update hunter data
         hunters_data[user_id] = hunter
         event_state['participants'][user_id] = hunter
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
 
         feedback_message = f"You took a defensive stance and recovered **{heal_amount}** HP!"
         if boss_damage > 0:
@@ -244,11 +238,13 @@ class EventCombatView(View):
         # Remove participant from event
         hunter = event_state['participants'].pop(user_id)
         
-        # Apply flee penalty
+        # Apply flee penalty; running away never knocks a hunter out
         hunters_data = self.load_hunters_data()
         if user_id in hunters_data:
-            hunters_data[user_id]['hp'] = max(1, hunters_data[user_id].get('hp', 100) - 20)
-            self.save_hunters_data(hunters_data)
+            fleeing = hunters_data[user_id]
+            self.play_turn(fleeing, event_state, Action(FLEE))
+            fleeing['hp'] = max(1, fleeing['hp'])
+            hunter_store.mark_dirty(user_id)
 
         # Remove channel permissions
         try:
@@ -295,27 +291,19 @@ class EventCombatView(View):
             await interaction.response.send_message(f"Not enough mana! You need {mana_cost} mana.", ephemeral=True)
             return
 
-        # Use special ability
+        # Use special ability: a double-strength hit, then the boss counter-attacks
         hunter['mana'] -= mana_cost
-        damage_multiplier = 2.0
-        base_attack = hunter.get('attack', 10)
-        damage_dealt = max(1, int((random.randint(int(base_attack * 0.8), int(base_attack * 1.2)) * damage_multiplier) - boss_data.get('defense', 0)))
-        
-        event_state['current_boss_hp'] -= damage_dealt
-        event_state['current_boss_hp'] = max(0, event_state['current_boss_hp'])
-
-        # Boss counter-attack
-        boss_damage = max(1, random.randint(int(boss_data['attack'] * 0.8), int(boss_data['attack'] * 1.2)) - hunter.get('defense', 0))
-        hunter['hp'] -= boss_damage
-        hunter['hp'] = max(0, hunter['hp'])
+        state, events = self.play_turn(hunter, event_state, Action(SKILL, strike=RAID_SPECIAL))
+        boss_damage = damage_dealt(events, ENEMY)
 
         # Update hunter data
         hunters_data[user_id] = hunter
         event_state['participants'][user_id] = hunter
-        self.save_hunters_data(hunters_data)
+        hunter_store.mark_dirty(user_id)
 
-        feedback_message = f"You used a special ability on {boss_data['name']} for **{damage_dealt}** damage!"
-        feedback_message += f"\n{boss_data['name']} retaliated for **{boss_damage}** damage."
+        feedback_message = f"You used a special ability on {boss_data['name']} for **{damage_dealt(events, PLAYER)}** damage!"
+        if boss_damage:
+            feedback_message += f"\n{boss_data['name']} retaliated for **{boss_damage}** damage."
         feedback_message += f"\nYour HP: {hunter['hp']}/{hunter.get('max_hp', 100)} | Mana: {hunter['mana']}/{hunter.get('max_mana', 100)}"
 
         await interaction.response.send_message(feedback_message, ephemeral=True)
@@ -374,7 +362,8 @@ class EventCombatView(View):
                 victory_embed.add_field(name="🏆 Rewards", value="\n".join(participant_rewards), inline=False)
             
             await event_channel.send(embed=victory_embed)
-            self.save_hunters_data(hunters_data)
+            for user_id in event_state['participants']:
+                hunter_store.mark_dirty(user_id)
 
         elif outcome == "defeat":
             defeat_embed = discord.Embed(
@@ -389,7 +378,8 @@ class EventCombatView(View):
                     hunters_data[user_id]['hp'] = hunters_data[user_id].get('max_hp', 100)
             
             await event_channel.send(embed=defeat_embed)
-            self.save_hunters_data(hunters_data)
+            for user_id in event_state['participants']:
+                hunter_store.mark_dirty(user_id)
 
         elif outcome == "timeout":
             timeout_embed = discord.Embed(
@@ -402,7 +392,7 @@ class EventCombatView(View):
         # Schedule channel deletion
         await asyncio.sleep(30)
         try:
-            await event_channel.delete()
+            await close_channel(event_channel)
         except:
             pass
         
@@ -419,12 +409,8 @@ class JoinEventView(View):
         self.active_event_battles = active_event_battles
 
     def load_hunters_data(self):
-        """Load hunter data from JSON file"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        """Load hunter data from the shared hunter store"""
+        return load_hunters_data()
 
     @discord.ui.button(label="Join Event", style=discord.ButtonStyle.success, emoji="⚔️")
     async def join_event_callback(self, interaction: discord.Interaction, button: Button):
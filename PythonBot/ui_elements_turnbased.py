@@ -1,10 +1,15 @@
 import discord
 from discord.ext import commands
-import json
 import random
 import asyncio
 from datetime import datetime
 from utils.boss_dialogue import dialogue_manager
+from utils.hunter_store import hunter_store, load_hunters_data
+from utils.channel_pool import close_channel
+from utils.combat_engine import (
+    ATTACK, DEFEND, FLEE, PLAYER, ENEMY, HIT, HEAL, ESCAPED, VICTORY,
+    DUEL_RULES, DUEL_SPECIAL, Action, Combatant, CombatState, damage_dealt, find_event, resolve_turn,
+)
 
 class TurnBasedCombatView(discord.ui.View):
     """Turn-based combat view with authentic Solo Leveling boss conversations"""
@@ -37,29 +42,37 @@ class TurnBasedCombatView(discord.ui.View):
         
     def load_hunter_data(self):
         """Load hunter data"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                data = json.load(f)
-                return data.get(str(self.user_id), {})
-        except FileNotFoundError:
-            return {}
+        return load_hunters_data().get(str(self.user_id), {})
+    
+    def play_turn(self, action):
+        """Resolve the exchange through the combat engine.
+        
+        The boss's hit is left for process_boss_turn to apply, so it lands
+        after the player's move has been shown.
+        """
+        if self.hunter_data:
+            attack = self.hunter_data.get('attack', 20)
+        else:
+            # No hunter record: a flat 15-25 hit
+            attack = 20
+            if action.kind == ATTACK:
+                action = action._replace(strike=DUEL_RULES.player_strike._replace(roll=(-5, 5)))
+        player = Combatant('Hunter', self.player_hp, self.player_max_hp, attack, flee_chance=0.3)
+        boss = Combatant(self.boss_data['name'], self.boss_hp, self.boss_max_hp, self.boss_data.get('attack', 30))
+        state, events = resolve_turn(CombatState(player, boss), action, DUEL_RULES)
+        
+        heal = find_event(events, HEAL)
+        if heal:
+            self.player_hp = min(self.player_max_hp, self.player_hp + heal.amount)
+        self.boss_hp = state.enemy.hp
+        return state, events
     
     def save_hunter_data(self):
         """Save hunter data"""
-        try:
-            with open('hunters_data.json', 'r') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {}
-        
+        data = load_hunters_data()
         if str(self.user_id) in data:
             data[str(self.user_id)]['hp'] = self.player_hp
-            
-            try:
-                with open('hunters_data.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-            except Exception as e:
-                print(f"Error saving hunter data: {e}")
+            hunter_store.mark_dirty(self.user_id)
     
     def create_combat_embed(self, dialogue_text="", action_result=""):
         """Create combat status embed with dialogue"""
@@ -168,18 +181,10 @@ class TurnBasedCombatView(discord.ui.View):
         
         await interaction.response.defer()
         
-        # Calculate damage
-        base_damage = random.randint(15, 25)
-        if self.hunter_data:
-            attack_stat = self.hunter_data.get('attack', 20)
-            base_damage = random.randint(attack_stat - 5, attack_stat + 10)
-        
-        # Critical hit chance
-        critical = random.random() < 0.15
-        if critical:
-            base_damage = int(base_damage * 1.5)
-        
-        self.boss_hp = max(0, self.boss_hp - base_damage)
+        # Calculate damage, with a 15% critical hit chance
+        state, events = self.play_turn(Action(ATTACK))
+        hit = find_event(events, HIT, PLAYER)
+        base_damage, critical = hit.amount, hit.critical
         
         # Get boss response to attack
         boss_response = dialogue_manager.get_player_action_response(self.boss_id, 'attack')
@@ -189,12 +194,12 @@ class TurnBasedCombatView(discord.ui.View):
         action_result = f"🗡️ You strike for **{base_damage}** damage!{crit_text}"
         
         # Check if boss is defeated
-        if self.boss_hp <= 0:
+        if state.outcome == VICTORY:
             await self.handle_boss_defeat(interaction, boss_response)
             return
         
         # Boss counter-attack
-        await self.process_boss_turn(interaction, boss_response, action_result)
+        await self.process_boss_turn(interaction, boss_response, action_result, damage_dealt(events, ENEMY))
     
     @discord.ui.button(label="Defend", style=discord.ButtonStyle.secondary, emoji="🛡️", row=0)
     async def defend_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -210,7 +215,8 @@ class TurnBasedCombatView(discord.ui.View):
         action_result = "🛡️ You take a defensive stance, reducing incoming damage by 50%!"
         
         # Boss attack with reduced damage
-        await self.process_boss_turn(interaction, boss_response, action_result, damage_reduction=0.5)
+        state, events = self.play_turn(Action(DEFEND))
+        await self.process_boss_turn(interaction, boss_response, action_result, damage_dealt(events, ENEMY))
     
     @discord.ui.button(label="Special Ability", style=discord.ButtonStyle.primary, emoji="✨", row=0)
     async def special_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -222,22 +228,20 @@ class TurnBasedCombatView(discord.ui.View):
         await interaction.response.defer()
         
         # Special ability effects
-        heal_amount = random.randint(20, 35)
-        self.player_hp = min(self.player_max_hp, self.player_hp + heal_amount)
-        
-        damage_amount = random.randint(20, 30)
-        self.boss_hp = max(0, self.boss_hp - damage_amount)
+        state, events = self.play_turn(DUEL_SPECIAL)
+        heal_amount = find_event(events, HEAL).amount
+        damage_amount = damage_dealt(events, PLAYER)
         
         boss_response = "Your power... it's extraordinary!"
         action_result = f"✨ **Shadow Extraction!** You heal for **{heal_amount}** HP and deal **{damage_amount}** shadow damage!"
         
         # Check if boss is defeated
-        if self.boss_hp <= 0:
+        if state.outcome == VICTORY:
             await self.handle_boss_defeat(interaction, boss_response)
             return
         
         # Boss counter-attack
-        await self.process_boss_turn(interaction, boss_response, action_result)
+        await self.process_boss_turn(interaction, boss_response, action_result, damage_dealt(events, ENEMY))
     
     @discord.ui.button(label="Flee", style=discord.ButtonStyle.secondary, emoji="💨", row=1)
     async def flee_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -247,7 +251,8 @@ class TurnBasedCombatView(discord.ui.View):
             return
         
         # 30% chance to flee successfully
-        if random.random() < 0.7:
+        state, events = self.play_turn(Action(FLEE))
+        if state.outcome != ESCAPED:
             boss_response = dialogue_manager.get_player_action_response(self.boss_id, 'flee')
             
             flee_embed = discord.Embed(
@@ -266,7 +271,7 @@ class TurnBasedCombatView(discord.ui.View):
             
             # Boss gets a free attack
             await asyncio.sleep(2)
-            await self.process_boss_turn(interaction, "", "You failed to escape!", damage_multiplier=1.2)
+            await self.process_boss_turn(interaction, "", "You failed to escape!", damage_dealt(events, ENEMY))
         else:
             # Successful flee
             victory_dialogue = dialogue_manager.get_victory_dialogue(self.boss_id, False)
@@ -291,8 +296,8 @@ class TurnBasedCombatView(discord.ui.View):
             
             await interaction.response.edit_message(embed=flee_embed, view=self)
     
-    async def process_boss_turn(self, interaction, boss_response, action_result, damage_reduction=0, damage_multiplier=1.0):
-        """Process boss turn with dialogue and attacks"""
+    async def process_boss_turn(self, interaction, boss_response, action_result, boss_damage):
+        """Process boss turn with dialogue, landing the hit play_turn rolled"""
         self.turn_count += 1
         
         # Update combat display with player action
@@ -304,12 +309,7 @@ class TurnBasedCombatView(discord.ui.View):
         # Boss attack
         boss_attack_dialogue = dialogue_manager.get_boss_attack_dialogue(self.boss_id)
         
-        # Calculate boss damage
-        base_boss_damage = random.randint(self.boss_data.get('attack', 30) - 10, self.boss_data.get('attack', 30) + 5)
-        base_boss_damage = int(base_boss_damage * damage_multiplier)
-        
-        # Apply damage reduction
-        final_damage = int(base_boss_damage * (1 - damage_reduction))
+        final_damage = boss_damage
         self.player_hp = max(0, self.player_hp - final_damage)
         
         boss_action_result = f"💀 {self.boss_data['name']} attacks for **{final_damage}** damage!"
@@ -358,19 +358,12 @@ class TurnBasedCombatView(discord.ui.View):
         
         # Update hunter data with rewards
         if self.hunter_data:
-            try:
-                with open('hunters_data.json', 'r') as f:
-                    data = json.load(f)
-                
-                user_data = data.get(str(self.user_id), {})
-                user_data['exp'] = user_data.get('exp', 0) + exp_reward
-                user_data['gold'] = user_data.get('gold', 0) + gold_reward
-                data[str(self.user_id)] = user_data
-                
-                with open('hunters_data.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-            except Exception as e:
-                print(f"Error updating rewards: {e}")
+            data = load_hunters_data()
+            user_data = data.get(str(self.user_id), {})
+            user_data['exp'] = user_data.get('exp', 0) + exp_reward
+            user_data['gold'] = user_data.get('gold', 0) + gold_reward
+            data[str(self.user_id)] = user_data
+            hunter_store.mark_dirty(self.user_id)
         
         # Disable all buttons
         for item in self.children:
@@ -381,7 +374,7 @@ class TurnBasedCombatView(discord.ui.View):
         # Clean up channel after delay
         await asyncio.sleep(30)
         try:
-            await self.combat_channel.delete()
+            await close_channel(self.combat_channel)
         except:
             pass
     
@@ -420,7 +413,7 @@ class TurnBasedCombatView(discord.ui.View):
         # Clean up channel after delay
         await asyncio.sleep(30)
         try:
-            await self.combat_channel.delete()
+            await close_channel(self.combat_channel)
         except:
             pass
     
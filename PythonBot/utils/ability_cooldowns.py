@@ -0,0 +1,114 @@
+"""Ability cooldowns as per-user arrays of numeric deadlines, one slot per ability."""
+
+import time
+from typing import Dict, Iterable, List
+
+from utils.async_io import DebouncedJsonFile, read_json
+
+# Cooldowns survive restarts here: {"slots": [ability ids], "users": {user id: [deadlines]}}
+COOLDOWNS_FILE = 'data/ability_cooldowns.json'
+# Seconds to wait after a cast before rewriting the cooldowns file
+FLUSH_DELAY = 2.0
+
+
+class AbilityCooldowns:
+    """Epoch-second deadlines per hunter, indexed by ability slot.
+
+    Each ability id gets a slot the first time it is put on cooldown; a
+    hunter's cooldowns are one list of floats in slot order, so checking
+    every ability on a combat view is a single lookup and a few float
+    compares, with no date parsing. Nothing is swept: elapsed deadlines just
+    read as ready, a hunter whose cooldowns have all elapsed is dropped when
+    next queried, and elapsed entries are left out of the file. Deadlines
+    are wall-clock epoch seconds rather than monotonic ones so they still
+    mean the same thing after a restart.
+    """
+
+    def __init__(self, path: str = COOLDOWNS_FILE):
+        self.path = path
+        self._slot_ids: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self._deadlines: Dict[str, List[float]] = {}
+        self._file = DebouncedJsonFile(path, self._dump, FLUSH_DELAY)
+
+    def _slot(self, ability_id: str) -> int:
+        slot = self._slots.get(ability_id)
+        if slot is None:
+            slot = self._slots[ability_id] = len(self._slot_ids)
+            self._slot_ids.append(ability_id)
+        return slot
+
+    def start(self, user_id, ability_id: str, seconds: float) -> float:
+        """Put an ability on cooldown for ``seconds`` and return the deadline"""
+        slot = self._slot(ability_id)
+        deadlines = self._deadlines.setdefault(str(user_id), [])
+        if len(deadlines) <= slot:
+            deadlines.extend([0.0] * (slot + 1 - len(deadlines)))
+        deadlines[slot] = time.time() + seconds
+        self._changed()
+        return deadlines[slot]
+
+    def remaining(self, user_id, ability_id: str) -> float:
+        """Seconds until an ability is ready, 0 if it already is"""
+        return self.readiness(user_id, (ability_id,))[0]
+
+    def readiness(self, user_id, ability_ids: Iterable[str]) -> List[float]:
+        """Seconds until each of ``ability_ids`` is ready (0.0 when ready), in one pass"""
+        user_id = str(user_id)
+        deadlines = self._deadlines.get(user_id)
+        if not deadlines:
+            return [0.0 for _ in ability_ids]
+        now = time.time()
+        if max(deadlines) <= now:
+            del self._deadlines[user_id]  # Everything has cooled down
+            return [0.0 for _ in ability_ids]
+        result = []
+        for ability_id in ability_ids:
+            slot = self._slots.get(ability_id)
+            deadline = deadlines[slot] if slot is not None and slot < len(deadlines) else 0.0
+            result.append(max(0.0, deadline - now))
+        return result
+
+    def clear(self, user_id) -> None:
+        """Reset every cooldown a hunter has"""
+        if self._deadlines.pop(str(user_id), None) is not None:
+            self._changed()
+
+    # Persistence --------------------------------------------------------
+
+    async def load(self) -> None:
+        """Read saved cooldowns; call once at startup"""
+        saved = await read_json(self.path, {}) or {}
+        slot_ids = saved.get('slots', [])
+        now = time.time()
+        for user_id, saved_deadlines in saved.get('users', {}).items():
+            if user_id in self._deadlines or max(saved_deadlines, default=0.0) <= now:
+                continue
+            deadlines = []
+            for ability_id, deadline in zip(slot_ids, saved_deadlines):
+                slot = self._slot(ability_id)
+                if len(deadlines) <= slot:
+                    deadlines.extend([0.0] * (slot + 1 - len(deadlines)))
+                deadlines[slot] = deadline
+            self._deadlines[user_id] = deadlines
+
+    def _changed(self) -> None:
+        self._file.changed()
+
+    def _dump(self) -> Dict:
+        now = time.time()
+        users = {user_id: [round(d, 1) if d > now else 0 for d in deadlines]
+                 for user_id, deadlines in self._deadlines.items() if max(deadlines) > now}
+        return {'slots': self._slot_ids, 'users': users}
+
+    def flush(self) -> None:
+        """Write the running cooldowns in the background"""
+        self._file.flush()
+
+    async def flush_async(self) -> None:
+        """Write the running cooldowns now; call before the process exits"""
+        await self._file.flush_async()
+
+
+# Global instance
+ability_cooldowns = AbilityCooldowns()
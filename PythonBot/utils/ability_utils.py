@@ -1,58 +1,43 @@
-import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional
+from utils.game_data import game_data
+from utils.ability_cooldowns import ability_cooldowns
+from utils.derived_stats import derived_stats
+
+# Real-time length of one cooldown turn
+SECONDS_PER_TURN = 10
 
 def load_abilities_data() -> Dict[str, Any]:
-    """Load abilities data from JSON file"""
-    try:
-        with open('data/abilities.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+    """Ability catalog from the shared game data registry"""
+    return game_data.abilities()
 
 def get_ability_data(ability_id: str) -> Optional[Dict[str, Any]]:
     """Get data for a specific ability"""
-    abilities = load_abilities_data()
-    return abilities.get(ability_id)
-
-def calculate_cooldown_end(turns_cooldown: int) -> str:
-    """Calculate when an ability cooldown ends (in seconds for real-time)"""
-    cooldown_seconds = turns_cooldown * 10  # 10 seconds per turn
-    return (datetime.now() + timedelta(seconds=cooldown_seconds)).isoformat()
-
-def is_ability_on_cooldown(hunter: Dict[str, Any], ability_id: str) -> bool:
+    return game_data.ability(ability_id)
+
+def format_cooldown(remaining: float) -> Optional[str]:
+    """Remaining cooldown as a short string, None once the ability is ready"""
+    if remaining <= 0:
+        return None
+    minutes, seconds = divmod(remaining, 60)
+    if minutes > 0:
+        return f"{int(minutes)}m {int(seconds)}s"
+    return f"{int(seconds)}s"
+
+def is_ability_on_cooldown(user_id: str, ability_id: str) -> bool:
     """Check if an ability is currently on cooldown"""
-    active_cooldowns = hunter.get('active_cooldowns', {})
-    if ability_id in active_cooldowns:
-        cooldown_end_str = active_cooldowns[ability_id]
-        try:
-            cooldown_end_time = datetime.fromisoformat(cooldown_end_str)
-            return datetime.now() < cooldown_end_time
-        except ValueError:
-            # Invalid datetime format, remove it
-            del active_cooldowns[ability_id]
-    return False
-
-def get_remaining_cooldown(hunter: Dict[str, Any], ability_id: str) -> Optional[str]:
+    return ability_cooldowns.remaining(user_id, ability_id) > 0
+
+def get_remaining_cooldown(user_id: str, ability_id: str) -> Optional[str]:
     """Get remaining cooldown time as a formatted string"""
-    active_cooldowns = hunter.get('active_cooldowns', {})
-    if ability_id in active_cooldowns:
-        cooldown_end_str = active_cooldowns[ability_id]
-        try:
-            cooldown_end_time = datetime.fromisoformat(cooldown_end_str)
-            remaining = cooldown_end_time - datetime.now()
-            if remaining.total_seconds() > 0:
-                minutes, seconds = divmod(remaining.total_seconds(), 60)
-                if minutes > 0:
-                    return f"{int(minutes)}m {int(seconds)}s"
-                else:
-                    return f"{int(seconds)}s"
-        except ValueError:
-            pass
-    return None
-
-def apply_ability_effect(hunter: Dict[str, Any], monster: Dict[str, Any], ability_id: str) -> Tuple[str, bool]:
+    return format_cooldown(ability_cooldowns.remaining(user_id, ability_id))
+
+def get_ability_cooldowns(user_id: str, ability_ids: Iterable[str]) -> List[Optional[str]]:
+    """Remaining cooldown of each ability (None when ready), for rendering a whole ability row at once"""
+    return [format_cooldown(remaining) for remaining in ability_cooldowns.readiness(user_id, ability_ids)]
+
+def apply_ability_effect(hunter: Dict[str, Any], monster: Dict[str, Any], ability_id: str,
+                         user_id: str) -> Tuple[str, bool]:
     """Apply an ability's effect and return result message and success status"""
     ability_data = get_ability_data(ability_id)
     if not ability_data:
@@ -63,13 +48,13 @@ def apply_ability_effect(hunter: Dict[str, Any], monster: Dict[str, Any], abilit
         return "Not enough mana!", False
 
     # Check cooldown
-    if is_ability_on_cooldown(hunter, ability_id):
-        remaining_cd = get_remaining_cooldown(hunter, ability_id)
+    remaining_cd = get_remaining_cooldown(user_id, ability_id)
+    if remaining_cd is not None:
         return f"{ability_data['name']} is on cooldown. {remaining_cd} remaining.", False
 
     # Deduct mana and set cooldown
     hunter['mana'] = max(0, hunter.get('mana', 0) - ability_data['mana_cost'])
-    hunter.setdefault('active_cooldowns', {})[ability_id] = calculate_cooldown_end(ability_data['cooldown_turns'])
+    ability_cooldowns.start(user_id, ability_id, ability_data['cooldown_turns'] * SECONDS_PER_TURN)
 
     damage_dealt = 0
     healing_done = 0
@@ -143,27 +128,8 @@ def apply_ability_effect(hunter: Dict[str, Any], monster: Dict[str, Any], abilit
             }
             message = f"You used **{ability_data['name']}**! You will evade the next attack."
 
-    # Clean up expired cooldowns
-    cleanup_expired_cooldowns(hunter)
-    
     return message, True
 
-def cleanup_expired_cooldowns(hunter: Dict[str, Any]) -> None:
-    """Remove expired cooldowns from hunter data"""
-    active_cooldowns = hunter.get('active_cooldowns', {})
-    expired_abilities = []
-    
-    for ability_id, cooldown_end_str in active_cooldowns.items():
-        try:
-            cooldown_end_time = datetime.fromisoformat(cooldown_end_str)
-            if datetime.now() > cooldown_end_time:
-                expired_abilities.append(ability_id)
-        except ValueError:
-            expired_abilities.append(ability_id)
-    
-    for ability_id in expired_abilities:
-        del active_cooldowns[ability_id]
-
 def process_turn_effects(hunter: Dict[str, Any]) -> str:
     """Process turn-based effects like buffs and debuffs"""
     messages = []
@@ -187,30 +153,17 @@ def process_turn_effects(hunter: Dict[str, Any]) -> str:
     return " ".join(messages)
 
 def get_effective_stats(hunter: Dict[str, Any]) -> Dict[str, int]:
-    """Get hunter's effective stats including temporary buffs"""
-    base_stats = {
-        'strength': hunter.get('strength', 10),
-        'agility': hunter.get('agility', 10),
-        'intelligence': hunter.get('intelligence', 10),
-        'defense': hunter.get('defense', 5)
-    }
-    
-    temp_buffs = hunter.get('temp_buffs', {})
-    
-    # Apply attack buff
-    if 'attack_buff' in temp_buffs:
-        buff_amount = temp_buffs['attack_buff'].get('amount', 0)
-        base_stats['strength'] += buff_amount
-    
-    return base_stats
+    """Get hunter's effective stats: base, equipment and temporary buffs"""
+    return derived_stats.effective(hunter)
 
 def initialize_hunter_abilities(hunter: Dict[str, Any]) -> None:
     """Initialize hunter with mana and basic abilities if not present"""
     hunter.setdefault('mana', 100)
     hunter.setdefault('max_mana', 100)
     hunter.setdefault('abilities', ['power_strike', 'heal'])
-    hunter.setdefault('active_cooldowns', {})
     hunter.setdefault('temp_buffs', {})
+    # Cooldowns live in utils.ability_cooldowns now; old ISO strings only ran for seconds
+    hunter.pop('active_cooldowns', None)
 
 def get_hunter_abilities_by_level(level: int) -> list:
     """Get abilities a hunter should have based on their level"""
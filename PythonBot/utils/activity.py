@@ -0,0 +1,218 @@
+"""Who is busy with what: one per-user activity registry every command gates on."""
+
+import time
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set
+
+from discord.ext import commands
+
+HUNT = 'hunt'                # Interactive hunt in an adventure channel (main.py)
+EXPLORATION = 'exploration'  # Dimensional gate run (Gates)
+RAID = 'raid'                # Dungeon raid (DungeonRaids)
+EVENT = 'event'              # Event boss battle (EventManagement, EventBosses)
+REST = 'rest'                # .rest recovery period
+TRAINING = 'training'        # Stat training session (Training)
+
+# Seconds an activity holds its user without being renewed; a fight whose
+# view died or a restart mid-raid frees the hunter once this runs out
+LEASES = {
+    HUNT: 15 * 60,
+    EXPLORATION: 30 * 60,
+    RAID: 60 * 60,
+    EVENT: 20 * 60,
+    REST: 90,
+    TRAINING: 60 * 60,
+}
+
+# Activity -> activities allowed to take over from it while it is live.
+# None may today: each one must end (or expire) first. Restarting the same
+# activity from the same owner just renews its lease.
+TRANSITIONS: Dict[str, Set[str]] = {
+    HUNT: set(),
+    EXPLORATION: set(),
+    RAID: set(),
+    EVENT: set(),
+    REST: set(),
+    TRAINING: set(),
+}
+
+# Activities that lock out every command, not just other activities
+LOCKOUT = {REST, TRAINING}
+# Activities that are fights
+COMBAT = {HUNT, EXPLORATION, RAID, EVENT}
+# Commands that still work during a lockout
+LOCKOUT_EXEMPT = {'help', 'commands', 'training', 'training_stats', 'status', 'my_adventure'}
+
+# Hunter record fields a fight in progress is saved under; a restart ends
+# every fight, so startup clears whatever the last run left in them
+BATTLE_FIELDS = ('battle', 'gate_battle', 'dungeon_battle')
+
+BUSY_MESSAGES = {
+    HUNT: "You are already in an interactive battle! Use the buttons to continue fighting.",
+    EXPLORATION: "You're already exploring a dimensional gate ({name})! Complete your current exploration first.",
+    RAID: "You're already raiding a dungeon! Finish your current raid first.",
+    EVENT: "❌ You are already in combat! Finish your current battle first.",
+    REST: "You are currently resting. Please wait {wait} before using commands.",
+    TRAINING: "You're currently training **{name}**! Please wait {wait} before using other commands.",
+}
+
+
+class Activity(NamedTuple):
+    kind: str
+    owner: str          # Cog (or module) that started it
+    expires_at: float   # Lease end, epoch seconds
+    data: Any           # Whatever the owner tracks for it
+
+
+class ActivityBusy(commands.CheckFailure):
+    """Raised by the global command check; the message is meant for the user"""
+
+
+class ActivityRegistry:
+    """Current activity per user, with a lease that frees the user when it runs out.
+
+    ``current`` is a single dict lookup, so every command can afford to ask.
+    A user has at most one activity; ``begin`` refuses while another live
+    activity holds them unless ``TRANSITIONS`` lets the new kind take over,
+    and ``end`` only ends the kind it is given, so one cog cannot free a
+    user another cog is still running. The registry itself is not
+    persisted; the lockouts that must outlive a restart (rest, training)
+    are kept in scheduler tables by their owners and begun again at startup.
+    """
+
+    def __init__(self):
+        self._current: Dict[str, Activity] = {}
+        self._by_kind: Dict[str, Set[str]] = {}
+
+    def current(self, user_id) -> Optional[Activity]:
+        """The user's live activity, None if they are free"""
+        user_id = str(user_id)
+        activity = self._current.get(user_id)
+        if activity is not None and activity.expires_at <= time.time():
+            self._drop(user_id)
+            return None
+        return activity
+
+    def is_busy(self, user_id) -> bool:
+        return self.current(user_id) is not None
+
+    def in_combat(self, user_id, hunter: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether the user is fighting: a live combat activity, or a battle saved on their record"""
+        if hunter is not None and any(hunter.get(field) for field in BATTLE_FIELDS):
+            return True
+        activity = self.current(user_id)
+        return activity is not None and activity.kind in COMBAT
+
+    def can_begin(self, user_id, kind: str, owner: str) -> bool:
+        activity = self.current(user_id)
+        return (activity is None
+                or (activity.kind == kind and activity.owner == owner)
+                or kind in TRANSITIONS.get(activity.kind, ()))
+
+    def begin(self, user_id, kind: str, owner: str, seconds: Optional[float] = None,
+              data: Any = None) -> Optional[Activity]:
+        """Start (or renew) an activity; None when the user is busy with something that may not hand over"""
+        if not self.can_begin(user_id, kind, owner):
+            return None
+        return self._set(str(user_id), kind, owner, seconds, data)
+
+    def renew(self, user_id, seconds: Optional[float] = None) -> None:
+        """Push back the lease of the user's live activity"""
+        activity = self.current(user_id)
+        if activity is not None:
+            self._set(str(user_id), activity.kind, activity.owner, seconds, activity.data)
+
+    def end(self, user_id, kind: Optional[str] = None) -> Optional[Activity]:
+        """Free the user if their activity is ``kind`` (any kind if None)"""
+        user_id = str(user_id)
+        activity = self._current.get(user_id)
+        if activity is None or (kind is not None and activity.kind != kind):
+            return None
+        self._drop(user_id)
+        return activity
+
+    def busy_message(self, activity: Activity) -> str:
+        """What to tell a user their activity blocks them with"""
+        wait = max(0, int(activity.expires_at - time.time()))
+        minutes, seconds = divmod(wait, 60)
+        data = activity.data if isinstance(activity.data, dict) else {}
+        name = data.get('gate_name') or str(data.get('type', 'Unknown')).title()
+        return BUSY_MESSAGES[activity.kind].format(wait=f"{minutes}:{seconds:02d}", name=name)
+
+    def view(self, kind: str, owner: str, seconds: Optional[float] = None) -> 'ActivityView':
+        """Dict of user id -> data for one kind, for cogs that kept their own tracking dict"""
+        return ActivityView(self, kind, owner, seconds)
+
+    async def command_check(self, ctx) -> bool:
+        """Global command check: resting and training lock out all but a few commands"""
+        activity = self.current(ctx.author.id)
+        if activity is not None and activity.kind in LOCKOUT and ctx.command.name not in LOCKOUT_EXEMPT:
+            raise ActivityBusy(self.busy_message(activity))
+        return True
+
+    def _set(self, user_id: str, kind: str, owner: str, seconds: Optional[float], data: Any) -> Activity:
+        self._drop(user_id)
+        lease = seconds if seconds is not None else LEASES[kind]
+        activity = self._current[user_id] = Activity(kind, owner, time.time() + lease, data)
+        self._by_kind.setdefault(kind, set()).add(user_id)
+        return activity
+
+    def _drop(self, user_id: str) -> None:
+        activity = self._current.pop(user_id, None)
+        if activity is not None:
+            self._by_kind.get(activity.kind, set()).discard(user_id)
+
+    def _users(self, kind: str) -> Set[str]:
+        users = self._by_kind.get(kind, set())
+        for user_id in list(users):
+            self.current(user_id)  # Drops expired leases
+        return users
+
+
+class ActivityView(MutableMapping):
+    """One kind of activity seen as the per-cog dict it replaces.
+
+    Assigning starts the activity (renewing it if already running) and
+    raises ``ActivityBusy`` if the user is busy with something else, reading
+    an entry renews its lease, ``del`` ends it and ``in`` is a live check, so
+    cogs keep their ``active_raids[user_id] = raid`` style unchanged while
+    the registry sees every activity in one place.
+    """
+
+    def __init__(self, registry: ActivityRegistry, kind: str, owner: str, seconds: Optional[float]):
+        self.registry = registry
+        self.kind = kind
+        self.owner = owner
+        self.seconds = seconds
+
+    def _live(self, user_id) -> Optional[Activity]:
+        activity = self.registry.current(user_id)
+        return activity if activity is not None and activity.kind == self.kind else None
+
+    def __getitem__(self, user_id) -> Any:
+        activity = self._live(user_id)
+        if activity is None:
+            raise KeyError(user_id)
+        self.registry.renew(user_id, self.seconds)
+        return activity.data
+
+    def __setitem__(self, user_id, data: Any) -> None:
+        if self.registry.begin(user_id, self.kind, self.owner, self.seconds, data) is None:
+            raise ActivityBusy(self.registry.busy_message(self.registry.current(user_id)))
+
+    def __delitem__(self, user_id) -> None:
+        if self.registry.end(user_id, self.kind) is None:
+            raise KeyError(user_id)
+
+    def __contains__(self, user_id) -> bool:
+        return self._live(user_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.registry._users(self.kind)))
+
+    def __len__(self) -> int:
+        return len(self.registry._users(self.kind))
+
+
+# Global instance
+activities = ActivityRegistry()
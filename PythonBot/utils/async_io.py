@@ -0,0 +1,133 @@
+"""Async file I/O: blocking reads and writes run on a small thread pool so the event loop never stalls."""
+
+import asyncio
+import functools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.hunter_storage import StoreEncoder, atomic_write_text
+
+# Disk work is I/O bound, a handful of threads is plenty and keeps memory bounded
+IO_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='bot-io')
+_path_locks: Dict[str, asyncio.Lock] = {}
+_pending_writes: Dict[str, Any] = {}
+_write_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking function on the I/O pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def path_lock(path: str) -> asyncio.Lock:
+    """Lock that serializes writers to one file (FIFO, so writes land in order)"""
+    return _path_locks.setdefault(_key(path), asyncio.Lock())
+
+
+def _read_json_file(path: str) -> Any:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+async def read_json(path: str, default: Any = None) -> Any:
+    """Read and parse a JSON file off the event loop; default if it does not exist"""
+    try:
+        return await run_io(_read_json_file, path)
+    except FileNotFoundError:
+        return default
+
+
+async def write_json(path: str, data: Any, indent: Optional[int] = 4) -> None:
+    """Atomically write JSON off the event loop, one writer per path at a time.
+
+    The data is serialized before awaiting, so callers may keep mutating it.
+    """
+    text = json.dumps(data, indent=indent, cls=StoreEncoder)
+    async with path_lock(path):
+        await run_io(atomic_write_text, path, text)
+
+
+def write_json_soon(path: str, data: Any, indent: Optional[int] = 4) -> None:
+    """Fire-and-forget write for sync callers; repeated calls before it runs collapse into one"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        atomic_write_text(path, json.dumps(data, indent=indent, cls=StoreEncoder))
+        return
+
+    key = _key(path)
+    already_pending = key in _pending_writes
+    _pending_writes[key] = data
+    if already_pending:
+        return
+
+    async def _write():
+        async with path_lock(path):
+            latest = _pending_writes.pop(key)
+            text = json.dumps(latest, indent=indent, cls=StoreEncoder)
+            try:
+                await run_io(atomic_write_text, path, text)
+            except Exception as e:
+                print(f"Error writing {path}: {e}")
+
+    def _forget(done: asyncio.Task) -> None:
+        if _write_tasks.get(key) is done:
+            del _write_tasks[key]
+
+    task = _write_tasks[key] = loop.create_task(_write())
+    task.add_done_callback(_forget)
+
+
+async def wait_written(path: str) -> None:
+    """Wait until a write_json_soon of ``path`` that is queued or running has landed"""
+    task = _write_tasks.get(_key(path))
+    if task is not None:
+        await task
+
+
+class DebouncedJsonFile:
+    """One JSON file rewritten a little after it changes, with bursts of changes collapsed into one write.
+
+    ``dump`` builds the data to write and is called when the write happens,
+    not when the change is reported. Outside a running loop changes are not
+    saved at all, since scripts have nothing to keep across restarts.
+    """
+
+    def __init__(self, path: str, dump: Callable[[], Any], delay: float, indent: Optional[int] = None):
+        self.path = path
+        self.dump = dump
+        self.delay = delay
+        self.indent = indent
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def changed(self) -> None:
+        """Schedule a write ``delay`` seconds from now unless one is already scheduled"""
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._handle = loop.call_later(self.delay, self.flush)
+
+    def flush(self) -> None:
+        """Write the file in the background"""
+        self._handle = None
+        write_json_soon(self.path, self.dump(), indent=self.indent)
+
+    async def flush_async(self) -> None:
+        """Write the file now and wait for it; call before the process exits"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        await wait_written(self.path)  # An earlier background write must not land after this one
+        await write_json(self.path, self.dump(), indent=self.indent)
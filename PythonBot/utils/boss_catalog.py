@@ -0,0 +1,130 @@
+"""Event boss catalog: id index, priority tiers and O(log n) weighted draws."""
+
+import bisect
+import random
+from itertools import accumulate
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.game_data import game_data
+
+# Used when data/boss_priority.json is missing
+DEFAULT_PRIORITY = {
+    "boss_priority": {"tier_1_legendary": ["antares", "shadow_monarch", "kamish"]},
+    "spawn_weights": {"tier_1_legendary": 5},
+    "auto_spawn_settings": {"enabled": False}
+}
+
+
+class WeightedDraw:
+    """Cumulative-weight table; each draw is one bisect"""
+
+    __slots__ = ('items', '_cumulative', '_total')
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]):
+        pairs = [(item, w) for item, w in zip(items, weights) if w > 0]
+        self.items = tuple(item for item, _ in pairs)
+        self._cumulative = list(accumulate(w for _, w in pairs))
+        self._total = self._cumulative[-1] if self._cumulative else 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw(self, rng: random.Random = random) -> Optional[Any]:
+        if not self.items:
+            return None
+        index = bisect.bisect_right(self._cumulative, rng.random() * self._total)
+        return self.items[min(index, len(self.items) - 1)]
+
+
+class BossCatalog:
+    """Indexes event_bosses.json against the tiers and weights in boss_priority.json.
+
+    A boss listed in several tiers gets the sum of their weights and bosses in
+    no tier get weight 1, the same odds the old repeated-list selection gave.
+    """
+
+    def __init__(self, bosses: Sequence[Mapping[str, Any]], priority: Optional[Mapping[str, Any]]):
+        priority = priority if priority is not None else DEFAULT_PRIORITY
+        self.bosses: Tuple[Mapping[str, Any], ...] = tuple(bosses)
+        self.by_id: Dict[str, Mapping[str, Any]] = {}
+        for boss in self.bosses:
+            self.by_id.setdefault(boss['id'], boss)
+
+        self.spawn_weights: Mapping[str, int] = priority.get('spawn_weights', {})
+        self.auto_spawn_settings: Mapping[str, Any] = priority.get('auto_spawn_settings', {})
+
+        # Tier key -> bosses in the order the tier lists them (unknown ids skipped)
+        self.tiers: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+        self.tier_ids: Dict[str, frozenset] = {}
+        self._tier_aliases: Dict[str, str] = {}
+        weights: Dict[str, float] = {}
+        for tier, boss_ids in priority.get('boss_priority', {}).items():
+            self.tier_ids[tier] = frozenset(boss_ids)
+            self.tiers[tier] = tuple(self.by_id[b] for b in boss_ids if b in self.by_id)
+            for boss in self.tiers[tier]:
+                weights[boss['id']] = weights.get(boss['id'], 0) + self.spawn_weights.get(tier, 1)
+            # "tier_1_legendary" is also reachable as "tier_1", "1" and "legendary"
+            parts = tier.lower().split('_')
+            for alias in {tier.lower(), '_'.join(parts[:2]), *parts[1:]}:
+                self._tier_aliases.setdefault(alias, tier)
+
+        categorized = set().union(*self.tier_ids.values()) if self.tier_ids else set()
+        self.uncategorized: Tuple[Mapping[str, Any], ...] = tuple(
+            b for b in self.by_id.values() if b['id'] not in categorized
+        )
+        for boss in self.uncategorized:
+            weights[boss['id']] = 1
+
+        ordered = list(self.by_id.values())
+        self._priority_draw = WeightedDraw(ordered, [weights.get(b['id'], 0) for b in ordered])
+        self._uniform_draw = WeightedDraw(ordered, [1] * len(ordered))
+        self._tier_draws = {
+            tier: WeightedDraw(members, [b.get('spawn_weight', 1) for b in members])
+            for tier, members in self.tiers.items()
+        }
+
+    def get(self, boss_id: str) -> Optional[Mapping[str, Any]]:
+        return self.by_id.get(boss_id)
+
+    def resolve_tier(self, name: str) -> Optional[str]:
+        """Tier key for 'tier_2_major', 'tier_2', '2' or 'major'"""
+        return self._tier_aliases.get(str(name).lower())
+
+    def tier(self, tier: str) -> Tuple[Mapping[str, Any], ...]:
+        return self.tiers.get(tier, ())
+
+    def draw(self, rng: random.Random = random,
+             exclude: Collection[str] = ()) -> Optional[Mapping[str, Any]]:
+        """Priority-weighted boss, skipping ids in exclude (e.g. already active)"""
+        return self._draw(self._priority_draw, rng, exclude) or self._draw(self._uniform_draw, rng, exclude)
+
+    def draw_from_tier(self, tier: str, rng: random.Random = random,
+                       exclude: Collection[str] = ()) -> Optional[Mapping[str, Any]]:
+        table = self._tier_draws.get(tier)
+        return self._draw(table, rng, exclude) if table else None
+
+    def available(self, exclude: Collection[str]) -> List[Mapping[str, Any]]:
+        return [b for b in self.by_id.values() if b['id'] not in exclude]
+
+    @staticmethod
+    def _draw(table: WeightedDraw, rng, exclude: Collection[str]) -> Optional[Mapping[str, Any]]:
+        if not exclude:
+            return table.draw(rng)
+        # Exclusions are a handful of active events; a few redraws beat rebuilding a table
+        for _ in range(8):
+            boss = table.draw(rng)
+            if boss is None or boss['id'] not in exclude:
+                return boss
+        remaining = [b for b in table.items if b['id'] not in exclude]
+        return rng.choice(remaining) if remaining else None
+
+
+def _build(bosses_data) -> BossCatalog:
+    bosses = (bosses_data or {}).get('event_bosses', [])
+    return BossCatalog(bosses, game_data.boss_priority())
+
+
+def get_boss_catalog() -> BossCatalog:
+    """Catalog for the current boss files (rebuilt when either one reloads)"""
+    key = f"boss_catalog:{game_data.version('boss_priority')}"
+    return game_data.derive('event_bosses', key, _build)
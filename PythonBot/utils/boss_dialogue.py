@@ -1,21 +1,18 @@
-import json
 import random
 from typing import Dict, List, Optional
+from utils.game_data import game_data
 
 class BossDialogueManager:
     """Manages authentic Solo Leveling boss conversations and turn-based combat dialogue"""
     
-    def __init__(self):
-        self.dialogues = self.load_boss_dialogues()
+    @property
+    def dialogues(self) -> Dict:
+        """Current boss dialogues (follows hot reloads of data/boss_dialogues.json)"""
+        return self.load_boss_dialogues()
     
     def load_boss_dialogues(self) -> Dict:
         """Load boss dialogue data from JSON file"""
-        try:
-            with open('data/boss_dialogues.json', 'r') as f:
-                data = json.load(f)
-                return data.get('boss_dialogues', {})
-        except FileNotFoundError:
-            return {}
+        return game_data.boss_dialogues()
     
     def get_encounter_intro(self, boss_id: str) -> str:
         """Get random encounter introduction dialogue"""
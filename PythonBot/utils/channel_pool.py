@@ -0,0 +1,412 @@
+"""Warm pool of private channels: leased by editing overwrites instead of created and deleted per fight."""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import discord
+
+from utils.hunter_store import hunter_store
+
+# Category the hunt adventure channels live in
+COMBAT_CATEGORY_ID = 1382846867418775552
+# Hidden idle channels kept ready per guild
+POOL_SIZE = 3
+# Idle channels beyond this are deleted on release instead of kept
+MAX_IDLE = 6
+# Seconds between channel creates while refilling, to stay clear of the create rate limit
+REFILL_INTERVAL = 2.0
+# A lease nobody has touched for this long goes back to the pool
+LEASE_IDLE_SECONDS = 1800
+# Bulk delete only reaches messages younger than 14 days; older leases are replaced, not scrubbed
+SCRUB_MAX_AGE = 13 * 24 * 3600
+SCRUB_LIMIT = 1000
+# Roles whose names contain one of these can see every pooled channel
+STAFF_ROLE_WORDS = ('mod', 'admin', 'staff')
+
+# Every pool, so a finished fight can hand back a channel without knowing where it came from
+_pools: List['ChannelPool'] = []
+
+HIDDEN = discord.PermissionOverwrite(view_channel=False)
+MEMBER_ACCESS = discord.PermissionOverwrite(
+    view_channel=True, send_messages=True, read_message_history=True, embed_links=True, add_reactions=True
+)
+STAFF_ACCESS = discord.PermissionOverwrite(view_channel=True, send_messages=True)
+BOT_ACCESS = discord.PermissionOverwrite(
+    view_channel=True, send_messages=True, read_message_history=True, embed_links=True, add_reactions=True,
+    manage_messages=True, manage_channels=True, manage_permissions=True
+)
+
+
+class ChannelPool:
+    """Keeps a few hidden text channels per guild in one category and leases them out.
+
+    A lease gives its members access with a single overwrite edit (or one
+    create when the pool ran dry) and a background task tops the pool back
+    up. Channel names and topics are never changed, since Discord only allows
+    a couple of renames per channel every ten minutes. Releasing hides the
+    channel again, purges it and puts it back; overwrite edits that would
+    change nothing are skipped. Leases are keyed by any string (a user id,
+    an event id) and survive restarts. With ``index_field`` set, keys are
+    user ids and each lease is also written to that field of the owner's
+    hunter record; a saved entry is checked against the channel's overwrites
+    the first time its owner is looked up, so startup makes no requests.
+    Otherwise, and for channels the index does not know, the first use in a
+    guild adopts the channels already in the category, treating a channel
+    with exactly one member overwrite as that member's lease. Duplicates and
+    shared leftovers found that way are scrubbed by the background refill.
+    """
+
+    def __init__(self, category_id: Optional[int] = COMBAT_CATEGORY_ID, category_name: Optional[str] = None,
+                 prefix: str = 'adventure', size: int = POOL_SIZE, idle_timeout: Optional[float] = LEASE_IDLE_SECONDS,
+                 index_field: Optional[str] = None, store=hunter_store):
+        self.category_id = category_id
+        self.category_name = category_name
+        self.prefix = prefix
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.index_field = index_field
+        self.store = store
+        self.bot = None
+        self._idle: Dict[int, List[int]] = {}
+        self._leases: Dict[str, int] = {}
+        self._owners: Dict[int, str] = {}
+        self._leased_at: Dict[int, float] = {}
+        self._touched: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._adopted: Set[int] = set()
+        self._recalled: Set[str] = set()
+        self._strays: Dict[int, List[int]] = {}
+        self._refills: Dict[int, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        _pools.append(self)
+
+    def attach(self, bot) -> None:
+        """Register the bot and forget channels that get deleted by hand"""
+        self.bot = bot
+        bot.add_listener(self._on_channel_delete, 'on_guild_channel_delete')
+
+    async def _on_channel_delete(self, channel) -> None:
+        idle = self._idle.get(channel.guild.id)
+        if idle and channel.id in idle:
+            idle.remove(channel.id)
+        key = self._owners.pop(channel.id, None)
+        if key is not None:
+            self._unbind(key)
+
+    # Lookups ------------------------------------------------------------
+
+    def get(self, key) -> Optional[discord.TextChannel]:
+        """The channel leased under ``key``, or None"""
+        key = str(key)
+        channel_id = self._leases.get(key)
+        if channel_id is None:
+            channel_id = self._recall(key)
+        if channel_id is None:
+            return None
+        channel = self.bot.get_channel(channel_id) if self.bot is not None else None
+        if channel is None:
+            self._unbind(key)
+        return channel
+
+    def owner_of(self, channel) -> Optional[str]:
+        """Lease key a channel is currently out under"""
+        return self._owners.get(channel.id)
+
+    def touch(self, key) -> None:
+        """Push back the idle release of a lease"""
+        key = str(key)
+        if key in self._leases:
+            self._touched[key] = time.monotonic()
+
+    # Owner index --------------------------------------------------------
+
+    def _recall(self, key: str) -> Optional[int]:
+        """Bind the lease saved on the owner's record, once per key, if the channel still belongs to them"""
+        if self.index_field is None or key in self._recalled or self.bot is None:
+            return None
+        self._recalled.add(key)
+        record = self.store.get(key)
+        channel_id = record.get(self.index_field) if record else None
+        if not channel_id:
+            return None
+        channel = self.bot.get_channel(channel_id)
+        category = self._category(channel.guild) if channel is not None else None
+        if (category is None or channel.category_id != category.id or channel.id in self._owners
+                or self._members(channel) != [int(key)]):
+            self._save_index(key, None)
+            return None
+        self._bind(key, channel, channel.created_at.timestamp())
+        return channel.id
+
+    def _save_index(self, key: str, channel_id: Optional[int]) -> None:
+        if self.index_field is None:
+            return
+        record = self.store.get(key)
+        if record is not None and record.get(self.index_field) != channel_id:
+            record[self.index_field] = channel_id
+            self.store.mark_dirty(key)
+
+    # Overwrites ---------------------------------------------------------
+
+    @staticmethod
+    def _members(channel) -> List[int]:
+        return [target.id for target in channel.overwrites
+                if not isinstance(target, discord.Role) and target.id != channel.guild.me.id]
+
+
+    def _overwrites(self, guild: discord.Guild, members: Iterable) -> Dict:
+        overwrites = {guild.default_role: HIDDEN, guild.me: BOT_ACCESS}
+        for role in guild.roles:
+            if any(word in role.name.lower() for word in STAFF_ROLE_WORDS):
+                overwrites[role] = STAFF_ACCESS
+        for member in members:
+            overwrites[member] = MEMBER_ACCESS
+        return overwrites
+
+    @staticmethod
+    def _matches(channel, overwrites: Dict) -> bool:
+        current = {target.id: overwrite for target, overwrite in channel.overwrites.items()}
+        return current == {target.id: overwrite for target, overwrite in overwrites.items()}
+
+    async def _set_overwrites(self, channel, overwrites: Dict, reason: str) -> None:
+        if not self._matches(channel, overwrites):
+            await channel.edit(overwrites=overwrites, reason=reason)
+
+    # Guild state --------------------------------------------------------
+
+    def _category(self, guild: discord.Guild) -> Optional[discord.CategoryChannel]:
+        if self.category_id is not None:
+            category = guild.get_channel(self.category_id)
+            if isinstance(category, discord.CategoryChannel):
+                return category
+        if self.category_name is not None:
+            return discord.utils.get(guild.categories, name=self.category_name)
+        return None
+
+    async def _ensure_category(self, guild: discord.Guild) -> Optional[discord.CategoryChannel]:
+        category = self._category(guild)
+        if category is None and self.category_name is not None:
+            category = await guild.create_category(self.category_name, overwrites={guild.default_role: HIDDEN})
+        return category
+
+    def _adopt(self, guild: discord.Guild) -> None:
+        """Sort the channels already in the category (after a restart or from before the pool).
+
+        Only reads the gateway cache; the strays it finds are left for the
+        background refill to scrub.
+        """
+        if guild.id in self._adopted:
+            return
+        self._adopted.add(guild.id)
+        category = self._category(guild)
+        if category is None:
+            return
+
+        idle = self._idle.setdefault(guild.id, [])
+        strays = self._strays.setdefault(guild.id, [])
+        for channel in category.text_channels:
+            if channel.id in self._owners or channel.id in idle:
+                continue
+            members = self._members(channel)
+            key = str(members[0]) if len(members) == 1 else None
+            leased = self.get(key) if key is not None else None
+            if leased is not None and leased.id == channel.id:
+                continue  # The owner index already had it
+            if key is not None and leased is None:
+                self._bind(key, channel, channel.created_at.timestamp())
+            elif members:
+                strays.append(channel.id)  # Shared, or a duplicate of someone's channel
+            else:
+                idle.append(channel.id)
+
+    def _bind(self, key: str, channel, leased_at: Optional[float] = None) -> None:
+        self._recalled.add(key)
+        self._save_index(key, channel.id)
+        self._leases[key] = channel.id
+        self._owners[channel.id] = key
+        self._leased_at[channel.id] = leased_at if leased_at is not None else time.time()
+        self._touched[key] = time.monotonic()
+        self._arm(key)
+
+    def _unbind(self, key: str) -> Optional[int]:
+        channel_id = self._leases.pop(key, None)
+        if channel_id is not None:
+            self._owners.pop(channel_id, None)
+            self._save_index(key, None)
+        self._touched.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        return channel_id
+
+    def _arm(self, key: str, delay: Optional[float] = None) -> None:
+        if self.idle_timeout is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._timers[key] = loop.call_later(delay if delay is not None else self.idle_timeout, self._expire, key)
+
+    def _expire(self, key: str) -> None:
+        self._timers.pop(key, None)
+        touched = self._touched.get(key)
+        if touched is None:
+            return
+        remaining = self.idle_timeout - (time.monotonic() - touched)
+        if remaining > 0:
+            self._arm(key, remaining)
+            return
+        asyncio.ensure_future(self.release(key))
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def _pop_idle(self, guild: discord.Guild):
+        idle = self._idle.get(guild.id, [])
+        while idle:
+            channel = guild.get_channel(idle.pop())
+            if channel is not None:
+                return channel
+        return None
+
+    def _next_name(self, category: discord.CategoryChannel) -> str:
+        return f"{self.prefix}-{len(category.text_channels) + 1}"
+
+    # Leasing ------------------------------------------------------------
+
+    async def lease(self, guild: discord.Guild, key, members: Iterable) -> Optional[discord.TextChannel]:
+        """Return the channel leased under ``key``, taking one from the pool if needed.
+
+        ``members`` are the only non-staff users who can see it. An existing
+        lease is returned as is when its overwrites already match, so calling
+        this on every command costs no API request.
+        """
+        key = str(key)
+        members = list(members)
+        async with self._lock(key):
+            self._adopt(guild)
+            overwrites = self._overwrites(guild, members)
+            channel = self.get(key)
+            try:
+                if channel is not None:
+                    self.touch(key)
+                    await self._set_overwrites(channel, overwrites, "Private channel access")
+                    return channel
+
+                channel = self._pop_idle(guild)
+                if channel is not None:
+                    try:
+                        await self._set_overwrites(channel, overwrites, "Leased from the channel pool")
+                    except discord.HTTPException:
+                        self._idle.setdefault(guild.id, []).append(channel.id)
+                        raise
+                else:
+                    category = await self._ensure_category(guild)
+                    channel = await guild.create_text_channel(
+                        name=self._next_name(category) if category else self.prefix,
+                        category=category,
+                        overwrites=overwrites,
+                        reason="Channel pool was empty"
+                    )
+            except discord.Forbidden as e:
+                print(f"[ERROR] Missing permissions for pooled channel: {e}")
+                return None
+            except discord.HTTPException as e:
+                print(f"[ERROR] Failed to lease pooled channel: {e}")
+                return None
+
+            self._bind(key, channel)
+        self.warm(guild)
+        return channel
+
+    async def grant(self, channel, member) -> None:
+        """Let one more member into a leased channel (skipped if they already have access)"""
+        if channel.overwrites_for(member) != MEMBER_ACCESS:
+            await channel.set_permissions(member, overwrite=MEMBER_ACCESS, reason="Joined a private channel")
+
+    async def release(self, key) -> None:
+        """Hide and purge a leased channel and return it to the pool"""
+        key = str(key)
+        async with self._lock(key):
+            channel_id = self._unbind(key)
+            if channel_id is None:
+                return
+            leased_at = self._leased_at.pop(channel_id, time.time())
+            channel = self.bot.get_channel(channel_id) if self.bot is not None else None
+            if channel is not None:
+                await self._scrub(channel, leased_at)
+
+    async def release_channel(self, channel) -> None:
+        """Release whatever lease ``channel`` is out under"""
+        key = self.owner_of(channel)
+        if key is not None:
+            await self.release(key)
+
+    async def _scrub(self, channel, leased_at: float) -> None:
+        guild = channel.guild
+        idle = self._idle.setdefault(guild.id, [])
+        try:
+            if time.time() - leased_at > SCRUB_MAX_AGE or len(idle) >= MAX_IDLE:
+                # Too old to bulk-purge, or surplus; the refill makes a fresh one if needed
+                await channel.delete(reason="Retired from the channel pool")
+                self.warm(guild)
+                return
+            await self._set_overwrites(channel, self._overwrites(guild, ()), "Returned to the channel pool")
+            await channel.purge(limit=SCRUB_LIMIT)
+        except discord.NotFound:
+            return
+        except discord.HTTPException as e:
+            print(f"[ERROR] Failed to scrub pooled channel {channel.id}: {e}")
+            return
+        idle.append(channel.id)
+
+    # Warm-up ------------------------------------------------------------
+
+    def warm(self, guild: discord.Guild) -> None:
+        """Top the guild's idle channels back up to ``size`` in the background"""
+        task = self._refills.get(guild.id)
+        if task is None or task.done():
+            self._refills[guild.id] = asyncio.create_task(self._refill(guild))
+
+    async def _refill(self, guild: discord.Guild) -> None:
+        self._adopt(guild)
+        strays = self._strays.pop(guild.id, [])
+        for channel_id in strays:
+            channel = guild.get_channel(channel_id)
+            if channel is not None and channel.id not in self._owners:
+                await self._scrub(channel, channel.created_at.timestamp())
+        idle = self._idle.setdefault(guild.id, [])
+        while len(idle) < self.size:
+            try:
+                category = await self._ensure_category(guild)
+                if category is None:
+                    return
+                channel = await guild.create_text_channel(
+                    name=self._next_name(category),
+                    category=category,
+                    overwrites=self._overwrites(guild, ()),
+                    reason="Warm channel pool"
+                )
+            except discord.HTTPException as e:
+                print(f"[ERROR] Failed to create pooled channel in {guild.name}: {e}")
+                return
+            idle.append(channel.id)
+            await asyncio.sleep(REFILL_INTERVAL)
+
+
+async def close_channel(channel) -> None:
+    """Return a pooled channel to its pool, or delete a channel no pool owns"""
+    for pool in _pools:
+        if pool.owner_of(channel) is not None:
+            await pool.release_channel(channel)
+            return
+    try:
+        await channel.delete()
+    except discord.NotFound:
+        pass
+
+
+# Global instance for hunt adventure channels
+combat_channels = ChannelPool(index_field='private_adventure_channel_id')
@@ -0,0 +1,312 @@
+"""Pure combat resolution shared by hunts, gates, dungeons, PvP and events.
+
+Nothing in here touches Discord or disk. A turn is a function of two
+combatants, an action, the mode's rules and an RNG; it returns the new state
+plus a list of events that the caller renders and persists. The RNG only
+needs ``randint``, ``random`` and ``uniform``, so the ``random`` module, a
+seeded ``random.Random`` or a simulator's generator all work.
+"""
+
+import random
+from typing import List, NamedTuple, Optional, Tuple
+
+# Actions
+ATTACK = 'attack'
+DEFEND = 'defend'
+FLEE = 'flee'
+SKILL = 'skill'
+WAIT = 'wait'  # the player did something the engine does not model (an item, an ability); only the enemy acts
+
+# Sides
+PLAYER = 'player'
+ENEMY = 'enemy'
+
+# Event kinds
+HIT = 'hit'
+HEAL = 'heal'
+GUARD = 'guard'
+EVADE = 'evade'
+STUNNED = 'stunned'
+ESCAPE = 'escape'
+ESCAPE_FAILED = 'escape_failed'
+
+# Outcomes
+VICTORY = 'victory'
+DEFEAT = 'defeat'
+ESCAPED = 'escaped'
+
+
+class Strike(NamedTuple):
+    """How one hit is rolled: ``attack`` is spread, rolled, scaled, crit, then reduced by defense"""
+    roll: Tuple[int, int] = (0, 0)          # added to attack
+    spread: Optional[Tuple[float, float]] = None  # attack * [lo, hi] before the roll
+    smooth: bool = False                    # spread with uniform floats instead of integer randint
+    scale: float = 1.0
+    crit_chance: float = 0.0
+    crit_multiplier: float = 1.5
+    pierce: bool = False                    # ignore the target's defense
+    fixed: bool = False                     # ignore the attacker's attack; damage is the roll alone
+    divisor: int = 1
+    min_damage: int = 1
+
+
+class Combatant(NamedTuple):
+    name: str
+    hp: int
+    max_hp: int
+    attack: int = 0
+    defense: int = 0
+    guard: Optional[int] = None  # defense while defending; plain defense when None
+    flee_chance: float = 0.0
+    evade: bool = False          # dodges the next hit, then clears
+    stunned: int = 0             # turns left without acting
+
+
+class CombatRules(NamedTuple):
+    """Everything that differs between battle modes"""
+    player_strike: Strike = Strike()
+    enemy_strike: Strike = Strike()
+    defend_strike: Optional[Strike] = None  # enemy hit on a defending player; enemy_strike when None
+    defend_factor: float = 1.0              # applied after the defend strike
+    defend_min: int = 0
+    defend_heal_chance: float = 0.0
+    defend_heal: Tuple[int, int] = (0, 0)
+    defend_heal_ratio: float = 0.0          # heal a share of max HP instead of a roll
+    flee_counter: Optional[Strike] = None   # free enemy hit after a failed escape
+    flee_penalty: Tuple[int, int] = (0, 0)  # damage taken even on a successful escape
+    enemy_counter: bool = True              # enemy acts after the player's turn
+
+
+class Action(NamedTuple):
+    kind: str
+    strike: Optional[Strike] = None   # overrides the mode's player strike (abilities, specials)
+    heal: Tuple[int, int] = (0, 0)
+
+
+class CombatState(NamedTuple):
+    player: Combatant
+    enemy: Combatant
+    outcome: Optional[str] = None
+
+
+class CombatEvent(NamedTuple):
+    kind: str
+    actor: str
+    amount: int = 0
+    critical: bool = False
+
+
+def roll_damage(attack: int, defense: int, strike: Strike, rng=random) -> Tuple[int, bool]:
+    """Roll one hit; returns (damage, critical)"""
+    if strike.fixed:
+        raw = 0
+    elif strike.spread is not None:
+        low, high = strike.spread
+        if strike.smooth:
+            raw = attack * rng.uniform(low, high)
+        else:
+            raw = rng.randint(int(attack * low), int(attack * high))
+    else:
+        raw = attack
+    if strike.roll != (0, 0):
+        raw += rng.randint(*strike.roll)
+    if strike.scale != 1.0:
+        raw = raw * strike.scale
+        if not strike.smooth:
+            raw = int(raw)
+
+    critical = strike.crit_chance > 0 and rng.random() < strike.crit_chance
+    if critical:
+        raw = int(raw * strike.crit_multiplier)
+    if not strike.pierce:
+        raw -= defense
+    raw = int(raw)
+    if strike.divisor > 1:
+        raw //= strike.divisor
+    return max(strike.min_damage, raw), critical
+
+
+def _hurt(combatant: Combatant, amount: int) -> Combatant:
+    return combatant._replace(hp=max(0, combatant.hp - amount))
+
+
+def _heal(combatant: Combatant, amount: int) -> Combatant:
+    return combatant._replace(hp=min(combatant.max_hp, combatant.hp + amount))
+
+
+def enemy_turn(player: Combatant, enemy: Combatant, rules: CombatRules, rng=random,
+               defending: bool = False, strike: Optional[Strike] = None) -> Tuple[Combatant, Combatant, List[CombatEvent]]:
+    """The enemy's attack on the player, honouring stun, evasion and the player's guard"""
+    events: List[CombatEvent] = []
+    if enemy.stunned > 0:
+        return player, enemy._replace(stunned=enemy.stunned - 1), [CombatEvent(STUNNED, ENEMY)]
+    if player.evade:
+        return player._replace(evade=False), enemy, [CombatEvent(EVADE, PLAYER)]
+
+    if strike is None:
+        strike = (rules.defend_strike or rules.enemy_strike) if defending else rules.enemy_strike
+    defense = player.guard if defending and player.guard is not None else player.defense
+    damage, critical = roll_damage(enemy.attack, defense, strike, rng)
+    if defending and rules.defend_factor != 1.0:
+        damage = max(rules.defend_min, int(damage * rules.defend_factor))
+    player = _hurt(player, damage)
+    events.append(CombatEvent(HIT, ENEMY, damage, critical))
+    return player, enemy, events
+
+
+def resolve_turn(state: CombatState, action: Action, rules: CombatRules, rng=random) -> Tuple[CombatState, List[CombatEvent]]:
+    """Resolve the player's action and the enemy's response.
+
+    Returns the new state and the events in the order they happened. The
+    state's outcome is set when the enemy falls (VICTORY), the player falls
+    (DEFEAT) or the player gets away (ESCAPED).
+    """
+    player, enemy = state.player, state.enemy
+    events: List[CombatEvent] = []
+
+    if action.kind == FLEE:
+        if rng.random() < player.flee_chance:
+            penalty = rng.randint(*rules.flee_penalty) if rules.flee_penalty != (0, 0) else 0
+            player = _hurt(player, penalty)
+            events.append(CombatEvent(ESCAPE, PLAYER, penalty))
+            outcome = DEFEAT if player.hp <= 0 else ESCAPED
+            return CombatState(player, enemy, outcome), events
+        events.append(CombatEvent(ESCAPE_FAILED, PLAYER))
+        if rules.flee_counter is not None:
+            player, enemy, counter = enemy_turn(player, enemy, rules, rng, strike=rules.flee_counter)
+            events.extend(counter)
+        return CombatState(player, enemy, DEFEAT if player.hp <= 0 else None), events
+
+    if action.kind == SKILL and action.heal != (0, 0):
+        amount = rng.randint(*action.heal)
+        player = _heal(player, amount)
+        events.append(CombatEvent(HEAL, PLAYER, amount))
+
+    if action.kind in (ATTACK, SKILL):
+        damage, critical = roll_damage(player.attack, enemy.defense, action.strike or rules.player_strike, rng)
+        enemy = _hurt(enemy, damage)
+        events.append(CombatEvent(HIT, PLAYER, damage, critical))
+        if enemy.hp <= 0:
+            return CombatState(player, enemy, VICTORY), events
+
+    defending = action.kind == DEFEND
+    if defending:
+        events.append(CombatEvent(GUARD, PLAYER))
+
+    if rules.enemy_counter:
+        player, enemy, counter = enemy_turn(player, enemy, rules, rng, defending=defending)
+        events.extend(counter)
+
+    if defending and rules.defend_heal_chance > 0 and rng.random() < rules.defend_heal_chance:
+        if rules.defend_heal_ratio:
+            amount = max(1, int(player.max_hp * rules.defend_heal_ratio))
+        else:
+            amount = rng.randint(*rules.defend_heal)
+        player = _heal(player, amount)
+        events.append(CombatEvent(HEAL, PLAYER, amount))
+
+    return CombatState(player, enemy, DEFEAT if player.hp <= 0 else None), events
+
+
+def damage_dealt(events: List[CombatEvent], actor: str) -> int:
+    """Total damage ``actor`` did in a turn"""
+    return sum(event.amount for event in events if event.kind == HIT and event.actor == actor)
+
+
+def find_event(events: List[CombatEvent], kind: str, actor: Optional[str] = None) -> Optional[CombatEvent]:
+    for event in events:
+        if event.kind == kind and (actor is None or event.actor == actor):
+            return event
+    return None
+
+
+# Rules for each battle mode, matching the formulas each one has always used
+
+# Button-driven hunt (process_interactive_combat)
+HUNT_RULES = CombatRules(
+    player_strike=Strike(roll=(-5, 5)),
+    enemy_strike=Strike(roll=(-3, 3)),
+    defend_factor=0.5,
+    defend_min=1,
+    flee_counter=Strike(),
+)
+
+# .attack / .defend / .flee in a regular hunt battle
+COMMAND_HUNT_RULES = CombatRules(
+    player_strike=Strike(roll=(1, 10)),
+    enemy_strike=Strike(roll=(1, 5)),
+    defend_strike=Strike(),
+    defend_heal_chance=0.3,
+    defend_heal=(5, 15),
+    flee_counter=Strike(roll=(1, 10), pierce=True, min_damage=0),
+)
+
+# .attack / .defend / .flee on a gate or dungeon floor
+FLOOR_RULES = CombatRules(
+    player_strike=Strike(roll=(1, 10), pierce=True),
+    enemy_strike=Strike(roll=(1, 5)),
+    defend_strike=Strike(roll=(1, 5)),
+    defend_heal_chance=0.3,
+    defend_heal=(5, 15),
+    flee_counter=Strike(roll=(1, 5), pierce=True, min_damage=0),
+)
+
+# Global event boss fought with .attack
+EVENT_BATTLE_RULES = CombatRules(
+    player_strike=Strike(roll=(10, 30)),
+    enemy_strike=Strike(divisor=3, min_damage=10),
+)
+
+# Ability-driven combat in the AdvancedCombat cog
+ADVANCED_RULES = CombatRules()
+
+# DungeonManagement's button hunt: escaping always works but costs HP
+DUNGEON_VIEW_RULES = CombatRules(flee_penalty=(5, 20))
+
+# Shared raid against an event boss (ui_elements_event)
+RAID_RULES = CombatRules(
+    player_strike=Strike(spread=(0.8, 1.2)),
+    enemy_strike=Strike(spread=(0.8, 1.2)),
+    defend_factor=0.5,
+    defend_min=1,
+    defend_heal_chance=1.0,
+    defend_heal=(5, 15),
+    flee_penalty=(20, 20),
+)
+RAID_SPECIAL = Strike(spread=(0.8, 1.2), scale=2.0)
+
+# EventManagement world boss
+WORLD_BOSS_RULES = CombatRules(
+    player_strike=Strike(spread=(0.8, 1.2), smooth=True),
+    enemy_strike=Strike(spread=(0.8, 1.2), smooth=True),
+    defend_strike=Strike(spread=(0.4, 0.6), smooth=True),
+    defend_heal_chance=1.0,
+    defend_heal_ratio=0.05,
+    flee_penalty=(20, 20),
+)
+
+# Shared event-boss battle resolved in ticks (utils.event_ticks)
+TICK_RULES = CombatRules(
+    player_strike=Strike(spread=(0.8, 1.2), pierce=True, min_damage=0),
+    enemy_strike=Strike(roll=(-5, 5), pierce=True, min_damage=0),
+    defend_factor=0.5,
+)
+TICK_BOSS_ATTACK = 20
+
+# Turn-based boss duel with dialogue (ui_elements_turnbased)
+DUEL_RULES = CombatRules(
+    player_strike=Strike(roll=(-5, 10), crit_chance=0.15, pierce=True, min_damage=0),
+    enemy_strike=Strike(roll=(-10, 5), pierce=True, min_damage=0),
+    defend_factor=0.5,
+    flee_counter=Strike(roll=(-10, 5), scale=1.2, pierce=True, min_damage=0),
+)
+DUEL_SPECIAL = Action(SKILL, strike=Strike(roll=(20, 30), fixed=True, pierce=True), heal=(20, 35))
+
+# Player vs player: one side acts per turn, so each attack is resolved with
+# enemy_turn(defender, attacker, ...) and a guarding defender halves it
+PVP_RULES = CombatRules(
+    enemy_strike=Strike(roll=(1, 10)),
+    defend_factor=0.5,
+    defend_min=1,
+    enemy_counter=False,
+)
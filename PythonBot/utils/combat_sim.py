@@ -0,0 +1,385 @@
+"""Headless combat simulator for balance checks and throughput benchmarks.
+
+Plays large batches of fights under the same rules the bot uses
+(utils.combat_engine) against the real monster catalog and gate/dungeon
+floor layouts, then reports win rate, turns to kill, EXP and gold per hour
+of play and hours to the next level. With numpy installed a whole batch is
+rolled at once; without it, or with --python, every fight goes through
+resolve_turn one at a time. A given --seed always gives the same report on
+the same backend.
+
+    python -m utils.combat_sim hunt --fights 100000 --seed 1
+    python -m utils.combat_sim gate --fights 20000 --level 25
+    python -m utils.combat_sim dungeon --python
+
+Every simulated hunter attacks each turn and starts each fight at full HP;
+gate and dungeon runs carry HP from floor to floor and pay out only when the
+last floor is cleared.
+"""
+
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Falls back to the pure-Python engine
+    np = None
+
+from utils.combat_engine import (
+    ATTACK, FLOOR_RULES, HUNT_RULES, VICTORY,
+    Action, CombatRules, CombatState, Combatant, Strike, resolve_turn,
+)
+from utils.floor_scaling import DEFAULT_GATES, DUNGEONS, dungeon_floor_monster, gate_floor_count, gate_floor_monster, is_red_gate
+from utils.game_data import game_data
+from utils.spawn_tables import RANKS, AliasTable, get_spawn_tables
+
+# Fights still going after this many turns count as unfinished
+MAX_TURNS = 200
+# Fights rolled together on the numpy path; bounds memory for huge runs
+BATCH_SIZE = 65536
+# Wall-clock cost of play, for the per-hour figures
+TURN_SECONDS = 3.0      # reading the embed and clicking a button
+FIGHT_OVERHEAD = 3.0    # the .hunt cooldown
+RESPAWN_SECONDS = 180   # the death timer after a lost fight
+
+# First level of each hunter rank (RANK_ROLES)
+RANK_ENTRY_LEVELS = {'E': 1, 'D': 11, 'C': 21, 'B': 31, 'A': 41, 'S': 51}
+
+
+class Scenario(NamedTuple):
+    """One row of the report: a hunter of ``level`` fighting ``floors`` back to back.
+
+    For a hunt ``floors`` is a single slot filled from ``pool`` by weight each
+    fight; for gates and dungeons it is the fixed floor list.
+    """
+    name: str
+    level: int
+    rules: CombatRules
+    floors: Sequence[Optional[Dict]]
+    pool: Sequence[Dict] = ()
+    weights: Sequence[float] = ()
+    floor_defense: bool = False  # floor commands block with agility // 2 instead of defense
+
+
+class SimResult(NamedTuple):
+    scenario: Scenario
+    fights: int
+    wins: int
+    unfinished: int
+    kill_turns: float   # mean turns over won fights
+    seconds: float      # simulated play time
+    exp: int
+    gold: int
+    wall: float         # real seconds spent simulating
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def exp_per_hour(self) -> float:
+        return self.exp * 3600 / self.seconds if self.seconds else 0.0
+
+    @property
+    def gold_per_hour(self) -> float:
+        return self.gold * 3600 / self.seconds if self.seconds else 0.0
+
+    @property
+    def fights_per_second(self) -> float:
+        return self.fights / self.wall if self.wall else 0.0
+
+
+def hunter_at_level(level: int) -> Dict:
+    """A fresh hunter who has only ever gained levels (register stats plus award_exp growth)"""
+    gained = level - 1
+    return {
+        'name': f"Lv.{level} Hunter",
+        'level': level,
+        'strength': 10 + gained,
+        'agility': 10 + gained,
+        'intelligence': 10 + gained,
+        'defense': 5,
+        'hp': 100 + gained * 20,
+        'max_hp': 100 + gained * 20,
+    }
+
+
+def _player(hunter: Dict, scenario: Scenario) -> Combatant:
+    defense = hunter['agility'] // 2 if scenario.floor_defense else hunter['defense']
+    return Combatant(hunter['name'], hunter['hp'], hunter['max_hp'], hunter['strength'], defense)
+
+
+def hunt_scenarios(levels: Optional[Sequence[int]] = None) -> List[Scenario]:
+    """Interactive .hunt at the entry level of every rank, against that rank's spawn pool"""
+    tables = get_spawn_tables()
+    scenarios = []
+    for rank in RANKS:
+        pool = tables.pool(rank)
+        if not pool:
+            continue
+        for level in levels or (RANK_ENTRY_LEVELS[rank],):
+            scenarios.append(Scenario(
+                f"hunt {rank}-Rank", level, HUNT_RULES, (None,),
+                pool=pool, weights=tables.pool_weights(rank),
+            ))
+    return scenarios
+
+
+def gate_scenarios(levels: Optional[Sequence[int]] = None) -> List[Scenario]:
+    """Every gate the Gates cog offers, entered at its level requirement"""
+    data = game_data.get('gates')
+    if not data or 'gates' not in data:
+        data = DEFAULT_GATES
+    scenarios = []
+    for gates in data['gates'].values():
+        for gate in gates:
+            boss_floor = gate_floor_count(gate)
+            floors = [
+                gate_floor_monster(gate['name'], gate['difficulty'], gate['rewards'], floor, boss_floor, red=is_red_gate(gate))
+                for floor in range(1, boss_floor + 1)
+            ]
+            for level in levels or (gate['level_req'],):
+                scenarios.append(Scenario(f"gate {gate['name']}", level, FLOOR_RULES, floors, floor_defense=True))
+    return scenarios
+
+
+def dungeon_scenarios(levels: Optional[Sequence[int]] = None) -> List[Scenario]:
+    """Every DungeonRaids dungeon, raided at its minimum level"""
+    scenarios = []
+    for name, dungeon in DUNGEONS['dungeons'].items():
+        boss_floor = dungeon['boss_floor']
+        floors = [dungeon_floor_monster(name, dungeon, floor, boss_floor) for floor in range(1, boss_floor + 1)]
+        for level in levels or (dungeon['min_level'],):
+            scenarios.append(Scenario(f"dungeon {name}", level, FLOOR_RULES, floors, floor_defense=True))
+    return scenarios
+
+
+SCENARIOS = {
+    'hunt': hunt_scenarios,
+    'gate': gate_scenarios,
+    'dungeon': dungeon_scenarios,
+}
+
+
+# Pure-Python path -------------------------------------------------------
+
+def _run_python(scenario: Scenario, fights: int, seed: int, turn_seconds: float, overhead: float) -> SimResult:
+    rng = random.Random(seed)
+    hunter = hunter_at_level(scenario.level)
+    table = AliasTable(scenario.weights) if scenario.pool else None
+    action = Action(ATTACK)
+    wins = unfinished = kill_turn_total = exp = gold = 0
+    seconds = 0.0
+    started = time.perf_counter()
+
+    for _ in range(fights):
+        player = _player(hunter, scenario)
+        turns = loot_exp = loot_gold = 0
+        outcome = None
+        for monster in scenario.floors:
+            if monster is None:
+                monster = scenario.pool[table.sample(rng)]
+            state = CombatState(player, Combatant(monster['name'], monster['hp'], monster['hp'],
+                                                  monster['attack'], monster.get('defense', 0)))
+            floor_turns = 0
+            while state.outcome is None and floor_turns < MAX_TURNS:
+                state, _ = resolve_turn(state, action, scenario.rules, rng)
+                floor_turns += 1
+            turns += floor_turns
+            outcome = state.outcome
+            if outcome != VICTORY:
+                break
+            player = state.player
+            loot_exp += monster['exp_reward']
+            loot_gold += monster['gold_reward']
+
+        seconds += overhead + turns * turn_seconds
+        if outcome == VICTORY:
+            wins += 1
+            kill_turn_total += turns
+            exp += loot_exp
+            gold += loot_gold
+        elif outcome is None:
+            unfinished += 1
+        else:
+            seconds += RESPAWN_SECONDS
+
+    return SimResult(scenario, fights, wins, unfinished, kill_turn_total / wins if wins else 0.0,
+                     seconds, exp, gold, time.perf_counter() - started)
+
+
+# Vectorized path --------------------------------------------------------
+
+def roll_damage_array(attack, defense, strike: Strike, gen):
+    """roll_damage for whole arrays of attackers at once; returns (damage, critical)"""
+    n = len(attack)
+    if strike.fixed:
+        raw = np.zeros(n)
+    elif strike.spread is not None:
+        low, high = strike.spread
+        if strike.smooth:
+            raw = attack * gen.uniform(low, high, n)
+        else:
+            raw = gen.integers((attack * low).astype(np.int64), (attack * high).astype(np.int64), endpoint=True).astype(float)
+    else:
+        raw = attack.astype(float)
+    if strike.roll != (0, 0):
+        raw = raw + gen.integers(strike.roll[0], strike.roll[1], n, endpoint=True)
+    if strike.scale != 1.0:
+        raw = raw * strike.scale
+        if not strike.smooth:
+            raw = np.trunc(raw)
+
+    if strike.crit_chance > 0:
+        critical = gen.random(n) < strike.crit_chance
+        raw = np.where(critical, np.trunc(raw * strike.crit_multiplier), raw)
+    else:
+        critical = np.zeros(n, dtype=bool)
+    if not strike.pierce:
+        raw = raw - defense
+    damage = np.trunc(raw).astype(np.int64)
+    if strike.divisor > 1:
+        damage //= strike.divisor
+    return np.maximum(strike.min_damage, damage), critical
+
+
+def _fight_arrays(player_hp, player_attack, player_defense, enemy_hp, enemy_attack, enemy_defense,
+                  rules: CombatRules, gen):
+    """Every fight attacks until someone falls; returns (won, unfinished, turns, player_hp)"""
+    n = len(player_hp)
+    player_hp = player_hp.copy()
+    enemy_hp = enemy_hp.copy()
+    won = np.zeros(n, dtype=bool)
+    turns = np.zeros(n, dtype=np.int64)
+    active = np.arange(n)
+
+    for _ in range(MAX_TURNS):
+        if not len(active):
+            break
+        turns[active] += 1
+        damage, _ = roll_damage_array(player_attack[active], enemy_defense[active], rules.player_strike, gen)
+        enemy_hp[active] = np.maximum(0, enemy_hp[active] - damage)
+        killed = enemy_hp[active] <= 0
+        won[active[killed]] = True
+        active = active[~killed]
+
+        if rules.enemy_counter and len(active):
+            damage, _ = roll_damage_array(enemy_attack[active], player_defense[active], rules.enemy_strike, gen)
+            player_hp[active] = np.maximum(0, player_hp[active] - damage)
+            active = active[player_hp[active] > 0]
+
+    unfinished = np.zeros(n, dtype=bool)
+    unfinished[active] = True
+    return won, unfinished, turns, player_hp
+
+
+def _run_numpy(scenario: Scenario, fights: int, seed: int, turn_seconds: float, overhead: float) -> SimResult:
+    gen = np.random.default_rng(seed)
+    player = _player(hunter_at_level(scenario.level), scenario)
+    if scenario.pool:
+        weights = np.asarray(scenario.weights, dtype=float)
+        weights /= weights.sum()
+        pool = {key: np.array([monster.get(key, 0) for monster in scenario.pool])
+                for key in ('hp', 'attack', 'defense', 'exp_reward', 'gold_reward')}
+    wins = unfinished_total = exp = gold = 0
+    kill_turn_total = 0
+    seconds = 0.0
+    started = time.perf_counter()
+
+    for offset in range(0, fights, BATCH_SIZE):
+        n = min(BATCH_SIZE, fights - offset)
+        player_hp = np.full(n, player.hp, dtype=np.int64)
+        player_attack = np.full(n, player.attack, dtype=np.int64)
+        player_defense = np.full(n, player.defense, dtype=np.int64)
+        alive = np.ones(n, dtype=bool)
+        unfinished = np.zeros(n, dtype=bool)
+        turns = np.zeros(n, dtype=np.int64)
+        loot_exp = np.zeros(n, dtype=np.int64)
+        loot_gold = np.zeros(n, dtype=np.int64)
+
+        for monster in scenario.floors:
+            idx = np.flatnonzero(alive)
+            if not len(idx):
+                break
+            if monster is None:
+                picks = gen.choice(len(scenario.pool), size=len(idx), p=weights)
+                stats = {key: values[picks] for key, values in pool.items()}
+            else:
+                stats = {key: np.full(len(idx), monster.get(key, 0), dtype=np.int64)
+                         for key in ('hp', 'attack', 'defense', 'exp_reward', 'gold_reward')}
+            won, stalled, floor_turns, hp_left = _fight_arrays(
+                player_hp[idx], player_attack[idx], player_defense[idx],
+                stats['hp'], stats['attack'], stats['defense'], scenario.rules, gen
+            )
+            turns[idx] += floor_turns
+            player_hp[idx] = hp_left
+            loot_exp[idx] += np.where(won, stats['exp_reward'], 0)
+            loot_gold[idx] += np.where(won, stats['gold_reward'], 0)
+            unfinished[idx[stalled]] = True
+            alive[idx[~won]] = False
+
+        deaths = ~alive & ~unfinished
+        wins += int(alive.sum())
+        unfinished_total += int(unfinished.sum())
+        kill_turn_total += int(turns[alive].sum())
+        exp += int(loot_exp[alive].sum())
+        gold += int(loot_gold[alive].sum())
+        seconds += n * overhead + float(turns.sum()) * turn_seconds + int(deaths.sum()) * RESPAWN_SECONDS
+
+    return SimResult(scenario, fights, wins, unfinished_total, kill_turn_total / wins if wins else 0.0,
+                     seconds, exp, gold, time.perf_counter() - started)
+
+
+def simulate(scenario: Scenario, fights: int, seed: int = 0, use_numpy: bool = True,
+             turn_seconds: float = TURN_SECONDS, overhead: float = FIGHT_OVERHEAD) -> SimResult:
+    """Play ``fights`` runs of a scenario on the fastest backend available"""
+    run = _run_numpy if use_numpy and np is not None else _run_python
+    return run(scenario, fights, seed, turn_seconds, overhead)
+
+
+def hours_to_level(result: SimResult) -> Optional[float]:
+    """Hours of this content to earn the next level, None if it never pays"""
+    from utils.leveling_system import leveling_system
+
+    if result.exp_per_hour <= 0:
+        return None
+    return leveling_system.get_exp_for_next_level(result.scenario.level) / result.exp_per_hour
+
+
+def format_report(results: Sequence[SimResult]) -> str:
+    lines = [
+        f"{'scenario':<32} {'lvl':>4} {'win%':>6} {'turns':>6} {'exp/h':>9} {'gold/h':>9} {'h/lvl':>7} {'fights/s':>10}"
+    ]
+    for result in results:
+        to_level = hours_to_level(result)
+        lines.append(
+            f"{result.scenario.name[:32]:<32} {result.scenario.level:>4} {result.win_rate * 100:>5.1f}% "
+            f"{result.kill_turns:>6.1f} {result.exp_per_hour:>9.0f} {result.gold_per_hour:>9.0f} "
+            f"{(f'{to_level:.2f}' if to_level is not None else '-'):>7} {result.fights_per_second:>10.0f}"
+        )
+        if result.unfinished:
+            lines.append(f"    {result.unfinished} fights hit the {MAX_TURNS}-turn cap")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate batches of fights and report balance figures")
+    parser.add_argument('mode', choices=sorted(SCENARIOS))
+    parser.add_argument('--fights', type=int, default=10000, help="Fights (or full runs) per scenario")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--level', type=int, action='append', help="Hunter level to test (repeatable); default is each entry level")
+    parser.add_argument('--python', action='store_true', help="Use the pure-Python engine even if numpy is installed")
+    parser.add_argument('--turn-seconds', type=float, default=TURN_SECONDS, help="Play time charged per turn")
+    parser.add_argument('--fight-overhead', type=float, default=FIGHT_OVERHEAD, help="Play time charged per fight")
+    args = parser.parse_args()
+
+    use_numpy = not args.python and np is not None
+    print(f"Backend: {'numpy' if use_numpy else 'python'}, {args.fights} fights per scenario, seed {args.seed}")
+    results = [
+        simulate(scenario, args.fights, args.seed, use_numpy, args.turn_seconds, args.fight_overhead)
+        for scenario in SCENARIOS[args.mode](args.level)
+    ]
+    print(format_report(results))
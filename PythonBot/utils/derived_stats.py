@@ -0,0 +1,107 @@
+"""Hunter stats derived from base stats, the equipped loadout and temporary buffs."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Tuple
+
+from utils.game_data import game_data
+from utils.item_index import ItemIndex, get_item_index
+
+# Stats equipment can raise, with the value a hunter record starts from
+STATS = ('strength', 'agility', 'intelligence', 'defense')
+STAT_DEFAULTS = {'strength': 10, 'agility': 10, 'intelligence': 10, 'defense': 5}
+# Distinct loadouts whose bonus vectors are kept per catalog version
+LOADOUT_CACHE_SIZE = 512
+
+Loadout = Tuple[str, ...]
+Bonus = Tuple[int, ...]  # One entry per STATS field
+
+NO_BONUS: Bonus = (0,) * len(STATS)
+
+
+def loadout_of(hunter: Mapping[str, Any]) -> Loadout:
+    """Equipped item names in a slot-independent order; the cache key for their bonuses"""
+    equipment = hunter.get('equipment') or {}
+    return tuple(sorted(name for name in equipment.values() if name))
+
+
+class EquipmentBonuses:
+    """LRU of loadout -> summed stat bonus over one version of the item catalog.
+
+    Built through ``game_data.derive``, so a reload of data/items.json
+    replaces the whole cache instead of anything having to invalidate it.
+    """
+
+    def __init__(self, index: ItemIndex, maxsize: int = LOADOUT_CACHE_SIZE):
+        self.index = index
+        self.maxsize = maxsize
+        self._cache: 'OrderedDict[Loadout, Bonus]' = OrderedDict()
+
+    def get(self, loadout: Loadout) -> Bonus:
+        bonus = self._cache.get(loadout)
+        if bonus is not None:
+            self._cache.move_to_end(loadout)
+            return bonus
+        bonus = self._sum(loadout)
+        self._cache[loadout] = bonus
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return bonus
+
+    def _sum(self, loadout: Loadout) -> Bonus:
+        totals = [0] * len(STATS)
+        for name in loadout:
+            info = self.index.get_info(name)
+            if info:
+                for i, stat in enumerate(STATS):
+                    totals[i] += info.get(stat, 0)
+        return tuple(totals) if any(totals) else NO_BONUS
+
+
+class DerivedStats:
+    """The one place hunter stats are computed.
+
+    ``base_<stat>`` fields are what training and levelling raise; the bare
+    ``<stat>`` fields the rest of the bot reads are base plus the equipment
+    bonus, rewritten by ``apply`` whenever the loadout or base changes. The
+    bonus for a loadout is summed once per catalog version and then served
+    from an LRU, so applying or reading stats is a few dict lookups.
+    """
+
+    def bonuses(self) -> EquipmentBonuses:
+        """Loadout bonus cache for the current item catalog"""
+        return game_data.derive('items', 'equipment_bonuses',
+                                lambda _data: EquipmentBonuses(get_item_index()))
+
+    def equipment_bonus(self, hunter: Mapping[str, Any]) -> Dict[str, int]:
+        """What the hunter's equipped items add to each stat"""
+        return dict(zip(STATS, self.bonuses().get(loadout_of(hunter))))
+
+    def ensure_base(self, hunter: Dict[str, Any]) -> None:
+        """Give records from before base stats existed a base equal to their current stats"""
+        for stat in STATS:
+            if f'base_{stat}' not in hunter:
+                hunter[f'base_{stat}'] = hunter.get(stat, STAT_DEFAULTS[stat])
+
+    def stats(self, hunter: Dict[str, Any]) -> Dict[str, int]:
+        """Base plus equipment for each stat"""
+        self.ensure_base(hunter)
+        bonus = self.bonuses().get(loadout_of(hunter))
+        return {stat: hunter[f'base_{stat}'] + extra for stat, extra in zip(STATS, bonus)}
+
+    def apply(self, hunter: Dict[str, Any]) -> Dict[str, int]:
+        """Write base plus equipment into the hunter's stat fields (memory only) and return them"""
+        stats = self.stats(hunter)
+        hunter.update(stats)
+        return stats
+
+    def effective(self, hunter: Dict[str, Any]) -> Dict[str, int]:
+        """Stats for combat: base plus equipment plus temporary buffs"""
+        stats = self.stats(hunter)
+        attack_buff = hunter.get('temp_buffs', {}).get('attack_buff')
+        if attack_buff:
+            stats['strength'] += attack_buff.get('amount', 0)
+        return stats
+
+
+# Global instance
+derived_stats = DerivedStats()
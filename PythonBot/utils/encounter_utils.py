@@ -2,26 +2,9 @@
 Utility functions for encounter system and daily hunt tracking.
 """
 
-import json
 from datetime import datetime, date
 from typing import Dict, Any
 
-def load_hunters_data():
-    """Load hunter data from JSON file"""
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data(data):
-    """Save hunter data to JSON file"""
-    try:
-        with open('hunters_data.json', 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving hunters data: {e}")
-
 def check_and_reset_daily_hunts(hunter: Dict[str, Any]) -> bool:
     """Check if daily hunts should be reset and reset if needed"""
     today_str = datetime.now().date().isoformat()
@@ -98,20 +81,13 @@ def apply_encounter_reward(hunter: Dict[str, Any], reward_data: Dict[str, Any])
         
         if item_name in ENCOUNTER_ITEMS:
             item_data = ENCOUNTER_ITEMS[item_name]
-            if 'inventory' not in hunter:
-                hunter['inventory'] = {}
+            from utils.inventory_model import add_instance, add_item
             
             if item_data.get('stackable', False):
-                hunter['inventory'][item_name] = hunter['inventory'].get(item_name, 0) + 1
+                add_item(hunter, item_name)
             else:
-                # For non-stackable items, create unique keys if needed
-                base_name = item_name
-                counter = 1
-                unique_name = base_name
-                while unique_name in hunter['inventory']:
-                    unique_name = f"{base_name}_{counter}"
-                    counter += 1
-                hunter['inventory'][unique_name] = item_data
+                # Non-stackable items keep only the properties the catalog lacks
+                add_instance(hunter, item_data, item_name)
             
             messages.append(f"Received {item_data['name']}!")
     
@@ -0,0 +1,119 @@
+"""Fixed-window combat ticks for shared event-boss battles."""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.combat_engine import TICK_BOSS_ATTACK, TICK_RULES, Combatant, enemy_turn, roll_damage
+
+# Length of one combat round; every click inside it is resolved together
+TICK_SECONDS = 2.0
+
+ATTACK = 'attack'
+DEFEND = 'defend'
+FLEE = 'flee'
+
+
+class TickResult:
+    """What happened in one round, ready to be rendered as a single embed"""
+
+    __slots__ = ('attacks', 'defenders', 'fled', 'boss_target', 'boss_damage', 'boss_defeated')
+
+    def __init__(self):
+        self.attacks: List[Tuple[str, int]] = []
+        self.defenders: List[str] = []
+        self.fled: List[str] = []
+        self.boss_target: Optional[str] = None
+        self.boss_damage = 0
+        self.boss_defeated = False
+
+    @property
+    def total_damage(self) -> int:
+        return sum(damage for _, damage in self.attacks)
+
+
+def resolve_tick(boss_monster: Dict, participants: Dict[str, Dict], actions: Dict[str, str],
+                 rng: random.Random = random) -> TickResult:
+    """Resolve one round in memory.
+
+    Flees leave first, then every attack lands, then, if the boss survived,
+    it picks one counter-attack against a random remaining participant.
+    Mutates ``boss_monster['hp']`` and removes fled participants; applying
+    the counter-attack damage to the hunter is left to the caller.
+    """
+    result = TickResult()
+
+    for user_id, action in actions.items():
+        if action == FLEE and participants.pop(user_id, None) is not None:
+            result.fled.append(user_id)
+
+    for user_id, action in actions.items():
+        participant = participants.get(user_id)
+        if participant is None:
+            continue
+        if action == ATTACK:
+            damage, _ = roll_damage(participant['hunter'].get('attack', 10), 0, TICK_RULES.player_strike, rng)
+            boss_monster['hp'] = max(0, boss_monster['hp'] - damage)
+            result.attacks.append((user_id, damage))
+        elif action == DEFEND:
+            result.defenders.append(user_id)
+
+    if boss_monster['hp'] <= 0:
+        result.boss_defeated = True
+        return result
+
+    if participants:
+        target_id = rng.choice(list(participants))
+        hunter = participants[target_id]['hunter']
+        target = Combatant(target_id, hunter.get('hp', 100), hunter.get('max_hp', 100))
+        boss = Combatant(boss_monster.get('name', 'Boss'), boss_monster['hp'], boss_monster['hp'], TICK_BOSS_ATTACK)
+        _, _, events = enemy_turn(target, boss, TICK_RULES, rng, defending=actions.get(target_id) == DEFEND)
+        result.boss_target = target_id
+        result.boss_damage = events[0].amount
+
+    return result
+
+
+class EventTicker:
+    """Collects participant actions and hands them to ``on_tick`` once per window.
+
+    Each participant has at most one queued action per round (the latest click
+    wins), so a raid of any size costs one resolution, one persist and one
+    message edit per tick. Rounds with no actions are skipped.
+    """
+
+    def __init__(self, on_tick: Callable[[Dict[str, str]], Awaitable[None]], interval: float = TICK_SECONDS):
+        self.on_tick = on_tick
+        self.interval = interval
+        self._actions: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, user_id, action: str) -> None:
+        """Queue a participant's action for the next round"""
+        self._actions[str(user_id)] = action
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop ticking; safe to call from inside ``on_tick``"""
+        task, self._task = self._task, None
+        self._actions.clear()
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _run(self) -> None:
+        while self._task is asyncio.current_task():
+            await asyncio.sleep(self.interval)
+            if not self._actions:
+                continue
+            actions, self._actions = self._actions, {}
+            try:
+                await self.on_tick(actions)
+            except Exception as e:
+                print(f"Error resolving event combat tick: {e}")
@@ -0,0 +1,253 @@
+"""Gate and dungeon floor layouts: how many floors a run has and what waits on each.
+
+Shared by the Gates and DungeonRaids cogs and by the offline combat simulator,
+so balance numbers live in one place and never need Discord to evaluate.
+"""
+
+from typing import Dict
+
+# Built-in gate list, used when data/gates.json is missing
+DEFAULT_GATES = {
+    "gates": {
+        "E-Rank": [
+            {"name": "Abandoned Factory", "difficulty": 1, "level_req": 1, "rewards": {"exp": 50, "gold": 100}},
+            {"name": "Dark Alley", "difficulty": 2, "level_req": 3, "rewards": {"exp": 75, "gold": 150}}
+        ],
+        "D-Rank": [
+            {"name": "Haunted School", "difficulty": 3, "level_req": 10, "rewards": {"exp": 150, "gold": 300}},
+            {"name": "Underground Tunnel", "difficulty": 4, "level_req": 15, "rewards": {"exp": 200, "gold": 400}}
+        ],
+        "C-Rank": [
+            {"name": "Ancient Ruins", "difficulty": 5, "level_req": 25, "rewards": {"exp": 350, "gold": 700}},
+            {"name": "Mystic Forest", "difficulty": 6, "level_req": 30, "rewards": {"exp": 450, "gold": 900}}
+        ],
+        "B-Rank": [
+            {"name": "Crystal Caverns", "difficulty": 7, "level_req": 40, "rewards": {"exp": 600, "gold": 1200}},
+            {"name": "Demon's Lair", "difficulty": 8, "level_req": 45, "rewards": {"exp": 750, "gold": 1500}}
+        ],
+        "A-Rank": [
+            {"name": "Dragon's Den", "difficulty": 9, "level_req": 60, "rewards": {"exp": 1000, "gold": 2000}},
+            {"name": "Shadow Realm", "difficulty": 10, "level_req": 70, "rewards": {"exp": 1250, "gold": 2500}}
+        ],
+        "S-Rank": [
+            {"name": "Heaven's Trial", "difficulty": 12, "level_req": 80, "rewards": {"exp": 1750, "gold": 3500}},
+            {"name": "Monarch's Domain", "difficulty": 15, "level_req": 90, "rewards": {"exp": 2500, "gold": 5000}}
+        ],
+        "Red-Gate": [
+            {"name": "Red Gate (E)", "difficulty": 3, "level_req": 5, "special_access": "red_gates", "rewards": {"exp": 200, "gold": 400, "items": ["Shadow Fragment"]}},
+            {"name": "Red Gate (D)", "difficulty": 6, "level_req": 15, "special_access": "red_gates", "rewards": {"exp": 500, "gold": 800, "items": ["Shadow Essence"]}},
+            {"name": "Red Gate (C)", "difficulty": 10, "level_req": 30, "special_access": "red_gates", "rewards": {"exp": 1000, "gold": 1600, "items": ["Shadow Crystal"]}},
+            {"name": "Red Gate (B)", "difficulty": 15, "level_req": 45, "special_access": "red_gates", "rewards": {"exp": 1800, "gold": 2800, "items": ["Shadow Stone"]}},
+            {"name": "Red Gate (A)", "difficulty": 20, "level_req": 65, "special_access": "red_gates", "rewards": {"exp": 2800, "gold": 4200, "items": ["Shadow Core"]}},
+            {"name": "Red Gate (S)", "difficulty": 25, "level_req": 85, "special_access": "red_gates", "rewards": {"exp": 4000, "gold": 6000, "items": ["Shadow Heart"]}}
+        ]
+    }
+}
+
+# Dungeon raid configuration
+DUNGEONS = {
+    "dungeons": {
+        "Abandoned Mine": {
+            "min_level": 1,
+            "min_rank": "E",
+            "floors": 3,
+            "boss_floor": 3,
+            "base_difficulty": 10,
+            "rewards": {
+                "exp_per_floor": 50,
+                "gold_per_floor": 75,
+                "boss_exp": 200,
+                "boss_gold": 300
+            }
+        },
+        "Goblin Cave": {
+            "min_level": 5,
+            "min_rank": "D",
+            "floors": 4,
+            "boss_floor": 4,
+            "base_difficulty": 20,
+            "rewards": {
+                "exp_per_floor": 100,
+                "gold_per_floor": 150,
+                "boss_exp": 400,
+                "boss_gold": 600
+            }
+        },
+        "Demon Castle": {
+            "min_level": 25,
+            "min_rank": "C",
+            "floors": 5,
+            "boss_floor": 5,
+            "base_difficulty": 30,
+            "rewards": {
+                "exp_per_floor": 200,
+                "gold_per_floor": 300,
+                "boss_exp": 1000,
+                "boss_gold": 1500
+            }
+        },
+        "Red Gate Portal": {
+            "min_level": 40,
+            "min_rank": "B",
+            "floors": 10,
+            "boss_floor": 10,
+            "base_difficulty": 50,
+            "rewards": {
+                "exp_per_floor": 300,
+                "gold_per_floor": 500,
+                "boss_exp": 2000,
+                "boss_gold": 3000
+            }
+        },
+        "Monarch's Domain": {
+            "min_level": 90,
+            "min_rank": "S",
+            "floors": 15,
+            "boss_floor": 15,
+            "base_difficulty": 100,
+            "rewards": {
+                "exp_per_floor": 500,
+                "gold_per_floor": 800,
+                "boss_exp": 5000,
+                "boss_gold": 8000
+            }
+        },
+        "Red Dungeon": {
+            "min_level": 30,
+            "min_rank": "C",
+            "floors": 8,
+            "boss_floor": 8,
+            "base_difficulty": 40,
+            "special_access": "Red",
+            "rewards": {
+                "exp_per_floor": 250,
+                "gold_per_floor": 400,
+                "boss_exp": 1500,
+                "boss_gold": 2500
+            }
+        },
+        "Blue Dungeon": {
+            "min_level": 50,
+            "min_rank": "B",
+            "floors": 12,
+            "boss_floor": 12,
+            "base_difficulty": 60,
+            "special_access": "Blue",
+            "rewards": {
+                "exp_per_floor": 400,
+                "gold_per_floor": 600,
+                "boss_exp": 2500,
+                "boss_gold": 4000
+            }
+        },
+        "Gold Dungeon": {
+            "min_level": 70,
+            "min_rank": "A",
+            "floors": 20,
+            "boss_floor": 20,
+            "base_difficulty": 80,
+            "special_access": "Gold",
+            "rewards": {
+                "exp_per_floor": 600,
+                "gold_per_floor": 1000,
+                "boss_exp": 4000,
+                "boss_gold": 7000
+            }
+        }
+    }
+}
+
+GATE_FLOOR_TYPES = ["Guardian", "Sentinel", "Warden", "Keeper", "Protector"]
+DUNGEON_FLOOR_TYPES = [
+    "Skeleton Warrior", "Orc Berserker", "Shadow Beast",
+    "Stone Golem", "Fire Elemental", "Ice Wraith",
+    "Demon Scout", "Undead Knight", "Crystal Spider"
+]
+
+
+def is_red_gate(gate: Dict) -> bool:
+    return gate['name'].startswith('Red Gate')
+
+
+def gate_floor_count(gate: Dict) -> int:
+    """Floors in a gate run; the boss is on the last one"""
+    if is_red_gate(gate):
+        return 5 + gate['difficulty'] // 3  # Red gates have more floors
+    return 3 + gate['difficulty'] // 4  # Regular gates scale with difficulty
+
+
+def gate_floor_monster(gate_name: str, difficulty: int, rewards: Dict, floor: int, boss_floor: int, red: bool = False) -> Dict:
+    """The monster guarding ``floor`` of a gate"""
+    if floor == boss_floor:
+        # Boss monster with enhanced stats and rewards
+        if red:
+            base_hp = 120 + (difficulty * 20)
+            base_attack = 25 + (difficulty * 4)
+            boss_name = f"Red {gate_name} King"
+        else:
+            base_hp = 100 + (difficulty * 15)
+            base_attack = 20 + (difficulty * 3)
+            boss_name = f"{gate_name} Boss"
+        
+        return {
+            "name": boss_name,
+            "hp": base_hp,
+            "attack": base_attack,
+            "defense": 3 + (difficulty // 2),
+            "exp_reward": rewards["exp"],
+            "gold_reward": rewards["gold"],
+            "level": 5 + difficulty,
+            "abilities": ["Powerful Strike", "Rage"],
+            "rarity": "boss"
+        }
+
+    # Regular floor monster with scaling difficulty
+    floor_multiplier = 1.2 ** (floor - 1)
+    return {
+        "name": f"Floor {floor} {GATE_FLOOR_TYPES[(floor - 1) % len(GATE_FLOOR_TYPES)]}",
+        "hp": int((25 + (difficulty * 4)) * floor_multiplier),
+        "attack": int((6 + (difficulty * 2)) * floor_multiplier),
+        "defense": 1 + (difficulty // 3),
+        "exp_reward": int((20 + (floor * 8)) * (1 + difficulty * 0.1)),
+        "gold_reward": int((30 + (floor * 15)) * (1 + difficulty * 0.1)),
+        "level": floor + difficulty // 2,
+        "abilities": ["Strike"],
+        "rarity": "common"
+    }
+
+
+def dungeon_floor_monster(dungeon_name: str, dungeon: Dict, floor: int, boss_floor: int) -> Dict:
+    """The monster guarding ``floor`` of a dungeon raid"""
+    if floor == boss_floor:
+        # Boss monster with special abilities
+        boss_names = [
+            f"{dungeon_name} Lord",
+            f"{dungeon_name} King",
+            f"{dungeon_name} Overlord",
+            f"Ancient {dungeon_name} Guardian"
+        ]
+        return {
+            "name": boss_names[hash(dungeon_name) % len(boss_names)],
+            "hp": dungeon["base_difficulty"] + (floor * 20),
+            "attack": 15 + (floor * 4),
+            "defense": 5 + (floor // 2),
+            "exp_reward": dungeon["rewards"]["boss_exp"],
+            "gold_reward": dungeon["rewards"]["boss_gold"],
+            "level": floor + 10,
+            "abilities": ["Devastating Strike", "Fury", "Regeneration"],
+            "rarity": "boss"
+        }
+
+    # Regular floor monster with scaling difficulty
+    floor_multiplier = 1.15 ** (floor - 1)
+    return {
+        "name": f"{DUNGEON_FLOOR_TYPES[(floor - 1) % len(DUNGEON_FLOOR_TYPES)]} Lv.{floor + 5}",
+        "hp": int((20 + (dungeon["base_difficulty"] // 4)) * floor_multiplier),
+        "attack": int((6 + (floor * 1.5)) * floor_multiplier),
+        "defense": 2 + (floor // 3),
+        "exp_reward": int(dungeon["rewards"]["exp_per_floor"] * (1 + floor * 0.1)),
+        "gold_reward": int(dungeon["rewards"]["gold_per_floor"] * (1 + floor * 0.1)),
+        "level": floor + 5,
+        "abilities": ["Strike", "Guard"],
+        "rarity": "elite" if floor > dungeon["floors"] // 2 else "common"
+    }
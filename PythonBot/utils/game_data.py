@@ -0,0 +1,245 @@
+"""Registry for the static JSON catalogs in data/, parsed once and hot-reloaded when a file changes."""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from utils.async_io import run_io
+
+DATA_DIR = 'data'
+
+# Catalog name -> file inside DATA_DIR
+CATALOG_FILES = {
+    'monsters': 'monsters.json',
+    'items': 'items.json',
+    'abilities': 'abilities.json',
+    'gates': 'gates.json',
+    'dungeons': 'dungeons.json',
+    'event_bosses': 'event_bosses.json',
+    'boss_priority': 'boss_priority.json',
+    'boss_dialogues': 'boss_dialogues.json',
+    'quests': 'quests.json',
+    'wiki': 'wiki_data.json',
+}
+
+# How often (seconds) a catalog's mtime is re-checked; keeps os.stat off every lookup
+RELOAD_CHECK_INTERVAL = 2.0
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Game data is read-only; copy it (dict(x) / list(x)) before changing it")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation; copies (dict(), .copy(), deepcopy) are plain dicts"""
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (thaw(self),)
+
+
+class FrozenList(list):
+    """list that refuses mutation; slicing, + and copies give plain lists"""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (thaw(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into FrozenDict / FrozenList"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Deep, mutable copy of frozen game data"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _Catalog:
+    __slots__ = ('path', 'data', 'mtime', 'version', 'checked_at', 'derived', 'reloading')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = None
+        self.mtime = None
+        self.version = 0
+        self.checked_at = 0.0
+        self.derived: Dict[str, Any] = {}
+        self.reloading: Optional[asyncio.Task] = None
+
+
+class GameDataRegistry:
+    """Single owner of the static game catalogs.
+
+    Each file is parsed once into read-only structures shared by every cog.
+    Lookups re-check the file's mtime at most every RELOAD_CHECK_INTERVAL
+    seconds; when it changed the file is reparsed on the I/O pool while the
+    current copy keeps being served, so edits to data/*.json apply without a
+    restart or a parse on the event loop. Indexes built from a catalog go through ``derive`` so
+    they are rebuilt exactly when the catalog reloads.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._catalogs = {name: _Catalog(os.path.join(data_dir, filename))
+                          for name, filename in CATALOG_FILES.items()}
+
+    def _parse(self, catalog: _Catalog):
+        """Read and freeze a catalog file; returns (mtime, data) or (None, None) if missing"""
+        try:
+            mtime = os.stat(catalog.path).st_mtime_ns
+            with open(catalog.path, 'r') as f:
+                return mtime, freeze(json.load(f))
+        except FileNotFoundError:
+            return None, None
+
+    def _install(self, catalog: _Catalog, mtime, data) -> None:
+        if catalog.version and mtime != catalog.mtime:
+            print(f"Reloaded game data: {catalog.path}")
+        catalog.mtime = mtime
+        catalog.data = data
+        catalog.version += 1
+        catalog.derived.clear()
+
+    def _refresh(self, catalog: _Catalog) -> None:
+        now = time.monotonic()
+        if catalog.version and now - catalog.checked_at < self.check_interval:
+            return
+        catalog.checked_at = now
+        try:
+            mtime = os.stat(catalog.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if catalog.version and mtime == catalog.mtime:
+            return
+        if catalog.version:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass  # Scripts have no loop to block; reparse inline below
+            else:
+                if catalog.reloading is None:
+                    catalog.reloading = asyncio.ensure_future(self._reload(catalog))
+                return
+        try:
+            mtime, data = self._parse(catalog)
+        except json.JSONDecodeError as e:
+            # Keep serving the last good copy while someone is mid-edit
+            print(f"[ERROR] Invalid JSON in {catalog.path}: {e}")
+            if not catalog.version:
+                self._install(catalog, None, None)
+            return
+        self._install(catalog, mtime, data)
+
+    async def _reload(self, catalog: _Catalog) -> None:
+        """Reparse a changed catalog on the I/O pool and swap it in once parsed"""
+        try:
+            mtime, data = await run_io(self._parse, catalog)
+        except json.JSONDecodeError as e:
+            # Keep serving the last good copy while someone is mid-edit
+            print(f"[ERROR] Invalid JSON in {catalog.path}: {e}")
+        else:
+            self._install(catalog, mtime, data)
+        finally:
+            catalog.reloading = None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Frozen contents of a catalog, or default if its file does not exist"""
+        catalog = self._catalogs[name]
+        self._refresh(catalog)
+        return default if catalog.data is None else catalog.data
+
+    def version(self, name: str) -> int:
+        """Increments every time the catalog is (re)loaded"""
+        catalog = self._catalogs[name]
+        self._refresh(catalog)
+        return catalog.version
+
+    def derive(self, name: str, key: str, builder: Callable[[Any], Any]) -> Any:
+        """Cache builder(catalog data) until the catalog next reloads"""
+        catalog = self._catalogs[name]
+        self._refresh(catalog)
+        if key not in catalog.derived:
+            catalog.derived[key] = builder(catalog.data)
+        return catalog.derived[key]
+
+    async def preload(self) -> None:
+        """Parse every catalog on the I/O pool so the first command never hits the disk"""
+        await asyncio.gather(*(self._preload(catalog) for catalog in self._catalogs.values()))
+
+    async def _preload(self, catalog: _Catalog) -> None:
+        try:
+            mtime, data = await run_io(self._parse, catalog)
+        except json.JSONDecodeError as e:
+            print(f"[ERROR] Invalid JSON in {catalog.path}: {e}")
+            mtime, data = None, None
+        self._install(catalog, mtime, data)
+        catalog.checked_at = time.monotonic()
+
+    # Typed accessors ----------------------------------------------------
+
+    def monsters(self) -> Mapping[str, Sequence[Mapping[str, Any]]]:
+        """Monster families (goblins, orcs, ...) to their monster lists"""
+        return self.get('monsters', FrozenDict())
+
+    def items(self) -> Mapping[str, Mapping[str, Mapping[str, Any]]]:
+        """Item categories (weapons, armor, ...) to {item name: item info}"""
+        return self.get('items', FrozenDict())
+
+    def abilities(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.get('abilities', FrozenDict())
+
+    def ability(self, ability_id: str) -> Optional[Mapping[str, Any]]:
+        return self.abilities().get(ability_id)
+
+    def gates(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.get('gates', FrozenDict())
+
+    def dungeons(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.get('dungeons', FrozenDict())
+
+    def event_bosses(self) -> Sequence[Mapping[str, Any]]:
+        return self.get('event_bosses', FrozenDict()).get('event_bosses', FrozenList())
+
+    def boss_priority(self) -> Optional[Mapping[str, Any]]:
+        """Priority tiers, spawn weights and auto-spawn settings (None if the file is missing)"""
+        return self.get('boss_priority')
+
+    def boss_dialogues(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.get('boss_dialogues', FrozenDict()).get('boss_dialogues', FrozenDict())
+
+    def quest_templates(self) -> Mapping[str, List[Mapping[str, Any]]]:
+        return self.get('quests', FrozenDict())
+
+    def wiki_entries(self) -> Mapping[str, Mapping[str, Any]]:
+        return self.get('wiki', FrozenDict()).get('wiki_entries', FrozenDict())
+
+
+# Global instance shared by main.py and the cogs
+game_data = GameDataRegistry()
@@ -0,0 +1,656 @@
+"""Pluggable storage backends for hunter data (JSON file, journaled JSON or SQLite)."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HUNTERS_DATA_FILE = 'hunters_data.json'
+HUNTERS_BACKUP_FILE = 'hunters_data_backup.json'
+HUNTERS_DB_FILE = 'hunters.db'
+
+# The journal is folded into a fresh snapshot once it grows past this size...
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+# ...or when it has had entries for this many seconds
+JOURNAL_COMPACT_INTERVAL = 300.0
+
+
+class StoreEncoder(json.JSONEncoder):
+    """JSON encoder that handles Discord objects (Colour/Color store their int in .value)
+    and game objects that expose to_dict() (e.g. spawned monsters)"""
+    def default(self, o):
+        if hasattr(o, 'value') and isinstance(o.value, int):
+            return o.value
+        if hasattr(o, 'to_dict'):
+            return o.to_dict()
+        return json.JSONEncoder.default(self, o)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, cls=StoreEncoder, separators=(',', ':'), sort_keys=True)
+
+
+def _item_key(value: Any) -> Optional[str]:
+    """Item name for a list-style inventory entry (plain name or item dict)"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get('name')
+    return None
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Write text to a temp file, fsync it and rename it over path.
+
+    Readers (and a crash at any point) see either the old file or the new one,
+    never a truncated mix.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories can't be opened on Windows; the rename is still atomic
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 4) -> None:
+    """Atomically replace path with data serialized as JSON"""
+    atomic_write_text(path, json.dumps(data, indent=indent, cls=StoreEncoder))
+
+
+class StorageBackend:
+    """Interface every hunter storage backend implements"""
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Return every stored hunter keyed by user id"""
+        raise NotImplementedError
+
+    def save(self, data: Dict[str, Dict[str, Any]], dirty_ids: Optional[Iterable[str]] = None) -> None:
+        """Persist hunters; dirty_ids=None means any hunter may have changed"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonFileBackend(StorageBackend):
+    """Original format: the whole dict in one hunters_data.json file"""
+
+    def __init__(self, path: str = HUNTERS_DATA_FILE, backup_path: str = HUNTERS_BACKUP_FILE):
+        self.path = path
+        self.backup_path = backup_path
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            print(f"[ERROR] {self.path} is empty or malformed. Starting with no hunters.")
+            return {}
+
+    def save(self, data, dirty_ids=None) -> None:
+        try:
+            atomic_write_json(self.path, data)
+        except Exception as e:
+            print(f"Error saving {self.path}: {e}")
+            try:
+                with open(self.backup_path, 'w') as backup_f:
+                    json.dump(data, backup_f, indent=4, cls=StoreEncoder)
+                print("Data saved to backup file instead")
+            except Exception as backup_e:
+                print(f"Failed to create backup: {backup_e}")
+            raise
+
+
+class JournalBackend(JsonFileBackend):
+    """JSON snapshot plus an append-only journal of per-hunter field deltas.
+
+    Each save appends one line per changed hunter (only the top-level fields
+    that changed) and fsyncs once for the whole batch. A background thread
+    periodically folds the journal into a new snapshot written with
+    temp-file-plus-rename, so the snapshot on disk is always complete.
+    Startup replays snapshot, then any journal left from an interrupted
+    compaction, then the live journal.
+    """
+
+    def __init__(self, path: str = HUNTERS_DATA_FILE, journal_path: Optional[str] = None,
+                 compact_bytes: int = JOURNAL_COMPACT_BYTES,
+                 compact_interval: float = JOURNAL_COMPACT_INTERVAL):
+        super().__init__(path)
+        self.journal_path = journal_path or f"{path}.journal"
+        self.rotated_path = f"{self.journal_path}.old"
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+        # user_id -> {field: encoded JSON} as of the last journal write
+        self._persisted: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_size = 0
+        self._journal_started: Optional[float] = None
+        self._compactor: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _encode(hunter: Dict[str, Any]) -> Dict[str, str]:
+        return {key: _dumps(value) for key, value in hunter.items()}
+
+    def _replay(self, path: str, hunters: Dict[str, Dict[str, Any]]) -> int:
+        """Apply a journal file to hunters; returns the number of entries applied"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return 0
+        applied = 0
+        good_offset = 0
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    user_id = entry['id']
+                except (ValueError, KeyError, TypeError):
+                    if not line.endswith(b'\n'):
+                        # Torn final write from a crash: drop it so new appends start clean
+                        print(f"[WARN] Discarding incomplete entry at the end of {path}")
+                        break
+                    print(f"[WARN] Skipping unreadable entry in {path}")
+                    good_offset += len(line)
+                    continue
+                good_offset += len(line)
+                applied += 1
+                if entry.get('delete'):
+                    hunters.pop(user_id, None)
+                    continue
+                hunter = hunters.setdefault(user_id, {})
+                hunter.update(entry.get('set', {}))
+                for key in entry.get('unset', []):
+                    hunter.pop(key, None)
+        if good_offset < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
+        return applied
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        hunters = super().load_all()
+        replayed = self._replay(self.rotated_path, hunters) + self._replay(self.journal_path, hunters)
+        with self._lock:
+            self._persisted = {user_id: self._encode(h) for user_id, h in hunters.items()}
+        if replayed:
+            print(f"Replayed {replayed} journal entries onto {self.path}")
+            # Fold everything into a fresh snapshot before serving traffic
+            self.compact()
+        return hunters
+
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'ab')
+            self._journal_size = self._journal.tell()
+        return self._journal
+
+    def save(self, data, dirty_ids=None) -> None:
+        ids = list(data.keys()) if dirty_ids is None else [str(i) for i in dirty_ids]
+        with self._lock:
+            lines = []
+            # New encodings (None for deleted hunters), applied to _persisted only
+            # once the journal is fsynced; a failed write must be repeated on retry
+            staged: Dict[str, Optional[Dict[str, str]]] = {}
+            for user_id in ids:
+                hunter = data.get(user_id)
+                if hunter is None:
+                    if user_id in self._persisted:
+                        lines.append(_dumps({'id': user_id, 'delete': True}))
+                        staged[user_id] = None
+                    continue
+                encoded = self._encode(hunter)
+                line = self._delta(user_id, encoded)
+                if line is not None:
+                    lines.append(line)
+                    staged[user_id] = encoded
+            if dirty_ids is None:
+                for user_id in [uid for uid in self._persisted if uid not in data]:
+                    lines.append(_dumps({'id': user_id, 'delete': True}))
+                    staged[user_id] = None
+            if not lines:
+                return
+
+            payload = ('\n'.join(lines) + '\n').encode('utf-8')
+            journal = self._open_journal()
+            journal.write(payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+            for user_id, encoded in staged.items():
+                if encoded is None:
+                    self._persisted.pop(user_id, None)
+                else:
+                    self._persisted[user_id] = encoded
+            self._journal_size += len(payload)
+            if self._journal_started is None:
+                self._journal_started = time.monotonic()
+            due = (self._journal_size >= self.compact_bytes
+                   or time.monotonic() - self._journal_started >= self.compact_interval)
+
+        if due:
+            self.compact_in_background()
+
+    def _delta(self, user_id: str, encoded: Dict[str, str]) -> Optional[str]:
+        """Journal line for the fields of one hunter that changed since the last write, None if none did"""
+        previous = self._persisted.get(user_id, {})
+        changed = {key: value for key, value in encoded.items() if previous.get(key) != value}
+        removed = [key for key in previous if key not in encoded]
+        if not changed and not removed:
+            return None
+
+        # Values are already encoded, so splice them in rather than re-serializing
+        parts = [f'"id":{json.dumps(user_id)}']
+        if changed:
+            fields = ','.join(f'{json.dumps(key)}:{value}' for key, value in changed.items())
+            parts.append(f'"set":{{{fields}}}')
+        if removed:
+            parts.append(f'"unset":{json.dumps(removed)}')
+        return '{' + ','.join(parts) + '}'
+
+    def compact_in_background(self) -> None:
+        """Start a compaction thread unless one is already running"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self.compact, name='hunter-journal-compactor', daemon=True)
+        self._compactor.start()
+
+    def compact(self) -> bool:
+        """Fold the journal into a new snapshot; returns False if there was nothing to do"""
+        with self._lock:
+            # A rotated journal still on disk means an earlier compaction failed;
+            # the snapshot below supersedes it, so don't rotate again
+            if not os.path.exists(self.rotated_path):
+                if not self._journal_size and not (os.path.exists(self.journal_path)
+                                                   and os.path.getsize(self.journal_path)):
+                    return False
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                # New appends go to a fresh journal while the old one is folded in
+                os.replace(self.journal_path, self.rotated_path)
+            self._journal_size = 0
+            self._journal_started = None
+            # Encoded strings are immutable, so copying the per-hunter dicts is enough
+            state = {user_id: dict(fields) for user_id, fields in self._persisted.items()}
+
+        try:
+            snapshot = {user_id: {key: json.loads(value) for key, value in fields.items()}
+                        for user_id, fields in state.items()}
+            atomic_write_json(self.path, snapshot)
+            os.remove(self.rotated_path)
+        except Exception as e:
+            # The rotated journal is kept and replayed on the next start
+            print(f"Error compacting {self.journal_path}: {e}")
+            return False
+        return True
+
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        self.compact()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+# Top-level hunter fields kept as real, indexed columns
+SCALAR_COLUMNS = ('level', 'exp', 'rank', 'gold', 'hp', 'max_hp')
+# Sections stored in child tables instead of the extra JSON blob
+CHILD_SECTIONS = ('inventory', 'equipment', 'quests')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hunters (
+    user_id TEXT PRIMARY KEY,
+    level INTEGER,
+    exp INTEGER,
+    rank TEXT,
+    gold INTEGER,
+    hp INTEGER,
+    max_hp INTEGER,
+    pvp_wins INTEGER NOT NULL DEFAULT 0,
+    pvp_losses INTEGER NOT NULL DEFAULT 0,
+    inventory_kind TEXT,
+    has_equipment INTEGER NOT NULL DEFAULT 0,
+    has_quests INTEGER NOT NULL DEFAULT 0,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_hunters_level ON hunters(level DESC, exp DESC);
+CREATE INDEX IF NOT EXISTS idx_hunters_exp ON hunters(exp DESC);
+CREATE INDEX IF NOT EXISTS idx_hunters_rank ON hunters(rank);
+CREATE INDEX IF NOT EXISTS idx_hunters_gold ON hunters(gold DESC);
+CREATE INDEX IF NOT EXISTS idx_hunters_pvp ON hunters(pvp_wins DESC, pvp_losses);
+
+CREATE TABLE IF NOT EXISTS hunter_inventory (
+    user_id TEXT NOT NULL REFERENCES hunters(user_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    item_key TEXT,
+    value TEXT NOT NULL,
+    PRIMARY KEY (user_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_item ON hunter_inventory(item_key);
+
+CREATE TABLE IF NOT EXISTS hunter_equipment (
+    user_id TEXT NOT NULL REFERENCES hunters(user_id) ON DELETE CASCADE,
+    slot TEXT NOT NULL,
+    item TEXT,
+    value TEXT NOT NULL,
+    PRIMARY KEY (user_id, slot)
+);
+
+CREATE TABLE IF NOT EXISTS hunter_quests (
+    user_id TEXT NOT NULL REFERENCES hunters(user_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    quest_id TEXT,
+    value TEXT NOT NULL,
+    PRIMARY KEY (user_id, position)
+);
+"""
+
+# Columns that leaderboard queries may sort by (all indexed)
+LEADERBOARD_COLUMNS = {
+    'level': 'level DESC, exp DESC',
+    'exp': 'exp DESC',
+    'gold': 'gold DESC',
+    'pvp_wins': 'pvp_wins DESC, pvp_losses ASC',
+}
+
+
+class SqliteBackend(StorageBackend):
+    """SQLite (WAL mode) storage with one row per hunter.
+
+    Hot scalar fields are real indexed columns; inventory, equipment and quests
+    live in child tables; everything else is kept in a JSON ``extra`` column.
+    Only the parts of a hunter that actually changed since the last save are
+    written, so a gold change costs a single row update.
+    """
+
+    def __init__(self, path: str = HUNTERS_DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        # Last persisted encoding of each hunter, per part, used to skip unchanged writes
+        self._persisted: Dict[str, Dict[str, Any]] = {}
+
+    # Encoding -----------------------------------------------------------
+
+    @staticmethod
+    def _encode(hunter: Dict[str, Any]) -> Dict[str, Any]:
+        """Split a hunter dict into the row and child-table parts"""
+        extra = {k: v for k, v in hunter.items() if k not in SCALAR_COLUMNS and k not in CHILD_SECTIONS}
+        pvp = hunter.get('pvp_stats') or {}
+        row = tuple(hunter.get(col) for col in SCALAR_COLUMNS) + (
+            int(pvp.get('wins', 0) or 0),
+            int(pvp.get('losses', 0) or 0),
+        )
+
+        inventory = hunter.get('inventory')
+        if isinstance(inventory, dict):
+            inventory_kind = 'dict'
+            inventory_rows = [(i, key, _dumps(value)) for i, (key, value) in enumerate(inventory.items())]
+        elif isinstance(inventory, list):
+            inventory_kind = 'list'
+            inventory_rows = [(i, _item_key(value), _dumps(value)) for i, value in enumerate(inventory)]
+        else:
+            inventory_kind = None if 'inventory' not in hunter else 'raw'
+            inventory_rows = [] if inventory_kind is None else [(0, None, _dumps(inventory))]
+
+        equipment = hunter.get('equipment')
+        has_equipment = 'equipment' in hunter
+        equipment_rows = []
+        if isinstance(equipment, dict):
+            equipment_rows = [
+                (slot, item if isinstance(item, str) else None, _dumps(item))
+                for slot, item in equipment.items()
+            ]
+        elif has_equipment:
+            has_equipment = False
+            extra['equipment'] = equipment
+
+        quests = hunter.get('quests')
+        has_quests = 'quests' in hunter
+        quest_rows = []
+        if isinstance(quests, dict):
+            position = 0
+            for category, entries in quests.items():
+                if isinstance(entries, dict):
+                    for quest_id, quest in entries.items():
+                        quest_rows.append((position, category, quest_id, _dumps(quest)))
+                        position += 1
+                    if not entries:
+                        quest_rows.append((position, category, None, '{}'))
+                        position += 1
+                else:
+                    quest_rows.append((position, category, None, _dumps(entries)))
+                    position += 1
+        elif has_quests:
+            has_quests = False
+            extra['quests'] = quests
+
+        return {
+            'row': row,
+            'meta': (inventory_kind, int(has_equipment), int(has_quests), _dumps(extra)),
+            'inventory': inventory_rows,
+            'equipment': equipment_rows,
+            'quests': quest_rows,
+        }
+
+    @staticmethod
+    def _decode(row: sqlite3.Row, inventory_rows: List[Tuple], equipment_rows: List[Tuple],
+                quest_rows: List[Tuple]) -> Dict[str, Any]:
+        hunter = json.loads(row['extra'] or '{}')
+        for col in SCALAR_COLUMNS:
+            if row[col] is not None:
+                hunter[col] = row[col]
+
+        kind = row['inventory_kind']
+        if kind == 'dict':
+            hunter['inventory'] = {key: json.loads(value) for _, key, value in inventory_rows}
+        elif kind == 'list':
+            hunter['inventory'] = [json.loads(value) for _, _, value in inventory_rows]
+        elif kind == 'raw':
+            hunter['inventory'] = json.loads(inventory_rows[0][2]) if inventory_rows else None
+
+        if row['has_equipment']:
+            hunter['equipment'] = {slot: json.loads(value) for slot, _, value in equipment_rows}
+
+        if row['has_quests']:
+            quests: Dict[str, Any] = {}
+            for _, category, quest_id, value in quest_rows:
+                if quest_id is None:
+                    quests[category] = json.loads(value)
+                else:
+                    quests.setdefault(category, {})[quest_id] = json.loads(value)
+            hunter['quests'] = quests
+        return hunter
+
+    # Backend API --------------------------------------------------------
+
+    def is_empty(self) -> bool:
+        return self.conn.execute('SELECT 1 FROM hunters LIMIT 1').fetchone() is None
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        self.conn.row_factory = sqlite3.Row
+        try:
+            rows = self.conn.execute('SELECT * FROM hunters').fetchall()
+            children: Dict[str, Dict[str, List[Tuple]]] = {}
+            for table, cols in (('hunter_inventory', 'position, item_key, value'),
+                                ('hunter_equipment', 'slot, item, value'),
+                                ('hunter_quests', 'position, category, quest_id, value')):
+                for child in self.conn.execute(f'SELECT user_id, {cols} FROM {table} ORDER BY user_id, rowid'):
+                    children.setdefault(child[0], {}).setdefault(table, []).append(tuple(child)[1:])
+        finally:
+            self.conn.row_factory = None
+
+        hunters = {}
+        for row in rows:
+            user_id = row['user_id']
+            child = children.get(user_id, {})
+            hunters[user_id] = self._decode(
+                row,
+                sorted(child.get('hunter_inventory', [])),
+                child.get('hunter_equipment', []),
+                sorted(child.get('hunter_quests', [])),
+            )
+            self._persisted[user_id] = self._encode(hunters[user_id])
+        return hunters
+
+    def save(self, data, dirty_ids=None) -> None:
+        ids = list(data.keys()) if dirty_ids is None else [str(i) for i in dirty_ids]
+        # New encodings (None for deleted hunters), applied to _persisted only once
+        # the transaction commits; a rolled-back batch must be rewritten on retry
+        staged: Dict[str, Optional[Dict[str, Any]]] = {}
+        with self.conn:
+            for user_id in ids:
+                hunter = data.get(user_id)
+                if hunter is None:
+                    if user_id in self._persisted or dirty_ids is not None:
+                        self.conn.execute('DELETE FROM hunters WHERE user_id = ?', (user_id,))
+                        staged[user_id] = None
+                    continue
+                encoded = self._encode(hunter)
+                if self._save_hunter(user_id, encoded):
+                    staged[user_id] = encoded
+
+            if dirty_ids is None:
+                # Full save: anything persisted but no longer in memory was deleted
+                for user_id in [uid for uid in self._persisted if uid not in data]:
+                    self.conn.execute('DELETE FROM hunters WHERE user_id = ?', (user_id,))
+                    staged[user_id] = None
+
+        for user_id, encoded in staged.items():
+            if encoded is None:
+                self._persisted.pop(user_id, None)
+            else:
+                self._persisted[user_id] = encoded
+
+    def _save_hunter(self, user_id: str, encoded: Dict[str, Any]) -> bool:
+        """Write the parts of a hunter that differ from what was persisted; False if nothing did"""
+        previous = self._persisted.get(user_id)
+        if previous == encoded:
+            return False
+
+        if previous is None:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO hunters (user_id, level, exp, rank, gold, hp, max_hp, '
+                'pvp_wins, pvp_losses, inventory_kind, has_equipment, has_quests, extra) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (user_id,) + encoded['row'] + encoded['meta'],
+            )
+        elif previous['row'] != encoded['row'] or previous['meta'] != encoded['meta']:
+            self.conn.execute(
+                'UPDATE hunters SET level = ?, exp = ?, rank = ?, gold = ?, hp = ?, max_hp = ?, '
+                'pvp_wins = ?, pvp_losses = ?, inventory_kind = ?, has_equipment = ?, '
+                'has_quests = ?, extra = ? WHERE user_id = ?',
+                encoded['row'] + encoded['meta'] + (user_id,),
+            )
+
+        if previous is None or previous['inventory'] != encoded['inventory']:
+            self.conn.execute('DELETE FROM hunter_inventory WHERE user_id = ?', (user_id,))
+            self.conn.executemany(
+                'INSERT INTO hunter_inventory (user_id, position, item_key, value) VALUES (?, ?, ?, ?)',
+                [(user_id,) + r for r in encoded['inventory']],
+            )
+        if previous is None or previous['equipment'] != encoded['equipment']:
+            self.conn.execute('DELETE FROM hunter_equipment WHERE user_id = ?', (user_id,))
+            self.conn.executemany(
+                'INSERT INTO hunter_equipment (user_id, slot, item, value) VALUES (?, ?, ?, ?)',
+                [(user_id,) + r for r in encoded['equipment']],
+            )
+        if previous is None or previous['quests'] != encoded['quests']:
+            self.conn.execute('DELETE FROM hunter_quests WHERE user_id = ?', (user_id,))
+            self.conn.executemany(
+                'INSERT INTO hunter_quests (user_id, position, category, quest_id, value) VALUES (?, ?, ?, ?, ?)',
+                [(user_id,) + r for r in encoded['quests']],
+            )
+        return True
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # Indexed queries ----------------------------------------------------
+
+    def top_hunters(self, metric: str = 'level', limit: int = 10) -> List[Tuple[str, Any]]:
+        """Return (user_id, value) pairs for the top hunters by an indexed metric"""
+        order = LEADERBOARD_COLUMNS[metric]
+        return self.conn.execute(
+            f'SELECT user_id, {metric} FROM hunters WHERE {metric} IS NOT NULL ORDER BY {order} LIMIT ?',
+            (limit,),
+        ).fetchall()
+
+    def rank_of(self, user_id: str, metric: str = 'exp') -> Optional[int]:
+        """1-based leaderboard position of a hunter for a single-column metric"""
+        if metric not in ('exp', 'gold', 'pvp_wins'):
+            raise ValueError(f"Unsupported metric: {metric}")
+        value = self.conn.execute(f'SELECT {metric} FROM hunters WHERE user_id = ?', (str(user_id),)).fetchone()
+        if value is None or value[0] is None:
+            return None
+        ahead = self.conn.execute(f'SELECT COUNT(*) FROM hunters WHERE {metric} > ?', (value[0],)).fetchone()[0]
+        return ahead + 1
+
+    def rank_distribution(self) -> Dict[str, int]:
+        """Number of hunters per rank"""
+        return dict(self.conn.execute('SELECT COALESCE(rank, \'E\'), COUNT(*) FROM hunters GROUP BY rank'))
+
+    # Import / export ----------------------------------------------------
+
+    def import_json(self, path: str = HUNTERS_DATA_FILE) -> int:
+        """One-shot import of a hunters_data.json file; returns the number of hunters"""
+        data = JsonFileBackend(path).load_all()
+        self.save(data)
+        return len(data)
+
+    def export_json(self, path: str = HUNTERS_DATA_FILE) -> int:
+        """Write every hunter back out in the original JSON format"""
+        data = self.load_all()
+        atomic_write_json(path, data)
+        return len(data)
+
+
+def create_backend(kind: Optional[str] = None) -> StorageBackend:
+    """Build the backend selected by HUNTER_STORAGE ('json', 'journal' or 'sqlite')"""
+    kind = (kind or os.getenv('HUNTER_STORAGE', 'json')).lower()
+    json_path = os.getenv('HUNTERS_DATA_PATH', HUNTERS_DATA_FILE)
+    if kind == 'sqlite':
+        backend = SqliteBackend(os.getenv('HUNTER_DB_PATH', HUNTERS_DB_FILE))
+        if backend.is_empty() and os.path.exists(json_path):
+            count = backend.import_json(json_path)
+            print(f"Imported {count} hunters from {json_path} into {backend.path}")
+        return backend
+    if kind == 'journal':
+        return JournalBackend(json_path)
+    return JsonFileBackend(json_path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move hunter data between hunters_data.json and SQLite")
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('--json', default=HUNTERS_DATA_FILE, help="JSON file to read or write")
+    parser.add_argument('--db', default=HUNTERS_DB_FILE, help="SQLite database path")
+    args = parser.parse_args()
+
+    db = SqliteBackend(args.db)
+    if args.action == 'import':
+        print(f"Imported {db.import_json(args.json)} hunters into {args.db}")
+    else:
+        print(f"Exported {db.export_json(args.json)} hunters to {args.json}")
+    db.close()
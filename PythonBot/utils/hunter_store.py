@@ -0,0 +1,314 @@
+"""Shared in-memory hunter data store with write-behind persistence."""
+
+import asyncio
+import atexit
+import copy
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from utils.async_io import path_lock, run_io
+from utils.hunter_storage import StorageBackend, create_backend
+
+# Seconds to wait after the first change before writing to disk, so a burst of
+# saves during one command only costs a single write
+FLUSH_DELAY = 2.0
+
+
+class HunterStore:
+    """Keeps every hunter record in memory and writes them back to disk lazily.
+
+    All cogs share the same dict, so a record handed out by ``get`` is live:
+    mutate it, call ``mark_dirty`` and the store flushes on a short coalescing
+    timer (or immediately when no event loop is running, e.g. in scripts).
+    Timer flushes hand a frozen copy to the I/O thread pool, so serializing
+    and writing never block the event loop.
+
+    Read-modify-write paths that await in between should use ``transaction``,
+    which serializes updates per hunter while different hunters run in parallel.
+    Replies sent from inside one go through ``after_commit`` so the lock is
+    never held across a Discord round-trip.
+    """
+
+    def __init__(self, backend: Optional[StorageBackend] = None, flush_delay: float = FLUSH_DELAY):
+        self._backend = backend
+        self.flush_delay = flush_delay
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._dirty_all = False
+        self._dirty_ids: Set[str] = set()
+        self._flush_handle = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_owners: Dict[str, asyncio.Task] = {}
+        # Callbacks queued by after_commit, per hunter with an open transaction
+        self._after_commit: Dict[str, List[Tuple[Callable[..., Awaitable], tuple, dict]]] = {}
+        self._versions: Dict[str, int] = {}
+        # Deep copies as of the last flush; only dirty hunters are re-copied
+        self._frozen: Dict[str, Dict[str, Any]] = {}
+        self._write_lock = threading.Lock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        self._inflight = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+
+    @property
+    def backend(self) -> StorageBackend:
+        """Storage backend, chosen from HUNTER_STORAGE on first use so .env is loaded by then"""
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    @property
+    def path(self) -> str:
+        return self.backend.path
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Return the live hunters dict, reading the file only on first access"""
+        if self._data is None:
+            self._data = self.backend.load_all()
+        return self._data
+
+    async def load_async(self) -> Dict[str, Dict[str, Any]]:
+        """Like ``load`` but reads the backend on the I/O pool; call once at startup"""
+        if self._data is None:
+            data = await run_io(self.backend.load_all)
+            if self._data is None:
+                self._data = data
+        return self._data
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the live record for a hunter, or None if they are not registered"""
+        return self.load().get(str(user_id))
+
+    def put(self, user_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or replace a hunter record and mark it dirty"""
+        user_id = str(user_id)
+        self.load()[user_id] = record
+        self.mark_dirty(user_id)
+        return record
+
+    def add_listener(self, callback: Callable[[Optional[str]], None]) -> None:
+        """Call ``callback(user_id)`` whenever a hunter is marked dirty (None when it may be anyone)"""
+        self._listeners.append(callback)
+
+    def version(self, user_id: str) -> int:
+        """Number of committed transactions for a hunter (0 if never updated)"""
+        return self._versions.get(str(user_id), 0)
+
+    @asynccontextmanager
+    async def transaction(self, user_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Serialize a read-modify-write on one hunter.
+
+        Yields the live record (None if the hunter is not registered). On a
+        clean exit a changed record gets its version bumped and is marked
+        dirty, then the lock is released and anything queued with
+        ``after_commit`` runs; if the block raises, the record is restored to
+        its state on entry and the queued callbacks are dropped.
+        Nested transactions for the same hunter in the same task are allowed.
+        """
+        user_id = str(user_id)
+        task = asyncio.current_task()
+        if task is not None and self._lock_owners.get(user_id) is task:
+            yield self.get(user_id)
+            return
+
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        pending: List[Tuple[Callable[..., Awaitable], tuple, dict]] = []
+        async with lock:
+            self._lock_owners[user_id] = task
+            self._after_commit[user_id] = pending
+            try:
+                record = self.get(user_id)
+                snapshot = copy.deepcopy(record) if record is not None else None
+                try:
+                    yield record
+                except BaseException:
+                    if record is not None:
+                        record.clear()
+                        record.update(snapshot)
+                    raise
+                current = self.get(user_id)
+                if current is not None and current != snapshot:
+                    self._versions[user_id] = self._versions.get(user_id, 0) + 1
+                    self.mark_dirty(user_id)
+            finally:
+                self._lock_owners.pop(user_id, None)
+                self._after_commit.pop(user_id, None)
+        for callback, args, kwargs in pending:
+            await callback(*args, **kwargs)
+
+    def after_commit(self, user_id: str, callback: Callable[..., Awaitable], *args, **kwargs) -> None:
+        """Await ``callback(*args, **kwargs)`` once this task's transaction on the hunter commits.
+
+        Meant for replies and other Discord calls: they run in order after the
+        lock is released, so a slow or failed send neither blocks the hunter
+        nor rolls back a change the user is being told about. Outside a
+        transaction the callback is scheduled right away.
+        """
+        user_id = str(user_id)
+        task = asyncio.current_task()
+        if task is not None and self._lock_owners.get(user_id) is task:
+            self._after_commit[user_id].append((callback, args, kwargs))
+        else:
+            asyncio.ensure_future(callback(*args, **kwargs))
+
+    def save(self, data: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Accept a full hunters dict (legacy save) and schedule a flush.
+
+        Every hunter is re-copied and handed to the backend, so this is for
+        bulk changes (admin resets, migrations); a change to one hunter
+        should call ``mark_dirty(user_id)`` instead.
+        """
+        live = self.load()
+        if data is not None and data is not live:
+            # Caller built its own dict; adopt its contents without
+            # replacing the object other modules hold references to
+            live.clear()
+            live.update(data)
+        self.mark_dirty()
+
+    def mark_dirty(self, user_id: Optional[str] = None) -> None:
+        """Flag the store (or one hunter) as changed and schedule a write-behind flush"""
+        self._mark_unwritten(user_id)
+        for callback in self._listeners:
+            callback(None if user_id is None else str(user_id))
+
+    def _mark_unwritten(self, user_id: Optional[str] = None) -> None:
+        """Queue a hunter (or everyone) for the next flush without reporting a change to listeners"""
+        self._dirty = True
+        if user_id is None:
+            self._dirty_all = True
+        else:
+            self._dirty_ids.add(str(user_id))
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (standalone scripts): write straight away
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.flush_delay, self._timer_flush)
+
+    def _timer_flush(self) -> None:
+        self._flush_handle = None
+        if not self._dirty or self._data is None:
+            return
+        snapshot = self._snapshot()
+        self._flush_task = asyncio.ensure_future(self._write_async(*snapshot))
+
+    def _snapshot(self) -> Tuple[int, Dict[str, Dict[str, Any]], Optional[Set[str]]]:
+        """Freeze the dirty hunters and clear the dirty flags.
+
+        Handlers keep mutating the live dict while the copy is written, so the
+        backend only ever sees records nobody else holds.
+        """
+        data = self._data
+        if self._dirty_all or not self._dirty_ids:
+            refresh = set(data)
+            dirty_ids = None
+        else:
+            refresh = set(self._dirty_ids)
+            dirty_ids = refresh
+
+        snapshot = {}
+        for user_id, record in data.items():
+            frozen = self._frozen.get(user_id)
+            if frozen is None or user_id in refresh:
+                frozen = self._frozen[user_id] = copy.deepcopy(record)
+            snapshot[user_id] = frozen
+        for user_id in [uid for uid in self._frozen if uid not in data]:
+            del self._frozen[user_id]
+
+        self._dirty = False
+        self._dirty_all = False
+        self._dirty_ids.clear()
+        self._snapshot_seq += 1
+        return self._snapshot_seq, snapshot, dirty_ids
+
+    def _write(self, seq: int, snapshot: Dict[str, Dict[str, Any]], dirty_ids: Optional[Set[str]]) -> bool:
+        """Hand a snapshot to the backend (runs on the I/O pool or inline)"""
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return True  # A newer snapshot already reached disk
+            try:
+                self.backend.save(snapshot, dirty_ids)
+            except Exception as e:
+                print(f"Error saving hunter data: {e}")
+                return False
+            self._written_seq = seq
+            return True
+
+    async def _write_async(self, seq: int, snapshot: Dict[str, Dict[str, Any]],
+                           dirty_ids: Optional[Set[str]]) -> bool:
+        self._inflight += 1
+        try:
+            async with path_lock(self.path):
+                ok = await run_io(self._write, seq, snapshot, dirty_ids)
+        finally:
+            self._inflight -= 1
+        if not ok:
+            # Keep the changes pending and try again on the next timer; the
+            # records themselves did not change, so listeners are not told again
+            if dirty_ids is None:
+                self._mark_unwritten()
+            else:
+                for user_id in dirty_ids:
+                    self._mark_unwritten(user_id)
+        return ok
+
+    async def flush_async(self) -> bool:
+        """Write pending changes on the I/O pool and wait for it (use from coroutines)"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+        if not self._dirty or self._data is None:
+            return False
+        return await self._write_async(*self._snapshot())
+
+    def flush(self) -> bool:
+        """Write pending changes synchronously (scripts, shutdown)"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty or self._data is None:
+            return False
+
+        seq, snapshot, dirty_ids = self._snapshot()
+        if self._inflight:
+            # An older background write may still be queued and will be skipped,
+            # so make the backend compare every hunter instead of just these ids
+            dirty_ids = None
+        if not self._write(seq, snapshot, dirty_ids):
+            # Stay dirty without rescheduling; outside a loop that would just retry inline
+            self._dirty = True
+            self._dirty_all = True
+            return False
+        return True
+
+    def close(self) -> None:
+        """Flush pending changes and let the backend finish (e.g. compact its journal)"""
+        self.flush()
+        if self._backend is not None:
+            self._backend.close()
+
+
+# Global instance shared by main.py, the cogs and the UI views
+hunter_store = HunterStore()
+atexit.register(hunter_store.close)
+
+
+def load_hunters_data() -> Dict[str, Dict[str, Any]]:
+    """Return the shared, live hunters dict"""
+    return hunter_store.load()
+
+
+def save_hunters_data(data: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    """Mark all hunter data as changed (bulk edits); single-hunter changes use hunter_store.mark_dirty(user_id)"""
+    hunter_store.save(data)
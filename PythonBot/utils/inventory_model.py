@@ -0,0 +1,198 @@
+"""Compact hunter inventories: stack counts by catalog key plus a small table of rolled instances."""
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from utils.item_index import ItemIndex, get_item_index
+
+# hunter['inventory'] is {item key: count}. Units whose properties differ from
+# the catalog (rolled stats, items the catalog doesn't know) also keep those
+# properties here, as {item key: [properties, ...]}, one entry per such unit
+INSTANCES_FIELD = 'item_instances'
+
+# Fields every item dict repeats that say nothing about the unit itself
+_IDENTITY_FIELDS = ('name', 'id', 'aliases', 'stackable')
+
+# Key for legacy item dicts with no name, no id and no catalog match
+UNKNOWN_ITEM = 'Unknown Item'
+
+
+class InventoryEntry(NamedTuple):
+    key: str                    # Inventory key: the catalog key, or the item's own name if uncatalogued
+    count: int
+    info: Mapping[str, Any]     # Catalog info, overlaid with the first instance's properties
+    instances: List[Dict[str, Any]]
+
+
+def item_key(name: str, index: Optional[ItemIndex] = None) -> str:
+    """Inventory key for a name, id, alias or legacy "Name_1" copy key"""
+    entry = (index or get_item_index()).resolve(name)
+    return entry.key if entry is not None else str(name)
+
+
+def _item_name(item: Mapping[str, Any], index: ItemIndex, fallback: Optional[str] = None) -> str:
+    """Name to file an item dict under: its name or id, the old inventory key, or the catalog entry it copies"""
+    name = item.get('name') or item.get('id') or fallback
+    if name:
+        return str(name)
+    entry = index.match(item)
+    return entry.key if entry is not None else UNKNOWN_ITEM
+
+
+def _unit_properties(item: Mapping[str, Any], info: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """What sets one unit apart from its catalog entry (everything, when uncatalogued)"""
+    return {
+        field: value for field, value in item.items()
+        if field not in _IDENTITY_FIELDS and (info is None or info.get(field) != value)
+    }
+
+
+def get_inventory(hunter: Dict[str, Any], index: Optional[ItemIndex] = None) -> Dict[str, int]:
+    """The hunter's {item key: count} dict, compacting a legacy layout first if one slipped in"""
+    inventory = hunter.get('inventory')
+    if not isinstance(inventory, dict) or any(type(count) is not int for count in inventory.values()):
+        compact_inventory(hunter, index)
+        inventory = hunter['inventory']
+    return inventory
+
+
+def add_item(hunter: Dict[str, Any], name: str, count: int = 1,
+             index: Optional[ItemIndex] = None) -> str:
+    """Add ``count`` plain units of an item and return its inventory key"""
+    key = item_key(name, index)
+    inventory = get_inventory(hunter, index)
+    inventory[key] = inventory.get(key, 0) + count
+    return key
+
+
+def add_instance(hunter: Dict[str, Any], item: Mapping[str, Any], name: Optional[str] = None,
+                 index: Optional[ItemIndex] = None) -> str:
+    """Add one unit from a full item dict; only properties the catalog doesn't already have are kept"""
+    index = index or get_item_index()
+    name = name or _item_name(item, index)
+    entry = index.resolve(name)
+    key = entry.key if entry is not None else name
+    properties = _unit_properties(item, entry.info if entry is not None else None)
+    inventory = get_inventory(hunter, index)
+    inventory[key] = inventory.get(key, 0) + 1
+    if properties:
+        hunter.setdefault(INSTANCES_FIELD, {}).setdefault(key, []).append(properties)
+    return key
+
+
+def remove_item(hunter: Dict[str, Any], key: str, count: int = 1) -> int:
+    """Remove up to ``count`` units (rolled ones last) and return how many are left"""
+    inventory = get_inventory(hunter)
+    left = max(0, inventory.get(key, 0) - count)
+    if left:
+        inventory[key] = left
+    else:
+        inventory.pop(key, None)
+    _trim_instances(hunter, key, left)
+    return left
+
+
+def _trim_instances(hunter: Dict[str, Any], key: str, count: int) -> None:
+    table = hunter.get(INSTANCES_FIELD)
+    if not table or key not in table:
+        return
+    if count <= 0:
+        del table[key]
+    else:
+        del table[key][count:]
+    if not table:
+        del hunter[INSTANCES_FIELD]
+
+
+def get_instances(hunter: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """Properties of the rolled units of an item (never more than the hunter owns)"""
+    count = hunter.get('inventory', {}).get(key, 0) if isinstance(hunter.get('inventory'), dict) else 0
+    return hunter.get(INSTANCES_FIELD, {}).get(key, [])[:max(0, count)]
+
+
+def inventory_entries(hunter: Dict[str, Any], index: Optional[ItemIndex] = None,
+                      keys: Optional[Iterable[str]] = None) -> List[InventoryEntry]:
+    """Everything the hunter holds, each key resolved against the catalog once"""
+    index = index or get_item_index()
+    inventory = get_inventory(hunter, index)
+    entries = []
+    for key in (inventory if keys is None else keys):
+        count = inventory.get(key, 0)
+        if count <= 0:
+            continue
+        instances = get_instances(hunter, key)
+        info = index.get_info(key) or {}
+        if instances:
+            info = {**info, **instances[0]}
+        entries.append(InventoryEntry(key, count, info, instances))
+    return entries
+
+
+def compact_inventory(hunter: Dict[str, Any], index: Optional[ItemIndex] = None) -> bool:
+    """Rewrite a hunter's inventory in the compact layout; True if anything changed.
+
+    Handles every layout older code produced: a list of names and item dicts,
+    dicts holding full item copies under "Name", "Name_1", ... keys, names
+    that differ from the catalog key only by case or alias, and counts that
+    are None or strings. Copies identical to the catalog collapse into the
+    stack count; copies with their own properties become instances.
+    """
+    index = index or get_item_index()
+    old = hunter.get('inventory')
+    old_instances = hunter.get(INSTANCES_FIELD, {})
+
+    units = []  # (name, count, item dict or None)
+    if isinstance(old, list):
+        for item in old:
+            if isinstance(item, Mapping):
+                units.append((_item_name(item, index), 1, item))
+            elif item:
+                units.append((str(item), 1, None))
+    elif isinstance(old, Mapping):
+        for name, value in old.items():
+            if isinstance(value, Mapping):
+                units.append((_item_name(value, index, name), 1, value))
+            else:
+                try:
+                    count = int(value) if value is not None else 0
+                except (TypeError, ValueError):
+                    count = 0
+                units.append((name, count, None))
+
+    inventory: Dict[str, int] = {}
+    instances: Dict[str, List[Dict[str, Any]]] = {}
+    for name, count, item in units:
+        if count <= 0 or not name:
+            continue
+        entry = index.resolve(name)
+        key = entry.key if entry is not None else str(name)
+        inventory[key] = inventory.get(key, 0) + count
+        if item is not None:
+            properties = _unit_properties(item, entry.info if entry is not None else None)
+            if properties:
+                instances.setdefault(key, []).append(properties)
+    for key, rolled in old_instances.items():
+        if key in inventory:
+            instances.setdefault(key, []).extend(rolled)
+    for key in list(instances):
+        del instances[key][inventory[key]:]
+
+    changed = old != inventory or old_instances != instances
+    hunter['inventory'] = inventory
+    if instances:
+        hunter[INSTANCES_FIELD] = instances
+    else:
+        hunter.pop(INSTANCES_FIELD, None)
+    return changed
+
+
+def migrate_inventories(store, index: Optional[ItemIndex] = None) -> int:
+    """Compact every hunter's inventory once; returns how many records were rewritten"""
+    index = index or get_item_index()
+    migrated = 0
+    for user_id, hunter in store.load().items():
+        if compact_inventory(hunter, index):
+            store.mark_dirty(user_id)
+            migrated += 1
+    if migrated:
+        print(f"Compacted {migrated} hunter inventories")
+    return migrated
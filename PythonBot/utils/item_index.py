@@ -0,0 +1,161 @@
+"""Prebuilt item lookup: canonical ids, normalized names, aliases and fuzzy suggestions."""
+
+import difflib
+import re
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set
+
+from utils.game_data import game_data
+
+# Legacy inventories store extra copies of non-stackable items as "Name_1", "Name_2", ...
+_COPY_SUFFIX = re.compile(r'^(.*?)_(\d+)$')
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Minimum similarity (0-1) for a name to be offered as a suggestion
+SUGGEST_CUTOFF = 0.6
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive form of an item name"""
+    return ' '.join(str(name).casefold().split())
+
+
+def slugify(name: str) -> str:
+    """Punctuation-free id form: "Hunter's Bow" -> "hunters_bow\""""
+    return _NON_ALNUM.sub('_', str(name).casefold().replace("'", '')).strip('_')
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ItemEntry(NamedTuple):
+    key: str        # Name the catalog (and hunters' inventories) use for the item
+    id: str
+    name: str       # Display name
+    category: str
+    info: Mapping[str, Any]
+
+
+class ItemIndex:
+    """Constant-time item resolution over a {category: {key: info}} catalog.
+
+    Every item is reachable by its catalog key, its display name, its id and
+    the slug of each, all case/whitespace-normalized, plus any names listed
+    in an item's "aliases". ``resolve`` also maps legacy "Name_1" inventory
+    keys back to the base item; ``suggest`` offers close names on a miss.
+    """
+
+    def __init__(self, catalog: Optional[Mapping[str, Mapping[str, Mapping[str, Any]]]]):
+        self._entries: Dict[str, ItemEntry] = {}
+        self._lookup: Dict[str, str] = {}
+        self._trigram_index: Dict[str, Set[str]] = {}
+
+        for category, items in (catalog or {}).items():
+            if not isinstance(items, Mapping):
+                continue
+            for key, info in items.items():
+                if key in self._entries or not isinstance(info, Mapping):
+                    continue  # First category wins, like the old linear scans
+                name = info.get('name', key)
+                entry = ItemEntry(key, info.get('id') or slugify(name), name, category, info)
+                self._entries[key] = entry
+                for alias in (key, name, entry.id, *info.get('aliases', ())):
+                    self._add_alias(alias, key)
+
+        for key, entry in self._entries.items():
+            for gram in _trigrams(normalize_name(entry.name)):
+                self._trigram_index.setdefault(gram, set()).add(key)
+
+    def _add_alias(self, alias: str, key: str) -> None:
+        for form in (normalize_name(alias), slugify(alias)):
+            if form:
+                self._lookup.setdefault(form, key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def _find(self, name: str) -> Optional[ItemEntry]:
+        key = self._lookup.get(normalize_name(name))
+        if key is None:
+            key = self._lookup.get(slugify(name))
+        return self._entries.get(key) if key is not None else None
+
+    def resolve(self, name: str) -> Optional[ItemEntry]:
+        """Entry for a key, name, id or alias; "Iron Sword_2" resolves to Iron Sword"""
+        if not name:
+            return None
+        entry = self._find(name)
+        if entry is None:
+            match = _COPY_SUFFIX.match(str(name))
+            if match:
+                entry = self._find(match.group(1))
+        return entry
+
+    def match(self, item: Mapping[str, Any]) -> Optional[ItemEntry]:
+        """Entry whose catalog info a nameless item dict is a copy of (a scan; legacy data only)"""
+        for entry in self._entries.values():
+            if entry.info == item:
+                return entry
+        return None
+
+    def get_info(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Item info for a name (what the old per-category loops returned)"""
+        entry = self.resolve(name)
+        return entry.info if entry else None
+
+    def suggest(self, name: str, limit: int = 3, keys: Optional[Iterable[str]] = None) -> List[str]:
+        """Display names closest to a misspelled name, best first.
+
+        Trigram overlap narrows the catalog to a few candidates before the
+        edit-distance ratio is computed. Pass keys to restrict suggestions
+        (e.g. to what a hunter actually owns).
+        """
+        query = normalize_name(name)
+        if not query:
+            return []
+        allowed = None
+        if keys is not None:
+            allowed = {entry.key for entry in map(self.resolve, keys) if entry}
+
+        counts: Dict[str, int] = {}
+        for gram in _trigrams(query):
+            for key in self._trigram_index.get(gram, ()):
+                if allowed is None or key in allowed:
+                    counts[key] = counts.get(key, 0) + 1
+        candidates = sorted(counts, key=counts.get, reverse=True)[:20]
+
+        scored = []
+        for key in candidates:
+            entry = self._entries[key]
+            ratio = difflib.SequenceMatcher(None, query, normalize_name(entry.name)).ratio()
+            if ratio >= SUGGEST_CUTOFF:
+                scored.append((ratio, entry.name))
+        scored.sort(key=lambda pair: -pair[0])
+        return [name for _, name in scored[:limit]]
+
+
+def get_item_index() -> ItemIndex:
+    """Index over data/items.json, rebuilt automatically when the file reloads"""
+    return game_data.derive('items', 'item_index', ItemIndex)
+
+
+def find_inventory_key(inventory: Mapping[str, Any], item_name: str, index: ItemIndex) -> Optional[str]:
+    """Inventory key holding the item a player typed (case-insensitive, alias-aware)"""
+    if item_name in inventory:
+        return item_name
+    wanted = normalize_name(item_name)
+    for key in inventory:
+        if normalize_name(key) == wanted:
+            return key
+    entry = index.resolve(item_name)
+    if entry is None:
+        return None
+    for key in inventory:
+        owned = index.resolve(key)
+        if owned is not None and owned.key == entry.key:
+            return key
+    return None
@@ -0,0 +1,318 @@
+"""Leaderboards kept sorted as hunters change, so rankings never scan every hunter."""
+
+import asyncio
+import bisect
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from utils.async_io import write_json_soon
+from utils.hunter_store import hunter_store
+
+# Written for the web dashboard, next to hunters_data.json
+LEADERBOARD_FILE = 'leaderboard.json'
+# Seconds to wait after a change before rewriting the dashboard snapshot
+SNAPSHOT_DELAY = 10.0
+# Hunters per board in the dashboard snapshot
+SNAPSHOT_TOP = 10
+# Matches needed before a hunter appears on the win-rate board
+PVP_MIN_MATCHES = 5
+
+
+def _pvp(hunter: Dict) -> Dict:
+    return hunter.get('pvp_stats') or {}
+
+
+def _pvp_matches(hunter: Dict) -> int:
+    pvp = _pvp(hunter)
+    return pvp.get('wins', 0) + pvp.get('losses', 0)
+
+
+def _win_rate(hunter: Dict) -> float:
+    matches = _pvp_matches(hunter)
+    return _pvp(hunter).get('wins', 0) / matches if matches else 0.0
+
+
+class Metric(NamedTuple):
+    title: str
+    key: Callable[[Dict], Optional[Tuple]]  # higher sorts first; None keeps the hunter off the board
+    value: Callable[[Dict], str]            # how a hunter's score is shown
+
+
+METRICS = {
+    'level': Metric(
+        "Level",
+        lambda h: (h.get('level', 1), h.get('exp', 0)),
+        lambda h: f"Level {h.get('level', 1)} • {h.get('exp', 0):,} EXP",
+    ),
+    'exp': Metric(
+        "Total EXP",
+        lambda h: (h.get('exp', 0),),
+        lambda h: f"{h.get('exp', 0):,} EXP",
+    ),
+    'gold': Metric(
+        "Gold",
+        lambda h: (h.get('gold', 0),),
+        lambda h: f"{h.get('gold', 0):,} Gold",
+    ),
+    'pvp_wins': Metric(
+        "PvP Wins",
+        lambda h: (_pvp(h)['wins'], -_pvp(h).get('losses', 0)) if _pvp(h).get('wins', 0) > 0 else None,
+        lambda h: f"{_pvp(h).get('wins', 0)} W / {_pvp(h).get('losses', 0)} L",
+    ),
+    'pvp_winrate': Metric(
+        "PvP Win Rate",
+        lambda h: (_win_rate(h), _pvp(h).get('wins', 0)) if _pvp_matches(h) >= PVP_MIN_MATCHES else None,
+        lambda h: f"{_win_rate(h) * 100:.1f}% ({_pvp_matches(h)} matches)",
+    ),
+}
+
+METRIC_ALIASES = {
+    'lvl': 'level',
+    'xp': 'exp',
+    'money': 'gold',
+    'pvp': 'pvp_wins',
+    'wins': 'pvp_wins',
+    'winrate': 'pvp_winrate',
+    'wr': 'pvp_winrate',
+}
+
+
+def resolve_metric(name: str) -> Optional[str]:
+    """Board name for user input like 'XP' or 'winrate', None if unknown"""
+    name = name.lower().replace('-', '_')
+    name = METRIC_ALIASES.get(name, name)
+    return name if name in METRICS else None
+
+
+class LeaderboardEntry(NamedTuple):
+    position: int
+    user_id: str
+    hunter: Dict[str, Any]
+
+
+class _Board:
+    """One metric's hunters in rank order; entries are (negated key, user_id) so ascending is best first"""
+
+    __slots__ = ('entries', 'by_user')
+
+    def __init__(self):
+        self.entries: List[Tuple[Tuple, str]] = []
+        self.by_user: Dict[str, Tuple[Tuple, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def update(self, user_id: str, key: Optional[Tuple]) -> None:
+        entry = (tuple(-part for part in key), user_id) if key is not None else None
+        old = self.by_user.get(user_id)
+        if old == entry:
+            return
+        if old is not None:
+            del self.entries[bisect.bisect_left(self.entries, old)]
+            del self.by_user[user_id]
+        if entry is not None:
+            bisect.insort(self.entries, entry)
+            self.by_user[user_id] = entry
+
+    def top(self, limit: int, offset: int = 0) -> List[str]:
+        return [user_id for _, user_id in self.entries[offset:offset + limit]]
+
+    def position(self, user_id: str) -> Optional[int]:
+        entry = self.by_user.get(user_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self.entries, entry) + 1
+
+
+class _Totals:
+    """Server-wide sums for the dashboard, adjusted per hunter instead of re-added"""
+
+    __slots__ = ('hunters', 'levels', 'gold', 'shadows', 'battles', 'ranks', 'by_user')
+
+    def __init__(self):
+        self.hunters = self.levels = self.gold = self.shadows = self.battles = 0
+        self.ranks: Dict[str, int] = {}
+        self.by_user: Dict[str, Tuple[int, int, int, int, str]] = {}
+
+    def _apply(self, share: Tuple[int, int, int, int, str], sign: int) -> None:
+        level, gold, shadows, battles, rank = share
+        self.hunters += sign
+        self.levels += sign * level
+        self.gold += sign * gold
+        self.shadows += sign * shadows
+        self.battles += sign * battles
+        self.ranks[rank] = self.ranks.get(rank, 0) + sign
+        if not self.ranks[rank]:
+            del self.ranks[rank]
+
+    def update(self, user_id: str, hunter: Optional[Dict]) -> None:
+        share = None
+        if hunter is not None:
+            share = (hunter.get('level', 1), hunter.get('gold', 0), len(hunter.get('shadows') or ()),
+                     _pvp_matches(hunter), hunter.get('rank') or 'E')
+        old = self.by_user.get(user_id)
+        if old == share:
+            return
+        if old is not None:
+            self._apply(old, -1)
+            del self.by_user[user_id]
+        if share is not None:
+            self._apply(share, 1)
+            self.by_user[user_id] = share
+
+
+class Leaderboards:
+    """Sorted boards for level, EXP, gold and PvP, updated from hunter store changes.
+
+    The store reports which hunter changed; those ids are re-indexed on the
+    next read, each costing O(log n) per board. Only a full reload (the first
+    read, or a bulk save such as an admin reset) re-checks every hunter's
+    scores, and then only moves the ones that differ. Top-N reads are a slice and a
+    hunter's position is a bisect. Display names are cached per user and the
+    dashboard gets a JSON snapshot shortly after changes settle.
+    """
+
+    def __init__(self, store=hunter_store, snapshot_path: str = LEADERBOARD_FILE):
+        self.store = store
+        self.snapshot_path = snapshot_path
+        self._boards: Dict[str, _Board] = {name: _Board() for name in METRICS}
+        self._totals = _Totals()
+        self._pending: Set[str] = set()
+        self._stale_all = True  # nothing indexed yet
+        self._names: Dict[str, str] = {}
+        self.bot = None
+        self._snapshot_handle = None
+        store.add_listener(self._on_change)
+
+    def attach(self, bot) -> None:
+        """Resolve display names for the dashboard snapshot and keep them fresh"""
+        self.bot = bot
+        bot.add_listener(self._on_user_update, 'on_user_update')
+
+    async def _on_user_update(self, before, after) -> None:
+        if before.name != after.name:
+            self._names.pop(str(after.id), None)
+
+    def _on_change(self, user_id: Optional[str]) -> None:
+        if user_id is None:
+            self._stale_all = True
+        else:
+            self._pending.add(user_id)
+        self._schedule_snapshot()
+
+    def _reindex(self, user_id: str, hunter: Optional[Dict]) -> None:
+        for name, metric in METRICS.items():
+            self._boards[name].update(user_id, metric.key(hunter) if hunter is not None else None)
+        self._totals.update(user_id, hunter)
+
+    def sync(self) -> None:
+        """Apply every change reported since the last read"""
+        data = self.store.load()
+        if self._stale_all:
+            user_ids = set(data) | set(self._totals.by_user)
+            self._stale_all = False
+        else:
+            user_ids = self._pending
+        self._pending = set()
+        for user_id in user_ids:
+            self._reindex(user_id, data.get(user_id))
+
+    def top(self, metric: str, limit: int = 10, offset: int = 0) -> List[LeaderboardEntry]:
+        """The best ``limit`` hunters on a board, starting after ``offset``"""
+        self.sync()
+        data = self.store.load()
+        return [
+            LeaderboardEntry(offset + i, user_id, data[user_id])
+            for i, user_id in enumerate(self._boards[metric].top(limit, offset), 1)
+        ]
+
+    def position(self, user_id, metric: str) -> Optional[int]:
+        """1-based position of a hunter on a board, None if they are not on it"""
+        self.sync()
+        return self._boards[metric].position(str(user_id))
+
+    def size(self, metric: str) -> int:
+        self.sync()
+        return len(self._boards[metric])
+
+    def display_name(self, bot, user_id) -> str:
+        """Cached Discord name for a hunter, looked up once per user"""
+        user_id = str(user_id)
+        name = self._names.get(user_id)
+        if name is None:
+            user = bot.get_user(int(user_id)) if bot is not None else None
+            if user is None:
+                return f"Hunter {user_id[-4:]}"  # Not cached; try again next time
+            name = self._names[user_id] = user.name
+        return name
+
+    def stats(self) -> Dict[str, Any]:
+        """Dashboard statistics in the shape dashboard/server.js calculateStats returns"""
+        self.sync()
+        totals = self._totals
+        return {
+            'totalHunters': totals.hunters,
+            'averageLevel': round(totals.levels / totals.hunters) if totals.hunters else 0,
+            'totalGold': totals.gold,
+            'totalShadows': totals.shadows,
+            'rankDistribution': dict(totals.ranks),
+            'topHunters': [
+                {
+                    'name': self.display_name(self.bot, entry.user_id),
+                    'level': entry.hunter.get('level', 1),
+                    'rank': entry.hunter.get('rank'),
+                    'gold': entry.hunter.get('gold', 0),
+                    'shadows': len(entry.hunter.get('shadows') or ()),
+                }
+                for entry in self.top('level', SNAPSHOT_TOP)
+            ],
+            'pvpStats': {
+                'totalBattles': totals.battles,
+                'topPvPHunters': [
+                    {
+                        'name': self.display_name(self.bot, entry.user_id),
+                        'wins': _pvp(entry.hunter).get('wins', 0),
+                        'losses': _pvp(entry.hunter).get('losses', 0),
+                        'rank': _pvp(entry.hunter).get('rank'),
+                        'level': entry.hunter.get('level', 1),
+                    }
+                    for entry in self.top('pvp_wins', 5)
+                ],
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything the dashboard reads, without it ever sorting the hunters itself"""
+        boards = {}
+        for name, metric in METRICS.items():
+            boards[name] = [
+                {
+                    'position': entry.position,
+                    'user_id': entry.user_id,
+                    'name': self.display_name(self.bot, entry.user_id),
+                    'value': metric.value(entry.hunter),
+                }
+                for entry in self.top(name, SNAPSHOT_TOP)
+            ]
+        return {'updated_at': time.time(), 'stats': self.stats(), 'boards': boards}
+
+    def _schedule_snapshot(self) -> None:
+        if self._snapshot_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Scripts have no dashboard to feed
+        self._snapshot_handle = loop.call_later(SNAPSHOT_DELAY, self.write_snapshot)
+
+    def write_snapshot(self) -> None:
+        """Write the dashboard snapshot in the background"""
+        self._snapshot_handle = None
+        try:
+            write_json_soon(self.snapshot_path, self.snapshot())
+        except Exception as e:
+            print(f"Error writing leaderboard snapshot: {e}")
+
+
+# Global instance
+leaderboards = Leaderboards()
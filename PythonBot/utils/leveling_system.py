@@ -1,9 +1,15 @@
 """Leveling system and rank utilities for the Solo Leveling RPG bot."""
 
-import json
+import bisect
 import discord
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, NamedTuple, Sequence, Tuple
 import os
+from utils.hunter_store import hunter_store
+
+try:
+    import numpy as np
+except ImportError:  # Batch lookups fall back to bisect
+    np = None
 
 # Rank role mapping for Discord role management - Solo Leveling Lore Accurate
 RANK_ROLES = {
@@ -17,13 +23,37 @@ RANK_ROLES = {
     range(101, 1000): "Monarch"
 }
 
+# Highest level with an explicit rank; anything outside 1..MAX_RANKED_LEVEL is Monarch
+MAX_RANKED_LEVEL = 999
+
+
+def _rank_array(ranges) -> List[str]:
+    """Flatten {(min, max): rank} ranges into a list indexed by level"""
+    ranks = ['Monarch'] * (MAX_RANKED_LEVEL + 1)
+    for (min_level, max_level), rank in ranges:
+        for level in range(max(min_level, 1), min(max_level, MAX_RANKED_LEVEL) + 1):
+            ranks[level] = rank
+    return ranks
+
+
+_RANK_ROLE_BY_LEVEL = _rank_array(((r.start, r.stop - 1), role) for r, role in RANK_ROLES.items())
+
+
 def get_rank_role_name(level: int) -> str:
     """Return the rank role name based on player level."""
-    for rank_range, role_name in RANK_ROLES.items():
-        if level in rank_range:
-            return role_name
+    if 0 < level <= MAX_RANKED_LEVEL:
+        return _RANK_ROLE_BY_LEVEL[level]
     return "Monarch"  # Default for very high levels
 
+
+class LevelBatch(NamedTuple):
+    """Per-hunter results of LevelingSystem.batch_levels, in input order"""
+    levels: Sequence[int]
+    ranks: List[str]
+    progress: Sequence[int]   # EXP earned inside the current level
+    needed: Sequence[int]     # EXP the current level takes to clear
+
+
 class LevelingSystem:
     """Handles experience, leveling, and rank logic for players."""
     def __init__(self):
@@ -55,6 +85,18 @@ class LevelingSystem:
         
         # Pre-calculated EXP requirements for each level
         self._exp_table = self._generate_exp_table()
+
+        # Sorted copy of the table: _level_starts[i] is the total EXP that starts level i + 1,
+        # so the level for a total is a single bisect
+        self.max_level = len(self._exp_table)
+        self._level_starts = [self._exp_table[level] for level in range(1, self.max_level + 1)]
+        # Indexed by level (0..max_level): EXP to clear that level, as get_exp_for_next_level reports it
+        self._level_spans = [self.get_exp_for_next_level(level) for level in range(self.max_level + 1)]
+        self._rank_by_level = _rank_array(self.rank_mappings.items())
+        if np is not None:
+            self._np_starts = np.array(self._level_starts, dtype=np.int64)
+            self._np_level_base = np.array([0] + self._level_starts, dtype=np.int64)
+            self._np_spans = np.array(self._level_spans, dtype=np.int64)
     
     def _generate_exp_table(self) -> Dict[int, int]:
         """Generate a table of total EXP required to START each level"""
@@ -88,10 +130,7 @@ class LevelingSystem:
     
     def get_level_from_exp(self, total_exp: int) -> int:
         """Calculate level based on total EXP"""
-        for level in range(1, len(self._exp_table) + 1):
-            if total_exp < self._exp_table.get(level, float('inf')):
-                return level - 1
-        return len(self._exp_table)
+        return bisect.bisect_right(self._level_starts, total_exp)
     
     def get_exp_for_next_level(self, current_level: int) -> int:
         """Get EXP required to reach the next level"""
@@ -120,10 +159,31 @@ class LevelingSystem:
     
     def get_rank_for_level(self, level: int) -> str:
         """Get rank name based on level"""
-        for (min_level, max_level), rank in self.rank_mappings.items():
-            if min_level <= level <= max_level:
-                return rank
+        if 0 < level <= MAX_RANKED_LEVEL:
+            return self._rank_by_level[level]
         return 'Monarch'  # Default for very high levels
+
+    def batch_levels(self, total_exps: Sequence[int]) -> LevelBatch:
+        """Levels, ranks and in-level progress for many EXP totals in one pass.
+
+        Matches calling get_level_from_exp, get_rank_for_level and
+        get_exp_progress per hunter. Uses NumPy when it is installed.
+        """
+        if np is not None:
+            exps = np.asarray(total_exps, dtype=np.int64)
+            levels = np.searchsorted(self._np_starts, exps, side='right')
+            needed = self._np_spans[levels]
+            progress = np.minimum(np.maximum(exps - self._np_level_base[levels], 0), needed)
+            levels, progress, needed = levels.tolist(), progress.tolist(), needed.tolist()
+        else:
+            levels = [bisect.bisect_right(self._level_starts, exp) for exp in total_exps]
+            needed = [self._level_spans[level] for level in levels]
+            progress = [
+                min(max(exp - (self._level_starts[level - 1] if level else 0), 0), span)
+                for exp, level, span in zip(total_exps, levels, needed)
+            ]
+        ranks = [self.get_rank_for_level(level) for level in levels]
+        return LevelBatch(levels, ranks, progress, needed)
     
     def calculate_exp_gain(self, action_type: str, enemy_rank: str = None, difficulty: str = "normal") -> int:
         """Calculate EXP gain based on action type and difficulty"""
@@ -169,155 +229,70 @@ class LevelingSystem:
 # Global instance
 leveling_system = LevelingSystem()
 
-def load_hunters_data():
-    """Load hunter data from JSON file"""
-    try:
-        with open('hunters_data.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-
-def save_hunters_data(data):
-    """Save hunter data to JSON file"""
-    with open('hunters_data.json', 'w') as f:
-        json.dump(data, f, indent=4)
-
 async def update_user_rank_role(member: discord.Member, new_level: int):
-    """Update user's rank role based on their new level"""
-    print(f"[DEBUG] Starting role update for {member} (Level {new_level})")
-    
-    guild = member.guild
-    new_rank_name = get_rank_role_name(new_level)
-    print(f"[DEBUG] Target rank role: {new_rank_name}")
-    
-    # Debug: List all guild roles
-    print(f"[DEBUG] Guild roles available: {[role.name for role in guild.roles]}")
-    
-    new_rank_role = discord.utils.get(guild.roles, name=new_rank_name)
-    print(f"[DEBUG] Found existing role: {new_rank_role is not None}")
-
-    # Create role if it doesn't exist
-    if new_rank_role is None:
-        print(f"[DEBUG] Role '{new_rank_name}' not found, attempting to create...")
-        try:
-            new_rank_role = await guild.create_role(
-                name=new_rank_name,
-                reason="Auto-created rank role for leveling system"
-            )
-            print(f"[DEBUG] ✅ Created new role: {new_rank_name}")
-        except discord.Forbidden as e:
-            print(f"[ERROR] ❌ Bot lacks permission to create role '{new_rank_name}': {e}")
-            return
-        except Exception as e:
-            print(f"[ERROR] ❗ Error creating role '{new_rank_name}': {e}")
-            return
-
-    # Remove all existing rank roles from user
-    rank_names = list(RANK_ROLES.values())
-    roles_to_remove = [r for r in member.roles if r.name in rank_names]
-    print(f"[DEBUG] Removing old roles: {[r.name for r in roles_to_remove]}")
-
-    try:
-        if roles_to_remove:
-            await member.remove_roles(*roles_to_remove, reason="Rank update")
-            print(f"[DEBUG] 🗑️ Removed old rank roles from {member.display_name}")
-
-        # Assign new role
-        print(f"[DEBUG] Adding new role: {new_rank_role.name}")
-        await member.add_roles(new_rank_role, reason="Rank promotion")
-        print(f"[DEBUG] 🎖️ Assigned {new_rank_name} role to {member.display_name}")
-        
-        # Send DM notification
-        try:
-            await member.send(f"🎉 Congratulations! You've been promoted to **{new_rank_name}** (Level {new_level})!")
-            print(f"[DEBUG] 📧 Sent promotion DM to {member.display_name}")
-        except discord.Forbidden:
-            print(f"[DEBUG] 📭 Could not DM {member.display_name} about rank promotion")
-            
-    except discord.Forbidden as e:
-        print(f"[ERROR] ❌ Bot lacks permission to manage roles for {member.display_name}: {e}")
-    except Exception as e:
-        print(f"[ERROR] ❗ Error updating role for {member.display_name}: {e}")
-        import traceback
-        traceback.print_exc()
+    """Queue a rank role update for the member; the edit and DM happen in the background"""
+    from utils.role_sync import role_sync
+    role_sync.request(member, new_level)
 
 async def award_exp(user_id: str, exp_amount: int, bot, action_type: str = "action") -> Dict:
     """Award EXP to a user and handle level ups"""
-    hunters_data = load_hunters_data()
-    
-    if user_id not in hunters_data:
-        return {"error": "User not found"}
-    
-    hunter = hunters_data[user_id]
-    
-    # Get current stats
-    old_level = hunter.get('level', 1)
-    old_exp = hunter.get('exp', 0)
-    old_rank = hunter.get('rank', 'E')
+    async with hunter_store.transaction(user_id) as hunter:
+        if hunter is None:
+            return {"error": "User not found"}
+        
+        # Get current stats
+        old_level = hunter.get('level', 1)
+        old_exp = hunter.get('exp', 0)
+        old_rank = hunter.get('rank', 'E')
     
-    # Add EXP
-    new_total_exp = old_exp + exp_amount
-    new_level = leveling_system.get_level_from_exp(new_total_exp)
-    new_rank = leveling_system.get_rank_for_level(new_level)
+        # Add EXP
+        new_total_exp = old_exp + exp_amount
+        new_level = leveling_system.get_level_from_exp(new_total_exp)
+        new_rank = leveling_system.get_rank_for_level(new_level)
     
-    # Update hunter data
-    print(f"[DEBUG] Before EXP update - User: {user_id}, Old EXP: {old_exp}, Old Level: {old_level}, Old Rank: {old_rank}")
-    hunter['exp'] = new_total_exp
-    hunter['level'] = new_level
-    hunter['rank'] = new_rank
-    print(f"[DEBUG] After EXP update - User: {user_id}, New EXP: {new_total_exp}, New Level: {new_level}, New Rank: {new_rank}")
+        # Update hunter data
+        print(f"[DEBUG] Before EXP update - User: {user_id}, Old EXP: {old_exp}, Old Level: {old_level}, Old Rank: {old_rank}")
+        hunter['exp'] = new_total_exp
+        hunter['level'] = new_level
+        hunter['rank'] = new_rank
+        print(f"[DEBUG] After EXP update - User: {user_id}, New EXP: {new_total_exp}, New Level: {new_level}, New Rank: {new_rank}")
     
-    # Calculate stat bonuses for level up
-    levels_gained = new_level - old_level
-    if levels_gained > 0:
-        # Award stat points for each level gained
-        stat_points_per_level = 3
-        bonus_stats = levels_gained * stat_points_per_level
+        # Calculate stat bonuses for level up
+        levels_gained = new_level - old_level
+        if levels_gained > 0:
+            # Award stat points for each level gained
+            stat_points_per_level = 3
+            bonus_stats = levels_gained * stat_points_per_level
         
-        # Distribute stats based on current build
-        strength_bonus = bonus_stats // 3
-        agility_bonus = bonus_stats // 3
-        intel_bonus = bonus_stats - strength_bonus - agility_bonus
+            # Distribute stats based on current build
+            strength_bonus = bonus_stats // 3
+            agility_bonus = bonus_stats // 3
+            intel_bonus = bonus_stats - strength_bonus - agility_bonus
         
-        hunter['strength'] = hunter.get('strength', 10) + strength_bonus
-        hunter['agility'] = hunter.get('agility', 10) + agility_bonus
-        hunter['intelligence'] = hunter.get('intelligence', 10) + intel_bonus
+            hunter['strength'] = hunter.get('strength', 10) + strength_bonus
+            hunter['agility'] = hunter.get('agility', 10) + agility_bonus
+            hunter['intelligence'] = hunter.get('intelligence', 10) + intel_bonus
         
-        # Update base stats
-        hunter['base_strength'] = hunter.get('base_strength', 10) + strength_bonus
-        hunter['base_agility'] = hunter.get('base_agility', 10) + agility_bonus
-        hunter['base_intelligence'] = hunter.get('base_intelligence', 10) + intel_bonus
+            # Update base stats
+            hunter['base_strength'] = hunter.get('base_strength', 10) + strength_bonus
+            hunter['base_agility'] = hunter.get('base_agility', 10) + agility_bonus
+            hunter['base_intelligence'] = hunter.get('base_intelligence', 10) + intel_bonus
         
-        # Increase HP and MP
-        hp_gain = levels_gained * 20
-        mp_gain = levels_gained * 10
+            # Increase HP and MP
+            hp_gain = levels_gained * 20
+            mp_gain = levels_gained * 10
         
-        hunter['max_hp'] = hunter.get('max_hp', 100) + hp_gain
-        hunter['max_mp'] = hunter.get('max_mp', 50) + mp_gain
-        hunter['hp'] = hunter['max_hp']  # Full heal on level up
-        hunter['mp'] = hunter['max_mp']  # Full mana on level up
-    
-    try:
-        print(f"[DEBUG] Attempting to save hunters_data.json after EXP award...")
-        save_hunters_data(hunters_data)
-        print(f"[DEBUG] Successfully saved hunters_data.json. User {user_id} now has EXP: {hunter['exp']}, Level: {hunter['level']}, Rank: {hunter['rank']}")
-    except Exception as e:
-        print(f"[ERROR] Failed to save hunters_data.json in award_exp: {e}")
-        import traceback
-        traceback.print_exc()
+            hunter['max_hp'] = hunter.get('max_hp', 100) + hp_gain
+            hunter['max_mp'] = hunter.get('max_mp', 50) + mp_gain
+            hunter['hp'] = hunter['max_hp']  # Full heal on level up
+            hunter['mp'] = hunter['max_mp']  # Full mana on level up
     
     # Handle rank role updates if level changed
     rank_changed = old_rank != new_rank
     if rank_changed and levels_gained > 0:
         try:
-            user = bot.get_user(int(user_id))
-            if user:
-                # Find the user in all guilds to update roles
-                for guild in bot.guilds:
-                    member = guild.get_member(int(user_id))
-                    if member:
-                        await update_user_rank_role(member, new_level)
-                        break
+            from utils.role_sync import role_sync
+            role_sync.request_for_user(bot, user_id, new_level)
         except Exception as e:
             print(f"Error updating rank role: {e}")
     
@@ -335,85 +310,9 @@ async def award_exp(user_id: str, exp_amount: int, bot, action_type: str = "acti
 
 
 async def send_level_up_notification(user, level_up_data):
-    """Send a private message to user about their level up"""
-    try:
-        if level_up_data["levels_gained"] > 0:
-            embed = discord.Embed(
-                title="🎉 LEVEL UP! 🎉",
-                color=discord.Color.gold()
-            )
-            
-            embed.add_field(
-                name="New Level",
-                value=f"Level {level_up_data['new_level']} (+" + str(level_up_data['levels_gained']) + ")",
-                inline=True
-            )
-            
-            if level_up_data["rank_changed"]:
-                embed.add_field(
-                    name="Rank Promotion!",
-                    value=f"{level_up_data['old_rank']} → **{level_up_data['new_rank']}**",
-                    inline=True
-                )
-            
-            embed.add_field(
-                name="EXP Gained",
-                value=f"+{level_up_data['exp_gained']} EXP",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="Total EXP",
-                value=f"{level_up_data['total_exp']:,} EXP",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="Bonuses",
-                value=f"• +{level_up_data['levels_gained'] * 3} Stat Points\n• +{level_up_data['levels_gained'] * 20} Max HP\n• +{level_up_data['levels_gained'] * 10} Max MP\n• Full HP/MP Restore",
-                inline=False
-            )
-            
-            embed.set_footer(text="Keep hunting to grow stronger!")
-            
-            await user.send(embed=embed)
-        else:
-            # Just EXP gain notification
-            embed = discord.Embed(
-                title="⚡ EXP Gained",
-                description=f"You gained **{level_up_data['exp_gained']} EXP**!",
-                color=discord.Color.blue()
-            )
-            embed.add_field(
-                name="Total EXP",
-                value=f"{level_up_data['total_exp']:,} EXP",
-                inline=True
-            )
-            embed.add_field(
-                name="Current Level",
-                value=f"Level {level_up_data['new_level']}",
-                inline=True
-            )
-            
-            # Show progress to next level
-            current_progress, needed_for_next = leveling_system.get_exp_progress(
-                level_up_data['total_exp'], 
-                level_up_data['new_level']
-            )
-            progress_bar = create_progress_bar(current_progress, needed_for_next)
-            embed.add_field(
-                name="Next Level Progress",
-                value=f"{progress_bar}\n{current_progress:,}/{needed_for_next:,} EXP",
-                inline=False
-            )
-            
-            await user.send(embed=embed)
-            
-    except discord.Forbidden:
-        # User has DMs disabled
-        print(f"Cannot send DM to user {user.id} - DMs disabled")
-    except Exception as e:
-        print(f"Error sending level up notification: {e}")
+    """Queue an EXP/level-up DM for the user; events within a few seconds share one digest"""
+    from utils.notifications import notifications
+    notifications.add_exp(user, level_up_data)
 
 def create_progress_bar(current: int, maximum: int, length: int = 10) -> str:
     """Create a visual progress bar"""
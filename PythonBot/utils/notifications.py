@@ -0,0 +1,221 @@
+"""Outbound DM queue: per-user EXP, level-up and promotion events coalesced into one digest."""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+import discord
+
+from utils.hunter_store import hunter_store
+from utils.leveling_system import create_progress_bar, leveling_system
+
+# Events for one user inside this window become a single DM
+NOTIFY_WINDOW = 5.0
+# DMs in flight at once across all users
+MAX_CONCURRENT_DMS = 4
+# Retries for failed sends, waiting DM_RETRY_BASE * 2**attempt seconds in between
+DM_RETRIES = 3
+DM_RETRY_BASE = 1.0
+# After a user turns out to block DMs, skip them for this long
+DM_CLOSED_COOLDOWN = 3600
+
+# Per-hunter setting stored under 'dm_notifications'
+NOTIFY_ALL = 'all'        # every EXP gain, level-up and promotion
+NOTIFY_LEVELS = 'levels'  # quiet: only level-ups and promotions
+NOTIFY_OFF = 'off'        # no DMs at all
+NOTIFY_MODES = (NOTIFY_ALL, NOTIFY_LEVELS, NOTIFY_OFF)
+
+
+def get_notify_mode(user_id) -> str:
+    """Return the hunter's DM setting, 'all' when unset or unregistered"""
+    hunter = hunter_store.get(user_id)
+    mode = hunter.get('dm_notifications', NOTIFY_ALL) if hunter else NOTIFY_ALL
+    return mode if mode in NOTIFY_MODES else NOTIFY_ALL
+
+
+class _Digest:
+    """Everything that happened to one user during a window"""
+
+    __slots__ = ('exp_gained', 'total_exp', 'old_level', 'new_level', 'old_rank', 'new_rank', 'promoted')
+
+    def __init__(self):
+        self.exp_gained = 0
+        self.total_exp: Optional[int] = None
+        self.old_level: Optional[int] = None
+        self.new_level: Optional[int] = None
+        self.old_rank: Optional[str] = None
+        self.new_rank: Optional[str] = None
+        self.promoted = False
+
+    @property
+    def levels_gained(self) -> int:
+        if self.old_level is None or self.new_level is None:
+            return 0
+        return max(self.new_level - self.old_level, 0)
+
+    def add_exp(self, level_up_data: Dict) -> None:
+        self.exp_gained += level_up_data.get('exp_gained', 0)
+        self.total_exp = level_up_data.get('total_exp', self.total_exp)
+        if self.old_level is None:
+            self.old_level = level_up_data.get('old_level')
+            self.old_rank = level_up_data.get('old_rank')
+        self.new_level = level_up_data.get('new_level', self.new_level)
+        if level_up_data.get('rank_changed'):
+            self.promoted = True
+            self.new_rank = level_up_data.get('new_rank')
+
+    def add_promotion(self, rank_name: str, level: int) -> None:
+        self.promoted = True
+        self.new_rank = rank_name
+        if self.new_level is None or level > self.new_level:
+            self.new_level = level
+
+    def is_quiet(self) -> bool:
+        """True when there is nothing a quiet-mode user wants to hear about"""
+        return not self.promoted and self.levels_gained == 0
+
+    def build_embed(self) -> discord.Embed:
+        if self.levels_gained > 0:
+            embed = discord.Embed(title="🎉 LEVEL UP! 🎉", color=discord.Color.gold())
+            embed.add_field(
+                name="New Level",
+                value=f"Level {self.new_level} (+{self.levels_gained})",
+                inline=True
+            )
+            if self.promoted:
+                embed.add_field(
+                    name="Rank Promotion!",
+                    value=f"{self.old_rank} → **{self.new_rank}**" if self.old_rank else f"**{self.new_rank}**",
+                    inline=True
+                )
+            embed.add_field(name="EXP Gained", value=f"+{self.exp_gained} EXP", inline=True)
+            embed.add_field(name="Total EXP", value=f"{self.total_exp:,} EXP", inline=True)
+            embed.add_field(
+                name="Bonuses",
+                value=f"• +{self.levels_gained * 3} Stat Points\n• +{self.levels_gained * 20} Max HP\n• +{self.levels_gained * 10} Max MP\n• Full HP/MP Restore",
+                inline=False
+            )
+            embed.set_footer(text="Keep hunting to grow stronger!")
+            return embed
+
+        if self.total_exp is None:
+            # Promotion without an EXP award, e.g. a rank fix-up from .status
+            return discord.Embed(
+                title="🎖️ Rank Promotion!",
+                description=f"🎉 Congratulations! You've been promoted to **{self.new_rank}** (Level {self.new_level})!",
+                color=discord.Color.gold()
+            )
+
+        embed = discord.Embed(
+            title="⚡ EXP Gained",
+            description=f"You gained **{self.exp_gained} EXP**!",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Total EXP", value=f"{self.total_exp:,} EXP", inline=True)
+        embed.add_field(name="Current Level", value=f"Level {self.new_level}", inline=True)
+        if self.promoted:
+            embed.add_field(name="Rank Promotion!", value=f"**{self.new_rank}**", inline=True)
+
+        current_progress, needed_for_next = leveling_system.get_exp_progress(self.total_exp, self.new_level)
+        progress_bar = create_progress_bar(current_progress, needed_for_next)
+        embed.add_field(
+            name="Next Level Progress",
+            value=f"{progress_bar}\n{current_progress:,}/{needed_for_next:,} EXP",
+            inline=False
+        )
+        return embed
+
+
+class NotificationQueue:
+    """Buffers DM-worthy events per user and sends one digest per window.
+
+    The first event for a user opens a NOTIFY_WINDOW timer; everything that
+    arrives before it fires is merged, so a burst of kills or an event-boss
+    payout costs one DM per participant. Sends share a semaphore and back off
+    on errors, and users with DMs closed are skipped for a while.
+    """
+
+    def __init__(self, window: float = NOTIFY_WINDOW, max_concurrent: int = MAX_CONCURRENT_DMS):
+        self.window = window
+        self.max_concurrent = max_concurrent
+        self._digests: Dict[int, _Digest] = {}
+        self._recipients: Dict[int, discord.abc.Messageable] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._dm_closed: Dict[int, float] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    def _digest_for(self, user) -> Optional[_Digest]:
+        if get_notify_mode(user.id) == NOTIFY_OFF:
+            return None
+        closed_at = self._dm_closed.get(user.id)
+        if closed_at is not None:
+            if time.monotonic() - closed_at < DM_CLOSED_COOLDOWN:
+                return None
+            del self._dm_closed[user.id]
+
+        self._recipients[user.id] = user
+        digest = self._digests.get(user.id)
+        if digest is None:
+            digest = self._digests[user.id] = _Digest()
+            loop = asyncio.get_running_loop()
+            self._timers[user.id] = loop.call_later(self.window, self._flush_user, user.id)
+        return digest
+
+    def add_exp(self, user, level_up_data: Dict) -> None:
+        """Queue the result of award_exp for the user's next digest"""
+        digest = self._digest_for(user)
+        if digest is not None:
+            digest.add_exp(level_up_data)
+
+    def add_promotion(self, user, rank_name: str, level: int) -> None:
+        """Queue a rank promotion for the user's next digest"""
+        digest = self._digest_for(user)
+        if digest is not None:
+            digest.add_promotion(rank_name, level)
+
+    def _flush_user(self, user_id: int) -> None:
+        self._timers.pop(user_id, None)
+        digest = self._digests.pop(user_id, None)
+        user = self._recipients.pop(user_id, None)
+        if digest is None or user is None:
+            return
+        if get_notify_mode(user_id) == NOTIFY_LEVELS and digest.is_quiet():
+            return
+        task = asyncio.create_task(self._send(user, digest))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Send every buffered digest now and wait for the sends, e.g. on shutdown"""
+        for user_id in list(self._timers):
+            self._timers[user_id].cancel()
+            self._flush_user(user_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, user, digest: _Digest) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        embed = digest.build_embed()
+        async with self._semaphore:
+            for attempt in range(DM_RETRIES + 1):
+                try:
+                    await user.send(embed=embed)
+                    return
+                except discord.Forbidden:
+                    print(f"Cannot send DM to user {user.id} - DMs disabled")
+                    self._dm_closed[user.id] = time.monotonic()
+                    return
+                except discord.HTTPException as e:
+                    if attempt == DM_RETRIES:
+                        print(f"Error sending notification to {user.id}: {e}")
+                        return
+                    await asyncio.sleep(DM_RETRY_BASE * 2 ** attempt)
+                except Exception as e:
+                    print(f"Error sending notification to {user.id}: {e}")
+                    return
+
+
+# Global instance
+notifications = NotificationQueue()
@@ -0,0 +1,198 @@
+"""Rank role sync: cached role IDs, one roles edit per promotion, and per-guild rate limiting."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+import discord
+
+from utils.leveling_system import RANK_ROLES, get_rank_role_name
+from utils.notifications import notifications
+
+# Discord allows a handful of member edits per guild every few seconds; stay under it
+ROLE_EDITS_PER_SECOND = 1.0
+ROLE_EDIT_BURST = 5
+
+RANK_ROLE_NAMES = frozenset(RANK_ROLES.values())
+
+
+class _TokenBucket:
+    """Classic token bucket: ``burst`` edits at once, then ``rate`` per second"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RoleSyncService:
+    """Keeps members' rank roles in step with their level without hitting rate limits.
+
+    Requests are queued per guild and drained by one worker per guild through a
+    token bucket. A member with several pending promotions gets a single edit
+    for the latest level. Promotion DMs go through the notification queue. Rank role IDs are cached per guild and dropped when a
+    role is created, renamed or deleted; a member -> guild index saves scanning
+    every guild the bot is in to find a hunter.
+    """
+
+    def __init__(self, rate: float = ROLE_EDITS_PER_SECOND, burst: int = ROLE_EDIT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._role_ids: Dict[int, Dict[str, int]] = {}
+        self._member_guilds: Dict[int, int] = {}
+        self._pending: Dict[int, 'OrderedDict[int, int]'] = {}
+        self._buckets: Dict[int, _TokenBucket] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._guilds: Dict[int, discord.Guild] = {}
+
+    def attach(self, bot) -> None:
+        """Register the cache-invalidation listeners on the bot"""
+        bot.add_listener(self._on_role_changed, 'on_guild_role_create')
+        bot.add_listener(self._on_role_changed, 'on_guild_role_delete')
+        bot.add_listener(self._on_role_update, 'on_guild_role_update')
+        bot.add_listener(self._on_member_join, 'on_member_join')
+        bot.add_listener(self._on_member_remove, 'on_member_remove')
+
+    async def _on_role_changed(self, role: discord.Role) -> None:
+        self._role_ids.pop(role.guild.id, None)
+
+    async def _on_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        if before.name != after.name:
+            self._role_ids.pop(after.guild.id, None)
+
+    async def _on_member_join(self, member: discord.Member) -> None:
+        self._member_guilds.setdefault(member.id, member.guild.id)
+
+    async def _on_member_remove(self, member: discord.Member) -> None:
+        if self._member_guilds.get(member.id) == member.guild.id:
+            del self._member_guilds[member.id]
+
+    def find_member(self, bot, user_id) -> Optional[discord.Member]:
+        """Return the hunter's member object, scanning guilds only on an index miss"""
+        user_id = int(user_id)
+        guild_id = self._member_guilds.get(user_id)
+        if guild_id is not None:
+            guild = bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild else None
+            if member is not None:
+                return member
+            del self._member_guilds[user_id]
+        for guild in bot.guilds:
+            member = guild.get_member(user_id)
+            if member is not None:
+                self._member_guilds[user_id] = guild.id
+                return member
+        return None
+
+    def request(self, member: discord.Member, level: int, notify: bool = True) -> None:
+        """Queue a rank role sync for a member; returns immediately.
+
+        If the member already has a sync waiting it is updated in place, so
+        only the newest level is applied.
+        """
+        guild = member.guild
+        self._member_guilds[member.id] = guild.id
+        self._guilds[guild.id] = guild
+        # Keeps its place in the queue but takes the newest level
+        self._pending.setdefault(guild.id, OrderedDict())[member.id] = level
+        if notify:
+            notifications.add_promotion(member, get_rank_role_name(level), level)
+
+        worker = self._workers.get(guild.id)
+        if worker is None or worker.done():
+            self._workers[guild.id] = asyncio.create_task(self._drain(guild.id))
+
+    def request_for_user(self, bot, user_id, level: int, notify: bool = True) -> bool:
+        """Queue a sync for a user id; False if they are not in any of the bot's guilds"""
+        member = self.find_member(bot, user_id)
+        if member is None:
+            return False
+        self.request(member, level, notify)
+        return True
+
+    def pending_count(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    async def _drain(self, guild_id: int) -> None:
+        bucket = self._buckets.setdefault(guild_id, _TokenBucket(self.rate, self.burst))
+        pending = self._pending[guild_id]
+        while pending:
+            await bucket.acquire()
+            if not pending:
+                break
+            # Pop only once a token is ours, so promotions that arrive while we wait merge in
+            member_id, level = pending.popitem(last=False)
+            guild = self._guilds[guild_id]
+            member = guild.get_member(member_id)
+            if member is None:
+                continue
+            try:
+                await self._apply(member, level, bucket)
+            except Exception as e:
+                print(f"[ERROR] ❗ Error updating rank role for {member.display_name}: {e}")
+
+    def _cached_role(self, guild: discord.Guild, rank_name: str) -> Optional[discord.Role]:
+        role_ids = self._role_ids.get(guild.id)
+        if role_ids is None:
+            role_ids = {role.name: role.id for role in guild.roles if role.name in RANK_ROLE_NAMES}
+            self._role_ids[guild.id] = role_ids
+        role_id = role_ids.get(rank_name)
+        if role_id is None:
+            return None
+        role = guild.get_role(role_id)
+        if role is None:
+            # Deleted while we were not listening; rebuild on the next lookup
+            self._role_ids.pop(guild.id, None)
+        return role
+
+    async def _rank_role(self, guild: discord.Guild, rank_name: str, bucket: _TokenBucket) -> Optional[discord.Role]:
+        role = self._cached_role(guild, rank_name)
+        if role is None:
+            # A stale ID only drops the cache, so look once more against fresh roles
+            role = self._cached_role(guild, rank_name)
+        if role is not None:
+            return role
+
+        try:
+            await bucket.acquire()
+            role = await guild.create_role(
+                name=rank_name,
+                reason="Auto-created rank role for leveling system"
+            )
+        except discord.Forbidden as e:
+            print(f"[ERROR] ❌ Bot lacks permission to create role '{rank_name}': {e}")
+            return None
+        self._role_ids.setdefault(guild.id, {})[rank_name] = role.id
+        return role
+
+    async def _apply(self, member: discord.Member, level: int, bucket: _TokenBucket) -> None:
+        rank_name = get_rank_role_name(level)
+        rank_role = await self._rank_role(member.guild, rank_name, bucket)
+        if rank_role is None:
+            return
+
+        rank_ids = set(self._role_ids.get(member.guild.id, {}).values())
+        kept = [role for role in member.roles if not role.is_default() and role.id not in rank_ids]
+        current: Set[int] = {role.id for role in member.roles if role.id in rank_ids}
+        if current != {rank_role.id}:
+            try:
+                await member.edit(roles=kept + [rank_role], reason="Rank update")
+            except discord.Forbidden as e:
+                print(f"[ERROR] ❌ Bot lacks permission to manage roles for {member.display_name}: {e}")
+
+
+# Global instance
+role_sync = RoleSyncService()
@@ -0,0 +1,272 @@
+"""One heap of deadlines for every timer in the bot: cooldowns, rest, training and event timeouts."""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import time
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.async_io import DebouncedJsonFile, read_json
+
+# Persistent timers (rest, training, ...) live here between restarts
+TIMERS_FILE = 'data/timers.json'
+# Seconds to wait after a change before rewriting the timers file
+FLUSH_DELAY = 2.0
+
+# Called as on_expire(subject, data); may be a coroutine function
+ExpireHandler = Callable[[str, Any], Any]
+
+
+class TimerTable(MutableMapping):
+    """The deadlines of one kind of timer, keyed by subject (a user id, an event id).
+
+    ``until``/``remaining`` answer "is X busy, and until when" with one dict
+    lookup; expired entries are dropped lazily on read. Tables with an
+    ``on_expire`` handler also get a slot in the scheduler's heap so the
+    handler fires at the deadline, with no task per timer.
+
+    With ``deadline_key`` the table also works as a plain dict of session
+    dicts: assigning ``table[user_id] = {'end_time': ..., ...}`` schedules at
+    ``end_time`` and ``del table[user_id]`` cancels, so code written against
+    a dict of sessions keeps working. Such entries stay until deleted, since
+    their owner decides what an elapsed session means.
+    """
+
+    def __init__(self, scheduler: 'Scheduler', kind: str, persist: bool,
+                 on_expire: Optional[ExpireHandler], deadline_key: Optional[str]):
+        self.scheduler = scheduler
+        self.kind = kind
+        self.persist = persist
+        self.on_expire = on_expire
+        self.deadline_key = deadline_key
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._seqs: Dict[str, int] = {}
+
+    # Timer API ----------------------------------------------------------
+
+    def set(self, subject, deadline: float, data: Any = None) -> None:
+        """Start (or move) the timer for ``subject`` to the epoch time ``deadline``"""
+        subject = str(subject)
+        self._entries[subject] = (deadline, data)
+        self._seqs[subject] = self.scheduler._push(self, subject, deadline)
+        self.scheduler._changed(self)
+
+    def start(self, subject, seconds: float, data: Any = None) -> float:
+        """Start a timer ``seconds`` from now and return its deadline"""
+        deadline = time.time() + seconds
+        self.set(subject, deadline, data)
+        return deadline
+
+    def until(self, subject) -> Optional[float]:
+        """Deadline of a running timer, None if there is none or it has passed"""
+        subject = str(subject)
+        entry = self._entries.get(subject)
+        if entry is None:
+            return None
+        if entry[0] > time.time():
+            return entry[0]
+        if self.deadline_key is None:
+            self.discard(subject)
+        return None
+
+    def remaining(self, subject) -> float:
+        """Seconds left on a timer, 0 if it is not running"""
+        deadline = self.until(subject)
+        return max(0.0, deadline - time.time()) if deadline is not None else 0.0
+
+    def data(self, subject) -> Any:
+        entry = self._entries.get(str(subject))
+        return entry[1] if entry is not None else None
+
+    def discard(self, subject) -> bool:
+        """Cancel a timer; False if there was none"""
+        subject = str(subject)
+        if self._entries.pop(subject, None) is None:
+            return False
+        self._seqs.pop(subject, None)
+        self.scheduler._changed(self)
+        return True
+
+    # Dict API (tables with a deadline_key) ------------------------------
+
+    def __getitem__(self, subject) -> Any:
+        return self._entries[str(subject)][1]
+
+    def __setitem__(self, subject, session: Dict[str, Any]) -> None:
+        self.set(subject, session[self.deadline_key], session)
+
+    def __delitem__(self, subject) -> None:
+        if not self.discard(subject):
+            raise KeyError(subject)
+
+    def __contains__(self, subject) -> bool:
+        return str(subject) in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Scheduler side -----------------------------------------------------
+
+    def _is_current(self, subject: str, seq: int) -> bool:
+        return self._seqs.get(subject) == seq
+
+    def _fire(self, subject: str) -> Tuple[bool, Any]:
+        """Pop an elapsed timer for its handler; sessions without a handler stay for their owner"""
+        if self.on_expire is None:
+            return False, None
+        _, data = self._entries.pop(subject)
+        self._seqs.pop(subject, None)
+        self.scheduler._changed(self)
+        return True, data
+
+    def _keeps(self, deadline: float, now: float) -> bool:
+        """Whether an entry is worth saving: elapsed plain timers mean nothing after a restart"""
+        return deadline > now or self.on_expire is not None or self.deadline_key is not None
+
+    def _dump(self) -> Dict[str, List]:
+        now = time.time()
+        return {subject: [deadline, data] for subject, (deadline, data) in self._entries.items()
+                if self._keeps(deadline, now)}
+
+
+class Scheduler:
+    """Owns every deadline in the process and fires them from a single timer.
+
+    Timers are grouped into ``TimerTable``s by kind. Handlers run from one
+    ``loop.call_later`` armed for the earliest deadline in a heap, so
+    thousands of pending cooldowns cost one timer handle rather than one
+    sleeping task each; rescheduled or cancelled entries are skipped when
+    they surface. Tables created with ``persist=True`` are written to
+    ``data/timers.json`` shortly after each change and reloaded at startup,
+    and a handler whose deadline passed while the bot was down fires as soon
+    as its table is registered. Persisted data must be JSON-serializable;
+    in-memory tables may carry any object.
+    """
+
+    def __init__(self, path: str = TIMERS_FILE):
+        self.path = path
+        self._tables: Dict[str, TimerTable] = {}
+        self._loaded: Dict[str, Dict[str, List]] = {}
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._armed_for: Optional[float] = None
+        self._file = DebouncedJsonFile(path, self._dump, FLUSH_DELAY)
+
+    def table(self, kind: str, persist: bool = True, on_expire: Optional[ExpireHandler] = None,
+              deadline_key: Optional[str] = None) -> TimerTable:
+        """Register (or fetch) the table for one kind of timer; a reloaded cog's handler replaces the old one"""
+        table = self._tables.get(kind)
+        if table is None:
+            table = self._tables[kind] = TimerTable(self, kind, persist, on_expire, deadline_key)
+            self._restore(table)
+        elif on_expire is not None:
+            table.on_expire = on_expire
+        return table
+
+    def busy_until(self, subject, *kinds: str) -> Optional[float]:
+        """Latest running deadline for ``subject`` across ``kinds`` (every table if none given)"""
+        tables = [self._tables[kind] for kind in kinds if kind in self._tables] if kinds else self._tables.values()
+        deadlines = [d for d in (table.until(subject) for table in tables) if d is not None]
+        return max(deadlines) if deadlines else None
+
+    # Persistence --------------------------------------------------------
+
+    async def load(self) -> None:
+        """Read persisted timers; tables registered later pick theirs up"""
+        saved = await read_json(self.path, {}) or {}
+        for kind, entries in saved.items():
+            table = self._tables.get(kind)
+            if table is None:
+                self._loaded[kind] = entries
+            else:
+                self._restore(table, entries)
+
+    def _restore(self, table: TimerTable, entries: Optional[Dict[str, List]] = None) -> None:
+        if entries is None:
+            entries = self._loaded.pop(table.kind, {})
+        now = time.time()
+        for subject, (deadline, data) in entries.items():
+            if subject not in table._entries and table._keeps(deadline, now):
+                table.set(subject, deadline, data)
+
+    def _changed(self, table: TimerTable) -> None:
+        if table.persist:
+            self._file.changed()
+
+    def flush(self) -> None:
+        """Write the persistent timers in the background"""
+        self._file.flush()
+
+    async def flush_async(self) -> None:
+        """Write the persistent timers now; call before the process exits"""
+        await self._file.flush_async()
+
+    def _dump(self) -> Dict[str, Dict[str, List]]:
+        dump = {kind: dict(entries) for kind, entries in self._loaded.items()}
+        for kind, table in self._tables.items():
+            if table.persist and table._entries:
+                dump[kind] = table._dump()
+        return dump
+
+    # Firing -------------------------------------------------------------
+
+    def _push(self, table: TimerTable, subject: str, deadline: float) -> int:
+        seq = next(self._seq)
+        if table.on_expire is not None:
+            heapq.heappush(self._heap, (deadline, seq, table.kind, subject))
+            self._arm()
+        return seq
+
+    def _arm(self) -> None:
+        if not self._heap:
+            return
+        deadline = self._heap[0][0]
+        if self._handle is not None and self._armed_for is not None and self._armed_for <= deadline:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Armed by the next change made from inside the loop
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed_for = deadline
+        self._handle = loop.call_later(max(0.0, deadline - time.time()), self._run_due)
+
+    def _run_due(self) -> None:
+        self._handle = self._armed_for = None
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, kind, subject = heapq.heappop(self._heap)
+            table = self._tables.get(kind)
+            if table is None or not table._is_current(subject, seq):
+                continue
+            fired, data = table._fire(subject)
+            if fired:
+                self._call(table, subject, data)
+        self._arm()
+
+    @staticmethod
+    def _call(table: TimerTable, subject: str, data: Any) -> None:
+        try:
+            result = table.on_expire(subject, data)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(Scheduler._guard(table.kind, result))
+        except Exception as e:
+            print(f"Error firing {table.kind} timer for {subject}: {e}")
+
+    @staticmethod
+    async def _guard(kind: str, awaitable) -> None:
+        try:
+            await awaitable
+        except Exception as e:
+            print(f"Error firing {kind} timer: {e}")
+
+
+# Global instance
+scheduler = Scheduler()
@@ -0,0 +1,224 @@
+"""Rank-bucketed monster spawn tables with O(1) weighted sampling (Walker alias method)."""
+
+import random
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from utils.game_data import FrozenDict, game_data
+
+RANKS = ('E', 'D', 'C', 'B', 'A', 'S')
+
+# monsters.json is grouped by family; each family spawns from this rank up
+FAMILY_RANKS = {
+    'goblins': 'E',
+    'wolves': 'D',
+    'orcs': 'C',
+    'spiders': 'B',
+    'undead': 'B',
+    'elementals': 'A',
+    'demons': 'S',
+}
+
+# Monster ranks a hunter of each rank can meet (matches the old hunt progression)
+POOL_RANKS = {
+    'E': ('E',),
+    'D': ('E', 'D'),
+    'C': ('E', 'D', 'C'),
+    'B': ('D', 'C', 'B'),
+    'A': ('C', 'B', 'A'),
+    'S': RANKS,
+}
+
+# Level shown for catalog monsters that don't define one
+RANK_LEVELS = {'E': 1, 'D': 10, 'C': 20, 'B': 30, 'A': 45, 'S': 60}
+
+# Relative spawn weight by rarity; a monster's own "spawn_weight" overrides it
+RARITY_WEIGHTS = {
+    'common': 10.0,
+    'uncommon': 6.0,
+    'rare': 3.0,
+    'epic': 1.0,
+    'legendary': 0.25,
+}
+
+
+def normalize_rank(rank: Any) -> str:
+    """'E Rank', 'E-Rank', 'e' -> 'E'; F counts as E and National Level as S"""
+    text = str(rank or 'E').strip().upper()
+    if text.startswith('NATIONAL'):
+        return 'S'
+    letter = text[:1]
+    if letter == 'F':
+        return 'E'
+    return letter if letter in RANKS else 'E'
+
+
+class AliasTable:
+    """Walker's alias method: O(n) to build, O(1) per weighted draw"""
+
+    __slots__ = ('_prob', '_alias', '_n')
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasTable needs at least one weight")
+        total = float(sum(weights))
+        if total <= 0:
+            weights, total = [1.0] * n, float(n)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0  # Leftovers are 1 up to float error
+        self._prob = prob
+        self._alias = alias
+        self._n = n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Index drawn with probability proportional to its weight"""
+        i = int(rng.random() * self._n)
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+class MonsterInstance:
+    """One spawned monster: a shared read-only template plus its own changes.
+
+    Reads fall through to the template, writes (hp, current_hp, frozen_turns,
+    ...) land in a small per-instance dict, so spawning copies nothing. It
+    supports the dict operations combat code uses, and ``copy``/``to_dict``
+    give a plain dict for storing in hunter records.
+    """
+
+    __slots__ = ('template', '_state')
+
+    def __init__(self, template: Mapping[str, Any], **state):
+        self.template = template
+        self._state = state
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._state:
+            return self._state[key]
+        return self.template[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._state[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._state[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._state or key in self.template
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._state:
+            return self._state[key]
+        return self.template.get(key, default)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = dict(self.template)
+        data.update(self._state)
+        return data
+
+    copy = to_dict
+
+    def __repr__(self) -> str:
+        return f"MonsterInstance({self.get('name')!r}, hp={self.get('current_hp')}/{self.get('max_hp')})"
+
+
+class SpawnTables:
+    """Monster pools per hunter rank, built once from monsters.json and MONSTERS_LORE"""
+
+    def __init__(self, catalog: Optional[Mapping[str, Sequence[Mapping[str, Any]]]],
+                 lore: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        templates = []
+        by_name = {}
+        for family, monsters in (catalog or {}).items():
+            family_rank = FAMILY_RANKS.get(family, 'E')
+            for monster in monsters:
+                by_name[str(monster.get('name', '')).lower()] = len(templates)
+                templates.append(self._template(monster, family=family, rank=family_rank))
+        for monster_id, monster in (lore or {}).items():
+            index = by_name.get(str(monster.get('name', '')).lower())
+            if index is not None:
+                # Same monster in both sources: keep the catalog stats, link the lore id
+                templates[index] = FrozenDict(templates[index], id=monster_id)
+                continue
+            templates.append(self._template(monster, id=monster_id, rank=monster.get('rank', 'E')))
+        self.templates: Tuple[Mapping[str, Any], ...] = tuple(templates)
+
+        self._pools: Dict[str, Tuple[Tuple[Mapping[str, Any], ...], AliasTable]] = {}
+        for hunter_rank, allowed in POOL_RANKS.items():
+            pool = tuple(t for t in self.templates if t['rank'] in allowed)
+            if pool:
+                self._pools[hunter_rank] = (pool, AliasTable([self._weight(t) for t in pool]))
+
+    @staticmethod
+    def _template(monster: Mapping[str, Any], rank: str, **extra) -> Mapping[str, Any]:
+        template = dict(monster)
+        template.update(extra)
+        template['rank'] = normalize_rank(monster.get('rank', rank))
+        template.setdefault('level', RANK_LEVELS[template['rank']])
+        template.setdefault('rarity', 'common')
+        template.pop('lore', None)  # Lore text stays in MONSTERS_LORE
+        return FrozenDict(template)
+
+    @staticmethod
+    def _weight(template: Mapping[str, Any]) -> float:
+        if 'spawn_weight' in template:
+            return float(template['spawn_weight'])
+        return RARITY_WEIGHTS.get(str(template.get('rarity', 'common')).lower(), RARITY_WEIGHTS['common'])
+
+    def pool(self, hunter_rank: str) -> List[Mapping[str, Any]]:
+        """Templates a hunter of this rank can meet"""
+        entry = self._pools.get(normalize_rank(hunter_rank))
+        return list(entry[0]) if entry else []
+
+    def pool_weights(self, hunter_rank: str) -> List[float]:
+        """Spawn weights matching pool(hunter_rank)"""
+        return [self._weight(t) for t in self.pool(hunter_rank)]
+
+    def spawn(self, hunter_rank: str, rng: random.Random = random) -> Optional[MonsterInstance]:
+        """Weighted random monster for a hunter's rank, or None if the pool is empty"""
+        entry = self._pools.get(normalize_rank(hunter_rank)) or self._pools.get('E')
+        if entry is None:
+            return None
+        pool, table = entry
+        template = pool[table.sample(rng)]
+        return MonsterInstance(template, max_hp=template['hp'], current_hp=template['hp'])
+
+
+def _build_spawn_tables(catalog) -> SpawnTables:
+    try:
+        from data.encounter_data import MONSTERS_LORE
+    except ImportError:
+        MONSTERS_LORE = {}
+    return SpawnTables(catalog, MONSTERS_LORE)
+
+
+def get_spawn_tables() -> SpawnTables:
+    """Spawn tables for the current monster catalog (rebuilt when monsters.json reloads)"""
+    return game_data.derive('monsters', 'spawn_tables', _build_spawn_tables)
+
+
+def spawn_monster(hunter_rank: str, rng: random.Random = random) -> Optional[MonsterInstance]:
+    """Spawn a monster for a hunter of the given rank"""
+    return get_spawn_tables().spawn(hunter_rank, rng)
@@ -0,0 +1,102 @@
+"""Staged startup: the blocking work runs once before login, maintenance runs after the bot is ready."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+
+class StageTiming(NamedTuple):
+    name: str
+    seconds: float
+    background: bool
+    error: Optional[str]
+
+
+class Startup:
+    """Times each startup stage and reports cold start to first served command.
+
+    ``stage`` wraps work that must finish before the bot serves anything
+    (data reads, cog loading). ``defer`` schedules maintenance to run once
+    the bot is ready; each deferred job runs a single time per process, so a
+    gateway reconnect firing ``on_ready`` again repeats none of it. Failures
+    are logged and timed like any other stage rather than aborting startup.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: List[StageTiming] = []
+        self.ready_at: Optional[float] = None
+        self.first_command_at: Optional[float] = None
+        self._stages_done = self.started
+        self._deferred: List[tuple] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def attach(self, bot) -> None:
+        """Record the first command the bot finishes serving"""
+        bot.add_listener(self._on_command_completion, 'on_command_completion')
+
+    async def _on_command_completion(self, ctx) -> None:
+        if self.first_command_at is None:
+            self.first_command_at = time.perf_counter()
+            print(f"[startup] First command (.{ctx.command}) served {self.first_command_at - self.started:.2f}s "
+                  f"after process start")
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready_at is not None
+
+    async def _timed(self, name: str, work: Awaitable, background: bool) -> bool:
+        began = time.perf_counter()
+        error = None
+        try:
+            await work
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            print(f"[startup] Stage '{name}' failed: {error}")
+        self.timings.append(StageTiming(name, time.perf_counter() - began, background, error))
+        if not background:
+            self._stages_done = time.perf_counter()
+        if background:
+            print(f"[startup] Background '{name}' finished in {self.timings[-1].seconds:.2f}s")
+        return error is None
+
+    async def stage(self, name: str, *work: Awaitable) -> bool:
+        """Run one blocking stage; several awaitables given together run concurrently"""
+        return await self._timed(name, asyncio.gather(*work), background=False)
+
+    def defer(self, name: str, job: Callable[[], Awaitable]) -> None:
+        """Queue ``job()`` to run in the background once the bot is ready"""
+        if self.is_ready:
+            self._launch(name, job)
+        else:
+            self._deferred.append((name, job))
+
+    def _launch(self, name: str, job: Callable[[], Awaitable]) -> None:
+        if name not in self._tasks:
+            self._tasks[name] = asyncio.create_task(self._timed(name, job(), background=True))
+
+    def mark_ready(self) -> bool:
+        """Start the deferred jobs; False when the bot was already ready (a reconnect)"""
+        if self.is_ready:
+            return False
+        self.ready_at = time.perf_counter()
+        self.timings.append(StageTiming('gateway', self.ready_at - self._stages_done, False, None))
+        self.report()
+        deferred, self._deferred = self._deferred, []
+        for name, job in deferred:
+            self._launch(name, job)
+        return True
+
+    def report(self) -> None:
+        """Print how long each blocking stage took and the time to ready"""
+        print("[startup] Stage timings:")
+        for timing in self.timings:
+            if not timing.background:
+                status = " (failed)" if timing.error else ""
+                print(f"[startup]   {timing.name:<12} {timing.seconds:6.2f}s{status}")
+        if self.ready_at is not None:
+            print(f"[startup] Ready {self.ready_at - self.started:.2f}s after process start")
+
+
+# Global instance
+startup = Startup()
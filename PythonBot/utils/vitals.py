@@ -0,0 +1,135 @@
+"""HP/MP regeneration derived from a timestamp instead of rewritten on every read."""
+
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from utils.hunter_store import HunterStore, hunter_store
+
+# Fraction of max HP/MP regenerated per minute out of combat
+REGEN_PER_MINUTE = 0.05
+# Hunter field holding the epoch time ``hp``/``mp`` were last materialized at
+STAMP_FIELD = 'vitals_at'
+
+
+def regenerated(value: int, maximum: int, since: Optional[float], now: float,
+                rate: float = REGEN_PER_MINUTE) -> int:
+    """Value after regenerating ``rate`` of ``maximum`` per minute from ``since`` to ``now``"""
+    if since is None or value >= maximum:
+        return value
+    gained = int(maximum * rate * max(0.0, now - since) / 60)
+    return min(maximum, value + gained)
+
+
+class Vitals:
+    """Current HP/MP as a pure function of the stored values and their timestamp.
+
+    ``hp``/``mp`` on a hunter record are the values as of ``vitals_at``;
+    ``current`` adds the regeneration since then without touching the
+    record, so displaying a hunter costs no write. ``settle`` folds the
+    regeneration into the stored values in memory only; it runs before each
+    command so combat code reading ``hunter['hp']`` sees the live value, and
+    reaches disk only if the command goes on to save.
+
+    Writes the rest of the bot makes are noticed through the store's dirty
+    listener: when a saved record's HP or MP differs from what was last
+    settled, a mutation changed the base value and the timestamp restarts
+    from now, so regeneration never counts time that was already spent
+    under the old value. A hunter not settled yet this process is settled
+    on that first write instead, so an unrelated save after a restart keeps
+    the regeneration accrued while the bot was down. Button callbacks have
+    no before_invoke hook and settle the hunter themselves before using HP.
+
+    Nothing regenerates during a fight (a combat activity or a battle saved
+    on the record): the timestamp is held at now while it lasts and
+    restarted when the hunter is next seen out of it.
+    """
+
+    def __init__(self, store: HunterStore = hunter_store, activities=None):
+        self.store = store
+        self._activities = activities
+        # user id -> (hp, mp) as last settled, for hunters touched this process
+        self._settled: Dict[str, Tuple[Any, Any]] = {}
+        # Hunters last seen fighting, whose timestamp restarts once they stop
+        self._fighting: Set[str] = set()
+
+    @property
+    def activities(self):
+        """Activity registry, imported on first use"""
+        if self._activities is None:
+            from utils.activity import activities
+            self._activities = activities
+        return self._activities
+
+    def attach(self, bot) -> None:
+        """Settle the invoking hunter before every command and restamp on writes"""
+        bot.before_invoke(self._before_invoke)
+        self.store.add_listener(self._on_hunter_changed)
+
+    async def _before_invoke(self, ctx) -> None:
+        hunter = self.store.get(ctx.author.id)
+        if hunter is not None:
+            self.settle(ctx.author.id, hunter)
+
+    def current(self, user_id, hunter: Dict[str, Any], now: Optional[float] = None) -> Tuple[int, int]:
+        """(hp, mp) right now, regeneration included"""
+        if str(user_id) in self._fighting or self.activities.in_combat(user_id, hunter):
+            return hunter.get('hp', 0), hunter.get('mp', 0)
+        return self._regenerated(hunter, time.time() if now is None else now)
+
+    def _regenerated(self, hunter: Dict[str, Any], now: float) -> Tuple[int, int]:
+        since = hunter.get(STAMP_FIELD)
+        hp = regenerated(hunter.get('hp', 0), hunter.get('max_hp', 100), since, now)
+        mp = regenerated(hunter.get('mp', 0), hunter.get('max_mp', 50), since, now)
+        return hp, mp
+
+    def settle(self, user_id, hunter: Dict[str, Any], now: Optional[float] = None) -> Tuple[int, int]:
+        """Fold regeneration into ``hp``/``mp`` in memory and return the gains; never marks dirty"""
+        now = time.time() if now is None else now
+        user_id = str(user_id)
+        old_hp, old_mp = hunter.get('hp', 0), hunter.get('mp', 0)
+        if self._hold_in_combat(user_id, hunter, now):
+            self._settled[user_id] = (old_hp, old_mp)
+            return 0, 0
+        if self._settled.get(user_id, (old_hp, old_mp)) != (old_hp, old_mp):
+            # Changed since the last settle without a save we saw; don't credit the old stamp
+            hunter[STAMP_FIELD] = now
+        hp, mp = self._regenerated(hunter, now)
+        hunter['hp'], hunter['mp'] = hp, mp
+        hunter[STAMP_FIELD] = now
+        self._settled[user_id] = (hp, mp)
+        return hp - old_hp, mp - old_mp
+
+    def _hold_in_combat(self, user_id: str, hunter: Dict[str, Any], now: float) -> bool:
+        """Restamp a fighting hunter (or one just out of a fight); True while the fight lasts"""
+        if self.activities.in_combat(user_id, hunter):
+            self._fighting.add(user_id)
+            hunter[STAMP_FIELD] = now
+            return True
+        if user_id in self._fighting:
+            self._fighting.discard(user_id)
+            hunter[STAMP_FIELD] = now
+        return False
+
+    def _on_hunter_changed(self, user_id: Optional[str]) -> None:
+        # Legacy whole-dict saves don't say who changed; only settled hunters can be stale
+        user_ids = list(self._settled) if user_id is None else [user_id]
+        now = time.time()
+        for uid in user_ids:
+            hunter = self.store.get(uid)
+            if hunter is None:
+                self._settled.pop(uid, None)
+                continue
+            if uid not in self._settled:
+                # First sight since startup: credit what accrued under the stored stamp, don't drop it
+                self.settle(uid, hunter, now)
+                continue
+            base = (hunter.get('hp', 0), hunter.get('mp', 0))
+            if self._hold_in_combat(uid, hunter, now):
+                self._settled[uid] = base
+            elif self._settled.get(uid) != base:
+                hunter[STAMP_FIELD] = now
+                self._settled[uid] = base
+
+
+# Global instance
+vitals = Vitals()